@@ -9,14 +9,21 @@ eliminating the need for file-based coordination.
 from fastapi import FastAPI, HTTPException
 from fastapi.responses import JSONResponse
 from pydantic import BaseModel
-from typing import List, Dict, Any, Optional
+from typing import Any
+from collections.abc import Callable
 import asyncio
+import itertools
 import json
 import uuid
+from collections import deque
 from datetime import datetime
 import subprocess
 import sys
 import os
+import time
+
+# Responses carry whole completions, so lines can be far longer than asyncio's 64 KiB default
+STREAM_LIMIT = 16 * 1024 * 1024
 
 
 class Message(BaseModel):
@@ -26,109 +33,460 @@ class Message(BaseModel):
 
 class ChatRequest(BaseModel):
     model: str
-    messages: List[Message]
-    max_tokens: Optional[int] = 1024
-    temperature: Optional[float] = 0.5
-    system: Optional[str] = None
-    tools: Optional[List[Dict[str, Any]]] = None
+    messages: list[Message]
+    max_tokens: int | None = 1024
+    temperature: float | None = 0.5
+    system: str | None = None
+    tools: list[dict[str, Any]] | None = None
 
 
 class ChatResponse(BaseModel):
     id: str
     type: str = "message"
     role: str = "assistant"
-    content: List[Dict[str, Any]]
+    content: list[dict[str, Any]]
     model: str
-    stop_reason: Optional[str] = "end_turn"
-    stop_sequence: Optional[str] = None
-    usage: Dict[str, int]
+    stop_reason: str | None = "end_turn"
+    stop_sequence: str | None = None
+    usage: dict[str, int]
+
+
+class PoolSaturatedError(RuntimeError):
+    """Raised when the pool queue is full and a request is turned away"""
+
+
+def process_rss_mb(pid: int) -> float | None:
+    """Resident memory of a process in MB, or None where /proc is unavailable"""
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+def percentile(values: list[float], fraction: float) -> float | None:
+    """Nearest-rank percentile of values, or None when there are none"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(fraction * len(ordered) + 0.5)) - 1))
+    return ordered[index]
+
+
+class StdioWorker:
+    """One stdio worker process and the requests outstanding on it
+    
+    Requests are tagged with an id and written to the worker's stdin;
+    responses are matched back to their request by id, so several
+    requests can share the worker and finish in any order.
+    """
+    
+    def __init__(
+        self,
+        worker_id: str,
+        process: asyncio.subprocess.Process,
+        max_in_flight: int,
+        on_release: Callable[[], None] | None = None
+    ):
+        self.id = worker_id
+        self.process = process
+        self.max_in_flight = max_in_flight
+        self.on_release = on_release
+        self.pending: dict[str, asyncio.Future] = {}
+        self.latencies = deque(maxlen=1000)
+        self.completed = 0
+        self.failed = 0
+        self.last_active = time.monotonic()
+        self.reader_task = asyncio.create_task(self._read_responses())
+    
+    @property
+    def alive(self) -> bool:
+        return self.process.returncode is None and not self.reader_task.done()
+    
+    @property
+    def outstanding(self) -> int:
+        return len(self.pending)
+    
+    async def _read_responses(self):
+        """Resolve pending requests as their responses arrive"""
+        try:
+            while True:
+                line = await self.process.stdout.readline()
+                if not line:
+                    break
+                
+                try:
+                    response = json.loads(line.decode())
+                except json.JSONDecodeError:
+                    print(f"⚠️ {self.id} wrote a line that is not JSON: {line[:200]!r}")
+                    continue
+                
+                future = self.pending.get(response.pop("id", None))
+                if future is not None and not future.done():
+                    future.set_result(response)
+        except Exception as e:
+            print(f"❌ Failed to read from {self.id}: {e}")
+        finally:
+            # The worker is gone: nothing more will arrive for its requests
+            for future in self.pending.values():
+                if not future.done():
+                    future.set_exception(RuntimeError(f"Worker {self.id} died"))
+    
+    def submit(self, request: dict[str, Any]) -> str:
+        """Write one request and register it as outstanding; returns its id"""
+        request_id = uuid.uuid4().hex
+        self.pending[request_id] = asyncio.get_running_loop().create_future()
+        try:
+            self.process.stdin.write((json.dumps({**request, "id": request_id}) + "\n").encode())
+        except Exception:
+            self.pending.pop(request_id, None)
+            raise
+        return request_id
+    
+    async def wait(self, request_id: str, timeout: float) -> dict[str, Any]:
+        """Wait for the response to a submitted request"""
+        future = self.pending[request_id]
+        start = time.monotonic()
+        try:
+            await self.process.stdin.drain()
+            response = await asyncio.wait_for(asyncio.shield(future), timeout=timeout)
+        except BaseException:
+            self.failed += 1
+            if future.done():
+                self.pending.pop(request_id, None)
+            else:
+                # The worker is still running the request, so it keeps its slot until the
+                # worker answers or dies
+                future.add_done_callback(lambda f: self._release(request_id, f))
+            raise
+        finally:
+            self.last_active = time.monotonic()
+        
+        self.pending.pop(request_id, None)
+        self.completed += 1
+        self.latencies.append(time.monotonic() - start)
+        return response
+    
+    def _release(self, request_id: str, future: asyncio.Future):
+        """Free the slot of a request nobody is waiting for any more"""
+        self.pending.pop(request_id, None)
+        if not future.cancelled():
+            future.exception()  # Retrieved, so an abandoned failure isn't logged
+        if self.on_release is not None:
+            self.on_release()
+    
+    async def stop(self):
+        if self.process.returncode is None:
+            self.process.terminate()
+            await self.process.wait()
+        await asyncio.gather(self.reader_task, return_exceptions=True)
+    
+    def get_metrics(self) -> dict[str, Any]:
+        latencies = list(self.latencies)
+        return {
+            "id": self.id,
+            "pid": self.process.pid,
+            "alive": self.alive,
+            "outstanding": self.outstanding,
+            "idle_seconds": 0 if self.pending else round(time.monotonic() - self.last_active, 3),
+            "rss_mb": process_rss_mb(self.process.pid),
+            "completed": self.completed,
+            "failed": self.failed,
+            "latency_p50": percentile(latencies, 0.50),
+            "latency_p99": percentile(latencies, 0.99)
+        }
 
 
 class WorkerPool:
-    """Manages a pool of stdio workers"""
+    """Manages a pool of stdio workers
     
-    def __init__(self, num_workers: int = 3):
-        self.workers = []
-        self.available_workers = asyncio.Queue()
+    Each request goes to the live worker with the fewest outstanding
+    requests, up to max_in_flight per worker. Requests beyond that wait
+    in the pool; once max_queue_size are waiting, new requests are
+    rejected with PoolSaturatedError. Workers that exit are respawned.
+    
+    The pool starts with num_workers and autoscales between that and
+    max_workers: a worker is added when the oldest waiting request has
+    waited longer than scale_up_wait seconds, unless the server and its
+    workers would then exceed memory_budget_mb, and a worker beyond
+    num_workers is stopped once it has been idle for idle_cooldown seconds.
+    """
+    
+    def __init__(
+        self,
+        num_workers: int = 3,
+        max_in_flight: int = 4,
+        max_queue_size: int = 100,
+        request_timeout: float = 130,  # Slightly more than worker timeout
+        worker_command: list[str] | None = None,
+        max_workers: int | None = None,
+        scale_up_wait: float = 2.0,
+        idle_cooldown: float = 300.0,
+        memory_budget_mb: float | None = None,
+        autoscale_interval: float = 1.0
+    ):
         self.num_workers = num_workers
-        
+        self.max_workers = max(max_workers or num_workers, num_workers)
+        self.scale_up_wait = scale_up_wait
+        self.idle_cooldown = idle_cooldown
+        self.memory_budget_mb = memory_budget_mb
+        self.autoscale_interval = autoscale_interval
+        self.max_in_flight = max_in_flight
+        self.max_queue_size = max_queue_size
+        self.request_timeout = request_timeout
+        self.worker_command = worker_command or ["python", "/app/claude_docker_worker_stdio.py"]
+        self.workers: list[StdioWorker] = []
+        self.waiting: dict[int, float] = {}  # enqueue time of each waiting request
+        self.tickets = itertools.count()
+        self.next_worker_number = 1
+        self.scale_ups = 0
+        self.scale_downs = 0
+        self.memory_limited = 0
+        self.autoscale_task = None
+        self.restarts = 0
+        self.rejected = 0
+        self.queue_waits = deque(maxlen=1000)
+        self.slot_available = asyncio.Condition()
+        self.respawn_tasks = set()
+        self.stopping = False
+    
+    async def _spawn(self, worker_id: str) -> StdioWorker:
+        """Start one worker subprocess"""
+        process = await asyncio.create_subprocess_exec(
+            *self.worker_command,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            env={**os.environ, "WORKER_ID": worker_id, "WORKER_MAX_IN_FLIGHT": str(self.max_in_flight)},
+            limit=STREAM_LIMIT
+        )
+        worker = StdioWorker(worker_id, process, self.max_in_flight, self._notify_slot_available)
+        worker.reader_task.add_done_callback(lambda _: self._on_worker_exit(worker))
+        return worker
+    
+    @property
+    def queue_depth(self) -> int:
+        return len(self.waiting)
+    
+    async def _add_worker(self) -> StdioWorker:
+        worker_id = f"worker-{self.next_worker_number}"
+        self.next_worker_number += 1
+        worker = await self._spawn(worker_id)
+        self.workers.append(worker)
+        print(f"✅ Started {worker_id}")
+        return worker
+    
     async def start(self):
-        """Start all workers"""
-        for i in range(self.num_workers):
-            worker_id = f"worker-{i+1}"
-            
-            # Start worker subprocess
-            process = await asyncio.create_subprocess_exec(
-                "python", "/app/claude_docker_worker_stdio.py",
-                stdin=asyncio.subprocess.PIPE,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-                env={**os.environ, "WORKER_ID": worker_id}
-            )
-            
-            worker = {
-                "id": worker_id,
-                "process": process,
-                "busy": False
-            }
-            
-            self.workers.append(worker)
-            await self.available_workers.put(worker)
-            
-            print(f"✅ Started {worker_id}")
+        """Start the initial workers and the autoscaler"""
+        for _ in range(self.num_workers):
+            await self._add_worker()
+        if self.max_workers > self.num_workers:
+            self.autoscale_task = asyncio.create_task(self._autoscale())
+    
+    async def _autoscale(self):
+        """Periodically grow or shrink the pool"""
+        while not self.stopping:
+            await asyncio.sleep(self.autoscale_interval)
+            try:
+                await self._scale_once()
+            except Exception as e:
+                print(f"❌ Autoscaler error: {e}")
+    
+    async def _scale_once(self):
+        """Add one worker if requests wait too long, or stop one idle extra worker"""
+        now = time.monotonic()
+        oldest_wait = now - min(self.waiting.values()) if self.waiting else 0.0
+        
+        if oldest_wait > self.scale_up_wait:
+            if len(self.workers) >= self.max_workers:
+                return
+            if not self._memory_allows_worker():
+                self.memory_limited += 1
+                return
+            await self._add_worker()
+            self.scale_ups += 1
+            print(f"📈 Scaled up to {len(self.workers)} workers (queue wait {oldest_wait:.1f}s)")
+            async with self.slot_available:
+                self.slot_available.notify_all()
+            return
+        
+        if self.waiting or len(self.workers) <= self.num_workers:
+            return
+        # Dead workers are left to _respawn, which is replacing them
+        idle = [
+            w for w in self.workers
+            if w.alive and w.outstanding == 0 and now - w.last_active > self.idle_cooldown
+        ]
+        if not idle:
+            return
+        # Removing it from the pool first means nothing new is scheduled on it
+        worker = min(idle, key=lambda w: w.last_active)
+        self.workers.remove(worker)
+        await worker.stop()
+        self.scale_downs += 1
+        print(f"📉 Stopped idle {worker.id}, {len(self.workers)} workers left")
+    
+    def memory_usage_mb(self) -> float | None:
+        """Resident memory of the server and its workers, if it can be measured"""
+        usage = process_rss_mb(os.getpid())
+        if usage is None:
+            return None
+        for worker in self.workers:
+            usage += process_rss_mb(worker.process.pid) or 0
+        return usage
+    
+    def _memory_allows_worker(self) -> bool:
+        """Whether one more worker, sized like the current ones, fits the budget"""
+        if self.memory_budget_mb is None:
+            return True
+        usage = self.memory_usage_mb()
+        if usage is None:
+            return True
+        sizes = [process_rss_mb(w.process.pid) or 0 for w in self.workers]
+        per_worker = sum(sizes) / len(sizes) if sizes else 0
+        return usage + per_worker <= self.memory_budget_mb
+    
+    def _on_worker_exit(self, worker: StdioWorker):
+        if self.stopping or worker not in self.workers:
+            return
+        task = asyncio.create_task(self._respawn(worker))
+        self.respawn_tasks.add(task)
+        task.add_done_callback(self.respawn_tasks.discard)
+    
+    def _notify_slot_available(self):
+        """Wake waiting requests from a callback, outside any coroutine"""
+        task = asyncio.create_task(self._notify())
+        self.respawn_tasks.add(task)
+        task.add_done_callback(self.respawn_tasks.discard)
+    
+    async def _notify(self):
+        async with self.slot_available:
+            self.slot_available.notify_all()
+    
+    async def _respawn(self, worker: StdioWorker):
+        """Replace a dead worker, retrying with backoff if it won't start"""
+        print(f"⚠️ {worker.id} exited with code {worker.process.returncode}, respawning")
+        # The reader can stop while the process still runs; make sure it is gone first
+        await worker.stop()
+        delay = 0.5
+        while not self.stopping:
+            try:
+                replacement = await self._spawn(worker.id)
+                break
+            except Exception as e:
+                print(f"❌ Failed to respawn {worker.id}: {e}")
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, 30)
+        else:
+            return
+        
+        if worker not in self.workers:
+            # The slot was removed while the replacement started, so nothing would stop it
+            await replacement.stop()
+            return
+        self.workers[self.workers.index(worker)] = replacement
+        self.restarts += 1
+        async with self.slot_available:
+            self.slot_available.notify_all()
+    
+    def _pick_worker(self) -> StdioWorker | None:
+        """Live worker with the fewest outstanding requests and a free slot"""
+        candidates = [w for w in self.workers if w.alive and w.outstanding < w.max_in_flight]
+        if not candidates:
+            return None
+        return min(candidates, key=lambda w: w.outstanding)
     
     async def stop(self):
         """Stop all workers"""
+        self.stopping = True
+        if self.autoscale_task is not None:
+            self.autoscale_task.cancel()
+        for task in list(self.respawn_tasks):
+            task.cancel()
         for worker in self.workers:
-            if worker["process"].returncode is None:
-                worker["process"].terminate()
-                await worker["process"].wait()
+            await worker.stop()
         print("✅ All workers stopped")
     
-    async def execute(self, request: Dict[str, Any]) -> Dict[str, Any]:
-        """Execute request on an available worker"""
+    async def execute(self, request: dict[str, Any]) -> dict[str, Any]:
+        """Execute request on the least loaded worker"""
+        
+        worker, request_id = await self._submit(request)
+        response = await self._wait(worker, request_id)
+        
+        # Check for errors
+        if "error" in response:
+            raise RuntimeError(response["error"])
+        
+        return response
+    
+    async def _submit(self, request: dict[str, Any]):
+        """Wait for a worker with a free slot and send the request to it"""
         
-        # Get an available worker
-        worker = await self.available_workers.get()
+        if self.queue_depth >= self.max_queue_size:
+            self.rejected += 1
+            raise PoolSaturatedError(f"Worker pool queue is full ({self.queue_depth} waiting)")
         
+        enqueued = time.monotonic()
+        ticket = next(self.tickets)
+        self.waiting[ticket] = enqueued
         try:
-            # Mark as busy
-            worker["busy"] = True
-            
-            # Send request to worker
-            request_json = json.dumps(request) + "\n"
-            worker["process"].stdin.write(request_json.encode())
-            await worker["process"].stdin.drain()
-            
-            # Read response
-            response_line = await asyncio.wait_for(
-                worker["process"].stdout.readline(),
-                timeout=130  # Slightly more than worker timeout
-            )
-            
-            if not response_line:
-                raise RuntimeError(f"Worker {worker['id']} died")
-            
-            # Parse response
-            response = json.loads(response_line.decode())
-            
-            # Check for errors
-            if "error" in response:
-                raise RuntimeError(response["error"])
-            
-            return response
-            
+            async with self.slot_available:
+                await self.slot_available.wait_for(lambda: self._pick_worker() is not None)
+                worker = self._pick_worker()
+                # Submitting under the lock takes the slot before anyone else can pick it
+                request_id = worker.submit(request)
         finally:
-            # Mark as available again
-            worker["busy"] = False
-            await self.available_workers.put(worker)
+            del self.waiting[ticket]
+        self.queue_waits.append(time.monotonic() - enqueued)
+        
+        return worker, request_id
+    
+    async def _wait(self, worker: StdioWorker, request_id: str) -> dict[str, Any]:
+        """Wait for a submitted request and free its slot"""
+        try:
+            return await worker.wait(request_id, self.request_timeout)
+        finally:
+            async with self.slot_available:
+                self.slot_available.notify()
+    
+    def get_metrics(self) -> dict[str, Any]:
+        """Queue and per-worker metrics"""
+        queue_waits = list(self.queue_waits)
+        return {
+            "queue_depth": self.queue_depth,
+            "max_queue_size": self.max_queue_size,
+            "oldest_wait": round(time.monotonic() - min(self.waiting.values()), 3) if self.waiting else 0.0,
+            "queue_wait_p50": percentile(queue_waits, 0.50),
+            "queue_wait_p99": percentile(queue_waits, 0.99),
+            "rejected": self.rejected,
+            "restarts": self.restarts,
+            "num_workers": len(self.workers),
+            "min_workers": self.num_workers,
+            "max_workers": self.max_workers,
+            "scale_ups": self.scale_ups,
+            "scale_downs": self.scale_downs,
+            "memory_usage_mb": self.memory_usage_mb(),
+            "memory_budget_mb": self.memory_budget_mb,
+            "memory_limited": self.memory_limited,
+            "workers": [worker.get_metrics() for worker in self.workers]
+        }
 
 
 # Initialize FastAPI
 app = FastAPI(title="Claude Docker API (stdio)", version="2.0")
 
 # Initialize worker pool
-worker_pool = WorkerPool(num_workers=3)
+worker_pool = WorkerPool(
+    num_workers=int(os.environ.get("WORKER_POOL_SIZE", "3")),
+    max_in_flight=int(os.environ.get("WORKER_MAX_IN_FLIGHT", "4")),
+    max_queue_size=int(os.environ.get("WORKER_POOL_MAX_QUEUE", "100")),
+    max_workers=int(os.environ.get("WORKER_POOL_MAX_SIZE", "8")),
+    scale_up_wait=float(os.environ.get("WORKER_POOL_SCALE_UP_WAIT", "2")),
+    idle_cooldown=float(os.environ.get("WORKER_POOL_IDLE_COOLDOWN", "300")),
+    memory_budget_mb=float(os.environ["WORKER_POOL_MEMORY_BUDGET_MB"]) if "WORKER_POOL_MEMORY_BUDGET_MB" in os.environ else None
+)
 
 
 @app.on_event("startup")
@@ -152,7 +510,7 @@ async def root():
         "service": "claude-docker-api-stdio",
         "version": "2.0",
         "status": "ready",
-        "workers": worker_pool.num_workers,
+        "workers": len(worker_pool.workers),
         "architecture": "stdin/stdout pipes"
     }
 
@@ -163,6 +521,12 @@ async def health():
     return {"status": "ok", "service": "claude-docker-api-stdio"}
 
 
+@app.get("/metrics")
+async def metrics():
+    """Queue depth and per-worker load and latency"""
+    return worker_pool.get_metrics()
+
+
 @app.post("/v1/messages")
 async def create_message(request: ChatRequest):
     """Main Anthropic-compatible messages endpoint"""
@@ -212,11 +576,13 @@ async def create_message(request: ChatRequest):
         
         return response
         
-    except asyncio.TimeoutError:
-        raise HTTPException(status_code=504, detail="Claude Docker timeout")
+    except PoolSaturatedError as e:
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": "1"}) from e
+    except asyncio.TimeoutError as e:
+        raise HTTPException(status_code=504, detail="Claude Docker timeout") from e
     except Exception as e:
         print(f"❌ API Error: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+        raise HTTPException(status_code=500, detail=str(e)) from e
 
 
 if __name__ == "__main__":
@@ -17,6 +17,9 @@ import os
 import logging
 from pathlib import Path
 
+from claude_docker_api_stdio import PoolSaturatedError, StdioWorker
+from claude_docker_api_stdio import WorkerPool as StdioWorkerPool
+
 # Set up logging directory
 LOG_DIR = Path("/app/logs")
 LOG_DIR.mkdir(exist_ok=True)
@@ -62,119 +65,62 @@ class ChatResponse(BaseModel):
     usage: Dict[str, int]
 
 
-class WorkerPool:
-    """Enhanced worker pool with detailed logging"""
+class WorkerPool(StdioWorkerPool):
+    """Autoscaling stdio worker pool with a log file per worker"""
     
-    def __init__(self, num_workers: int = 3):
-        self.num_workers = num_workers
-        self.workers = []
-        self.available_workers = asyncio.Queue()
+    async def _spawn(self, worker_id: str) -> StdioWorker:
+        worker = await super()._spawn(worker_id)
         
-    async def start(self):
-        """Start all workers with logging"""
-        for i in range(self.num_workers):
-            worker_id = f"worker-{i+1}"
-            
-            # Create worker-specific logger
+        # Create worker-specific logger, reused when a worker id is respawned
+        worker_logger = worker_loggers.get(worker_id)
+        if worker_logger is None:
             worker_logger = logging.getLogger(f"worker.{worker_id}")
             worker_handler = logging.FileHandler(LOG_DIR / f"{worker_id}.log")
             worker_handler.setFormatter(logging.Formatter('%(asctime)s - %(message)s'))
             worker_logger.addHandler(worker_handler)
             worker_loggers[worker_id] = worker_logger
-            
-            # Start worker process
-            process = await asyncio.create_subprocess_exec(
-                sys.executable,
-                "/app/claude_docker_worker_stdio.py",
-                env={**os.environ, "WORKER_ID": worker_id},
-                stdin=asyncio.subprocess.PIPE,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-            )
-            
-            worker = {
-                "id": worker_id,
-                "process": process,
-                "busy": False,
-                "logger": worker_logger
-            }
-            
-            self.workers.append(worker)
-            await self.available_workers.put(worker)
-            
-            logger.info(f"✅ Started {worker_id}")
-            worker_logger.info(f"Worker {worker_id} started with PID {process.pid}")
+        
+        worker.logger = worker_logger
+        worker_logger.info(f"Worker {worker_id} started with PID {worker.process.pid}")
+        return worker
     
-    async def stop(self):
-        """Stop all workers"""
-        for worker in self.workers:
-            if worker["process"].returncode is None:
-                worker["process"].terminate()
-                await worker["process"].wait()
-                worker["logger"].info(f"Worker {worker['id']} stopped")
-        logger.info("✅ All workers stopped")
+    async def _submit(self, request: Dict[str, Any]):
+        worker, request_id = await super()._submit(request)
+        worker.logger.info(f"[{request_id[:8]}] Processing request: {json.dumps(request, indent=2)}")
+        logger.info(f"[{request_id[:8]}] Assigned to {worker.id}")
+        return worker, request_id
     
-    async def process_request(self, request: Dict[str, Any]) -> Dict[str, Any]:
-        """Process request with detailed logging"""
-        # Get available worker
-        worker = await self.available_workers.get()
-        worker["busy"] = True
-        
+    async def _wait(self, worker: StdioWorker, request_id: str) -> Dict[str, Any]:
         try:
-            # Log request
-            request_id = str(uuid.uuid4())[:8]
-            worker["logger"].info(f"[{request_id}] Processing request: {json.dumps(request, indent=2)}")
-            logger.info(f"[{request_id}] Assigned to {worker['id']}")
-            
-            # Send request
-            request_json = json.dumps(request) + '\n'
-            worker["process"].stdin.write(request_json.encode())
-            await worker["process"].stdin.drain()
-            
-            # Read response with timeout
-            try:
-                response_line = await asyncio.wait_for(
-                    worker["process"].stdout.readline(),
-                    timeout=130
-                )
-            except asyncio.TimeoutError:
-                worker["logger"].error(f"[{request_id}] Timeout waiting for response")
-                raise RuntimeError(f"Worker {worker['id']} timeout")
-            
-            if not response_line:
-                worker["logger"].error(f"[{request_id}] Worker died unexpectedly")
-                raise RuntimeError(f"Worker {worker['id']} died")
-            
-            # Parse response
-            response_text = response_line.decode()
-            worker["logger"].info(f"[{request_id}] Raw response: {response_text}")
-            
-            try:
-                response = json.loads(response_text)
-            except json.JSONDecodeError as e:
-                worker["logger"].error(f"[{request_id}] Failed to parse response: {e}")
-                worker["logger"].error(f"[{request_id}] Raw text: {response_text}")
-                raise RuntimeError(f"Invalid response from worker: {e}")
-            
-            # Check for errors
-            if "error" in response:
-                worker["logger"].error(f"[{request_id}] Worker returned error: {response['error']}")
-                raise RuntimeError(response["error"])
-            
-            worker["logger"].info(f"[{request_id}] Successfully processed request")
-            return response
-            
-        finally:
-            # Mark as available again
-            worker["busy"] = False
-            await self.available_workers.put(worker)
+            response = await super()._wait(worker, request_id)
+        except asyncio.TimeoutError:
+            worker.logger.error(f"[{request_id[:8]}] Timeout waiting for response")
+            raise RuntimeError(f"Worker {worker.id} timeout")
+        except RuntimeError as e:
+            worker.logger.error(f"[{request_id[:8]}] {e}")
+            raise
+        
+        if "error" in response:
+            worker.logger.error(f"[{request_id[:8]}] Worker returned error: {response['error']}")
+        else:
+            worker.logger.info(f"[{request_id[:8]}] Successfully processed request")
+        return response
 
 
 # Initialize FastAPI
 app = FastAPI(title="Claude Docker API with Logging", version="2.1")
 
 # Initialize worker pool
-worker_pool = WorkerPool(num_workers=3)
+worker_pool = WorkerPool(
+    num_workers=int(os.environ.get("WORKER_POOL_SIZE", "3")),
+    max_in_flight=int(os.environ.get("WORKER_MAX_IN_FLIGHT", "4")),
+    max_queue_size=int(os.environ.get("WORKER_POOL_MAX_QUEUE", "100")),
+    worker_command=[sys.executable, "/app/claude_docker_worker_stdio.py"],
+    max_workers=int(os.environ.get("WORKER_POOL_MAX_SIZE", "8")),
+    scale_up_wait=float(os.environ.get("WORKER_POOL_SCALE_UP_WAIT", "2")),
+    idle_cooldown=float(os.environ.get("WORKER_POOL_IDLE_COOLDOWN", "300")),
+    memory_budget_mb=float(os.environ["WORKER_POOL_MEMORY_BUDGET_MB"]) if "WORKER_POOL_MEMORY_BUDGET_MB" in os.environ else None
+)
 
 
 @app.on_event("startup")
@@ -183,7 +129,7 @@ async def startup_event():
     await worker_pool.start()
     logger.info("🚀 Claude Docker API Server started with enhanced logging")
     logger.info(f"📁 Logs directory: {LOG_DIR}")
-    logger.info("📊 Individual worker logs: worker-1.log, worker-2.log, worker-3.log")
+    logger.info("📊 Individual worker logs: worker-<n>.log")
 
 
 @app.on_event("shutdown")
@@ -198,12 +144,7 @@ async def root():
         "service": "claude-docker-api-with-logging",
         "version": "2.1",
         "logs_directory": str(LOG_DIR),
-        "log_files": [
-            "api_server.log",
-            "worker-1.log",
-            "worker-2.log", 
-            "worker-3.log"
-        ]
+        "log_files": sorted(path.name for path in LOG_DIR.glob("*.log"))
     }
 
 
@@ -212,9 +153,10 @@ async def health():
     worker_status = []
     for worker in worker_pool.workers:
         worker_status.append({
-            "id": worker["id"],
-            "alive": worker["process"].returncode is None,
-            "busy": worker["busy"]
+            "id": worker.id,
+            "alive": worker.alive,
+            "busy": worker.outstanding > 0,
+            "outstanding": worker.outstanding
         })
     
     return {
@@ -246,7 +188,7 @@ async def create_message(request: ChatRequest):
             worker_request["tools"] = request.tools
         
         # Process via worker
-        result = await worker_pool.process_request(worker_request)
+        result = await worker_pool.execute(worker_request)
         
         # Format response
         response = ChatResponse(
@@ -261,11 +203,20 @@ async def create_message(request: ChatRequest):
         
         return response
         
+    except PoolSaturatedError as e:
+        logger.warning(f"⏳ Rejected request: {e}")
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": "1"})
     except Exception as e:
         logger.error(f"❌ API Error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.get("/metrics")
+async def metrics():
+    """Queue depth, autoscaling state and per-worker load and latency"""
+    return worker_pool.get_metrics()
+
+
 @app.get("/logs/{worker_id}")
 async def get_worker_logs(worker_id: str, lines: int = 100):
     """Retrieve specific worker logs"""
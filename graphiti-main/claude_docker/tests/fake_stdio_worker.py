@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+Fake stdio worker for pool tests
+
+Speaks the id-tagged worker protocol without calling Claude: each request
+sleeps for the number of seconds after "sleep:" in its last message and
+then echoes the first word of that message.
+"""
+
+import asyncio
+import json
+import re
+import sys
+
+
+async def handle(request):
+    content = request['messages'][-1]['content']
+    match = re.search(r'sleep:([0-9.]+)', content)
+    if match:
+        await asyncio.sleep(float(match.group(1)))
+    sys.stdout.write(json.dumps({'id': request.get('id'), 'content': content.split()[0]}) + '\n')
+    sys.stdout.flush()
+
+
+async def main():
+    loop = asyncio.get_event_loop()
+    reader = asyncio.StreamReader()
+    protocol = asyncio.StreamReaderProtocol(reader)
+    await loop.connect_read_pipe(lambda: protocol, sys.stdin)
+
+    tasks = set()
+    while True:
+        line = await reader.readline()
+        if not line:
+            break
+        task = asyncio.create_task(handle(json.loads(line)))
+        tasks.add(task)
+        task.add_done_callback(tasks.discard)
+
+    if tasks:
+        await asyncio.gather(*tasks)
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
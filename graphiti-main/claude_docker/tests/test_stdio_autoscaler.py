@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Tests for WorkerPool autoscaling in the Claude Docker API
+Uses fake_stdio_worker.py, so no Claude or Docker is needed
+"""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'api'))
+
+from claude_docker_api_stdio import WorkerPool
+
+FAKE_WORKER = Path(__file__).parent / 'fake_stdio_worker.py'
+
+
+def make_pool(**kwargs) -> WorkerPool:
+    settings = {
+        'num_workers': 1,
+        'max_in_flight': 1,
+        'max_workers': 3,
+        'scale_up_wait': 0.2,
+        'idle_cooldown': 0.5,
+        'autoscale_interval': 0.1,
+    }
+    settings.update(kwargs)
+    return WorkerPool(worker_command=[sys.executable, str(FAKE_WORKER)], **settings)
+
+
+def chat(content: str) -> dict:
+    return {'messages': [{'role': 'user', 'content': content}]}
+
+
+async def test_scales_up_under_load_and_back_down():
+    """A burst adds workers up to max_workers; idle extras stop after the cool-down"""
+    pool = make_pool()
+    await pool.start()
+    try:
+        start = time.monotonic()
+        responses = await asyncio.gather(*[pool.execute(chat(f'r{i} sleep:1')) for i in range(6)])
+        elapsed = time.monotonic() - start
+        peak = pool.get_metrics()
+
+        deadline = time.monotonic() + 10
+        while len(pool.workers) > 1 and time.monotonic() < deadline:
+            await asyncio.sleep(0.1)
+        after = pool.get_metrics()
+    finally:
+        await pool.stop()
+
+    assert [r['content'] for r in responses] == [f'r{i}' for i in range(6)]
+    assert peak['num_workers'] == 3 and peak['scale_ups'] == 2, peak
+    assert elapsed < 5, f'burst took {elapsed:.1f}s, the pool did not grow'
+    assert after['num_workers'] == 1 and after['scale_downs'] == 2, after
+    print(f'✓ Grew to 3 workers for a burst ({elapsed:.1f}s) and shrank back to 1')
+
+
+async def test_busy_workers_are_not_stopped():
+    """Scale-down only stops workers with nothing outstanding"""
+    pool = make_pool(max_workers=2)
+    await pool.start()
+    try:
+        await asyncio.gather(*[pool.execute(chat(f'r{i} sleep:0.5')) for i in range(3)])
+        assert len(pool.workers) == 2
+
+        # Keep both workers busy for longer than the cool-down
+        await asyncio.gather(*[pool.execute(chat(f'long{i} sleep:1.2')) for i in range(2)])
+        workers_after_busy = len(pool.workers)
+    finally:
+        await pool.stop()
+
+    assert workers_after_busy == 2
+    print('✓ Busy workers kept through the cool-down')
+
+
+async def test_memory_budget_blocks_growth():
+    """No worker is added when it would not fit the memory budget"""
+    pool = make_pool(memory_budget_mb=1)
+    await pool.start()
+    try:
+        if pool.memory_usage_mb() is None:
+            print('- Skipped memory budget test: /proc is not available')
+            return
+        await asyncio.gather(*[pool.execute(chat(f'r{i} sleep:0.5')) for i in range(3)])
+        metrics = pool.get_metrics()
+    finally:
+        await pool.stop()
+
+    assert metrics['num_workers'] == 1 and metrics['scale_ups'] == 0, metrics
+    assert metrics['memory_limited'] > 0
+    print('✓ Memory budget kept the pool at 1 worker')
+
+
+async def test_dead_workers_are_left_to_respawn():
+    """Scale-down skips a worker being respawned, and a respawn into a removed slot is stopped"""
+    pool = make_pool(max_workers=2, idle_cooldown=0, autoscale_interval=60)
+    await pool.start()
+    await pool._add_worker()
+
+    spawned = []
+    spawn = pool._spawn
+
+    async def slow_spawn(worker_id):
+        await asyncio.sleep(0.3)
+        worker = await spawn(worker_id)
+        spawned.append(worker)
+        return worker
+
+    pool._spawn = slow_spawn
+    try:
+        dead = pool.workers[0]
+        dead.process.kill()
+        await dead.process.wait()
+        await asyncio.sleep(0.1)
+
+        # The dead worker is being replaced, so the live idle one is stopped instead
+        await pool._scale_once()
+        assert pool.workers == [dead]
+        await asyncio.gather(*pool.respawn_tasks)
+        assert pool.workers == spawned and spawned[0].alive
+
+        spawned[0].process.kill()
+        await spawned[0].process.wait()
+        await asyncio.sleep(0.1)
+        pool.workers.remove(spawned[0])
+        await asyncio.gather(*pool.respawn_tasks)
+        orphan_returncode = spawned[1].process.returncode
+    finally:
+        await pool.stop()
+
+    assert orphan_returncode is not None
+    print('✓ Respawning workers skipped by scale-down, orphaned replacement stopped')
+
+
+async def run_all_tests():
+    """Run all autoscaler tests"""
+    print('=== Worker Pool Autoscaler Tests ===\n')
+
+    tests = [
+        test_scales_up_under_load_and_back_down,
+        test_busy_workers_are_not_stopped,
+        test_memory_budget_blocks_growth,
+        test_dead_workers_are_left_to_respawn,
+    ]
+
+    failed = 0
+    for test in tests:
+        try:
+            await test()
+        except Exception as e:
+            print(f'✗ {test.__name__} failed: {e!r}')
+            failed += 1
+
+    print(f'\n=== Tests Complete: {len(tests) - failed}/{len(tests)} passed ===')
+    return failed == 0
+
+
+def main():
+    """Run tests"""
+    success = asyncio.run(run_all_tests())
+    sys.exit(0 if success else 1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+Tests for the stdio Claude Docker worker protocol
+Runs the worker against a fake Claude runner, so no Claude or Docker is needed
+"""
+
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+WORKER_SCRIPT = Path(__file__).parent.parent / 'workers' / 'claude_docker_worker_stdio.py'
+
+# Fake runner: sleeps for the number of seconds after "sleep:" in the prompt,
+# then echoes the first word after "Human:"
+FAKE_RUNNER = """#!/usr/bin/env python3
+import re
+import sys
+import time
+
+prompt = sys.stdin.read()
+match = re.search(r"sleep:([0-9.]+)", prompt)
+if match:
+    time.sleep(float(match.group(1)))
+print(prompt.split("Human: ", 1)[1].split()[0])
+"""
+
+
+class StdioWorkerTestClient:
+    """Starts a worker process and exchanges id-tagged JSON lines with it"""
+
+    def __init__(
+        self, runner_path: str, max_in_flight: int, max_line_bytes: int = 16 * 1024 * 1024
+    ):
+        self.runner_path = runner_path
+        self.max_in_flight = max_in_flight
+        self.max_line_bytes = max_line_bytes
+        self.process = None
+
+    async def start(self):
+        env = dict(os.environ)
+        env.update(
+            {
+                'WORKER_ID': 'test-worker',
+                'WORKER_MAX_IN_FLIGHT': str(self.max_in_flight),
+                'CLAUDE_DOCKER_RUNNER': self.runner_path,
+                'WORKER_CWD': tempfile.gettempdir(),
+                'WORKER_MAX_LINE_BYTES': str(self.max_line_bytes),
+            }
+        )
+        self.process = await asyncio.create_subprocess_exec(
+            sys.executable,
+            str(WORKER_SCRIPT),
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL,
+            env=env,
+        )
+
+    async def send(self, request_id, content: str):
+        request = {'id': request_id, 'messages': [{'role': 'user', 'content': content}]}
+        self.process.stdin.write((json.dumps(request) + '\n').encode())
+        await self.process.stdin.drain()
+
+    async def receive(self) -> dict:
+        line = await asyncio.wait_for(self.process.stdout.readline(), timeout=30)
+        return json.loads(line)
+
+    async def stop(self):
+        self.process.stdin.close()
+        await asyncio.wait_for(self.process.wait(), timeout=30)
+
+
+def write_fake_runner(directory: str) -> str:
+    runner_path = os.path.join(directory, 'fake_runner.py')
+    with open(runner_path, 'w') as f:
+        f.write(FAKE_RUNNER)
+    os.chmod(runner_path, 0o755)
+    return runner_path
+
+
+async def test_responses_are_tagged_and_out_of_order():
+    """A slow request must not hold back the responses behind it"""
+    with tempfile.TemporaryDirectory() as directory:
+        client = StdioWorkerTestClient(write_fake_runner(directory), max_in_flight=4)
+        await client.start()
+
+        start = time.monotonic()
+        await client.send('slow', 'slow sleep:1.5')
+        await client.send('fast-1', 'fast-1')
+        await client.send('fast-2', 'fast-2')
+
+        responses = [await client.receive() for _ in range(3)]
+        elapsed = time.monotonic() - start
+        await client.stop()
+
+    ids = [response['id'] for response in responses]
+    assert ids[-1] == 'slow', f'slow request should finish last, got {ids}'
+    assert sorted(ids) == ['fast-1', 'fast-2', 'slow']
+    assert all(response['content'] == response['id'] for response in responses)
+    assert elapsed < 3, f'requests did not overlap ({elapsed:.1f}s)'
+    print(f'✓ Responses tagged and out of order: {ids} in {elapsed:.1f}s')
+
+
+async def test_max_in_flight_bounds_concurrency():
+    """With one slot, requests run one after another in arrival order"""
+    with tempfile.TemporaryDirectory() as directory:
+        client = StdioWorkerTestClient(write_fake_runner(directory), max_in_flight=1)
+        await client.start()
+
+        start = time.monotonic()
+        await client.send(1, 'first sleep:0.5')
+        await client.send(2, 'second sleep:0.1')
+
+        responses = [await client.receive() for _ in range(2)]
+        elapsed = time.monotonic() - start
+        await client.stop()
+
+    assert [response['id'] for response in responses] == [1, 2]
+    assert elapsed >= 0.6, f'requests overlapped with max_in_flight=1 ({elapsed:.1f}s)'
+    print(f'✓ max_in_flight=1 serialises requests in {elapsed:.1f}s')
+
+
+async def test_invalid_json_and_pending_requests_on_close():
+    """Bad lines get an untagged error; requests in flight finish after stdin closes"""
+    with tempfile.TemporaryDirectory() as directory:
+        client = StdioWorkerTestClient(write_fake_runner(directory), max_in_flight=2)
+        await client.start()
+
+        client.process.stdin.write(b'not json\n')
+        await client.send('pending', 'pending sleep:0.3')
+        client.process.stdin.close()
+
+        error = await client.receive()
+        pending = await client.receive()
+        await asyncio.wait_for(client.process.wait(), timeout=30)
+
+    assert error['id'] is None and 'Invalid JSON' in error['error']
+    assert pending == {'content': 'pending', 'id': 'pending'}
+    print('✓ Invalid JSON reported and pending request completed on close')
+
+
+async def test_long_requests():
+    """Lines over 64 KiB are served, and lines over the limit get an id-tagged error"""
+    with tempfile.TemporaryDirectory() as directory:
+        client = StdioWorkerTestClient(
+            write_fake_runner(directory), max_in_flight=2, max_line_bytes=1024 * 1024
+        )
+        await client.start()
+
+        await client.send('long', 'long ' + 'x' * 200_000)
+        long_response = await client.receive()
+        await client.send('too-long', 'too-long ' + 'x' * 2_000_000)
+        too_long_response = await client.receive()
+        await client.send('after', 'after')
+        after_response = await client.receive()
+        await client.stop()
+
+    assert long_response == {'content': 'long', 'id': 'long'}
+    assert too_long_response['id'] == 'too-long' and 'exceeds' in too_long_response['error']
+    assert after_response == {'content': 'after', 'id': 'after'}
+    print('✓ Long requests served and oversized requests rejected by id')
+
+
+async def run_all_tests():
+    """Run all stdio worker tests"""
+    print('=== Stdio Claude Docker Worker Tests ===\n')
+
+    tests = [
+        test_responses_are_tagged_and_out_of_order,
+        test_max_in_flight_bounds_concurrency,
+        test_invalid_json_and_pending_requests_on_close,
+        test_long_requests,
+    ]
+
+    failed = 0
+    for test in tests:
+        try:
+            await test()
+        except Exception as e:
+            print(f'✗ {test.__name__} failed: {e}')
+            failed += 1
+
+    print(f'\n=== Tests Complete: {len(tests) - failed}/{len(tests)} passed ===')
+    return failed == 0
+
+
+def main():
+    """Run tests"""
+    success = asyncio.run(run_all_tests())
+    sys.exit(0 if success else 1)
+
+
+if __name__ == '__main__':
+    main()
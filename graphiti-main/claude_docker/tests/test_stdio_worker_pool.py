@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Tests for the stdio WorkerPool in the Claude Docker API
+Runs real stdio workers against a fake Claude runner, so no Claude or Docker is needed
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'api'))
+sys.path.insert(0, str(Path(__file__).parent))
+
+import claude_docker_api_stdio
+from claude_docker_api_stdio import PoolSaturatedError, WorkerPool
+from test_stdio_worker import WORKER_SCRIPT, write_fake_runner
+
+
+def make_pool(directory: str, **kwargs) -> WorkerPool:
+    os.environ['CLAUDE_DOCKER_RUNNER'] = write_fake_runner(directory)
+    os.environ['WORKER_CWD'] = directory
+    return WorkerPool(worker_command=[sys.executable, str(WORKER_SCRIPT)], **kwargs)
+
+
+def chat(content: str) -> dict:
+    return {'messages': [{'role': 'user', 'content': content}]}
+
+
+async def test_requests_share_workers():
+    """Requests run concurrently on each worker and spread over the least loaded"""
+    with tempfile.TemporaryDirectory() as directory:
+        pool = make_pool(directory, num_workers=2, max_in_flight=2)
+        await pool.start()
+        try:
+            start = time.monotonic()
+            responses = await asyncio.gather(
+                *[pool.execute(chat(f'r{i} sleep:1')) for i in range(4)]
+            )
+            elapsed = time.monotonic() - start
+            metrics = pool.get_metrics()
+        finally:
+            await pool.stop()
+
+    assert [r['content'] for r in responses] == ['r0', 'r1', 'r2', 'r3']
+    assert elapsed < 1.9, f'requests did not overlap ({elapsed:.1f}s)'
+    assert [w['completed'] for w in metrics['workers']] == [2, 2]
+    assert metrics['workers'][0]['latency_p50'] >= 1
+    print(f'✓ 4 requests on 2 workers in {elapsed:.1f}s')
+
+
+async def test_full_queue_is_rejected():
+    """Requests past max_queue_size fail fast instead of waiting"""
+    with tempfile.TemporaryDirectory() as directory:
+        pool = make_pool(directory, num_workers=1, max_in_flight=1, max_queue_size=1)
+        await pool.start()
+        try:
+            results = await asyncio.gather(
+                *[pool.execute(chat(f'r{i} sleep:0.3')) for i in range(3)], return_exceptions=True
+            )
+            metrics = pool.get_metrics()
+        finally:
+            await pool.stop()
+
+    rejected = [r for r in results if isinstance(r, PoolSaturatedError)]
+    assert len(rejected) == 1, results
+    assert metrics['rejected'] == 1 and metrics['queue_depth'] == 0
+    print('✓ Request rejected once the queue was full')
+
+
+async def test_dead_worker_is_respawned():
+    """Requests on a worker that dies fail, and the worker comes back"""
+    with tempfile.TemporaryDirectory() as directory:
+        pool = make_pool(directory, num_workers=1, max_in_flight=2)
+        await pool.start()
+        try:
+            in_flight = asyncio.create_task(pool.execute(chat('doomed sleep:5')))
+            await asyncio.sleep(0.5)
+            pool.workers[0].process.kill()
+
+            try:
+                await in_flight
+                raise AssertionError('request on killed worker should fail')
+            except RuntimeError as e:
+                assert 'died' in str(e)
+
+            response = await asyncio.wait_for(pool.execute(chat('after')), timeout=30)
+            metrics = pool.get_metrics()
+        finally:
+            await pool.stop()
+
+    assert response['content'] == 'after'
+    assert metrics['restarts'] == 1 and metrics['workers'][0]['alive'] is True
+    print('✓ Dead worker respawned')
+
+
+async def test_long_responses():
+    """Responses over 64 KiB are read; a worker whose output can't be read is stopped and replaced"""
+    with tempfile.TemporaryDirectory() as directory:
+        pool = make_pool(directory, num_workers=1, max_in_flight=2)
+        await pool.start()
+        try:
+            long_response = await pool.execute(chat('x' * 200_000))
+        finally:
+            await pool.stop()
+
+        claude_docker_api_stdio.STREAM_LIMIT = 1024
+        pool = make_pool(directory, num_workers=1, max_in_flight=2)
+        try:
+            await pool.start()
+            old_process = pool.workers[0].process
+            try:
+                await pool.execute(chat('y' * 2000))
+                raise AssertionError('request with an unreadable response should fail')
+            except RuntimeError as e:
+                assert 'died' in str(e)
+            await asyncio.wait_for(old_process.wait(), timeout=10)
+            await asyncio.wait_for(asyncio.gather(*pool.respawn_tasks), timeout=10)
+            restarts = pool.restarts
+        finally:
+            claude_docker_api_stdio.STREAM_LIMIT = 16 * 1024 * 1024
+            await pool.stop()
+
+    assert long_response['content'] == 'x' * 200_000
+    assert restarts == 1
+    print('✓ Long response read, unreadable worker terminated and replaced')
+
+
+async def test_timed_out_request_keeps_its_slot():
+    """A request that timed out still runs on the worker, so its slot isn't handed out"""
+    with tempfile.TemporaryDirectory() as directory:
+        pool = make_pool(directory, num_workers=1, max_in_flight=1, request_timeout=0.3)
+        await pool.start()
+        try:
+            try:
+                await pool.execute(chat('slow sleep:1.5'))
+                raise AssertionError('slow request should time out')
+            except asyncio.TimeoutError:
+                pass
+            assert pool.workers[0].outstanding == 1
+
+            start = time.monotonic()
+            pool.request_timeout = 30
+            response = await pool.execute(chat('next'))
+            elapsed = time.monotonic() - start
+            outstanding = pool.workers[0].outstanding
+        finally:
+            await pool.stop()
+
+    assert response['content'] == 'next'
+    assert elapsed >= 0.9, (
+        f'next request started before the timed out one finished ({elapsed:.1f}s)'
+    )
+    assert outstanding == 0
+    print(f'✓ Timed out request held its slot, next request waited {elapsed:.1f}s')
+
+
+async def run_all_tests():
+    """Run all worker pool tests"""
+    print('=== Stdio Worker Pool Tests ===\n')
+
+    tests = [
+        test_requests_share_workers,
+        test_full_queue_is_rejected,
+        test_dead_worker_is_respawned,
+        test_long_responses,
+        test_timed_out_request_keeps_its_slot,
+    ]
+
+    failed = 0
+    for test in tests:
+        try:
+            await test()
+        except Exception as e:
+            print(f'✗ {test.__name__} failed: {e!r}')
+            failed += 1
+
+    print(f'\n=== Tests Complete: {len(tests) - failed}/{len(tests)} passed ===')
+    return failed == 0
+
+
+def main():
+    """Run tests"""
+    success = asyncio.run(run_all_tests())
+    sys.exit(0 if success else 1)
+
+
+if __name__ == '__main__':
+    main()
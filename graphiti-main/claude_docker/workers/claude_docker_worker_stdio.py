@@ -8,53 +8,153 @@ following the Unix philosophy of simple, composable tools.
 
 import sys
 import json
+import re
 import asyncio
 import subprocess
 from typing import Dict, Any, List, Optional
 
+# Requests carry whole conversations, so lines can be far longer than asyncio's 64 KiB default
+DEFAULT_MAX_LINE_BYTES = 16 * 1024 * 1024
+
+REQUEST_ID_PATTERN = re.compile(rb'"id"\s*:\s*("(?:[^"\\]|\\.)*"|-?[0-9]+)')
+
 
 class StdioClaudeDockerWorker:
-    """Worker that processes requests via stdin/stdout"""
+    """Worker that processes requests via stdin/stdout
+    
+    Requests are read as JSON lines and handled concurrently, up to
+    max_in_flight at a time. Each response is written as soon as it is
+    ready, so responses may come back out of order; they carry the "id"
+    of the request they answer. A line longer than max_line_bytes is
+    skipped and answered with an error, tagged with its id when the id
+    appears near the start of the line.
+    """
     
-    def __init__(self, worker_id: str = "stdio-worker"):
+    def __init__(
+        self,
+        worker_id: str = "stdio-worker",
+        max_in_flight: int = 4,
+        claude_runner: str = "/workspace/claude_docker_runner.sh",
+        cwd: Optional[str] = "/app",
+        max_line_bytes: int = DEFAULT_MAX_LINE_BYTES
+    ):
         self.worker_id = worker_id
-        self.claude_runner = "/workspace/claude_docker_runner.sh"
+        self.max_in_flight = max_in_flight
+        self.claude_runner = claude_runner
+        self.cwd = cwd
+        self.max_line_bytes = max_line_bytes
+        self.in_flight = 0
         
     async def run(self):
-        """Main loop: read from stdin, process, write to stdout"""
+        """Main loop: read from stdin, process concurrently, write to stdout"""
         
         sys.stderr.write(f"🚀 Claude Docker Worker {self.worker_id} started\n")
-        sys.stderr.write(f"📥 Reading from stdin, writing to stdout\n")
+        sys.stderr.write(f"📥 Reading from stdin, writing to stdout (max in flight: {self.max_in_flight})\n")
         sys.stderr.flush()
         
-        # Process lines from stdin
-        for line in sys.stdin:
+        loop = asyncio.get_event_loop()
+        reader = asyncio.StreamReader(limit=self.max_line_bytes)
+        protocol = asyncio.StreamReaderProtocol(reader)
+        await loop.connect_read_pipe(lambda: protocol, sys.stdin)
+        
+        # Stop reading once max_in_flight requests are running, so the
+        # backlog stays in the pipe and the sender sees backpressure
+        slots = asyncio.Semaphore(self.max_in_flight)
+        tasks = set()
+        
+        while True:
+            line_bytes, too_long = await self._read_line(reader)
+            if not line_bytes:
+                break
+            
+            if too_long:
+                self._write_response({
+                    "id": self._find_request_id(line_bytes),
+                    "error": f"Request exceeds {self.max_line_bytes} bytes",
+                    "worker_id": self.worker_id
+                })
+                continue
+            
+            line = line_bytes.decode().strip()
+            if not line:
+                continue
+            
             try:
-                # Parse request
-                request = json.loads(line.strip())
-                
-                # Process with Claude Docker
-                response = await self.process_request(request)
-                
-                # Write response to stdout
-                print(json.dumps(response))
-                sys.stdout.flush()
-                
-            except json.JSONDecodeError as e:
-                error_response = {
+                request = json.loads(line)
+                if not isinstance(request, dict):
+                    raise ValueError("request must be a JSON object")
+            except (json.JSONDecodeError, ValueError) as e:
+                self._write_response({
+                    "id": None,
                     "error": f"Invalid JSON: {e}",
                     "worker_id": self.worker_id
-                }
-                print(json.dumps(error_response))
-                sys.stdout.flush()
-                
-            except Exception as e:
-                error_response = {
-                    "error": f"Worker error: {e}",
-                    "worker_id": self.worker_id
-                }
-                print(json.dumps(error_response))
-                sys.stdout.flush()
+                })
+                continue
+            
+            await slots.acquire()
+            task = asyncio.create_task(self._handle(request, slots))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+        
+        # stdin closed: finish what is already running before exiting
+        if tasks:
+            await asyncio.gather(*tasks)
+    
+    async def _read_line(self, reader: asyncio.StreamReader) -> tuple[bytes, bool]:
+        """Read one line, or the first max_line_bytes of a longer one and skip the rest"""
+        
+        try:
+            return await reader.readuntil(b"\n"), False
+        except asyncio.IncompleteReadError as e:
+            # stdin closed, possibly after a last line without a newline
+            return e.partial, False
+        except asyncio.LimitOverrunError as e:
+            head = await reader.read(e.consumed)
+        
+        while True:
+            try:
+                await reader.readuntil(b"\n")
+                return head, True
+            except asyncio.IncompleteReadError:
+                return head, True
+            except asyncio.LimitOverrunError as e:
+                await reader.read(e.consumed)
+    
+    def _find_request_id(self, line_bytes: bytes) -> Any:
+        """Best effort id of a request that is too long to parse"""
+        
+        match = REQUEST_ID_PATTERN.search(line_bytes)
+        if match is None:
+            return None
+        try:
+            return json.loads(match.group(1))
+        except json.JSONDecodeError:
+            return None
+    
+    async def _handle(self, request: Dict[str, Any], slots: asyncio.Semaphore):
+        """Run one request and write its response tagged with the request id"""
+        
+        self.in_flight += 1
+        try:
+            response = await self.process_request(request)
+        except Exception as e:
+            response = {
+                "error": f"Worker error: {e}",
+                "worker_id": self.worker_id
+            }
+        finally:
+            self.in_flight -= 1
+            slots.release()
+        
+        response["id"] = request.get("id")
+        self._write_response(response)
+    
+    def _write_response(self, response: Dict[str, Any]):
+        """Write one response line to stdout"""
+        
+        # Writes happen on the event loop thread, so whole lines never interleave
+        sys.stdout.write(json.dumps(response) + "\n")
+        sys.stdout.flush()
     
     async def process_request(self, request: Dict[str, Any]) -> Dict[str, Any]:
         """Process a single request with Claude Docker"""
@@ -92,14 +192,21 @@ class StdioClaudeDockerWorker:
                 stdin=asyncio.subprocess.PIPE,
                 stdout=asyncio.subprocess.PIPE,
                 stderr=asyncio.subprocess.PIPE,
-                cwd="/app"
+                cwd=self.cwd
             )
             
             # Send prompt and get response
-            stdout, stderr = await asyncio.wait_for(
-                process.communicate(input=prompt.encode('utf-8')),
-                timeout=120  # 2 minute timeout
-            )
+            try:
+                stdout, stderr = await asyncio.wait_for(
+                    process.communicate(input=prompt.encode('utf-8')),
+                    timeout=120  # 2 minute timeout
+                )
+            except asyncio.TimeoutError:
+                # Don't leave the runner going after its request has given up
+                if process.returncode is None:
+                    process.kill()
+                await process.wait()
+                raise
             
             if process.returncode != 0:
                 error_msg = stderr.decode() if stderr else "Unknown error"
@@ -166,11 +273,15 @@ def main():
     
     import os
     
-    # Get worker ID from environment or use default
+    # Get worker settings from environment or use defaults
     worker_id = os.environ.get('WORKER_ID', 'stdio-worker')
+    max_in_flight = int(os.environ.get('WORKER_MAX_IN_FLIGHT', '4'))
+    claude_runner = os.environ.get('CLAUDE_DOCKER_RUNNER', '/workspace/claude_docker_runner.sh')
+    cwd = os.environ.get('WORKER_CWD', '/app')
+    max_line_bytes = int(os.environ.get('WORKER_MAX_LINE_BYTES', str(DEFAULT_MAX_LINE_BYTES)))
     
     # Create and run worker
-    worker = StdioClaudeDockerWorker(worker_id)
+    worker = StdioClaudeDockerWorker(worker_id, max_in_flight, claude_runner, cwd, max_line_bytes)
     
     try:
         # Run the async worker
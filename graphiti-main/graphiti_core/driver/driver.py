@@ -17,7 +17,11 @@ limitations under the License.
 import logging
 from abc import ABC, abstractmethod
 from collections.abc import Coroutine
-from typing import Any
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from graphiti_core.search.ann_index import LocalAnnIndex
+    from graphiti_core.search.search_cache import SearchCache
 
 logger = logging.getLogger(__name__)
 
@@ -46,6 +50,13 @@ class GraphDriverSession(ABC):
 
 class GraphDriver(ABC):
     provider: str
+    # Optional local vector index used by the similarity searches, kept in sync by graphiti's writes
+    ann_index: 'LocalAnnIndex | None' = None
+    # Whether similarity searches query the native vector indices. Turned off if a vector index
+    # is missing, and back on by build_indices_and_constraints.
+    use_vector_indices: bool = True
+    # Optional cache of search() results, invalidated by graphiti's writes
+    search_cache: 'SearchCache | None' = None
 
     @abstractmethod
     def execute_query(self, cypher_query_: str, **kwargs: Any) -> Coroutine:
@@ -34,6 +34,7 @@ from graphiti_core.models.edges.edge_db_queries import (
     EPISODIC_EDGE_SAVE,
 )
 from graphiti_core.nodes import Node
+from graphiti_core.search.vector_store import vector_store
 
 logger = logging.getLogger(__name__)
 
@@ -72,6 +73,11 @@ class Edge(BaseModel, ABC):
         """,
             uuid=self.uuid,
         )
+        vector_store.invalidate([self.uuid])
+        if driver.ann_index is not None:
+            driver.ann_index.remove([self.uuid])
+        if driver.search_cache is not None:
+            driver.search_cache.bump([self.group_id])
 
         logger.debug(f'Deleted Edge: {self.uuid}')
 
@@ -99,6 +105,8 @@ class EpisodicEdge(Edge):
             group_id=self.group_id,
             created_at=self.created_at,
         )
+        if driver.search_cache is not None:
+            driver.search_cache.bump([self.group_id])
 
         logger.debug(f'Saved edge to Graph: {self.uuid}')
 
@@ -255,6 +263,11 @@ class EntityEdge(Edge):
             ENTITY_EDGE_SAVE,
             edge_data=edge_data,
         )
+        vector_store.invalidate([self.uuid])
+        if driver.ann_index is not None:
+            driver.ann_index.edges.upsert([(self.uuid, self.group_id, self.fact_embedding)])
+        if driver.search_cache is not None:
+            driver.search_cache.bump([self.group_id])
 
         logger.debug(f'Saved edge to Graph: {self.uuid}')
 
@@ -355,6 +368,8 @@ class CommunityEdge(Edge):
             group_id=self.group_id,
             created_at=self.created_at,
         )
+        if driver.search_cache is not None:
+            driver.search_cache.bump([self.group_id])
 
         logger.debug(f'Saved edge to Graph: {self.uuid}')
 
@@ -450,7 +465,7 @@ def get_episodic_edge_from_record(record: Any) -> EpisodicEdge:
     )
 
 
-def get_entity_edge_from_record(record: Any) -> EntityEdge:
+def get_entity_edge_from_record(record: Any, include_embedding: bool = False) -> EntityEdge:
     edge = EntityEdge(
         uuid=record['uuid'],
         source_node_uuid=record['source_node_uuid'],
@@ -477,6 +492,10 @@ def get_entity_edge_from_record(record: Any) -> EntityEdge:
     edge.attributes.pop('expired_at', None)
     edge.attributes.pop('valid_at', None)
     edge.attributes.pop('invalid_at', None)
+    # properties(r) carries the embedding; it is only kept when a reranker will use it
+    fact_embedding = edge.attributes.pop('fact_embedding', None)
+    if include_embedding:
+        edge.fact_embedding = fact_embedding
 
     return edge
 
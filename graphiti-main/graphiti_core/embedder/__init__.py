@@ -1,7 +1,11 @@
+from .batching import BatchingEmbedder
+from .cached import CachedEmbedder
 from .client import EmbedderClient
 from .openai import OpenAIEmbedder, OpenAIEmbedderConfig
 
 __all__ = [
+    'BatchingEmbedder',
+    'CachedEmbedder',
     'EmbedderClient',
     'OpenAIEmbedder',
     'OpenAIEmbedderConfig',
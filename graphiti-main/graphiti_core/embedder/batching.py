@@ -0,0 +1,128 @@
+"""
+Copyright 2024, Zep Software, Inc.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import asyncio
+import logging
+from collections.abc import Iterable
+
+from .client import EmbedderClient
+
+DEFAULT_BATCH_WINDOW = 0.005
+DEFAULT_MAX_BATCH_SIZE = 100
+DEFAULT_MAX_CONCURRENT_BATCHES = 4
+
+logger = logging.getLogger(__name__)
+
+
+class BatchingEmbedder(EmbedderClient):
+    """
+    Embedder that coalesces concurrent requests into create_batch calls on another EmbedderClient.
+
+    Texts passed to create are held for up to batch_window seconds, or until max_batch_size texts
+    are waiting, and are then embedded with a single create_batch call. Identical texts that are
+    waiting or in flight share one embedding. At most max_concurrent_batches batches are sent at
+    once.
+    """
+
+    def __init__(
+        self,
+        embedder: EmbedderClient,
+        batch_window: float = DEFAULT_BATCH_WINDOW,
+        max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+        max_concurrent_batches: int = DEFAULT_MAX_CONCURRENT_BATCHES,
+    ):
+        self.embedder = embedder
+        self.batch_window = batch_window
+        self.max_batch_size = max_batch_size
+        self.semaphore = asyncio.Semaphore(max_concurrent_batches)
+
+        # Texts that are waiting for a batch, and the result of every waiting or in flight text
+        self.pending: list[str] = []
+        self.futures: dict[str, asyncio.Future[list[float]]] = {}
+        self.flush_handle: asyncio.TimerHandle | None = None
+        self.tasks: set[asyncio.Task] = set()
+
+    async def create(
+        self, input_data: str | list[str] | Iterable[int] | Iterable[Iterable[int]]
+    ) -> list[float]:
+        # Callers pass a single text either as a string or as a list of one string
+        if isinstance(input_data, str):
+            text = input_data
+        elif (
+            isinstance(input_data, list) and len(input_data) == 1 and isinstance(input_data[0], str)
+        ):
+            text = input_data[0]
+        else:
+            return await self.embedder.create(input_data)
+
+        future = self._enqueue(text)
+        if len(self.pending) >= self.max_batch_size:
+            self._flush()
+        elif self.flush_handle is None and len(self.pending) > 0:
+            self.flush_handle = asyncio.get_running_loop().call_later(
+                self.batch_window, self._flush
+            )
+
+        return await asyncio.shield(future)
+
+    async def create_batch(self, input_data_list: list[str]) -> list[list[float]]:
+        futures = [self._enqueue(text) for text in input_data_list]
+        # The caller already batched these texts, so they are sent without waiting for the window
+        self._flush()
+
+        return list(await asyncio.gather(*[asyncio.shield(future) for future in futures]))
+
+    def _enqueue(self, text: str) -> asyncio.Future[list[float]]:
+        future = self.futures.get(text)
+        if future is None:
+            future = asyncio.get_running_loop().create_future()
+            self.futures[text] = future
+            self.pending.append(text)
+
+        return future
+
+    def _flush(self):
+        if self.flush_handle is not None:
+            self.flush_handle.cancel()
+            self.flush_handle = None
+
+        while len(self.pending) > 0:
+            batch = self.pending[: self.max_batch_size]
+            self.pending = self.pending[self.max_batch_size :]
+
+            task = asyncio.create_task(self._send(batch))
+            self.tasks.add(task)
+            task.add_done_callback(self.tasks.discard)
+
+    async def _send(self, texts: list[str]):
+        futures = [self.futures[text] for text in texts]
+        try:
+            async with self.semaphore:
+                embeddings = await self.embedder.create_batch(texts)
+            if len(embeddings) != len(texts):
+                raise ValueError(f'Expected {len(texts)} embeddings, got {len(embeddings)}')
+        except Exception as e:
+            logger.error(f'Error embedding batch of {len(texts)} texts: {e}')
+            for future in futures:
+                if not future.done():
+                    future.set_exception(e)
+        else:
+            for future, embedding in zip(futures, embeddings, strict=True):
+                if not future.done():
+                    future.set_result(embedding)
+        finally:
+            for text in texts:
+                self.futures.pop(text, None)
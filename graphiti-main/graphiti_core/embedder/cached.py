@@ -0,0 +1,169 @@
+"""
+Copyright 2024, Zep Software, Inc.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import asyncio
+import hashlib
+import logging
+import unicodedata
+from collections import OrderedDict
+from collections.abc import Iterable
+
+from diskcache import Cache
+
+from .client import EmbedderClient
+
+DEFAULT_EMBEDDING_CACHE_DIR = './embedding_cache'
+DEFAULT_EMBEDDING_CACHE_SIZE_LIMIT = 2**30
+DEFAULT_EMBEDDING_MEMORY_ENTRIES = 10000
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_embedding_text(text: str) -> str:
+    return ' '.join(unicodedata.normalize('NFC', text).split())
+
+
+class CachedEmbedder(EmbedderClient):
+    """
+    Embedder that caches the vectors of another EmbedderClient.
+
+    Vectors are looked up in an in-memory LRU first and then in an on-disk diskcache, which is
+    skipped when cache_dir is None. Keys combine the embedding model, the embedding dimension and
+    the normalized text, so embedders with a different model or dimension never share vectors.
+    Only the texts missing from both tiers are sent to the wrapped embedder.
+    """
+
+    def __init__(
+        self,
+        embedder: EmbedderClient,
+        cache_dir: str | None = DEFAULT_EMBEDDING_CACHE_DIR,
+        size_limit: int = DEFAULT_EMBEDDING_CACHE_SIZE_LIMIT,
+        max_memory_entries: int = DEFAULT_EMBEDDING_MEMORY_ENTRIES,
+    ):
+        self.embedder = embedder
+        self.max_memory_entries = max_memory_entries
+        self.memory_cache: OrderedDict[str, list[float]] = OrderedDict()
+        self.disk_cache = (
+            Cache(cache_dir, size_limit=size_limit, eviction_policy='least-recently-used')
+            if cache_dir is not None
+            else None
+        )
+        self.hits = 0
+        self.misses = 0
+
+        config = getattr(embedder, 'config', None)
+        self.model = str(
+            getattr(config, 'embedding_model', None) or getattr(embedder, 'model', None) or ''
+        )
+        self.embedding_dim = getattr(config, 'embedding_dim', None)
+
+    def get_key(self, text: str) -> str:
+        key = f'{type(self.embedder).__name__}:{self.model}:{self.embedding_dim}:'
+        return hashlib.sha256((key + normalize_embedding_text(text)).encode()).hexdigest()
+
+    async def create(
+        self, input_data: str | list[str] | Iterable[int] | Iterable[Iterable[int]]
+    ) -> list[float]:
+        # Callers pass a single text either as a string or as a list of one string
+        if isinstance(input_data, str):
+            text = input_data
+        elif (
+            isinstance(input_data, list) and len(input_data) == 1 and isinstance(input_data[0], str)
+        ):
+            text = input_data[0]
+        else:
+            return await self.embedder.create(input_data)
+
+        key = self.get_key(text)
+        cached = await self._get_many([key])
+        if key in cached:
+            return cached[key]
+
+        embedding = await self.embedder.create(input_data)
+        await self._set_many({key: embedding})
+
+        return embedding
+
+    async def create_batch(self, input_data_list: list[str]) -> list[list[float]]:
+        keys = [self.get_key(text) for text in input_data_list]
+        embeddings = await self._get_many(keys)
+
+        # Each missing text is embedded once, even if it repeats in the batch
+        missing: dict[str, str] = {}
+        for key, text in zip(keys, input_data_list, strict=True):
+            if key not in embeddings and key not in missing:
+                missing[key] = text
+
+        if len(missing) > 0:
+            new_embeddings = await self.embedder.create_batch(list(missing.values()))
+            created = dict(zip(missing.keys(), new_embeddings, strict=True))
+            await self._set_many(created)
+            embeddings.update(created)
+
+        return [embeddings[key] for key in keys]
+
+    async def _get_many(self, keys: list[str]) -> dict[str, list[float]]:
+        found: dict[str, list[float]] = {}
+        for key in keys:
+            embedding = self.memory_cache.get(key)
+            if embedding is not None:
+                self.memory_cache.move_to_end(key)
+                found[key] = embedding
+
+        disk_keys = [key for key in dict.fromkeys(keys) if key not in found]
+        if self.disk_cache is not None and len(disk_keys) > 0:
+            disk_found = await asyncio.to_thread(self._get_from_disk, disk_keys)
+            self._set_in_memory(disk_found)
+            found.update(disk_found)
+
+        hits = sum(1 for key in keys if key in found)
+        self.hits += hits
+        self.misses += len(keys) - hits
+
+        return found
+
+    async def _set_many(self, embeddings: dict[str, list[float]]):
+        self._set_in_memory(embeddings)
+        if self.disk_cache is not None:
+            await asyncio.to_thread(self._set_on_disk, embeddings)
+
+    def _set_in_memory(self, embeddings: dict[str, list[float]]):
+        for key, embedding in embeddings.items():
+            self.memory_cache[key] = embedding
+            self.memory_cache.move_to_end(key)
+
+        while len(self.memory_cache) > self.max_memory_entries:
+            self.memory_cache.popitem(last=False)
+
+    def _get_from_disk(self, keys: list[str]) -> dict[str, list[float]]:
+        assert self.disk_cache is not None
+        found: dict[str, list[float]] = {}
+        for key in keys:
+            embedding = self.disk_cache.get(key)
+            if embedding is not None:
+                found[key] = embedding  # type: ignore[assignment]
+
+        return found
+
+    def _set_on_disk(self, embeddings: dict[str, list[float]]):
+        assert self.disk_cache is not None
+        with self.disk_cache.transact():
+            for key, embedding in embeddings.items():
+                self.disk_cache.set(key, embedding)
+
+    def close(self):
+        if self.disk_cache is not None:
+            self.disk_cache.close()
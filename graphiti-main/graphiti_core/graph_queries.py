@@ -24,6 +24,13 @@ NEO4J_TO_FALKORDB_MAPPING = {
     'edge_name_and_fact': 'RELATES_TO',
 }
 
+# Neo4j vector index names, with the FalkorDB label and property each one covers
+VECTOR_INDEX_FIELDS = {
+    'entity_name_embedding': ('Entity', 'name_embedding'),
+    'community_name_embedding': ('Community', 'name_embedding'),
+    'edge_fact_embedding': ('RELATES_TO', 'fact_embedding'),
+}
+
 
 def get_range_indices(db_type: str = 'neo4j') -> list[LiteralString]:
     if db_type == 'falkordb':
@@ -86,6 +93,58 @@ def get_fulltext_indices(db_type: str = 'neo4j') -> list[LiteralString]:
         ]
 
 
+def get_vector_indices(embedding_dim: int, db_type: str = 'neo4j') -> list[str]:
+    if db_type == 'falkordb':
+        options = f"OPTIONS {{dimension: {embedding_dim}, similarityFunction: 'cosine'}}"
+        return [
+            f'CREATE VECTOR INDEX FOR (n:Entity) ON (n.name_embedding) {options}',
+            f'CREATE VECTOR INDEX FOR (n:Community) ON (n.name_embedding) {options}',
+            f'CREATE VECTOR INDEX FOR ()-[e:RELATES_TO]-() ON (e.fact_embedding) {options}',
+        ]
+    else:
+        options = (
+            f'OPTIONS {{indexConfig: {{`vector.dimensions`: {embedding_dim}, '
+            f"`vector.similarity_function`: 'cosine'}}}}"
+        )
+        return [
+            f"""CREATE VECTOR INDEX entity_name_embedding IF NOT EXISTS
+            FOR (n:Entity) ON n.name_embedding {options}""",
+            f"""CREATE VECTOR INDEX community_name_embedding IF NOT EXISTS
+            FOR (n:Community) ON n.name_embedding {options}""",
+            f"""CREATE VECTOR INDEX edge_fact_embedding IF NOT EXISTS
+            FOR ()-[e:RELATES_TO]-() ON e.fact_embedding {options}""",
+        ]
+
+
+def get_vector_nodes_query(name: str, db_type: str = 'neo4j') -> str:
+    # Yields node and a score normalized like vector.similarity.cosine for the $k nearest nodes
+    if db_type == 'falkordb':
+        label, field = VECTOR_INDEX_FIELDS[name]
+        # FalkorDB yields the cosine distance
+        return (
+            f"CALL db.idx.vector.queryNodes('{label}', '{field}', $k, vecf32($search_vector)) "
+            'YIELD node, score AS distance WITH node, (2 - distance)/2 AS score'
+        )
+    else:
+        return f"CALL db.index.vector.queryNodes('{name}', $k, $search_vector) YIELD node, score"
+
+
+def get_vector_relationships_query(name: str, db_type: str = 'neo4j') -> str:
+    # Yields relationship and a score normalized like vector.similarity.cosine
+    if db_type == 'falkordb':
+        label, field = VECTOR_INDEX_FIELDS[name]
+        return (
+            f"CALL db.idx.vector.queryRelationships('{label}', '{field}', $k, "
+            'vecf32($search_vector)) '
+            'YIELD relationship, score AS distance WITH relationship, (2 - distance)/2 AS score'
+        )
+    else:
+        return (
+            f"CALL db.index.vector.queryRelationships('{name}', $k, $search_vector) "
+            'YIELD relationship, score'
+        )
+
+
 def get_nodes_query(db_type: str = 'neo4j', name: str = '', query: str | None = None) -> str:
     if db_type == 'falkordb':
         label = NEO4J_TO_FALKORDB_MAPPING[name]
@@ -102,12 +161,12 @@ def get_vector_cosine_func_query(vec1, vec2, db_type: str = 'neo4j') -> str:
         return f'vector.similarity.cosine({vec1}, {vec2})'
 
 
-def get_relationships_query(name: str, db_type: str = 'neo4j') -> str:
+def get_relationships_query(name: str, db_type: str = 'neo4j', query: str = '$query') -> str:
     if db_type == 'falkordb':
         label = NEO4J_TO_FALKORDB_MAPPING[name]
-        return f"CALL db.idx.fulltext.queryRelationships('{label}', $query)"
+        return f"CALL db.idx.fulltext.queryRelationships('{label}', {query})"
     else:
-        return f'CALL db.index.fulltext.queryRelationships("{name}", $query, {{limit: $limit}})'
+        return f'CALL db.index.fulltext.queryRelationships("{name}", {query}, {{limit: $limit}})'
 
 
 def get_entity_node_save_bulk_query(nodes, db_type: str = 'neo4j') -> str | Any:
@@ -15,11 +15,14 @@ limitations under the License.
 """
 
 import logging
+import os
+from collections.abc import MutableMapping
 from datetime import datetime
 from time import time
+from typing import Any
 
 from dotenv import load_dotenv
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from typing_extensions import LiteralString
 
 from graphiti_core.cross_encoder.client import CrossEncoderClient
@@ -28,6 +31,7 @@ from graphiti_core.driver.driver import GraphDriver
 from graphiti_core.driver.neo4j_driver import Neo4jDriver
 from graphiti_core.edges import EntityEdge, EpisodicEdge
 from graphiti_core.embedder import EmbedderClient, OpenAIEmbedder
+from graphiti_core.embedder.client import EMBEDDING_DIM
 from graphiti_core.graphiti_types import GraphitiClients
 from graphiti_core.helpers import (
     semaphore_gather,
@@ -36,7 +40,9 @@ from graphiti_core.helpers import (
 )
 from graphiti_core.llm_client import LLMClient, OpenAIClient
 from graphiti_core.nodes import CommunityNode, EntityNode, EpisodeType, EpisodicNode
+from graphiti_core.search.ann_index import LocalAnnIndex
 from graphiti_core.search.search import SearchConfig, search
+from graphiti_core.search.search_cache import SearchCache
 from graphiti_core.search.search_config import DEFAULT_SEARCH_LIMIT, SearchResults
 from graphiti_core.search.search_config_recipes import (
     COMBINED_HYBRID_SEARCH_CROSS_ENCODER,
@@ -52,18 +58,29 @@ from graphiti_core.search.search_utils import (
 )
 from graphiti_core.telemetry import capture_event
 from graphiti_core.utils.bulk_utils import (
+    DEFAULT_BULK_CHUNK_SIZE,
+    BulkChunkCheckpoint,
+    CommittedNodeIndex,
     RawEpisode,
     add_nodes_and_edges_bulk,
     dedupe_edges_bulk,
     dedupe_nodes_bulk,
     extract_nodes_and_edges_bulk,
+    get_bulk_chunk_fingerprint,
+    load_bulk_chunk_checkpoint,
     resolve_edge_pointers,
+    resolve_edges_against_graph_bulk,
+    resolve_nodes_against_graph_bulk,
     retrieve_previous_episodes_bulk,
+    save_bulk_chunk_checkpoint,
 )
 from graphiti_core.utils.datetime_utils import utc_now
 from graphiti_core.utils.maintenance.community_operations import (
+    DEFAULT_SUMMARY_FAN_IN,
     build_communities,
+    build_communities_incremental,
     remove_communities,
+    remove_communities_by_uuids,
     update_community,
 )
 from graphiti_core.utils.maintenance.edge_operations import (
@@ -96,6 +113,31 @@ class AddEpisodeResults(BaseModel):
     edges: list[EntityEdge]
 
 
+class ExtractedEpisode(BaseModel):
+    """Result of the extraction stage of add_episode, passed to resolve_episode."""
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    episode: EpisodicNode
+    group_id: str
+    previous_episodes: list[EpisodicNode]
+    extracted_nodes: list[EntityNode]
+    entity_types: dict[str, Any] | None
+    edge_types: dict[str, Any] | None
+    edge_type_map: dict[tuple[str, str], list[str]]
+    created_at: datetime
+
+
+class ResolvedEpisode(BaseModel):
+    """Result of the resolution stage of add_episode, passed to save_episode."""
+
+    episode: EpisodicNode
+    nodes: list[EntityNode]
+    hydrated_nodes: list[EntityNode]
+    entity_edges: list[EntityEdge]
+    episodic_edges: list[EpisodicEdge]
+
+
 class Graphiti:
     def __init__(
         self,
@@ -108,6 +150,8 @@ class Graphiti:
         store_raw_episode_content: bool = True,
         graph_driver: GraphDriver | None = None,
         max_coroutines: int | None = None,
+        ann_index: LocalAnnIndex | None = None,
+        search_cache: SearchCache | None = None,
     ):
         """
         Initialize a Graphiti instance.
@@ -140,6 +184,15 @@ class Graphiti:
         max_coroutines : int | None, optional
             The maximum number of concurrent operations allowed. Overrides SEMAPHORE_LIMIT set in the environment.
             If not set, the Graphiti default is used.
+        ann_index : LocalAnnIndex | None, optional
+            A local approximate nearest neighbour index for the similarity searches to use
+            instead of scanning every embedding in the graph. It is attached to the driver and
+            kept in sync with the writes made through this instance. If the index is new or was
+            not saved after the last writes, fill it with build_ann_index.
+        search_cache : SearchCache | None, optional
+            A cache for search results. It is attached to the driver, and writes made through
+            this instance invalidate the results of the groups they touch. Only use it when no
+            other process writes to the same graph.
 
         Returns
         -------
@@ -167,6 +220,11 @@ class Graphiti:
                 raise ValueError('uri must be provided when graph_driver is None')
             self.driver = Neo4jDriver(uri, user, password)
 
+        if ann_index is not None:
+            self.driver.ann_index = ann_index
+        if search_cache is not None:
+            self.driver.search_cache = search_cache
+
         self.store_raw_episode_content = store_raw_episode_content
         self.max_coroutines = max_coroutines
         if llm_client:
@@ -274,6 +332,8 @@ class Graphiti:
             finally:
                 graphiti.close()
         """
+        if self.driver.ann_index is not None:
+            self.driver.ann_index.save()
         await self.driver.close()
 
     async def build_indices_and_constraints(self, delete_existing: bool = False):
@@ -306,10 +366,18 @@ class Graphiti:
         of the `build_indices_and_constraints` function. Refer to that function's
         documentation for details on the exact database schema modifications.
 
+        The vector indices are created with the embedder's embedding_dim.
+
         Caution: Running this method on a large existing database may take some time
         and could impact database performance during execution.
         """
-        await build_indices_and_constraints(self.driver, delete_existing)
+        config = getattr(self.embedder, 'config', None)
+        embedding_dim = (
+            getattr(config, 'embedding_dim', None)
+            or getattr(self.embedder, 'embedding_dim', None)
+            or EMBEDDING_DIM
+        )
+        await build_indices_and_constraints(self.driver, delete_existing, embedding_dim)
 
     async def retrieve_episodes(
         self,
@@ -418,120 +486,283 @@ class Graphiti:
         """
         try:
             start = time()
-            now = utc_now()
 
-            validate_entity_types(entity_types)
-            validate_excluded_entity_types(excluded_entity_types, entity_types)
-            validate_group_id(group_id)
-
-            previous_episodes = (
-                await self.retrieve_episodes(
-                    reference_time,
-                    last_n=RELEVANT_SCHEMA_LIMIT,
-                    group_ids=[group_id],
-                    source=source,
-                )
-                if previous_episode_uuids is None
-                else await EpisodicNode.get_by_uuids(self.driver, previous_episode_uuids)
+            extracted = await self.extract_episode(
+                name,
+                episode_body,
+                source_description,
+                reference_time,
+                source=source,
+                group_id=group_id,
+                uuid=uuid,
+                entity_types=entity_types,
+                excluded_entity_types=excluded_entity_types,
+                previous_episode_uuids=previous_episode_uuids,
+                edge_types=edge_types,
+                edge_type_map=edge_type_map,
             )
+            results = await self.resolve_episode(extracted, update_communities=update_communities)
 
-            episode = (
-                await EpisodicNode.get_by_uuid(self.driver, uuid)
-                if uuid is not None
-                else EpisodicNode(
-                    name=name,
-                    group_id=group_id,
-                    labels=[],
-                    source=source,
-                    content=episode_body,
-                    source_description=source_description,
-                    created_at=now,
-                    valid_at=reference_time,
-                )
-            )
+            end = time()
+            logger.info(f'Completed add_episode in {(end - start) * 1000} ms')
 
-            # Create default edge type map
-            edge_type_map_default = (
-                {('Entity', 'Entity'): list(edge_types.keys())}
-                if edge_types is not None
-                else {('Entity', 'Entity'): []}
-            )
+            return results
 
-            # Extract entities as nodes
+        except Exception as e:
+            raise e
 
-            extracted_nodes = await extract_nodes(
-                self.clients, episode, previous_episodes, entity_types, excluded_entity_types
-            )
+    async def extract_episode(
+        self,
+        name: str,
+        episode_body: str,
+        source_description: str,
+        reference_time: datetime,
+        source: EpisodeType = EpisodeType.message,
+        group_id: str = '',
+        uuid: str | None = None,
+        entity_types: dict[str, BaseModel] | None = None,
+        excluded_entity_types: list[str] | None = None,
+        previous_episode_uuids: list[str] | None = None,
+        edge_types: dict[str, BaseModel] | None = None,
+        edge_type_map: dict[tuple[str, str], list[str]] | None = None,
+        pending_episodes: list[EpisodicNode] | None = None,
+    ) -> ExtractedEpisode:
+        """
+        Run the extraction stage of add_episode.
 
-            # Extract edges and resolve nodes
-            (nodes, uuid_map, node_duplicates), extracted_edges = await semaphore_gather(
-                resolve_extracted_nodes(
-                    self.clients,
-                    extracted_nodes,
-                    episode,
-                    previous_episodes,
-                    entity_types,
-                ),
-                extract_edges(
-                    self.clients,
-                    episode,
-                    extracted_nodes,
-                    previous_episodes,
-                    edge_type_map or edge_type_map_default,
-                    group_id,
-                    edge_types,
-                ),
-                max_coroutines=self.max_coroutines,
-            )
+        This stage only reads episodes from the graph and extracts entities with the LLM, so it
+        can run for an episode while earlier episodes of the same group are still being resolved
+        and written by resolve_episode. Resolution must still run in episode order.
 
-            edges = resolve_edge_pointers(extracted_edges, uuid_map)
+        Parameters are the same as add_episode, plus:
 
-            (resolved_edges, invalidated_edges), hydrated_nodes = await semaphore_gather(
-                resolve_extracted_edges(
-                    self.clients,
-                    edges,
-                    episode,
-                    nodes,
-                    edge_types or {},
-                    edge_type_map or edge_type_map_default,
-                ),
-                extract_attributes_from_nodes(
-                    self.clients, nodes, episode, previous_episodes, entity_types
-                ),
-                max_coroutines=self.max_coroutines,
+        pending_episodes : list[EpisodicNode] | None
+            Optional. Earlier episodes of the group that have been extracted but not written yet.
+            They are used as previous episodes alongside the ones already in the graph. Ignored
+            when previous_episode_uuids is given.
+
+        Returns
+        -------
+        ExtractedEpisode
+            The episode and its extracted entities, to be passed to resolve_episode.
+        """
+        now = utc_now()
+
+        validate_entity_types(entity_types)
+        validate_excluded_entity_types(excluded_entity_types, entity_types)
+        validate_group_id(group_id)
+
+        if previous_episode_uuids is None:
+            previous_episodes = await self.retrieve_episodes(
+                reference_time,
+                last_n=RELEVANT_SCHEMA_LIMIT,
+                group_ids=[group_id],
+                source=source,
             )
+            if pending_episodes:
+                seen_uuids = {episode.uuid for episode in previous_episodes}
+                previous_episodes = sorted(
+                    previous_episodes
+                    + [
+                        episode
+                        for episode in pending_episodes
+                        if episode.uuid not in seen_uuids
+                        and episode.group_id == group_id
+                        and episode.source == source
+                        and episode.valid_at <= reference_time
+                    ],
+                    key=lambda episode: episode.valid_at,
+                )[-RELEVANT_SCHEMA_LIMIT:]
+        else:
+            previous_episodes = await EpisodicNode.get_by_uuids(self.driver, previous_episode_uuids)
+
+        episode = (
+            await EpisodicNode.get_by_uuid(self.driver, uuid)
+            if uuid is not None
+            else EpisodicNode(
+                name=name,
+                group_id=group_id,
+                labels=[],
+                source=source,
+                content=episode_body,
+                source_description=source_description,
+                created_at=now,
+                valid_at=reference_time,
+            )
+        )
 
-            duplicate_of_edges = build_duplicate_of_edges(episode, now, node_duplicates)
+        # Create default edge type map
+        edge_type_map_default = (
+            {('Entity', 'Entity'): list(edge_types.keys())}
+            if edge_types is not None
+            else {('Entity', 'Entity'): []}
+        )
 
-            entity_edges = resolved_edges + invalidated_edges + duplicate_of_edges
+        # Extract entities as nodes
 
-            episodic_edges = build_episodic_edges(nodes, episode.uuid, now)
+        extracted_nodes = await extract_nodes(
+            self.clients, episode, previous_episodes, entity_types, excluded_entity_types
+        )
 
-            episode.entity_edges = [edge.uuid for edge in entity_edges]
+        return ExtractedEpisode(
+            episode=episode,
+            group_id=group_id,
+            previous_episodes=previous_episodes,
+            extracted_nodes=extracted_nodes,
+            entity_types=entity_types,
+            edge_types=edge_types,
+            edge_type_map=edge_type_map or edge_type_map_default,
+            created_at=now,
+        )
 
-            if not self.store_raw_episode_content:
-                episode.content = ''
+    async def resolve_episode(
+        self, extracted: ExtractedEpisode, update_communities: bool = False
+    ) -> AddEpisodeResults:
+        """
+        Run the resolution and write stages of add_episode.
 
-            await add_nodes_and_edges_bulk(
-                self.driver, [episode], episodic_edges, hydrated_nodes, entity_edges, self.embedder
-            )
+        Extracted entities are deduplicated against the graph, edges are extracted, resolved and
+        invalidated, and the results are written. Episodes of the same group must be resolved one
+        at a time, in order, since each one reads what the previous ones wrote.
 
-            # Update any communities
-            if update_communities:
-                await semaphore_gather(
-                    *[
-                        update_community(self.driver, self.llm_client, self.embedder, node)
-                        for node in nodes
-                    ],
-                    max_coroutines=self.max_coroutines,
-                )
-            end = time()
-            logger.info(f'Completed add_episode in {(end - start) * 1000} ms')
+        Parameters
+        ----------
+        extracted : ExtractedEpisode
+            The output of extract_episode.
+        update_communities : bool
+            Optional. Whether to update communities with new node information
 
-            return AddEpisodeResults(episode=episode, nodes=nodes, edges=entity_edges)
+        Returns
+        -------
+        AddEpisodeResults
+            The episode with its resolved nodes and edges.
+        """
+        resolved = await self.resolve_episode_entities(extracted)
+        return await self.save_episode(resolved, update_communities=update_communities)
 
-        except Exception as e:
-            raise e
+    async def resolve_episode_entities(self, extracted: ExtractedEpisode) -> ResolvedEpisode:
+        """
+        Run the resolution stage of add_episode, without writing anything.
+
+        Extracted nodes are deduplicated against the graph, and edges are extracted, resolved and
+        invalidated against it. The result must be written with save_episode before the next
+        episode of the same group is resolved.
+
+        Parameters
+        ----------
+        extracted : ExtractedEpisode
+            The output of extract_episode.
+
+        Returns
+        -------
+        ResolvedEpisode
+            The nodes and edges to write for the episode.
+        """
+        episode = extracted.episode
+        previous_episodes = extracted.previous_episodes
+        extracted_nodes = extracted.extracted_nodes
+        entity_types = extracted.entity_types
+        edge_types = extracted.edge_types
+        edge_type_map = extracted.edge_type_map
+        now = extracted.created_at
+
+        # Extract edges and resolve nodes
+        (nodes, uuid_map, node_duplicates), extracted_edges = await semaphore_gather(
+            resolve_extracted_nodes(
+                self.clients,
+                extracted_nodes,
+                episode,
+                previous_episodes,
+                entity_types,
+            ),
+            extract_edges(
+                self.clients,
+                episode,
+                extracted_nodes,
+                previous_episodes,
+                edge_type_map,
+                extracted.group_id,
+                edge_types,
+            ),
+            max_coroutines=self.max_coroutines,
+        )
+
+        edges = resolve_edge_pointers(extracted_edges, uuid_map)
+
+        (resolved_edges, invalidated_edges), hydrated_nodes = await semaphore_gather(
+            resolve_extracted_edges(
+                self.clients,
+                edges,
+                episode,
+                nodes,
+                edge_types or {},
+                edge_type_map,
+            ),
+            extract_attributes_from_nodes(
+                self.clients, nodes, episode, previous_episodes, entity_types
+            ),
+            max_coroutines=self.max_coroutines,
+        )
+
+        duplicate_of_edges = build_duplicate_of_edges(episode, now, node_duplicates)
+
+        entity_edges = resolved_edges + invalidated_edges + duplicate_of_edges
+
+        episodic_edges = build_episodic_edges(nodes, episode.uuid, now)
+
+        episode.entity_edges = [edge.uuid for edge in entity_edges]
+
+        return ResolvedEpisode(
+            episode=episode,
+            nodes=nodes,
+            hydrated_nodes=hydrated_nodes,
+            entity_edges=entity_edges,
+            episodic_edges=episodic_edges,
+        )
+
+    async def save_episode(
+        self, resolved: ResolvedEpisode, update_communities: bool = False
+    ) -> AddEpisodeResults:
+        """
+        Run the write stage of add_episode.
+
+        Parameters
+        ----------
+        resolved : ResolvedEpisode
+            The output of resolve_episode_entities.
+        update_communities : bool
+            Optional. Whether to update communities with new node information
+
+        Returns
+        -------
+        AddEpisodeResults
+            The episode with its resolved nodes and edges.
+        """
+        episode = resolved.episode
+
+        if not self.store_raw_episode_content:
+            episode.content = ''
+
+        await add_nodes_and_edges_bulk(
+            self.driver,
+            [episode],
+            resolved.episodic_edges,
+            resolved.hydrated_nodes,
+            resolved.entity_edges,
+            self.embedder,
+        )
+
+        # Update any communities
+        if update_communities:
+            await semaphore_gather(
+                *[
+                    update_community(self.driver, self.llm_client, self.embedder, node)
+                    for node in resolved.nodes
+                ],
+                max_coroutines=self.max_coroutines,
+            )
+
+        return AddEpisodeResults(episode=episode, nodes=resolved.nodes, edges=resolved.entity_edges)
 
     ##### EXPERIMENTAL #####
     async def add_episode_bulk(
@@ -542,6 +773,8 @@ class Graphiti:
         excluded_entity_types: list[str] | None = None,
         edge_types: dict[str, BaseModel] | None = None,
         edge_type_map: dict[tuple[str, str], list[str]] | None = None,
+        chunk_size: int | None = None,
+        checkpoint_dir: str | None = None,
     ):
         """
         Process multiple episodes in bulk and update the graph.
@@ -555,6 +788,15 @@ class Graphiti:
             A list of RawEpisode objects to be processed and added to the graph.
         group_id : str | None
             An id for the graph partition the episode is a part of.
+        chunk_size : int | None
+            Optional. Process and commit the episodes in chunks of this many episodes, each in its
+            own transaction. Nodes from later chunks are deduplicated against the nodes committed
+            by earlier ones. Defaults to DEFAULT_BULK_CHUNK_SIZE when checkpoint_dir is set, and to
+            a single chunk otherwise.
+        checkpoint_dir : str | None
+            Optional. Directory where each chunk's extraction and dedupe results are saved. Running
+            the same episodes again with the same directory skips committed chunks and reuses the
+            saved results of a chunk that was extracted but not committed.
 
         Returns
         -------
@@ -571,9 +813,8 @@ class Graphiti:
         - Saving nodes, episodic edges, and entity edges to the knowledge graph
 
         This bulk operation is designed for efficiency when processing multiple episodes
-        at once. However, it's important to ensure that the bulk operation doesn't
-        overwhelm system resources. Consider implementing rate limiting or chunking for
-        very large batches of episodes.
+        at once. Set chunk_size for very large batches of episodes, so that memory stays
+        bounded and a failure only loses the work of the current chunk.
 
         Important: This method does not perform edge invalidation or date extraction steps.
         If these operations are required, use the `add_episode` method instead for each
@@ -581,7 +822,6 @@ class Graphiti:
         """
         try:
             start = time()
-            now = utc_now()
 
             validate_group_id(group_id)
 
@@ -592,6 +832,61 @@ class Graphiti:
                 else {('Entity', 'Entity'): []}
             )
 
+            if chunk_size is None:
+                chunk_size = (
+                    DEFAULT_BULK_CHUNK_SIZE
+                    if checkpoint_dir is not None
+                    else max(len(bulk_episodes), 1)
+                )
+            if chunk_size < 1:
+                raise ValueError('chunk_size must be at least 1')
+
+            committed_nodes = CommittedNodeIndex()
+            for chunk_index, chunk_start in enumerate(range(0, len(bulk_episodes), chunk_size)):
+                await self._add_episode_bulk_chunk(
+                    bulk_episodes[chunk_start : chunk_start + chunk_size],
+                    group_id,
+                    committed_nodes,
+                    os.path.join(checkpoint_dir, f'chunk-{chunk_index:06d}.json')
+                    if checkpoint_dir is not None
+                    else None,
+                    entity_types,
+                    excluded_entity_types,
+                    edge_types,
+                    edge_type_map or edge_type_map_default,
+                )
+
+            end = time()
+            logger.info(f'Completed add_episode_bulk in {(end - start) * 1000} ms')
+
+        except Exception as e:
+            raise e
+
+    async def _add_episode_bulk_chunk(
+        self,
+        bulk_episodes: list[RawEpisode],
+        group_id: str,
+        committed_nodes: CommittedNodeIndex,
+        checkpoint_path: str | None,
+        entity_types: dict[str, BaseModel] | None,
+        excluded_entity_types: list[str] | None,
+        edge_types: dict[str, BaseModel] | None,
+        edge_type_map: dict[tuple[str, str], list[str]],
+    ):
+        fingerprint = get_bulk_chunk_fingerprint(bulk_episodes, group_id)
+        checkpoint = (
+            load_bulk_chunk_checkpoint(checkpoint_path, fingerprint)
+            if checkpoint_path is not None
+            else None
+        )
+
+        if checkpoint is not None and checkpoint.status == 'committed':
+            logger.info(f'Skipping committed bulk chunk {checkpoint_path}')
+            committed_nodes.add(checkpoint.entity_nodes)
+            return
+
+        if checkpoint is None:
+            now = utc_now()
             episodes = [
                 await EpisodicNode.get_by_uuid(self.driver, episode.uuid)
                 if episode.uuid is not None
@@ -607,80 +902,153 @@ class Graphiti:
                 )
                 for episode in bulk_episodes
             ]
+            # Saved before the episodes are written, so a resumed chunk reuses their uuids
+            checkpoint = BulkChunkCheckpoint(fingerprint=fingerprint, episodes=episodes)
+            if checkpoint_path is not None:
+                save_bulk_chunk_checkpoint(checkpoint_path, checkpoint)
 
-            episodes_by_uuid: dict[str, EpisodicNode] = {
-                episode.uuid: episode for episode in episodes
-            }
-
+        if checkpoint.status == 'created':
             # Save all episodes
             await add_nodes_and_edges_bulk(
                 driver=self.driver,
-                episodic_nodes=episodes,
+                episodic_nodes=checkpoint.episodes,
                 episodic_edges=[],
                 entity_nodes=[],
                 entity_edges=[],
                 embedder=self.embedder,
             )
 
-            # Get previous episode context for each episode
-            episode_context = await retrieve_previous_episodes_bulk(self.driver, episodes)
-
-            # Extract all nodes and edges for each episode
-            extracted_nodes_bulk, extracted_edges_bulk = await extract_nodes_and_edges_bulk(
-                self.clients,
-                episode_context,
-                edge_type_map=edge_type_map or edge_type_map_default,
-                edge_types=edge_types,
-                entity_types=entity_types,
-                excluded_entity_types=excluded_entity_types,
+            episodic_edges, hydrated_nodes, entity_edges = await self._extract_episode_bulk(
+                checkpoint.episodes,
+                committed_nodes,
+                entity_types,
+                excluded_entity_types,
+                edge_types,
+                edge_type_map,
             )
+            checkpoint = checkpoint.model_copy(
+                update={
+                    'status': 'extracted',
+                    'episodic_edges': episodic_edges,
+                    'entity_nodes': hydrated_nodes,
+                    'entity_edges': entity_edges,
+                }
+            )
+            if checkpoint_path is not None:
+                save_bulk_chunk_checkpoint(checkpoint_path, checkpoint)
+
+        # save data to KG
+        await add_nodes_and_edges_bulk(
+            self.driver,
+            checkpoint.episodes,
+            checkpoint.episodic_edges,
+            checkpoint.entity_nodes,
+            checkpoint.entity_edges,
+            self.embedder,
+        )
 
-            # Dedupe extracted nodes in memory
-            nodes_by_episode, uuid_map = await dedupe_nodes_bulk(
-                self.clients, extracted_nodes_bulk, episode_context, entity_types
+        committed_nodes.add(checkpoint.entity_nodes)
+        if checkpoint_path is not None:
+            save_bulk_chunk_checkpoint(
+                checkpoint_path, checkpoint.model_copy(update={'status': 'committed'})
             )
 
-            episodic_edges: list[EpisodicEdge] = []
-            for episode_uuid, nodes in nodes_by_episode.items():
-                episodic_edges.extend(build_episodic_edges(nodes, episode_uuid, now))
+    async def _extract_episode_bulk(
+        self,
+        episodes: list[EpisodicNode],
+        committed_nodes: CommittedNodeIndex,
+        entity_types: dict[str, BaseModel] | None,
+        excluded_entity_types: list[str] | None,
+        edge_types: dict[str, BaseModel] | None,
+        edge_type_map: dict[tuple[str, str], list[str]],
+    ) -> tuple[list[EpisodicEdge], list[EntityNode], list[EntityEdge]]:
+        now = utc_now()
+
+        episodes_by_uuid: dict[str, EpisodicNode] = {episode.uuid: episode for episode in episodes}
+
+        # Get previous episode context for each episode
+        episode_context = await retrieve_previous_episodes_bulk(self.driver, episodes)
+
+        # Extract all nodes and edges for each episode
+        extracted_nodes_bulk, extracted_edges_bulk = await extract_nodes_and_edges_bulk(
+            self.clients,
+            episode_context,
+            edge_type_map=edge_type_map,
+            edge_types=edge_types,
+            entity_types=entity_types,
+            excluded_entity_types=excluded_entity_types,
+        )
+
+        # Dedupe extracted nodes in memory, and against the nodes of earlier chunks
+        nodes_by_episode, uuid_map = await dedupe_nodes_bulk(
+            self.clients, extracted_nodes_bulk, episode_context, entity_types, committed_nodes
+        )
 
-            # re-map edge pointers so that they don't point to discard dupe nodes
-            extracted_edges_bulk_updated: list[list[EntityEdge]] = [
-                resolve_edge_pointers(edges, uuid_map) for edges in extracted_edges_bulk
-            ]
+        # Resolve the deduplicated nodes against the existing graph
+        (
+            nodes_by_episode,
+            graph_uuid_map,
+            duplicate_of_edges,
+        ) = await resolve_nodes_against_graph_bulk(
+            self.clients, nodes_by_episode, episode_context, now, entity_types
+        )
 
-            # Dedupe extracted edges in memory
-            edges_by_episode = await dedupe_edges_bulk(
-                self.clients,
-                extracted_edges_bulk_updated,
-                episode_context,
-                [],
-                edge_types or {},
-                edge_type_map or edge_type_map_default,
-            )
+        episodic_edges: list[EpisodicEdge] = []
+        for episode_uuid, nodes in nodes_by_episode.items():
+            episodic_edges.extend(build_episodic_edges(nodes, episode_uuid, now))
 
-            # Extract node attributes
-            nodes_by_uuid: dict[str, EntityNode] = {
-                node.uuid: node for nodes in nodes_by_episode.values() for node in nodes
-            }
+        # re-map edge pointers so that they don't point to discard dupe nodes
+        extracted_edges_bulk_updated: list[list[EntityEdge]] = [
+            resolve_edge_pointers(resolve_edge_pointers(edges, uuid_map), graph_uuid_map)
+            for edges in extracted_edges_bulk
+        ]
 
-            extract_attributes_params: list[tuple[EntityNode, list[EpisodicNode]]] = []
-            for node in nodes_by_uuid.values():
-                episode_uuids: list[str] = []
-                for episode_uuid, mentioned_nodes in nodes_by_episode.items():
-                    for mentioned_node in mentioned_nodes:
-                        if node.uuid == mentioned_node.uuid:
-                            episode_uuids.append(episode_uuid)
-                            break
-
-                episode_mentions: list[EpisodicNode] = [
-                    episodes_by_uuid[episode_uuid] for episode_uuid in episode_uuids
-                ]
-                episode_mentions.sort(key=lambda x: x.valid_at, reverse=True)
+        # Dedupe extracted edges in memory
+        edges_by_episode = await dedupe_edges_bulk(
+            self.clients,
+            extracted_edges_bulk_updated,
+            episode_context,
+            [],
+            edge_types or {},
+            edge_type_map,
+        )
+
+        # Extract node attributes
+        nodes_by_uuid: dict[str, EntityNode] = {
+            node.uuid: node for nodes in nodes_by_episode.values() for node in nodes
+        }
+
+        extract_attributes_params: list[tuple[EntityNode, list[EpisodicNode]]] = []
+        for node in nodes_by_uuid.values():
+            episode_uuids: list[str] = []
+            for episode_uuid, mentioned_nodes in nodes_by_episode.items():
+                for mentioned_node in mentioned_nodes:
+                    if node.uuid == mentioned_node.uuid:
+                        episode_uuids.append(episode_uuid)
+                        break
+
+            episode_mentions: list[EpisodicNode] = [
+                episodes_by_uuid[episode_uuid] for episode_uuid in episode_uuids
+            ]
+            episode_mentions.sort(key=lambda x: x.valid_at, reverse=True)
+
+            extract_attributes_params.append((node, episode_mentions))
 
-                extract_attributes_params.append((node, episode_mentions))
+        edges_by_uuid: dict[str, EntityEdge] = {
+            edge.uuid: edge for edges in edges_by_episode.values() for edge in edges
+        }
 
-            new_hydrated_nodes: list[list[EntityNode]] = await semaphore_gather(
+        # Resolve edges against the existing graph while node attributes are extracted
+        (resolved_edges, invalidated_edges), new_hydrated_nodes = await semaphore_gather(
+            resolve_edges_against_graph_bulk(
+                self.clients,
+                list(edges_by_uuid.values()),
+                episodes_by_uuid,
+                list(nodes_by_uuid.values()),
+                edge_types or {},
+                edge_type_map,
+            ),
+            semaphore_gather(
                 *[
                     extract_attributes_from_nodes(
                         self.clients,
@@ -691,45 +1059,58 @@ class Graphiti:
                     )
                     for params in extract_attributes_params
                 ]
-            )
-
-            hydrated_nodes = [node for nodes in new_hydrated_nodes for node in nodes]
-
-            # TODO: Resolve nodes and edges against the existing graph
-            edges_by_uuid: dict[str, EntityEdge] = {
-                edge.uuid: edge for edges in edges_by_episode.values() for edge in edges
-            }
+            ),
+        )
 
-            # save data to KG
-            await add_nodes_and_edges_bulk(
-                self.driver,
-                episodes,
-                episodic_edges,
-                hydrated_nodes,
-                list(edges_by_uuid.values()),
-                self.embedder,
-            )
+        hydrated_nodes = [node for nodes in new_hydrated_nodes for node in nodes]
 
-            end = time()
-            logger.info(f'Completed add_episode_bulk in {(end - start) * 1000} ms')
+        entity_edges = resolved_edges + invalidated_edges + duplicate_of_edges
+        for edge in entity_edges:
+            for episode_uuid in edge.episodes:
+                if episode_uuid in episodes_by_uuid:
+                    episodes_by_uuid[episode_uuid].entity_edges.append(edge.uuid)
 
-        except Exception as e:
-            raise e
+        return episodic_edges, hydrated_nodes, entity_edges
 
-    async def build_communities(self, group_ids: list[str] | None = None) -> list[CommunityNode]:
+    async def build_communities(
+        self,
+        group_ids: list[str] | None = None,
+        incremental: bool = False,
+        summary_cache: MutableMapping[str, str] | None = None,
+        summary_fan_in: int = DEFAULT_SUMMARY_FAN_IN,
+    ) -> list[CommunityNode]:
         """
         Use a community clustering algorithm to find communities of nodes. Create community nodes summarising
         the content of these communities.
         ----------
         query : list[str] | None
             Optional. Create communities only for the listed group_ids. If blank the entire graph will be used.
+        incremental : bool
+            Optional. Only update the communities around entities and edges created since the last build,
+            instead of rebuilding every community. Returns only the communities that were rebuilt.
+        summary_cache : MutableMapping[str, str] | None
+            Optional. Stores merged member summaries keyed on their prompt and the model, so repeated
+            builds reuse them instead of calling the LLM again. A diskcache.Cache keeps them across runs.
+        summary_fan_in : int
+            Optional. Number of summaries merged by each LLM call when summarizing a community.
         """
-        # Clear existing communities
-        await remove_communities(self.driver)
+        if incremental:
+            (
+                community_nodes,
+                community_edges,
+                stale_community_uuids,
+            ) = await build_communities_incremental(
+                self.driver, self.llm_client, group_ids, summary_cache, summary_fan_in
+            )
 
-        community_nodes, community_edges = await build_communities(
-            self.driver, self.llm_client, group_ids
-        )
+            await remove_communities_by_uuids(self.driver, stale_community_uuids)
+        else:
+            # Clear existing communities
+            await remove_communities(self.driver)
+
+            community_nodes, community_edges = await build_communities(
+                self.driver, self.llm_client, group_ids, summary_cache, summary_fan_in
+            )
 
         await semaphore_gather(
             *[node.generate_name_embedding(self.embedder) for node in community_nodes],
@@ -0,0 +1,242 @@
+"""
+Copyright 2024, Zep Software, Inc.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import asyncio
+import logging
+from typing import Any
+
+from pydantic import BaseModel
+
+from graphiti_core.graphiti import AddEpisodeResults, ExtractedEpisode, Graphiti, ResolvedEpisode
+from graphiti_core.nodes import EpisodicNode
+from graphiti_core.utils.bulk_utils import RawEpisode
+
+DEFAULT_EXTRACT_WORKERS = 4
+DEFAULT_RESOLVE_WORKERS = 2
+DEFAULT_WRITE_WORKERS = 2
+DEFAULT_STAGE_QUEUE_SIZE = 16
+
+logger = logging.getLogger(__name__)
+
+
+class IngestionStats(BaseModel):
+    submitted: int = 0
+    completed: int = 0
+    failed: int = 0
+    extract_queue: int = 0
+    resolve_queue: int = 0
+    write_queue: int = 0
+
+
+class _PipelineItem:
+    def __init__(
+        self,
+        episode: RawEpisode,
+        group_id: str,
+        options: dict[str, Any],
+        update_communities: bool,
+        previous: '_PipelineItem | None',
+    ):
+        self.episode = episode
+        self.group_id = group_id
+        self.options = options
+        self.update_communities = update_communities
+        # The item submitted just before this one for the same group
+        self.previous = previous
+        self.extracted: ExtractedEpisode | None = None
+        self.resolved: ResolvedEpisode | None = None
+        self.extraction_done = asyncio.Event()
+        self.write_done = asyncio.Event()
+        self.future: asyncio.Future[AddEpisodeResults] = asyncio.get_running_loop().create_future()
+
+
+class EpisodeIngestionPipeline:
+    """
+    Runs add_episode for a stream of episodes as a bounded pipeline of extraction, resolution and
+    write stages, each with its own pool of workers.
+
+    Within a group the pipeline keeps add_episode's ordering: an episode is extracted after the
+    previous episode of its group, with that episode as context even if it isn't written yet, and
+    it is resolved only once the previous episode of its group has been written, so resolution
+    always reads the graph as add_episode would. Different groups, and the stages of consecutive
+    episodes of one group, run concurrently. submit waits while the extraction queue is full.
+    """
+
+    def __init__(
+        self,
+        graphiti: Graphiti,
+        extract_workers: int = DEFAULT_EXTRACT_WORKERS,
+        resolve_workers: int = DEFAULT_RESOLVE_WORKERS,
+        write_workers: int = DEFAULT_WRITE_WORKERS,
+        queue_size: int = DEFAULT_STAGE_QUEUE_SIZE,
+    ):
+        self.graphiti = graphiti
+        self.extract_queue: asyncio.Queue[_PipelineItem] = asyncio.Queue(maxsize=queue_size)
+        self.resolve_queue: asyncio.Queue[_PipelineItem] = asyncio.Queue(maxsize=queue_size)
+        self.write_queue: asyncio.Queue[_PipelineItem] = asyncio.Queue(maxsize=queue_size)
+        self.worker_counts = (extract_workers, resolve_workers, write_workers)
+        self.workers: list[asyncio.Task] = []
+        self.last_items: dict[str, _PipelineItem] = {}
+        # Episodes that are extracted but not written yet, by group
+        self.unwritten: dict[str, list[EpisodicNode]] = {}
+        self.stats = IngestionStats()
+
+    async def __aenter__(self) -> 'EpisodeIngestionPipeline':
+        self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    def start(self):
+        extract_workers, resolve_workers, write_workers = self.worker_counts
+        self.workers = (
+            [asyncio.create_task(self._extract_worker()) for _ in range(extract_workers)]
+            + [asyncio.create_task(self._resolve_worker()) for _ in range(resolve_workers)]
+            + [asyncio.create_task(self._write_worker()) for _ in range(write_workers)]
+        )
+
+    async def close(self):
+        """Wait for every submitted episode to finish and stop the workers."""
+        await self.extract_queue.join()
+        await self.resolve_queue.join()
+        await self.write_queue.join()
+        for worker in self.workers:
+            worker.cancel()
+        await asyncio.gather(*self.workers, return_exceptions=True)
+        self.workers = []
+
+    async def submit(
+        self,
+        episode: RawEpisode,
+        group_id: str = '',
+        update_communities: bool = False,
+        entity_types: dict[str, BaseModel] | None = None,
+        excluded_entity_types: list[str] | None = None,
+        edge_types: dict[str, BaseModel] | None = None,
+        edge_type_map: dict[tuple[str, str], list[str]] | None = None,
+    ) -> asyncio.Future[AddEpisodeResults]:
+        """
+        Queue an episode and return a future for its add_episode results.
+
+        Episodes of the same group are applied in the order they are submitted.
+        """
+        item = _PipelineItem(
+            episode,
+            group_id,
+            {
+                'entity_types': entity_types,
+                'excluded_entity_types': excluded_entity_types,
+                'edge_types': edge_types,
+                'edge_type_map': edge_type_map,
+            },
+            update_communities,
+            self.last_items.get(group_id),
+        )
+        self.last_items[group_id] = item
+        self.stats.submitted += 1
+
+        await self.extract_queue.put(item)
+        return item.future
+
+    def get_stats(self) -> IngestionStats:
+        return self.stats.model_copy(
+            update={
+                'extract_queue': self.extract_queue.qsize(),
+                'resolve_queue': self.resolve_queue.qsize(),
+                'write_queue': self.write_queue.qsize(),
+            }
+        )
+
+    def _fail(self, item: _PipelineItem, error: Exception):
+        logger.error(f'Error ingesting episode {item.episode.name}: {error}')
+        self.stats.failed += 1
+        if not item.future.done():
+            item.future.set_exception(error)
+        self._finish(item)
+
+    def _finish(self, item: _PipelineItem):
+        item.extraction_done.set()
+        item.write_done.set()
+        if item.extracted is not None:
+            unwritten = self.unwritten.get(item.group_id, [])
+            if item.extracted.episode in unwritten:
+                unwritten.remove(item.extracted.episode)
+        # Drop the chain of finished items so they can be garbage collected
+        item.previous = None
+        if self.last_items.get(item.group_id) is item:
+            del self.last_items[item.group_id]
+
+    async def _extract_worker(self):
+        while True:
+            item = await self.extract_queue.get()
+            try:
+                if item.previous is not None:
+                    await item.previous.extraction_done.wait()
+
+                episode = item.episode
+                item.extracted = await self.graphiti.extract_episode(
+                    episode.name,
+                    episode.content,
+                    episode.source_description,
+                    episode.reference_time,
+                    source=episode.source,
+                    group_id=item.group_id,
+                    uuid=episode.uuid,
+                    pending_episodes=list(self.unwritten.get(item.group_id, [])),
+                    **item.options,
+                )
+                self.unwritten.setdefault(item.group_id, []).append(item.extracted.episode)
+                # Queued before the next episode of the group can be, so groups stay in order
+                await self.resolve_queue.put(item)
+                item.extraction_done.set()
+            except Exception as e:
+                self._fail(item, e)
+            finally:
+                self.extract_queue.task_done()
+
+    async def _resolve_worker(self):
+        while True:
+            item = await self.resolve_queue.get()
+            try:
+                # Resolution reads the graph, so it waits for the previous episode's write
+                if item.previous is not None:
+                    await item.previous.write_done.wait()
+
+                assert item.extracted is not None
+                item.resolved = await self.graphiti.resolve_episode_entities(item.extracted)
+                await self.write_queue.put(item)
+            except Exception as e:
+                self._fail(item, e)
+            finally:
+                self.resolve_queue.task_done()
+
+    async def _write_worker(self):
+        while True:
+            item = await self.write_queue.get()
+            try:
+                assert item.resolved is not None
+                results = await self.graphiti.save_episode(
+                    item.resolved, update_communities=item.update_communities
+                )
+                self.stats.completed += 1
+                if not item.future.done():
+                    item.future.set_result(results)
+                self._finish(item)
+            except Exception as e:
+                self._fail(item, e)
+            finally:
+                self.write_queue.task_done()
@@ -14,10 +14,20 @@ See the License for the specific language governing permissions and
 limitations under the License.
 """
 
+from .cache import DiskLLMCache, InMemoryLLMCache, LLMCache
 from .client import LLMClient
 from .config import LLMConfig
 from .errors import RateLimitError
 from .openai_client import OpenAIClient
 from .claude_docker_client import ClaudeDockerClient
 
-__all__ = ['LLMClient', 'OpenAIClient', 'ClaudeDockerClient', 'LLMConfig', 'RateLimitError']
+__all__ = [
+    'LLMClient',
+    'OpenAIClient',
+    'ClaudeDockerClient',
+    'LLMConfig',
+    'RateLimitError',
+    'LLMCache',
+    'InMemoryLLMCache',
+    'DiskLLMCache',
+]
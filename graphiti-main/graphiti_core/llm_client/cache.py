@@ -0,0 +1,182 @@
+"""
+Copyright 2024, Zep Software, Inc.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import asyncio
+import copy
+import hashlib
+import json
+import logging
+import typing
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from importlib.metadata import PackageNotFoundError, version
+from time import monotonic
+
+from diskcache import Cache
+from pydantic import BaseModel
+
+from ..prompts.models import Message
+from .config import ModelSize
+
+DEFAULT_CACHE_DIR = './llm_cache'
+DEFAULT_CACHE_SIZE_LIMIT = 2**30
+DEFAULT_CACHE_MAX_ENTRIES = 10000
+
+logger = logging.getLogger(__name__)
+
+
+def _get_prompt_library_version() -> str:
+    # Prompts ship with graphiti-core, so its version identifies the prompt library
+    try:
+        return version('graphiti-core')
+    except PackageNotFoundError:
+        return 'unknown'
+
+
+DEFAULT_CACHE_NAMESPACE = f'graphiti-core:{_get_prompt_library_version()}'
+
+
+class CacheStats(BaseModel):
+    hits: int = 0
+    misses: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups > 0 else 0.0
+
+
+class LLMCache(ABC):
+    """
+    Stores LLM responses by a key built from the request.
+
+    Entries expire after ttl seconds when it is set. The namespace is part of every key, so
+    changing it (by default it changes with the prompt library version) starts a fresh cache.
+    """
+
+    def __init__(self, ttl: float | None = None, namespace: str = DEFAULT_CACHE_NAMESPACE):
+        self.ttl = ttl
+        self.namespace = namespace
+        self.stats = CacheStats()
+
+    def get_key(
+        self,
+        model: str | None,
+        messages: list[Message],
+        response_model: type[BaseModel] | None,
+        max_tokens: int,
+        model_size: ModelSize,
+    ) -> str:
+        key = json.dumps(
+            {
+                'namespace': self.namespace,
+                'model': model,
+                'model_size': model_size.value,
+                'max_tokens': max_tokens,
+                'response_model': response_model.model_json_schema()
+                if response_model is not None
+                else None,
+                'messages': [m.model_dump() for m in messages],
+            },
+            sort_keys=True,
+        )
+        return hashlib.sha256(key.encode()).hexdigest()
+
+    async def get(self, key: str) -> dict[str, typing.Any] | None:
+        response = await self._get(key)
+        if response is None:
+            self.stats.misses += 1
+        else:
+            self.stats.hits += 1
+            logger.debug(f'Cache hit for {key}')
+
+        return response
+
+    async def set(self, key: str, response: dict[str, typing.Any]):
+        await self._set(key, response)
+
+    @abstractmethod
+    async def _get(self, key: str) -> dict[str, typing.Any] | None:
+        pass
+
+    @abstractmethod
+    async def _set(self, key: str, response: dict[str, typing.Any]):
+        pass
+
+
+class InMemoryLLMCache(LLMCache):
+    """LLM cache held in process memory, evicting the least recently used entry past max_entries."""
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_CACHE_MAX_ENTRIES,
+        ttl: float | None = None,
+        namespace: str = DEFAULT_CACHE_NAMESPACE,
+    ):
+        super().__init__(ttl, namespace)
+        self.max_entries = max_entries
+        self.entries: OrderedDict[str, tuple[float | None, dict[str, typing.Any]]] = OrderedDict()
+
+    async def _get(self, key: str) -> dict[str, typing.Any] | None:
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+
+        expires_at, response = entry
+        if expires_at is not None and expires_at <= monotonic():
+            del self.entries[key]
+            return None
+
+        self.entries.move_to_end(key)
+        # Copies keep callers that modify a response from changing the cached entry
+        return copy.deepcopy(response)
+
+    async def _set(self, key: str, response: dict[str, typing.Any]):
+        expires_at = monotonic() + self.ttl if self.ttl is not None else None
+        self.entries[key] = (expires_at, copy.deepcopy(response))
+        self.entries.move_to_end(key)
+
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+
+class DiskLLMCache(LLMCache):
+    """
+    LLM cache persisted with diskcache, so responses survive restarts.
+
+    The cache is bounded to size_limit bytes and evicts the least recently used entries. Disk
+    access runs in a worker thread to keep it off the event loop.
+    """
+
+    def __init__(
+        self,
+        directory: str = DEFAULT_CACHE_DIR,
+        size_limit: int = DEFAULT_CACHE_SIZE_LIMIT,
+        ttl: float | None = None,
+        namespace: str = DEFAULT_CACHE_NAMESPACE,
+    ):
+        super().__init__(ttl, namespace)
+        self.cache = Cache(directory, size_limit=size_limit, eviction_policy='least-recently-used')
+
+    async def _get(self, key: str) -> dict[str, typing.Any] | None:
+        response = await asyncio.to_thread(self.cache.get, key)
+        return response if isinstance(response, dict) else None
+
+    async def _set(self, key: str, response: dict[str, typing.Any]):
+        await asyncio.to_thread(self.cache.set, key, response, expire=self.ttl)
+
+    def close(self):
+        self.cache.close()
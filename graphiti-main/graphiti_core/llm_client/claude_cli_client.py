@@ -9,9 +9,12 @@ to work with Graphiti's expected format.
 """
 
 import json
+import logging
+import re
 import subprocess
 import asyncio
-from typing import Any, Optional
+from time import monotonic
+from typing import Any
 from pathlib import Path
 
 from pydantic import BaseModel
@@ -21,6 +24,201 @@ from .client import LLMClient
 from .config import LLMConfig, ModelSize
 from .errors import EmptyResponseError, RefusalError
 
+logger = logging.getLogger(__name__)
+
+DEFAULT_HEALTH_CHECK_INTERVAL = 30.0
+DEFAULT_REQUEST_TIMEOUT = 300.0
+STREAM_LIMIT = 2**24
+
+
+class ClaudeCLIWorker:
+    """
+    A Claude CLI process speaking the stream-json protocol, started ahead of its request.
+
+    The request is written to stdin as one JSON user message and answered with a "result" event
+    on stdout. A stream-json session keeps its conversation, so a worker serves a single request
+    and stdin is closed after it, which makes the process exit once it has answered.
+    """
+
+    def __init__(self, command: list[str]):
+        self.command = command
+        self.process: asyncio.subprocess.Process | None = None
+        self.last_latency: float | None = None
+
+    async def start(self):
+        self.process = await asyncio.create_subprocess_exec(
+            *self.command,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL,
+            limit=STREAM_LIMIT,
+        )
+
+    def is_healthy(self) -> bool:
+        return self.process is not None and self.process.returncode is None
+
+    async def submit(self, prompt: str) -> str:
+        if not self.is_healthy():
+            raise RuntimeError("Claude CLI worker is not running")
+        assert self.process is not None
+        assert self.process.stdin is not None and self.process.stdout is not None
+
+        message = {
+            "type": "user",
+            "message": {"role": "user", "content": [{"type": "text", "text": prompt}]},
+        }
+        start = monotonic()
+        self.process.stdin.write((json.dumps(message) + "\n").encode())
+        await self.process.stdin.drain()
+        self.process.stdin.close()
+
+        async for line in self.process.stdout:
+            try:
+                event = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if not isinstance(event, dict) or event.get("type") != "result":
+                continue
+
+            self.last_latency = monotonic() - start
+            if event.get("is_error"):
+                raise RuntimeError(f"Claude CLI error: {event.get('result')}")
+            return event.get("result") or ""
+
+        raise RuntimeError("Claude CLI worker exited")
+
+    async def close(self):
+        if self.process is not None and self.process.returncode is None:
+            if self.process.stdin is not None and not self.process.stdin.is_closing():
+                self.process.stdin.close()
+            try:
+                await asyncio.wait_for(self.process.wait(), timeout=5)
+            except asyncio.TimeoutError:
+                self.process.kill()
+                await self.process.wait()
+
+
+class ClaudeCLIPool:
+    """
+    Keeps pool_size Claude CLI processes started ahead of the requests.
+
+    Each process answers one request, so prompts never see each other's conversation. When a
+    request takes a process, a replacement is started in the background, so the next request
+    doesn't wait for the CLI to start. At most pool_size requests run at once; further callers
+    wait. A periodic health check drops processes that exited and tops the pool back up.
+    """
+
+    def __init__(
+        self,
+        command: list[str],
+        pool_size: int,
+        health_check_interval: float | None = DEFAULT_HEALTH_CHECK_INTERVAL,
+    ):
+        self.command = command
+        self.pool_size = pool_size
+        self.health_check_interval = health_check_interval
+        self.idle: list[ClaudeCLIWorker] = []
+        self.starting = 0
+        self.in_use = 0
+        self.tasks: set[asyncio.Task] = set()
+        self.available = asyncio.Condition()
+        self.health_task: asyncio.Task | None = None
+        self.spawned = 0
+        self.last_latency: float | None = None
+
+    async def start(self):
+        workers = [ClaudeCLIWorker(self.command) for _ in range(self.pool_size)]
+        await asyncio.gather(*[worker.start() for worker in workers])
+        self.idle = workers
+        self.spawned += len(workers)
+        if self.health_check_interval is not None:
+            self.health_task = asyncio.create_task(self._health_check_loop())
+
+    async def submit(self, prompt: str) -> str:
+        async with self.available:
+            await self.available.wait_for(
+                lambda: self.in_use < self.pool_size and self._has_idle_worker()
+            )
+            worker = self.idle.pop()
+            self.in_use += 1
+            self.starting += 1
+
+        # The replacement starts outside the lock, so other requests aren't held up by it
+        self._run_in_background(self._spawn())
+        try:
+            response = await worker.submit(prompt)
+            self.last_latency = worker.last_latency
+            return response
+        finally:
+            self._run_in_background(worker.close())
+            async with self.available:
+                self.in_use -= 1
+                self.available.notify_all()
+
+    def _has_idle_worker(self) -> bool:
+        # Workers that exited while idle are dropped here and replaced by the health check
+        self.idle = [worker for worker in self.idle if worker.is_healthy()]
+        return len(self.idle) > 0
+
+    async def health_check(self):
+        async with self.available:
+            self._has_idle_worker()
+            missing = self.pool_size - len(self.idle) - self.starting
+            if missing > 0:
+                logger.warning(f"Starting {missing} Claude CLI workers to refill the pool")
+            self.starting += max(missing, 0)
+
+        for _ in range(missing):
+            self._run_in_background(self._spawn())
+
+    async def _spawn(self):
+        worker = ClaudeCLIWorker(self.command)
+        try:
+            await worker.start()
+        except Exception as e:
+            logger.error(f"Failed to start Claude CLI worker: {e}")
+            async with self.available:
+                self.starting -= 1
+            return
+
+        async with self.available:
+            self.starting -= 1
+            self.idle.append(worker)
+            self.spawned += 1
+            self.available.notify_all()
+
+    def _run_in_background(self, coroutine):
+        task = asyncio.create_task(coroutine)
+        self.tasks.add(task)
+        task.add_done_callback(self.tasks.discard)
+
+    async def _health_check_loop(self):
+        assert self.health_check_interval is not None
+        while True:
+            await asyncio.sleep(self.health_check_interval)
+            try:
+                await self.health_check()
+            except Exception as e:
+                logger.error(f"Claude CLI pool health check failed: {e}")
+
+    def get_stats(self) -> dict[str, Any]:
+        return {
+            "pool_size": self.pool_size,
+            "idle": len(self.idle),
+            "starting": self.starting,
+            "in_use": self.in_use,
+            "spawned": self.spawned,
+            "last_latency": self.last_latency,
+        }
+
+    async def close(self):
+        if self.health_task is not None:
+            self.health_task.cancel()
+            await asyncio.gather(self.health_task, return_exceptions=True)
+        await asyncio.gather(*self.tasks, return_exceptions=True)
+        await asyncio.gather(*[worker.close() for worker in self.idle])
+        self.idle = []
+
 
 class ClaudeCLIClient(LLMClient):
     """
@@ -30,16 +228,30 @@ class ClaudeCLIClient(LLMClient):
     your existing Claude Code CLI installation.
     """
     
-    def __init__(self, config: LLMConfig, claude_command: str = "claude"):
+    def __init__(
+        self,
+        config: LLMConfig,
+        claude_command: str = "claude",
+        pool_size: int = 0,
+        request_timeout: float = DEFAULT_REQUEST_TIMEOUT,
+    ):
         """
         Initialize the Claude CLI client.
         
         Args:
             config: LLM configuration
             claude_command: Path to claude executable (default: "claude")
+            pool_size: Number of Claude CLI processes kept started ahead of the calls, per model.
+                Each process answers one call. With the default of 0 a process is started when
+                the call is made.
+            request_timeout: Seconds to wait for a pooled process to answer
         """
         super().__init__(config)
         self.claude_command = claude_command
+        self.pool_size = pool_size
+        self.request_timeout = request_timeout
+        self.pools: dict[str | None, ClaudeCLIPool] = {}
+        self.pool_lock = asyncio.Lock()
         
         # Test if Claude is available
         try:
@@ -52,7 +264,7 @@ class ClaudeCLIClient(LLMClient):
                 raise RuntimeError(f"Claude CLI not found at: {self.claude_command}")
             print(f"✅ Claude CLI found: {result.stdout.strip()}")
         except Exception as e:
-            raise RuntimeError(f"Failed to initialize Claude CLI: {e}")
+            raise RuntimeError(f"Failed to initialize Claude CLI: {e}") from e
     
     async def _generate_response(
         self,
@@ -76,18 +288,35 @@ class ClaudeCLIClient(LLMClient):
             schema = response_model.model_json_schema()
             prompt += f"\n\nIMPORTANT: You must respond with valid JSON that matches this schema:\n{json.dumps(schema, indent=2)}\n\nRespond ONLY with the JSON object, no additional text."
         
+        # Add model selection if specified
+        model = None
+        if model_size == ModelSize.small and self.config.small_model:
+            model = self.config.small_model
+        elif self.config.model:
+            model = self.config.model
+
+        if self.pool_size > 0:
+            pool = await self._get_pool(model)
+            try:
+                response_text = await asyncio.wait_for(
+                    pool.submit(prompt), timeout=self.request_timeout
+                )
+            except asyncio.TimeoutError as e:
+                raise TimeoutError("Claude CLI timed out") from e
+
+            response_text = response_text.strip()
+            if not response_text:
+                raise EmptyResponseError("Claude returned empty response")
+            return self._parse_response(response_text, response_model)
+
         # Prepare Claude CLI command
         cmd = [
             self.claude_command,
             "--max-tokens", str(max_tokens),
             "--temperature", str(self.config.temperature),
         ]
-        
-        # Add model selection if specified
-        if model_size == ModelSize.small and self.config.small_model:
-            cmd.extend(["--model", self.config.small_model])
-        elif self.config.model:
-            cmd.extend(["--model", self.config.model])
+        if model:
+            cmd.extend(["--model", model])
         
         try:
             # Execute Claude CLI asynchronously
@@ -110,38 +339,68 @@ class ClaudeCLIClient(LLMClient):
             if not response_text:
                 raise EmptyResponseError("Claude returned empty response")
             
-            # Parse response based on expected format
-            if response_model:
-                # Extract JSON from response
-                try:
-                    # Try to parse the entire response as JSON first
-                    response_json = json.loads(response_text)
-                except json.JSONDecodeError:
-                    # Try to extract JSON from markdown code blocks
-                    import re
-                    json_match = re.search(r'```(?:json)?\s*([\s\S]*?)\s*```', response_text)
-                    if json_match:
-                        response_json = json.loads(json_match.group(1))
-                    else:
-                        # Try to find JSON object in the text
-                        json_match = re.search(r'\{[\s\S]*\}', response_text)
-                        if json_match:
-                            response_json = json.loads(json_match.group(0))
-                        else:
-                            raise ValueError(f"Could not extract JSON from response: {response_text[:200]}")
-                
-                # Validate against model
-                validated = response_model.model_validate(response_json)
-                return validated.model_dump()
-            else:
-                # Return as text response
-                return {"content": response_text}
+            return self._parse_response(response_text, response_model)
                 
-        except asyncio.TimeoutError:
-            raise TimeoutError("Claude CLI timed out")
+        except asyncio.TimeoutError as e:
+            raise TimeoutError("Claude CLI timed out") from e
         except Exception as e:
             print(f"Error calling Claude CLI: {e}")
             raise
+
+    def _parse_response(
+        self, response_text: str, response_model: type[BaseModel] | None
+    ) -> dict[str, Any]:
+        """Parse the Claude CLI output based on the expected format."""
+        if response_model:
+            # Extract JSON from response
+            try:
+                # Try to parse the entire response as JSON first
+                response_json = json.loads(response_text)
+            except json.JSONDecodeError:
+                # Try to extract JSON from markdown code blocks
+                json_match = re.search(r'```(?:json)?\s*([\s\S]*?)\s*```', response_text)
+                if json_match:
+                    response_json = json.loads(json_match.group(1))
+                else:
+                    # Try to find JSON object in the text
+                    json_match = re.search(r'\{[\s\S]*\}', response_text)
+                    if json_match:
+                        response_json = json.loads(json_match.group(0))
+                    else:
+                        raise ValueError(f"Could not extract JSON from response: {response_text[:200]}")
+            
+            # Validate against model
+            validated = response_model.model_validate(response_json)
+            return validated.model_dump()
+        else:
+            # Return as text response
+            return {"content": response_text}
+
+    async def _get_pool(self, model: str | None) -> ClaudeCLIPool:
+        """Get the process pool for a model, starting it on first use."""
+        async with self.pool_lock:
+            pool = self.pools.get(model)
+            if pool is None:
+                cmd = [
+                    self.claude_command,
+                    "--print",
+                    "--input-format", "stream-json",
+                    "--output-format", "stream-json",
+                    "--verbose",
+                ]
+                if model:
+                    cmd.extend(["--model", model])
+
+                pool = ClaudeCLIPool(cmd, self.pool_size)
+                await pool.start()
+                self.pools[model] = pool
+
+            return pool
+
+    async def close(self):
+        """Stop the pooled Claude CLI processes."""
+        await asyncio.gather(*[pool.close() for pool in self.pools.values()])
+        self.pools = {}
     
     def _format_messages_to_prompt(self, messages: list[Message]) -> str:
         """Format messages into a prompt string for Claude CLI."""
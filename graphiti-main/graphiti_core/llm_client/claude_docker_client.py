@@ -5,28 +5,231 @@ This integrates Claude Docker as a first-class LLM provider within Graphiti
 
 import asyncio
 import json
+import logging
 import subprocess
 import sys
-from typing import List, Dict, Any, Optional
+from time import monotonic
+from typing import Any
 from datetime import datetime
 
 from .client import LLMClient
 from .config import LLMConfig
 from ..prompts.models import Message
 
+logger = logging.getLogger(__name__)
+
+CLAUDE_DOCKER_IMAGE = "claude-docker:latest"
+DEFAULT_MAX_REQUESTS_PER_CONTAINER = 100
+MAX_CONTAINER_RESTART_DELAY = 30.0
+DEFAULT_CONTAINER_WAIT_TIMEOUT = 300.0
+
+
+class ClaudeDockerContainer:
+    """A long-lived container that Claude requests are executed in with docker exec"""
+
+    def __init__(self, container_id: str):
+        self.container_id = container_id
+        self.requests = 0
+        self.total_latency = 0.0
+        self.last_latency: float | None = None
+
+    def record(self, latency: float):
+        self.requests += 1
+        self.total_latency += latency
+        self.last_latency = latency
+
+    def get_stats(self) -> dict[str, Any]:
+        return {
+            "container_id": self.container_id,
+            "requests": self.requests,
+            "last_latency": self.last_latency,
+            "mean_latency": self.total_latency / self.requests if self.requests else None,
+        }
+
+
+class ClaudeDockerContainerPool:
+    """
+    Keeps pool_size Claude Docker containers running and executes requests in idle ones.
+
+    Each container runs one request at a time. A container is replaced after
+    max_requests_per_container requests, or as soon as a request in it fails. A request that
+    finds no idle container within wait_timeout seconds fails with a TimeoutError, so callers
+    don't hang while replacement containers fail to start.
+    """
+
+    def __init__(
+        self,
+        run_args: list[str],
+        pool_size: int,
+        max_requests_per_container: int = DEFAULT_MAX_REQUESTS_PER_CONTAINER,
+        image: str = CLAUDE_DOCKER_IMAGE,
+        docker_command: str = "docker",
+        wait_timeout: float = DEFAULT_CONTAINER_WAIT_TIMEOUT,
+    ):
+        self.run_args = run_args
+        self.pool_size = pool_size
+        self.max_requests_per_container = max_requests_per_container
+        self.image = image
+        self.docker_command = docker_command
+        self.wait_timeout = wait_timeout
+        self.containers: dict[str, ClaudeDockerContainer] = {}
+        self.idle: asyncio.Queue[ClaudeDockerContainer] = asyncio.Queue()
+        self.replacements: set[asyncio.Task] = set()
+        self.recycled = 0
+
+    async def start(self):
+        results = await asyncio.gather(
+            *[self._start_container() for _ in range(self.pool_size)], return_exceptions=True
+        )
+        errors = [result for result in results if isinstance(result, BaseException)]
+        if errors:
+            # Don't leave the containers that did start running
+            await asyncio.gather(
+                *[self._remove_container(container_id) for container_id in list(self.containers)]
+            )
+            self.containers = {}
+            raise errors[0]
+
+        for container in results:
+            self.idle.put_nowait(container)
+
+    async def execute(self, args: list[str], input_data: bytes) -> tuple[int, bytes, bytes]:
+        """Run a command in an idle container and return its exit code, stdout and stderr."""
+        try:
+            container = await asyncio.wait_for(self.idle.get(), timeout=self.wait_timeout)
+        except asyncio.TimeoutError as e:
+            raise TimeoutError(
+                f"No Claude Docker container became available within {self.wait_timeout}s"
+            ) from e
+        start = monotonic()
+        failed = True
+        try:
+            process = await asyncio.create_subprocess_exec(
+                self.docker_command, "exec", "-i", container.container_id, *args,
+                stdin=asyncio.subprocess.PIPE,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE
+            )
+            stdout, stderr = await process.communicate(input=input_data)
+            failed = process.returncode != 0
+            return process.returncode or 0, stdout, stderr
+        finally:
+            container.record(monotonic() - start)
+            if failed or container.requests >= self.max_requests_per_container:
+                self._recycle(container)
+            else:
+                self.idle.put_nowait(container)
+
+    def _recycle(self, container: ClaudeDockerContainer):
+        self.containers.pop(container.container_id, None)
+        self.recycled += 1
+        task = asyncio.create_task(self._replace(container))
+        self.replacements.add(task)
+        task.add_done_callback(self.replacements.discard)
+
+    async def _replace(self, container: ClaudeDockerContainer):
+        await self._remove_container(container.container_id)
+
+        delay = 1.0
+        while True:
+            try:
+                self.idle.put_nowait(await self._start_container())
+                return
+            except Exception as e:
+                logger.error(f"Failed to start Claude Docker container, retrying in {delay}s: {e}")
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, MAX_CONTAINER_RESTART_DELAY)
+
+    async def _start_container(self) -> ClaudeDockerContainer:
+        process = await asyncio.create_subprocess_exec(
+            self.docker_command, "run", "-d", "--rm", *self.run_args,
+            self.image, "sleep", "infinity",
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE
+        )
+        stdout, stderr = await process.communicate()
+        if process.returncode != 0:
+            raise RuntimeError(f"docker run failed: {stderr.decode().strip()}")
+
+        container = ClaudeDockerContainer(stdout.decode().strip())
+        self.containers[container.container_id] = container
+        return container
+
+    async def _remove_container(self, container_id: str):
+        process = await asyncio.create_subprocess_exec(
+            self.docker_command, "rm", "-f", container_id,
+            stdout=asyncio.subprocess.DEVNULL,
+            stderr=asyncio.subprocess.DEVNULL
+        )
+        await process.wait()
+
+    def get_stats(self) -> dict[str, Any]:
+        return {
+            "pool_size": self.pool_size,
+            "idle": self.idle.qsize(),
+            "recycled": self.recycled,
+            "containers": [container.get_stats() for container in self.containers.values()],
+        }
+
+    async def close(self):
+        for task in list(self.replacements):
+            task.cancel()
+        await asyncio.gather(*self.replacements, return_exceptions=True)
+        await asyncio.gather(
+            *[self._remove_container(container_id) for container_id in list(self.containers)]
+        )
+        self.containers = {}
+
 
 class ClaudeDockerClient(LLMClient):
     """
     Native Claude Docker integration for Graphiti.
     Runs Claude locally via Docker containers instead of calling external APIs.
+
+    By default every call runs in a fresh `docker run --rm` container. With pool_size > 0 the
+    client keeps that many containers running and executes calls in them with docker exec.
     """
     
-    def __init__(self, config: LLMConfig):
+    def __init__(
+        self,
+        config: LLMConfig,
+        pool_size: int = 0,
+        max_requests_per_container: int = DEFAULT_MAX_REQUESTS_PER_CONTAINER,
+    ):
         super().__init__(config)
         self.claude_docker_path = "/workspace/claude_docker_runner.sh"
         self.worker_id = f"graphiti-worker-{datetime.now().strftime('%Y%m%d%H%M%S')}"
+        self.docker_run_args = [
+            "-v", "/Users/farieds/.claude-docker/claude-home:/home/claude-user/.claude:rw",
+            "-v", "/Users/farieds/.claude-docker/credentials:/home/claude-user/.config/claude:rw",
+            "-e", f"WORKER_ID={self.worker_id}",
+        ]
+        self.pool_size = pool_size
+        self.max_requests_per_container = max_requests_per_container
+        self.container_pool: ClaudeDockerContainerPool | None = None
+        self.pool_lock = asyncio.Lock()
+
+    async def _get_container_pool(self) -> ClaudeDockerContainerPool:
+        """Get the warm container pool, starting it on first use."""
+        async with self.pool_lock:
+            if self.container_pool is None:
+                container_pool = ClaudeDockerContainerPool(
+                    self.docker_run_args,
+                    self.pool_size,
+                    max_requests_per_container=self.max_requests_per_container,
+                )
+                await container_pool.start()
+                self.container_pool = container_pool
+
+            return self.container_pool
+
+    async def close(self):
+        """Stop the warm containers."""
+        if self.container_pool is not None:
+            await self.container_pool.close()
+            self.container_pool = None
         
-    async def _execute_claude_docker(self, messages: List[Dict[str, Any]], tools: Optional[List[Dict]] = None) -> Dict[str, Any]:
+    async def _execute_claude_docker(self, messages: list[dict[str, Any]], tools: list[dict] | None = None) -> dict[str, Any]:
         """Execute Claude Docker with proper message formatting"""
         
         # Build the prompt in Claude's expected format
@@ -50,38 +253,43 @@ class ClaudeDockerClient(LLMClient):
         
         full_prompt = "\n".join(prompt_lines)
         
-        # Execute via subprocess with proper volumes
-        cmd = [
-            "docker", "run", "--rm", "-i",
-            "-v", "/Users/farieds/.claude-docker/claude-home:/home/claude-user/.claude:rw",
-            "-v", "/Users/farieds/.claude-docker/credentials:/home/claude-user/.config/claude:rw",
-            "-e", f"WORKER_ID={self.worker_id}",
-            "claude-docker:latest",
+        claude_args = [
             "claude", "--print",
             "--model", "sonnet"  # Use model alias for Claude Docker
         ]
         
         if tools:
             # Add tool definitions to the command
-            cmd.extend(["--tools", json.dumps(tools)])
+            claude_args.extend(["--tools", json.dumps(tools)])
+
+        # Execute via subprocess with proper volumes
+        cmd = ["docker", "run", "--rm", "-i", *self.docker_run_args, CLAUDE_DOCKER_IMAGE, *claude_args]
         
         try:
-            # Run Claude Docker
-            process = await asyncio.create_subprocess_exec(
-                *cmd,
-                stdin=asyncio.subprocess.PIPE,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE
-            )
-            
-            stdout, stderr = await process.communicate(input=full_prompt.encode())
+            if self.pool_size > 0:
+                # Run Claude in a warm container
+                container_pool = await self._get_container_pool()
+                returncode, stdout, stderr = await container_pool.execute(
+                    claude_args, full_prompt.encode()
+                )
+            else:
+                # Run Claude Docker
+                process = await asyncio.create_subprocess_exec(
+                    *cmd,
+                    stdin=asyncio.subprocess.PIPE,
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.PIPE
+                )
+
+                stdout, stderr = await process.communicate(input=full_prompt.encode())
+                returncode = process.returncode
             
-            if process.returncode != 0:
+            if returncode != 0:
                 print(f"Command failed: {' '.join(cmd)}")
-                print(f"Return code: {process.returncode}")
+                print(f"Return code: {returncode}")
                 print(f"Stdout: {stdout.decode()}")
                 print(f"Stderr: {stderr.decode()}")
-                raise RuntimeError(f"Claude Docker failed with return code {process.returncode}")
+                raise RuntimeError(f"Claude Docker failed with return code {returncode}")
             
             # Parse response
             response_text = stdout.decode().strip()
@@ -98,7 +306,7 @@ class ClaudeDockerClient(LLMClient):
         except Exception as e:
             raise RuntimeError(f"Claude Docker execution failed: {str(e)}")
     
-    async def _generate_response(self, messages: List[Message], **kwargs) -> str:
+    async def _generate_response(self, messages: list[Message], **kwargs) -> str:
         """Generate a response using Claude Docker"""
         
         # Convert Message objects to dicts
@@ -116,8 +324,8 @@ class ClaudeDockerClient(LLMClient):
         return str(response)
     
     async def _generate_response_with_tools(
-        self, messages: List[Message], tools: List[Dict[str, Any]], **kwargs
-    ) -> Dict[str, Any]:
+        self, messages: list[Message], tools: list[dict[str, Any]], **kwargs
+    ) -> dict[str, Any]:
         """Generate a response with tool use for structured output"""
         
         # Convert messages
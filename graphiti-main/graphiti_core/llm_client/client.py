@@ -14,23 +14,21 @@ See the License for the specific language governing permissions and
 limitations under the License.
 """
 
-import hashlib
 import json
 import logging
 import typing
 from abc import ABC, abstractmethod
 
 import httpx
-from diskcache import Cache
 from pydantic import BaseModel
 from tenacity import retry, retry_if_exception, stop_after_attempt, wait_random_exponential
 
 from ..prompts.models import Message
+from .cache import DEFAULT_CACHE_DIR, DiskLLMCache, LLMCache
 from .config import DEFAULT_MAX_TOKENS, LLMConfig, ModelSize
 from .errors import RateLimitError
 
 DEFAULT_TEMPERATURE = 0
-DEFAULT_CACHE_DIR = './llm_cache'
 
 MULTILINGUAL_EXTRACTION_RESPONSES = (
     '\n\nAny extracted information should be returned in the same language as it was written in.'
@@ -49,7 +47,9 @@ def is_server_or_retry_error(exception):
 
 
 class LLMClient(ABC):
-    def __init__(self, config: LLMConfig | None, cache: bool = False):
+    def __init__(
+        self, config: LLMConfig | None, cache: bool = False, llm_cache: LLMCache | None = None
+    ):
         if config is None:
             config = LLMConfig()
 
@@ -58,12 +58,12 @@ class LLMClient(ABC):
         self.small_model = config.small_model
         self.temperature = config.temperature
         self.max_tokens = config.max_tokens
-        self.cache_enabled = cache
-        self.cache_dir = None
+        self.cache_enabled = cache or llm_cache is not None
+        self.llm_cache = llm_cache
 
-        # Only create the cache directory if caching is enabled
-        if self.cache_enabled:
-            self.cache_dir = Cache(DEFAULT_CACHE_DIR)
+        # Only create the cache directory if caching is enabled without a cache being provided
+        if self.cache_enabled and self.llm_cache is None:
+            self.llm_cache = DiskLLMCache(DEFAULT_CACHE_DIR)
 
     def _clean_input(self, input: str) -> str:
         """Clean input string of invalid unicode and control characters.
@@ -120,12 +120,6 @@ class LLMClient(ABC):
     ) -> dict[str, typing.Any]:
         pass
 
-    def _get_cache_key(self, messages: list[Message]) -> str:
-        # Create a unique cache key based on the messages and model
-        message_str = json.dumps([m.model_dump() for m in messages], sort_keys=True)
-        key_str = f'{self.model}:{message_str}'
-        return hashlib.md5(key_str.encode()).hexdigest()
-
     async def generate_response(
         self,
         messages: list[Message],
@@ -136,6 +130,17 @@ class LLMClient(ABC):
         if max_tokens is None:
             max_tokens = self.max_tokens
 
+        # The key is taken from the request as given, before the prompt is extended below
+        cache_key: str | None = None
+        if self.llm_cache is not None:
+            cache_key = self.llm_cache.get_key(
+                self.model, messages, response_model, max_tokens, model_size
+            )
+
+            cached_response = await self.llm_cache.get(cache_key)
+            if cached_response is not None:
+                return cached_response
+
         if response_model is not None:
             serialized_model = json.dumps(response_model.model_json_schema())
             messages[
@@ -147,14 +152,6 @@ class LLMClient(ABC):
         # Add multilingual extraction instructions
         messages[0].content += MULTILINGUAL_EXTRACTION_RESPONSES
 
-        if self.cache_enabled and self.cache_dir is not None:
-            cache_key = self._get_cache_key(messages)
-
-            cached_response = self.cache_dir.get(cache_key)
-            if cached_response is not None:
-                logger.debug(f'Cache hit for {cache_key}')
-                return cached_response
-
         for message in messages:
             message.content = self._clean_input(message.content)
 
@@ -162,9 +159,8 @@ class LLMClient(ABC):
             messages, response_model, max_tokens, model_size
         )
 
-        if self.cache_enabled and self.cache_dir is not None:
-            cache_key = self._get_cache_key(messages)
-            self.cache_dir.set(cache_key, response)
+        if self.llm_cache is not None and cache_key is not None:
+            await self.llm_cache.set(cache_key, response)
 
         return response
 
@@ -34,6 +34,7 @@ from graphiti_core.models.nodes.node_db_queries import (
     ENTITY_NODE_SAVE,
     EPISODIC_NODE_SAVE,
 )
+from graphiti_core.search.vector_store import vector_store
 from graphiti_core.utils.datetime_utils import utc_now
 
 logger = logging.getLogger(__name__)
@@ -104,6 +105,11 @@ class Node(BaseModel, ABC):
         """,
             uuid=self.uuid,
         )
+        vector_store.invalidate([self.uuid])
+        if driver.ann_index is not None:
+            driver.ann_index.remove([self.uuid])
+        if driver.search_cache is not None:
+            driver.search_cache.bump([self.group_id])
 
         logger.debug(f'Deleted Node: {self.uuid}')
 
@@ -126,6 +132,11 @@ class Node(BaseModel, ABC):
         """,
             group_id=group_id,
         )
+        vector_store.clear()
+        if driver.ann_index is not None:
+            driver.ann_index.remove_groups([group_id])
+        if driver.search_cache is not None:
+            driver.search_cache.bump([group_id])
 
         return 'SUCCESS'
 
@@ -161,6 +172,8 @@ class EpisodicNode(Node):
             valid_at=self.valid_at,
             source=self.source.value,
         )
+        if driver.search_cache is not None:
+            driver.search_cache.bump([self.group_id])
 
         logger.debug(f'Saved Node to Graph: {self.uuid}')
 
@@ -326,6 +339,11 @@ class EntityNode(Node):
             labels=self.labels + ['Entity'],
             entity_data=entity_data,
         )
+        vector_store.invalidate([self.uuid])
+        if driver.ann_index is not None:
+            driver.ann_index.entities.upsert([(self.uuid, self.group_id, self.name_embedding)])
+        if driver.search_cache is not None:
+            driver.search_cache.bump([self.group_id])
 
         logger.debug(f'Saved Node to Graph: {self.uuid}')
 
@@ -413,6 +431,11 @@ class CommunityNode(Node):
             name_embedding=self.name_embedding,
             created_at=self.created_at,
         )
+        vector_store.invalidate([self.uuid])
+        if driver.ann_index is not None:
+            driver.ann_index.communities.upsert([(self.uuid, self.group_id, self.name_embedding)])
+        if driver.search_cache is not None:
+            driver.search_cache.bump([self.group_id])
 
         logger.debug(f'Saved Node to Graph: {self.uuid}')
 
@@ -542,7 +565,7 @@ def get_episodic_node_from_record(record: Any) -> EpisodicNode:
     )
 
 
-def get_entity_node_from_record(record: Any) -> EntityNode:
+def get_entity_node_from_record(record: Any, include_embedding: bool = False) -> EntityNode:
     entity_node = EntityNode(
         uuid=record['uuid'],
         name=record['name'],
@@ -556,7 +579,10 @@ def get_entity_node_from_record(record: Any) -> EntityNode:
     entity_node.attributes.pop('uuid', None)
     entity_node.attributes.pop('name', None)
     entity_node.attributes.pop('group_id', None)
-    entity_node.attributes.pop('name_embedding', None)
+    # properties(n) carries the embedding; it is only kept when a reranker will use it
+    name_embedding = entity_node.attributes.pop('name_embedding', None)
+    if include_embedding:
+        entity_node.name_embedding = name_embedding
     entity_node.attributes.pop('summary', None)
     entity_node.attributes.pop('created_at', None)
 
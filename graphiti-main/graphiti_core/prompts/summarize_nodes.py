@@ -54,7 +54,7 @@ def summarize_pair(context: dict[str, Any]) -> list[Message]:
         Message(
             role='user',
             content=f"""
-        Synthesize the information from the following two summaries into a single succinct summary.
+        Synthesize the information from the following {len(context['node_summaries'])} summaries into a single succinct summary.
         
         Summaries must be under 250 words.
 
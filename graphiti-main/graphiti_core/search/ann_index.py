@@ -0,0 +1,420 @@
+"""
+Copyright 2024, Zep Software, Inc.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import hashlib
+import logging
+import os
+from collections.abc import Iterable
+from typing import TYPE_CHECKING
+
+import numpy as np
+from numpy.typing import ArrayLike, NDArray
+from typing_extensions import LiteralString
+
+if TYPE_CHECKING:
+    from graphiti_core.driver.driver import GraphDriver
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_N_PROBE = 8
+DEFAULT_MIN_TRAIN_SIZE = 4096
+KMEANS_ITERATIONS = 10
+# Centroids are trained on at most this many vectors per list
+KMEANS_SAMPLES_PER_LIST = 64
+# A partition is retrained once it has grown this many times past the size it was trained at
+RETRAIN_GROWTH = 4
+
+AnnEntry = tuple[str, str, list[float] | None]
+
+
+def _normalize(vectors: ArrayLike) -> NDArray[np.float32]:
+    array = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(array, axis=-1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return array / norms
+
+
+class _IvfPartition:
+    """
+    Inverted-file index over the vectors of one group.
+
+    Below min_train_size the partition is searched exhaustively. Once it is large enough, the
+    vectors are clustered with spherical k-means into about sqrt(n) lists, and a query only scores
+    the vectors of the n_probe lists whose centroids are closest to it.
+    """
+
+    def __init__(self, group_id: str, dim: int):
+        self.group_id = group_id
+        self.dim = dim
+        self.uuids: list[str] = []
+        self.positions: dict[str, int] = {}
+        self.vectors: NDArray[np.float32] = np.empty((0, dim), dtype=np.float32)
+        self.alive: NDArray[np.bool_] = np.empty(0, dtype=bool)
+        self.centroids: NDArray[np.float32] | None = None
+        self.lists: list[list[int]] = []
+        self.trained_size = 0
+
+    def __len__(self) -> int:
+        return len(self.positions)
+
+    def upsert(self, uuid: str, vector: NDArray[np.float32]):
+        if vector.shape != (self.dim,):
+            raise ValueError(
+                f'Embedding for {uuid} has dimension {vector.shape[-1]}, index has {self.dim}'
+            )
+
+        self.remove(uuid)
+        position = len(self.uuids)
+        if position == len(self.vectors):
+            capacity = max(2 * position, 64)
+            vectors = np.zeros((capacity, self.dim), dtype=np.float32)
+            vectors[:position] = self.vectors[:position]
+            alive = np.zeros(capacity, dtype=bool)
+            alive[:position] = self.alive[:position]
+            self.vectors, self.alive = vectors, alive
+
+        self.uuids.append(uuid)
+        self.positions[uuid] = position
+        self.vectors[position] = vector
+        self.alive[position] = True
+        if self.centroids is not None:
+            self.lists[int(np.argmax(self.centroids @ vector))].append(position)
+
+    def remove(self, uuid: str):
+        position = self.positions.pop(uuid, None)
+        if position is not None:
+            self.alive[position] = False
+
+    def maybe_train(self, min_train_size: int):
+        size = len(self)
+        if size < min_train_size or (
+            self.centroids is not None and size < RETRAIN_GROWTH * self.trained_size
+        ):
+            # Removed vectors are only dropped from the arrays once they are the majority
+            if len(self.uuids) > 2 * size:
+                self._compact()
+                self._rebuild_lists()
+            return
+
+        self._compact()
+        self._train()
+
+    def search(self, query: NDArray[np.float32], n_probe: int) -> tuple[NDArray, NDArray]:
+        if self.centroids is None:
+            candidates = np.flatnonzero(self.alive[: len(self.uuids)])
+        else:
+            n_probe = min(n_probe, len(self.centroids))
+            probes = np.argpartition(-(self.centroids @ query), n_probe - 1)[:n_probe]
+            candidates = np.fromiter(
+                (position for probe in probes for position in self.lists[probe]), dtype=np.int64
+            )
+            candidates = candidates[self.alive[candidates]]
+
+        return candidates, self.vectors[candidates] @ query
+
+    def _compact(self):
+        live = np.flatnonzero(self.alive[: len(self.uuids)])
+        self.uuids = [self.uuids[position] for position in live]
+        self.positions = {uuid: position for position, uuid in enumerate(self.uuids)}
+        self.vectors = self.vectors[live]
+        self.alive = np.ones(len(live), dtype=bool)
+
+    def _train(self):
+        n_lists = max(int(np.sqrt(len(self.uuids))), 1)
+        rng = np.random.default_rng(0)
+        sample_size = min(len(self.uuids), KMEANS_SAMPLES_PER_LIST * n_lists)
+        vectors = self.vectors[rng.choice(len(self.uuids), sample_size, replace=False)]
+        centroids = vectors[:n_lists]
+        for _ in range(KMEANS_ITERATIONS):
+            assignments = np.argmax(vectors @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assignments, vectors)
+            # Empty lists keep their previous centroid
+            empty = np.bincount(assignments, minlength=n_lists) == 0
+            sums[empty] = centroids[empty]
+            centroids = _normalize(sums)
+
+        self.centroids = centroids
+        self.trained_size = len(self.uuids)
+        self._rebuild_lists()
+
+    def _rebuild_lists(self):
+        if self.centroids is None:
+            return
+
+        assignments = np.argmax(self.vectors[: len(self.uuids)] @ self.centroids.T, axis=1)
+        self.lists = [[] for _ in range(len(self.centroids))]
+        for position, assignment in enumerate(assignments):
+            if self.alive[position]:
+                self.lists[assignment].append(position)
+
+    def save(self, path: str):
+        self._compact()
+        group_id = np.array(self.group_id)
+        uuids = np.array(self.uuids, dtype=str)
+
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            if self.centroids is None:
+                np.savez(f, group_id=group_id, uuids=uuids, vectors=self.vectors)
+            else:
+                np.savez(
+                    f,
+                    group_id=group_id,
+                    uuids=uuids,
+                    vectors=self.vectors,
+                    centroids=self.centroids,
+                )
+        os.replace(tmp_path, path)
+        self._rebuild_lists()
+
+    @classmethod
+    def load(cls, path: str) -> '_IvfPartition':
+        with np.load(path, allow_pickle=False) as arrays:
+            vectors = arrays['vectors'].astype(np.float32)
+            partition = cls(str(arrays['group_id']), vectors.shape[1])
+            partition.uuids = [str(uuid) for uuid in arrays['uuids']]
+            if 'centroids' in arrays:
+                partition.centroids = arrays['centroids'].astype(np.float32)
+
+        partition.positions = {uuid: position for position, uuid in enumerate(partition.uuids)}
+        partition.vectors = vectors
+        partition.alive = np.ones(len(vectors), dtype=bool)
+        partition.trained_size = len(vectors)
+        partition._rebuild_lists()
+        return partition
+
+
+class AnnCollection:
+    """Approximate nearest neighbour index over one kind of embedding, partitioned by group_id."""
+
+    def __init__(
+        self,
+        name: str,
+        n_probe: int = DEFAULT_N_PROBE,
+        min_train_size: int = DEFAULT_MIN_TRAIN_SIZE,
+    ):
+        self.name = name
+        self.n_probe = n_probe
+        self.min_train_size = min_train_size
+        self.partitions: dict[str, _IvfPartition] = {}
+        self.group_ids: dict[str, str] = {}
+        self.dirty: set[str] = set()
+
+    def __len__(self) -> int:
+        return len(self.group_ids)
+
+    def upsert(self, entries: Iterable[AnnEntry]):
+        """Add or replace (uuid, group_id, embedding) entries. A None embedding removes the uuid."""
+        changed: set[str] = set()
+        for uuid, group_id, embedding in entries:
+            self.remove([uuid])
+            if embedding is None:
+                continue
+
+            vector = _normalize(embedding)
+            partition = self.partitions.get(group_id)
+            if partition is None:
+                partition = self.partitions[group_id] = _IvfPartition(group_id, len(vector))
+            partition.upsert(uuid, vector)
+            self.group_ids[uuid] = group_id
+            changed.add(group_id)
+
+        for group_id in changed:
+            self.partitions[group_id].maybe_train(self.min_train_size)
+        self.dirty |= changed
+
+    def remove(self, uuids: Iterable[str]):
+        for uuid in uuids:
+            group_id = self.group_ids.pop(uuid, None)
+            if group_id is not None:
+                self.partitions[group_id].remove(uuid)
+                self.dirty.add(group_id)
+
+    def remove_groups(self, group_ids: Iterable[str]):
+        for group_id in group_ids:
+            partition = self.partitions.pop(group_id, None)
+            if partition is None:
+                continue
+
+            for uuid in partition.positions:
+                del self.group_ids[uuid]
+            self.dirty.add(group_id)
+
+    def clear(self):
+        self.dirty |= set(self.partitions)
+        self.partitions.clear()
+        self.group_ids.clear()
+
+    def search(
+        self,
+        search_vector: list[float],
+        group_ids: list[str] | None,
+        limit: int,
+        min_score: float,
+    ) -> list[tuple[str, float]]:
+        """
+        Return up to limit (uuid, score) pairs in descending score order.
+
+        Scores are normalized cosine similarities in [0, 1], like Neo4j's vector.similarity.cosine.
+        """
+        query = _normalize(search_vector)
+        partitions = (
+            list(self.partitions.values())
+            if group_ids is None
+            else [self.partitions[g] for g in group_ids if g in self.partitions]
+        )
+
+        uuids: list[str] = []
+        scores: list[NDArray] = []
+        for partition in partitions:
+            if len(partition) == 0 or partition.dim != len(query):
+                continue
+
+            positions, partition_scores = partition.search(query, self.n_probe)
+            partition_scores = (partition_scores + 1) / 2
+            keep = partition_scores > min_score
+            positions, partition_scores = positions[keep], partition_scores[keep]
+            if len(positions) > limit:
+                top = np.argpartition(-partition_scores, limit - 1)[:limit]
+                positions, partition_scores = positions[top], partition_scores[top]
+
+            uuids.extend(partition.uuids[position] for position in positions)
+            scores.append(partition_scores)
+
+        if len(uuids) == 0:
+            return []
+
+        all_scores = np.concatenate(scores)
+        order = np.argsort(-all_scores, kind='stable')[:limit]
+        return [(uuids[i], float(all_scores[i])) for i in order]
+
+    def save(self, directory: str):
+        for group_id in self.dirty:
+            digest = hashlib.sha1(group_id.encode()).hexdigest()[:16]
+            path = os.path.join(directory, f'{self.name}-{digest}.npz')
+            partition = self.partitions.get(group_id)
+            if partition is not None and len(partition) > 0:
+                partition.save(path)
+            elif os.path.exists(path):
+                os.remove(path)
+        self.dirty.clear()
+
+    def load(self, directory: str):
+        for file_name in sorted(os.listdir(directory)):
+            if file_name.startswith(f'{self.name}-') and file_name.endswith('.npz'):
+                partition = _IvfPartition.load(os.path.join(directory, file_name))
+                self.partitions[partition.group_id] = partition
+                self.group_ids.update((uuid, partition.group_id) for uuid in partition.uuids)
+
+
+class LocalAnnIndex:
+    """
+    Local approximate nearest neighbour index used by the similarity searches in place of a
+    brute-force cosine scan over the graph.
+
+    Entity name, fact and community name embeddings are kept in separate collections, each
+    partitioned by group_id. Attach the index to a driver (Graphiti does this when it is passed
+    ann_index) and the save and delete methods on nodes and edges, the bulk writer and the
+    maintenance operations keep it in sync with the writes this process makes. Writes made by
+    other processes are not seen; call build_ann_index to rebuild the index from the graph.
+
+    If path is set, the index is loaded from that directory and save() writes the partitions that
+    changed back to it. Graphiti.close() saves the index.
+    """
+
+    def __init__(
+        self,
+        path: str | None = None,
+        n_probe: int = DEFAULT_N_PROBE,
+        min_train_size: int = DEFAULT_MIN_TRAIN_SIZE,
+    ):
+        self.path = path
+        self.entities = AnnCollection('entity', n_probe, min_train_size)
+        self.edges = AnnCollection('edge', n_probe, min_train_size)
+        self.communities = AnnCollection('community', n_probe, min_train_size)
+
+        if path is not None:
+            os.makedirs(path, exist_ok=True)
+            for collection in self.collections:
+                collection.load(path)
+
+    @property
+    def collections(self) -> list[AnnCollection]:
+        return [self.entities, self.edges, self.communities]
+
+    def remove(self, uuids: list[str]):
+        for collection in self.collections:
+            collection.remove(uuids)
+
+    def remove_groups(self, group_ids: list[str]):
+        for collection in self.collections:
+            collection.remove_groups(group_ids)
+
+    def clear(self):
+        for collection in self.collections:
+            collection.clear()
+
+    def save(self):
+        if self.path is None:
+            return
+
+        for collection in self.collections:
+            collection.save(self.path)
+
+
+async def build_ann_index(
+    driver: 'GraphDriver', index: LocalAnnIndex, group_ids: list[str] | None = None
+):
+    """Load every embedding in the given groups (all groups if None) from the graph into index."""
+    queries: list[tuple[AnnCollection, LiteralString]] = [
+        (
+            index.entities,
+            """
+            MATCH (n:Entity)
+            WHERE n.name_embedding IS NOT NULL AND ($group_ids IS NULL OR n.group_id IN $group_ids)
+            RETURN n.uuid AS uuid, n.group_id AS group_id, n.name_embedding AS embedding
+            """,
+        ),
+        (
+            index.edges,
+            """
+            MATCH (:Entity)-[e:RELATES_TO]->(:Entity)
+            WHERE e.fact_embedding IS NOT NULL AND ($group_ids IS NULL OR e.group_id IN $group_ids)
+            RETURN e.uuid AS uuid, e.group_id AS group_id, e.fact_embedding AS embedding
+            """,
+        ),
+        (
+            index.communities,
+            """
+            MATCH (c:Community)
+            WHERE c.name_embedding IS NOT NULL AND ($group_ids IS NULL OR c.group_id IN $group_ids)
+            RETURN c.uuid AS uuid, c.group_id AS group_id, c.name_embedding AS embedding
+            """,
+        ),
+    ]
+
+    for collection, query in queries:
+        records, _, _ = await driver.execute_query(query, group_ids=group_ids, routing_='r')
+
+        if group_ids is None:
+            collection.clear()
+        else:
+            collection.remove_groups(group_ids)
+        collection.upsert(
+            (record['uuid'], record['group_id'], record['embedding']) for record in records
+        )
+        logger.debug(f'Loaded {len(records)} embeddings into the {collection.name} index')
@@ -18,6 +18,9 @@ import logging
 from collections import defaultdict
 from time import time
 
+import numpy as np
+from numpy.typing import NDArray
+
 from graphiti_core.cross_encoder.client import CrossEncoderClient
 from graphiti_core.driver.driver import GraphDriver
 from graphiti_core.edges import EntityEdge
@@ -25,6 +28,7 @@ from graphiti_core.errors import SearchRerankerError
 from graphiti_core.graphiti_types import GraphitiClients
 from graphiti_core.helpers import semaphore_gather
 from graphiti_core.nodes import CommunityNode, EntityNode, EpisodicNode
+from graphiti_core.search.search_cache import Generations
 from graphiti_core.search.search_config import (
     DEFAULT_SEARCH_LIMIT,
     CommunityReranker,
@@ -46,7 +50,9 @@ from graphiti_core.search.search_utils import (
     community_similarity_search,
     edge_bfs_search,
     edge_fulltext_search,
+    edge_fulltext_search_batch,
     edge_similarity_search,
+    edge_similarity_search_batch,
     episode_fulltext_search,
     episode_mentions_reranker,
     get_embeddings_for_communities,
@@ -56,7 +62,9 @@ from graphiti_core.search.search_utils import (
     node_bfs_search,
     node_distance_reranker,
     node_fulltext_search,
+    node_fulltext_search_batch,
     node_similarity_search,
+    node_similarity_search_batch,
     rrf,
 )
 
@@ -86,14 +94,30 @@ async def search(
             episodes=[],
             communities=[],
         )
+
+    # if group_ids is empty, set it to None
+    group_ids = group_ids if group_ids and group_ids != [''] else None
+
+    # Searches given a query vector are not cached, as the key doesn't include it
+    search_cache = driver.search_cache if query_vector is None else None
+    cache_key = ''
+    generations: Generations = ()
+    if search_cache is not None:
+        cache_key = search_cache.get_key(
+            query, group_ids, config, search_filter, center_node_uuid, bfs_origin_node_uuids
+        )
+        generations = search_cache.get_generations(group_ids)
+        cached_results = search_cache.get(cache_key, group_ids)
+        if cached_results is not None:
+            logger.debug(f'search returned cached results for query {query}')
+            return cached_results
+
     query_vector = (
         query_vector
         if query_vector is not None
         else await embedder.create(input_data=[query.replace('\n', ' ')])
     )
 
-    # if group_ids is empty, set it to None
-    group_ids = group_ids if group_ids and group_ids != [''] else None
     edges, nodes, episodes, communities = await semaphore_gather(
         edge_search(
             driver,
@@ -151,6 +175,9 @@ async def search(
         communities=communities,
     )
 
+    if search_cache is not None:
+        search_cache.set(cache_key, generations, results)
+
     latency = (time() - start) * 1000
 
     logger.debug(f'search returned context for query {query} in {latency} ms')
@@ -158,6 +185,266 @@ async def search(
     return results
 
 
+async def search_batch(
+    clients: GraphitiClients,
+    queries: list[str],
+    group_ids: list[str] | None,
+    config: SearchConfig,
+    search_filter: SearchFilters,
+) -> list[SearchResults]:
+    """
+    Run the same search for many queries at once, returning one SearchResults per query.
+
+    All queries are embedded with a single create_batch call. Edge and node bm25 and cosine
+    similarity lookups are sent as one UNWIND query per method for all queries and reranked per
+    query. Configurations that need per-query graph traversal or another reranker, or that search
+    episodes or communities, fall back to search() for each query with the batched query vectors.
+    """
+    start = time()
+
+    results = [SearchResults(edges=[], nodes=[], episodes=[], communities=[]) for _ in queries]
+    active_idxs = [i for i, query in enumerate(queries) if query.strip() != '']
+    if len(active_idxs) == 0:
+        return results
+
+    active_queries = [queries[i] for i in active_idxs]
+    query_vectors = await clients.embedder.create_batch(
+        [query.replace('\n', ' ') for query in active_queries]
+    )
+
+    # if group_ids is empty, set it to None
+    group_ids = group_ids if group_ids and group_ids != [''] else None
+
+    if _supports_batch_search(config):
+        edges_batch, nodes_batch = await semaphore_gather(
+            edge_search_batch(
+                clients.driver,
+                active_queries,
+                query_vectors,
+                group_ids,
+                config.edge_config,
+                search_filter,
+                config.limit,
+                config.reranker_min_score,
+            ),
+            node_search_batch(
+                clients.driver,
+                active_queries,
+                query_vectors,
+                group_ids,
+                config.node_config,
+                search_filter,
+                config.limit,
+                config.reranker_min_score,
+            ),
+        )
+        active_results = [
+            SearchResults(edges=edges, nodes=nodes, episodes=[], communities=[])
+            for edges, nodes in zip(edges_batch, nodes_batch, strict=True)
+        ]
+    else:
+        active_results = await semaphore_gather(
+            *[
+                search(
+                    clients,
+                    query,
+                    group_ids,
+                    config,
+                    search_filter,
+                    query_vector=query_vector,
+                )
+                for query, query_vector in zip(active_queries, query_vectors, strict=True)
+            ]
+        )
+
+    for i, result in zip(active_idxs, active_results, strict=True):
+        results[i] = result
+
+    latency = (time() - start) * 1000
+
+    logger.debug(f'search_batch returned context for {len(active_queries)} queries in {latency} ms')
+
+    return results
+
+
+def _supports_batch_search(config: SearchConfig) -> bool:
+    if config.episode_config is not None or config.community_config is not None:
+        return False
+
+    edge_config = config.edge_config
+    if edge_config is not None and (
+        EdgeSearchMethod.bfs in edge_config.search_methods
+        or edge_config.reranker
+        not in (EdgeReranker.rrf, EdgeReranker.mmr, EdgeReranker.episode_mentions)
+    ):
+        return False
+
+    node_config = config.node_config
+    return node_config is None or (
+        NodeSearchMethod.bfs not in node_config.search_methods
+        and node_config.reranker in (NodeReranker.rrf, NodeReranker.mmr)
+    )
+
+
+async def edge_search_batch(
+    driver: GraphDriver,
+    queries: list[str],
+    query_vectors: list[list[float]],
+    group_ids: list[str] | None,
+    config: EdgeSearchConfig | None,
+    search_filter: SearchFilters,
+    limit=DEFAULT_SEARCH_LIMIT,
+    reranker_min_score: float = 0,
+) -> list[list[EntityEdge]]:
+    if config is None:
+        return [[] for _ in queries]
+
+    include_embedding = config.reranker == EdgeReranker.mmr
+    fulltext_results, similarity_results = await semaphore_gather(
+        edge_fulltext_search_batch(
+            driver, queries, search_filter, group_ids, 2 * limit, include_embedding
+        )
+        if EdgeSearchMethod.bm25 in config.search_methods
+        else _empty_batch(len(queries)),
+        edge_similarity_search_batch(
+            driver,
+            query_vectors,
+            search_filter,
+            group_ids,
+            2 * limit,
+            config.sim_min_score,
+            include_embedding,
+        )
+        if EdgeSearchMethod.cosine_similarity in config.search_methods
+        else _empty_batch(len(queries)),
+    )
+
+    search_results_batch: list[list[list[EntityEdge]]] = [
+        [fulltext, similarity]
+        for fulltext, similarity in zip(fulltext_results, similarity_results, strict=True)
+    ]
+
+    embeddings: dict[str, NDArray[np.float32]] = {}
+    if include_embedding:
+        embeddings = await get_embeddings_for_edges(
+            driver,
+            list(
+                {
+                    edge.uuid: edge
+                    for search_results in search_results_batch
+                    for result in search_results
+                    for edge in result
+                }.values()
+            ),
+        )
+
+    reranked_edges_batch: list[list[EntityEdge]] = []
+    for query_vector, search_results in zip(query_vectors, search_results_batch, strict=True):
+        edge_uuid_map = {edge.uuid: edge for result in search_results for edge in result}
+
+        if config.reranker == EdgeReranker.mmr:
+            reranked_uuids = maximal_marginal_relevance(
+                query_vector,
+                {uuid: embeddings[uuid] for uuid in edge_uuid_map if uuid in embeddings},
+                config.mmr_lambda,
+                reranker_min_score,
+                limit,
+            )
+        else:
+            reranked_uuids = rrf(
+                [[edge.uuid for edge in result] for result in search_results],
+                min_score=reranker_min_score,
+            )
+
+        reranked_edges = [edge_uuid_map[uuid] for uuid in reranked_uuids]
+
+        if config.reranker == EdgeReranker.episode_mentions:
+            reranked_edges.sort(reverse=True, key=lambda edge: len(edge.episodes))
+
+        reranked_edges_batch.append(reranked_edges[:limit])
+
+    return reranked_edges_batch
+
+
+async def node_search_batch(
+    driver: GraphDriver,
+    queries: list[str],
+    query_vectors: list[list[float]],
+    group_ids: list[str] | None,
+    config: NodeSearchConfig | None,
+    search_filter: SearchFilters,
+    limit=DEFAULT_SEARCH_LIMIT,
+    reranker_min_score: float = 0,
+) -> list[list[EntityNode]]:
+    if config is None:
+        return [[] for _ in queries]
+
+    include_embedding = config.reranker == NodeReranker.mmr
+    fulltext_results, similarity_results = await semaphore_gather(
+        node_fulltext_search_batch(
+            driver, queries, search_filter, group_ids, 2 * limit, include_embedding
+        )
+        if NodeSearchMethod.bm25 in config.search_methods
+        else _empty_batch(len(queries)),
+        node_similarity_search_batch(
+            driver,
+            query_vectors,
+            search_filter,
+            group_ids,
+            2 * limit,
+            config.sim_min_score,
+            include_embedding,
+        )
+        if NodeSearchMethod.cosine_similarity in config.search_methods
+        else _empty_batch(len(queries)),
+    )
+
+    search_results_batch: list[list[list[EntityNode]]] = [
+        [fulltext, similarity]
+        for fulltext, similarity in zip(fulltext_results, similarity_results, strict=True)
+    ]
+
+    embeddings: dict[str, NDArray[np.float32]] = {}
+    if include_embedding:
+        embeddings = await get_embeddings_for_nodes(
+            driver,
+            list(
+                {
+                    node.uuid: node
+                    for search_results in search_results_batch
+                    for result in search_results
+                    for node in result
+                }.values()
+            ),
+        )
+
+    reranked_nodes_batch: list[list[EntityNode]] = []
+    for query_vector, search_results in zip(query_vectors, search_results_batch, strict=True):
+        node_uuid_map = {node.uuid: node for result in search_results for node in result}
+
+        if config.reranker == NodeReranker.mmr:
+            reranked_uuids = maximal_marginal_relevance(
+                query_vector,
+                {uuid: embeddings[uuid] for uuid in node_uuid_map if uuid in embeddings},
+                config.mmr_lambda,
+                reranker_min_score,
+                limit,
+            )
+        else:
+            reranked_uuids = rrf(
+                [[node.uuid for node in result] for result in search_results],
+                min_score=reranker_min_score,
+            )
+
+        reranked_nodes_batch.append([node_uuid_map[uuid] for uuid in reranked_uuids][:limit])
+
+    return reranked_nodes_batch
+
+
+async def _empty_batch(num_queries: int) -> list[list]:
+    return [[] for _ in range(num_queries)]
+
+
 async def edge_search(
     driver: GraphDriver,
     cross_encoder: CrossEncoderClient,
@@ -173,10 +460,13 @@ async def edge_search(
 ) -> list[EntityEdge]:
     if config is None:
         return []
+    include_embedding = config.reranker == EdgeReranker.mmr
     search_results: list[list[EntityEdge]] = list(
         await semaphore_gather(
             *[
-                edge_fulltext_search(driver, query, search_filter, group_ids, 2 * limit),
+                edge_fulltext_search(
+                    driver, query, search_filter, group_ids, 2 * limit, include_embedding
+                ),
                 edge_similarity_search(
                     driver,
                     query_vector,
@@ -186,9 +476,15 @@ async def edge_search(
                     group_ids,
                     2 * limit,
                     config.sim_min_score,
+                    include_embedding,
                 ),
                 edge_bfs_search(
-                    driver, bfs_origin_node_uuids, config.bfs_max_depth, search_filter, 2 * limit
+                    driver,
+                    bfs_origin_node_uuids,
+                    config.bfs_max_depth,
+                    search_filter,
+                    2 * limit,
+                    include_embedding,
                 ),
             ]
         )
@@ -198,7 +494,12 @@ async def edge_search(
         source_node_uuids = [edge.source_node_uuid for result in search_results for edge in result]
         search_results.append(
             await edge_bfs_search(
-                driver, source_node_uuids, config.bfs_max_depth, search_filter, 2 * limit
+                driver,
+                source_node_uuids,
+                config.bfs_max_depth,
+                search_filter,
+                2 * limit,
+                include_embedding,
             )
         )
 
@@ -218,6 +519,7 @@ async def edge_search(
             search_result_uuids_and_vectors,
             config.mmr_lambda,
             reranker_min_score,
+            limit,
         )
     elif config.reranker == EdgeReranker.cross_encoder:
         fact_to_uuid_map = {edge.fact: edge.uuid for edge in list(edge_uuid_map.values())[:limit]}
@@ -273,15 +575,29 @@ async def node_search(
 ) -> list[EntityNode]:
     if config is None:
         return []
+    include_embedding = config.reranker == NodeReranker.mmr
     search_results: list[list[EntityNode]] = list(
         await semaphore_gather(
             *[
-                node_fulltext_search(driver, query, search_filter, group_ids, 2 * limit),
+                node_fulltext_search(
+                    driver, query, search_filter, group_ids, 2 * limit, include_embedding
+                ),
                 node_similarity_search(
-                    driver, query_vector, search_filter, group_ids, 2 * limit, config.sim_min_score
+                    driver,
+                    query_vector,
+                    search_filter,
+                    group_ids,
+                    2 * limit,
+                    config.sim_min_score,
+                    include_embedding,
                 ),
                 node_bfs_search(
-                    driver, bfs_origin_node_uuids, search_filter, config.bfs_max_depth, 2 * limit
+                    driver,
+                    bfs_origin_node_uuids,
+                    search_filter,
+                    config.bfs_max_depth,
+                    2 * limit,
+                    include_embedding,
                 ),
             ]
         )
@@ -291,7 +607,12 @@ async def node_search(
         origin_node_uuids = [node.uuid for result in search_results for node in result]
         search_results.append(
             await node_bfs_search(
-                driver, origin_node_uuids, search_filter, config.bfs_max_depth, 2 * limit
+                driver,
+                origin_node_uuids,
+                search_filter,
+                config.bfs_max_depth,
+                2 * limit,
+                include_embedding,
             )
         )
 
@@ -311,6 +632,7 @@ async def node_search(
             search_result_uuids_and_vectors,
             config.mmr_lambda,
             reranker_min_score,
+            limit,
         )
     elif config.reranker == NodeReranker.cross_encoder:
         name_to_uuid_map = {node.name: node.uuid for node in list(node_uuid_map.values())}
@@ -425,7 +747,11 @@ async def community_search(
         )
 
         reranked_uuids = maximal_marginal_relevance(
-            query_vector, search_result_uuids_and_vectors, config.mmr_lambda, reranker_min_score
+            query_vector,
+            search_result_uuids_and_vectors,
+            config.mmr_lambda,
+            reranker_min_score,
+            limit,
         )
     elif config.reranker == CommunityReranker.cross_encoder:
         name_to_uuid_map = {node.name: node.uuid for result in search_results for node in result}
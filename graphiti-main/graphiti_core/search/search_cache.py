@@ -0,0 +1,136 @@
+"""
+Copyright 2024, Zep Software, Inc.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import hashlib
+import json
+from collections import OrderedDict, defaultdict
+from collections.abc import Iterable
+
+from pydantic import BaseModel
+
+from graphiti_core.search.search_config import SearchConfig, SearchResults
+from graphiti_core.search.search_filters import SearchFilters
+
+DEFAULT_SEARCH_CACHE_SIZE = 1024
+
+Generations = tuple[int, ...]
+
+
+class SearchCacheStats(BaseModel):
+    hits: int
+    misses: int
+    size: int
+
+
+class SearchCache:
+    """
+    LRU cache of search() results, invalidated by per-group generation counters.
+
+    Every write made through graphiti_core bumps the generation of the groups it touched once it
+    has committed. A cached result remembers the generations of its groups from when its search
+    started and is only served while they are unchanged, so results are never stale across writes
+    made by this process, including writes that land while the search is running. Searches
+    without group_ids depend on every group. Writes made by other processes are not seen.
+
+    Results are stored without their name and fact embeddings, which would otherwise make up most
+    of the cache's memory, so results served from the cache have them set to None.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_SEARCH_CACHE_SIZE):
+        self.max_entries = max_entries
+        self.entries: OrderedDict[str, tuple[Generations, SearchResults]] = OrderedDict()
+        self.generations: defaultdict[str, int] = defaultdict(int)
+        # Bumped by every write, for searches across all groups
+        self.any_generation = 0
+        # Bumped by writes whose groups aren't known
+        self.all_generation = 0
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    @staticmethod
+    def get_key(
+        query: str,
+        group_ids: list[str] | None,
+        config: SearchConfig,
+        search_filter: SearchFilters,
+        center_node_uuid: str | None = None,
+        bfs_origin_node_uuids: list[str] | None = None,
+    ) -> str:
+        key = json.dumps(
+            [
+                query,
+                group_ids,
+                config.model_dump(mode='json'),
+                search_filter.model_dump(mode='json'),
+                center_node_uuid,
+                bfs_origin_node_uuids,
+            ]
+        )
+        return hashlib.sha256(key.encode()).hexdigest()
+
+    def get_generations(self, group_ids: list[str] | None) -> Generations:
+        if group_ids is None:
+            return (self.any_generation,)
+        return (self.all_generation, *(self.generations[group_id] for group_id in group_ids))
+
+    def get(self, key: str, group_ids: list[str] | None) -> SearchResults | None:
+        entry = self.entries.get(key)
+        if entry is None or entry[0] != self.get_generations(group_ids):
+            self.misses += 1
+            return None
+
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return entry[1].model_copy(deep=True)
+
+    def set(self, key: str, generations: Generations, results: SearchResults):
+        """Store results of a search that started at the given generations."""
+        self.entries[key] = (generations, _without_embeddings(results))
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def bump(self, group_ids: Iterable[str] | None):
+        """Invalidate cached results for group_ids, or for every group if None."""
+        self.any_generation += 1
+        if group_ids is None:
+            self.all_generation += 1
+            return
+
+        for group_id in group_ids:
+            self.generations[group_id] += 1
+
+    def clear(self):
+        self.entries.clear()
+
+    def get_stats(self) -> SearchCacheStats:
+        return SearchCacheStats(hits=self.hits, misses=self.misses, size=len(self.entries))
+
+
+def _without_embeddings(results: SearchResults) -> SearchResults:
+    # The embeddings are dropped by a shallow copy before the deep copy, so they are never copied
+    return SearchResults(
+        edges=[edge.model_copy(update={'fact_embedding': None}) for edge in results.edges],
+        nodes=[node.model_copy(update={'name_embedding': None}) for node in results.nodes],
+        episodes=results.episodes,
+        communities=[
+            community.model_copy(update={'name_embedding': None})
+            for community in results.communities
+        ],
+    ).model_copy(deep=True)
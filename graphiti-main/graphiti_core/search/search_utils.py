@@ -16,24 +16,27 @@ limitations under the License.
 
 import logging
 from collections import defaultdict
+from collections.abc import Callable, Mapping
+from functools import partial
 from time import time
-from typing import Any
+from typing import Any, TypeVar
 
 import numpy as np
-from numpy._typing import NDArray
+from numpy.typing import NDArray
 from typing_extensions import LiteralString
 
 from graphiti_core.driver.driver import GraphDriver
-from graphiti_core.edges import EntityEdge, get_entity_edge_from_record
+from graphiti_core.edges import ENTITY_EDGE_RETURN, EntityEdge, get_entity_edge_from_record
 from graphiti_core.graph_queries import (
     get_nodes_query,
     get_relationships_query,
     get_vector_cosine_func_query,
+    get_vector_nodes_query,
+    get_vector_relationships_query,
 )
 from graphiti_core.helpers import (
     RUNTIME_QUERY,
     lucene_sanitize,
-    normalize_l2,
     semaphore_gather,
 )
 from graphiti_core.nodes import (
@@ -45,11 +48,13 @@ from graphiti_core.nodes import (
     get_entity_node_from_record,
     get_episodic_node_from_record,
 )
+from graphiti_core.search.ann_index import AnnCollection
 from graphiti_core.search.search_filters import (
     SearchFilters,
     edge_search_filter_query_constructor,
     node_search_filter_query_constructor,
 )
+from graphiti_core.search.vector_store import vector_store
 
 logger = logging.getLogger(__name__)
 
@@ -59,6 +64,57 @@ DEFAULT_MMR_LAMBDA = 0.5
 MAX_SEARCH_DEPTH = 3
 MAX_QUERY_LENGTH = 32
 
+T = TypeVar('T')
+
+# Nearest neighbours fetched from a vector index per result, before filtering
+VECTOR_INDEX_OVERSAMPLING = 10
+# Largest k a vector index query is retried with before falling back to an exhaustive search
+MAX_VECTOR_INDEX_K = 10_000
+# Errors from a vector index query that mean the index can't be used until indices are rebuilt
+VECTOR_INDEX_UNAVAILABLE_CODES = ('Neo.ClientError.Schema.', 'Neo.ClientError.Procedure.')
+VECTOR_INDEX_UNAVAILABLE_MESSAGES = (
+    'no such vector schema index',
+    'no such index',
+    'index does not exist',
+    'unknown index',
+    'no procedure with the name',
+)
+
+COMMUNITY_NODE_RETURN: LiteralString = """
+        RETURN
+            comm.uuid As uuid,
+            comm.group_id AS group_id,
+            comm.name AS name,
+            comm.created_at AS created_at,
+            comm.summary AS summary,
+            comm.name_embedding AS name_embedding
+        """
+
+ENTITY_NODE_MATCH: LiteralString = """{
+            uuid: n.uuid,
+            name: n.name,
+            group_id: n.group_id,
+            created_at: n.created_at,
+            summary: n.summary,
+            labels: labels(n),
+            attributes: properties(n)
+        }"""
+
+ENTITY_EDGE_MATCH: LiteralString = """{
+            uuid: r.uuid,
+            group_id: r.group_id,
+            source_node_uuid: startNode(r).uuid,
+            target_node_uuid: endNode(r).uuid,
+            created_at: r.created_at,
+            name: r.name,
+            fact: r.fact,
+            episodes: r.episodes,
+            expired_at: r.expired_at,
+            valid_at: r.valid_at,
+            invalid_at: r.invalid_at,
+            attributes: properties(r)
+        }"""
+
 
 def fulltext_query(query: str, group_ids: list[str] | None = None):
     group_ids_filter_list = (
@@ -155,6 +211,7 @@ async def edge_fulltext_search(
     search_filter: SearchFilters,
     group_ids: list[str] | None = None,
     limit=RELEVANT_SCHEMA_LIMIT,
+    include_embedding: bool = False,
 ) -> list[EntityEdge]:
     # fulltext search over facts
     fuzzy_query = fulltext_query(query, group_ids)
@@ -198,7 +255,7 @@ async def edge_fulltext_search(
         routing_='r',
     )
 
-    edges = [get_entity_edge_from_record(record) for record in records]
+    edges = [get_entity_edge_from_record(record, include_embedding) for record in records]
 
     return edges
 
@@ -212,6 +269,7 @@ async def edge_similarity_search(
     group_ids: list[str] | None = None,
     limit: int = RELEVANT_SCHEMA_LIMIT,
     min_score: float = DEFAULT_MIN_SCORE,
+    include_embedding: bool = False,
 ) -> list[EntityEdge]:
     # vector similarity search over embedded facts
     query_params: dict[str, Any] = {}
@@ -219,6 +277,27 @@ async def edge_similarity_search(
     filter_query, filter_params = edge_search_filter_query_constructor(search_filter)
     query_params.update(filter_params)
 
+    if (
+        driver.ann_index is not None
+        and filter_query == ''
+        and source_node_uuid is None
+        and target_node_uuid is None
+    ):
+        return await _ann_search(
+            driver,
+            driver.ann_index.edges,
+            search_vector,
+            group_ids,
+            limit,
+            min_score,
+            """
+            MATCH (n:Entity)-[e:RELATES_TO]->(m:Entity)
+            WHERE e.uuid IN $uuids
+            """
+            + ENTITY_EDGE_RETURN,
+            partial(get_entity_edge_from_record, include_embedding=include_embedding),
+        )
+
     group_filter_query: LiteralString = 'WHERE r.group_id IS NOT NULL'
     if group_ids is not None:
         group_filter_query += '\nAND r.group_id IN $group_ids'
@@ -232,18 +311,7 @@ async def edge_similarity_search(
         if target_node_uuid is not None:
             group_filter_query += '\nAND (m.uuid IN [$source_uuid, $target_uuid])'
 
-    query = (
-        RUNTIME_QUERY
-        + """
-        MATCH (n:Entity)-[r:RELATES_TO]->(m:Entity)
-        """
-        + group_filter_query
-        + filter_query
-        + """
-        WITH DISTINCT r, """
-        + get_vector_cosine_func_query('r.fact_embedding', '$search_vector', driver.provider)
-        + """ AS score
-        WHERE score > $min_score
+    return_query: LiteralString = """
         RETURN
             r.uuid AS uuid,
             r.group_id AS group_id,
@@ -260,20 +328,48 @@ async def edge_similarity_search(
         ORDER BY score DESC
         LIMIT $limit
         """
-    )
-    records, header, _ = await driver.execute_query(
-        query,
-        params=query_params,
-        search_vector=search_vector,
-        source_uuid=source_node_uuid,
-        target_uuid=target_node_uuid,
-        group_ids=group_ids,
-        limit=limit,
-        min_score=min_score,
-        routing_='r',
+    query_kwargs: dict[str, Any] = {
+        'params': query_params,
+        'search_vector': search_vector,
+        'source_uuid': source_node_uuid,
+        'target_uuid': target_node_uuid,
+        'group_ids': group_ids,
+        'limit': limit,
+        'min_score': min_score,
+    }
+
+    records = await _vector_index_search(
+        driver,
+        get_vector_relationships_query('edge_fact_embedding', driver.provider),
+        """
+        WITH relationship AS r, score, startNode(relationship) AS n, endNode(relationship) AS m
+        """
+        + group_filter_query
+        + filter_query
+        + """
+        AND score > $min_score"""
+        + return_query,
+        **query_kwargs,
     )
 
-    edges = [get_entity_edge_from_record(record) for record in records]
+    if records is None:
+        query = (
+            RUNTIME_QUERY
+            + """
+            MATCH (n:Entity)-[r:RELATES_TO]->(m:Entity)
+            """
+            + group_filter_query
+            + filter_query
+            + """
+            WITH DISTINCT r, """
+            + get_vector_cosine_func_query('r.fact_embedding', '$search_vector', driver.provider)
+            + """ AS score
+            WHERE score > $min_score"""
+            + return_query
+        )
+        records, _, _ = await driver.execute_query(query, routing_='r', **query_kwargs)
+
+    edges = [get_entity_edge_from_record(record, include_embedding) for record in records]
 
     return edges
 
@@ -284,6 +380,7 @@ async def edge_bfs_search(
     bfs_max_depth: int,
     search_filter: SearchFilters,
     limit: int,
+    include_embedding: bool = False,
 ) -> list[EntityEdge]:
     # vector similarity search over embedded facts
     if bfs_origin_node_uuids is None:
@@ -327,7 +424,7 @@ async def edge_bfs_search(
         routing_='r',
     )
 
-    edges = [get_entity_edge_from_record(record) for record in records]
+    edges = [get_entity_edge_from_record(record, include_embedding) for record in records]
 
     return edges
 
@@ -338,6 +435,7 @@ async def node_fulltext_search(
     search_filter: SearchFilters,
     group_ids: list[str] | None = None,
     limit=RELEVANT_SCHEMA_LIMIT,
+    include_embedding: bool = False,
 ) -> list[EntityNode]:
     # BM25 search to get top nodes
     fuzzy_query = fulltext_query(query, group_ids)
@@ -368,7 +466,7 @@ async def node_fulltext_search(
         routing_='r',
     )
 
-    nodes = [get_entity_node_from_record(record) for record in records]
+    nodes = [get_entity_node_from_record(record, include_embedding) for record in records]
 
     return nodes
 
@@ -380,6 +478,7 @@ async def node_similarity_search(
     group_ids: list[str] | None = None,
     limit=RELEVANT_SCHEMA_LIMIT,
     min_score: float = DEFAULT_MIN_SCORE,
+    include_embedding: bool = False,
 ) -> list[EntityNode]:
     # vector similarity search over entity names
     query_params: dict[str, Any] = {}
@@ -392,36 +491,69 @@ async def node_similarity_search(
     filter_query, filter_params = node_search_filter_query_constructor(search_filter)
     query_params.update(filter_params)
 
-    query = (
-        RUNTIME_QUERY
+    if driver.ann_index is not None and filter_query == '':
+        return await _ann_search(
+            driver,
+            driver.ann_index.entities,
+            search_vector,
+            group_ids,
+            limit,
+            min_score,
+            """
+            MATCH (n:Entity)
+            WHERE n.uuid IN $uuids
+            """
+            + ENTITY_NODE_RETURN,
+            partial(get_entity_node_from_record, include_embedding=include_embedding),
+        )
+
+    return_query: LiteralString = (
+        ENTITY_NODE_RETURN
         + """
-        MATCH (n:Entity)
+        ORDER BY score DESC
+        LIMIT $limit
+        """
+    )
+    query_kwargs: dict[str, Any] = {
+        'params': query_params,
+        'search_vector': search_vector,
+        'group_ids': group_ids,
+        'limit': limit,
+        'min_score': min_score,
+    }
+
+    records = await _vector_index_search(
+        driver,
+        get_vector_nodes_query('entity_name_embedding', driver.provider),
+        """
+        WITH node AS n, score
         """
         + group_filter_query
         + filter_query
         + """
-        WITH n, """
-        + get_vector_cosine_func_query('n.name_embedding', '$search_vector', driver.provider)
-        + """ AS score
-        WHERE score > $min_score"""
-        + ENTITY_NODE_RETURN
-        + """
-        ORDER BY score DESC
-        LIMIT $limit
-            """
+        AND score > $min_score"""
+        + return_query,
+        **query_kwargs,
     )
 
-    records, header, _ = await driver.execute_query(
-        query,
-        params=query_params,
-        search_vector=search_vector,
-        group_ids=group_ids,
-        limit=limit,
-        min_score=min_score,
-        routing_='r',
-    )
+    if records is None:
+        query = (
+            RUNTIME_QUERY
+            + """
+            MATCH (n:Entity)
+            """
+            + group_filter_query
+            + filter_query
+            + """
+            WITH n, """
+            + get_vector_cosine_func_query('n.name_embedding', '$search_vector', driver.provider)
+            + """ AS score
+            WHERE score > $min_score"""
+            + return_query
+        )
+        records, _, _ = await driver.execute_query(query, routing_='r', **query_kwargs)
 
-    nodes = [get_entity_node_from_record(record) for record in records]
+    nodes = [get_entity_node_from_record(record, include_embedding) for record in records]
 
     return nodes
 
@@ -432,6 +564,7 @@ async def node_bfs_search(
     search_filter: SearchFilters,
     bfs_max_depth: int,
     limit: int,
+    include_embedding: bool = False,
 ) -> list[EntityNode]:
     # vector similarity search over entity names
     if bfs_origin_node_uuids is None:
@@ -459,7 +592,7 @@ async def node_bfs_search(
         limit=limit,
         routing_='r',
     )
-    nodes = [get_entity_node_from_record(record) for record in records]
+    nodes = [get_entity_node_from_record(record, include_embedding) for record in records]
 
     return nodes
 
@@ -556,47 +689,415 @@ async def community_similarity_search(
     min_score=DEFAULT_MIN_SCORE,
 ) -> list[CommunityNode]:
     # vector similarity search over entity names
-    query_params: dict[str, Any] = {}
+    if driver.ann_index is not None:
+        return await _ann_search(
+            driver,
+            driver.ann_index.communities,
+            search_vector,
+            group_ids,
+            limit,
+            min_score,
+            """
+            MATCH (comm:Community)
+            WHERE comm.uuid IN $uuids
+            """
+            + COMMUNITY_NODE_RETURN,
+            get_community_node_from_record,
+        )
 
     group_filter_query: LiteralString = ''
     if group_ids is not None:
         group_filter_query += 'WHERE comm.group_id IN $group_ids'
+
+    return_query: LiteralString = (
+        COMMUNITY_NODE_RETURN
+        + """
+        ORDER BY score DESC
+        LIMIT $limit
+        """
+    )
+    query_kwargs: dict[str, Any] = {
+        'search_vector': search_vector,
+        'group_ids': group_ids,
+        'limit': limit,
+        'min_score': min_score,
+    }
+
+    records = await _vector_index_search(
+        driver,
+        get_vector_nodes_query('community_name_embedding', driver.provider),
+        """
+        WITH node AS comm, score
+        WHERE score > $min_score"""
+        + ('' if group_ids is None else ' AND comm.group_id IN $group_ids')
+        + return_query,
+        **query_kwargs,
+    )
+
+    if records is None:
+        query = (
+            RUNTIME_QUERY
+            + """
+            MATCH (comm:Community)
+            """
+            + group_filter_query
+            + """
+            WITH comm, """
+            + get_vector_cosine_func_query('comm.name_embedding', '$search_vector', driver.provider)
+            + """ AS score
+            WHERE score > $min_score"""
+            + return_query
+        )
+        records, _, _ = await driver.execute_query(query, routing_='r', **query_kwargs)
+
+    communities = [get_community_node_from_record(record) for record in records]
+
+    return communities
+
+
+async def _vector_index_search(
+    driver: GraphDriver,
+    index_query: str,
+    query: str,
+    search_vector: list[float],
+    limit: int,
+    min_score: float,
+    **kwargs: Any,
+) -> list[Any] | None:
+    # Runs a similarity query through a native vector index. index_query yields the $k nearest
+    # neighbours and query filters and returns them. None means the caller should fall back to its
+    # exhaustive query.
+    if not driver.use_vector_indices:
+        return None
+
+    k = limit * VECTOR_INDEX_OVERSAMPLING
+    try:
+        while True:
+            records, _, _ = await driver.execute_query(
+                index_query + query,
+                search_vector=search_vector,
+                k=k,
+                limit=limit,
+                min_score=min_score,
+                routing_='r',
+                **kwargs,
+            )
+            if len(records) >= limit:
+                return records
+
+            # The group and search filters only see the nearest k, so a short result is complete
+            # only if the index ran out of neighbours or reached ones scoring below min_score
+            neighbour_records, _, _ = await driver.execute_query(
+                index_query
+                + """
+                RETURN count(*) AS neighbours, min(score) AS lowest_score
+                """,
+                search_vector=search_vector,
+                k=k,
+                routing_='r',
+            )
+            neighbours = neighbour_records[0]['neighbours'] if neighbour_records else 0
+            lowest_score = neighbour_records[0]['lowest_score'] if neighbour_records else None
+            if neighbours < k or lowest_score is None or lowest_score <= min_score:
+                return records
+
+            if k >= MAX_VECTOR_INDEX_K:
+                return None
+            k = min(k * VECTOR_INDEX_OVERSAMPLING, MAX_VECTOR_INDEX_K)
+    except Exception as e:
+        if not _is_vector_index_unavailable(e):
+            logger.warning(f'Vector index search failed, falling back to exhaustive search: {e}')
+            return None
+
+        logger.warning(
+            f'Vector index is unavailable, using exhaustive search until indices are rebuilt: {e}'
+        )
+        driver.use_vector_indices = False
+        return None
+
+
+def _is_vector_index_unavailable(error: Exception) -> bool:
+    # Neo4j errors carry a status code; other drivers only have the message
+    code = getattr(error, 'code', None)
+    if isinstance(code, str) and code.startswith(VECTOR_INDEX_UNAVAILABLE_CODES):
+        return True
+
+    message = str(error).lower()
+    return any(hint in message for hint in VECTOR_INDEX_UNAVAILABLE_MESSAGES)
+
+
+async def node_fulltext_search_batch(
+    driver: GraphDriver,
+    queries: list[str],
+    search_filter: SearchFilters,
+    group_ids: list[str] | None = None,
+    limit=RELEVANT_SCHEMA_LIMIT,
+    include_embedding: bool = False,
+) -> list[list[EntityNode]]:
+    # BM25 search for many queries in a single round trip
+    fuzzy_queries = [
+        {'idx': i, 'query': fulltext_query(query, group_ids)} for i, query in enumerate(queries)
+    ]
+    fuzzy_queries = [q for q in fuzzy_queries if q['query'] != '']
+    if len(fuzzy_queries) == 0:
+        return [[] for _ in queries]
+
+    filter_query, filter_params = node_search_filter_query_constructor(search_filter)
+
+    query = (
+        """
+        UNWIND $queries AS q
+        """
+        + get_nodes_query(driver.provider, 'node_name_and_summary', 'q.query')
+        + """
+        YIELD node AS n, score
+        WITH q, n, score
+        WHERE n:Entity
+        """
+        + filter_query
+        + """
+        WITH q, n, score
+        ORDER BY score DESC
+        WITH q, collect("""
+        + ENTITY_NODE_MATCH
+        + """)[..$limit] AS matches
+        RETURN q.idx AS query_idx, matches
+        """
+    )
+
+    records, _, _ = await driver.execute_query(
+        query,
+        params=filter_params,
+        queries=fuzzy_queries,
+        group_ids=group_ids,
+        limit=limit,
+        routing_='r',
+    )
+
+    return _group_batch_records(
+        records,
+        len(queries),
+        partial(get_entity_node_from_record, include_embedding=include_embedding),
+    )
+
+
+async def node_similarity_search_batch(
+    driver: GraphDriver,
+    search_vectors: list[list[float]],
+    search_filter: SearchFilters,
+    group_ids: list[str] | None = None,
+    limit=RELEVANT_SCHEMA_LIMIT,
+    min_score: float = DEFAULT_MIN_SCORE,
+    include_embedding: bool = False,
+) -> list[list[EntityNode]]:
+    # vector similarity search over entity names for many queries in a single round trip
+    if len(search_vectors) == 0:
+        return []
+
+    query_params: dict[str, Any] = {}
+
+    group_filter_query: LiteralString = 'WHERE n.group_id IS NOT NULL'
+    if group_ids is not None:
+        group_filter_query += ' AND n.group_id IN $group_ids'
         query_params['group_ids'] = group_ids
 
+    filter_query, filter_params = node_search_filter_query_constructor(search_filter)
+    query_params.update(filter_params)
+
     query = (
         RUNTIME_QUERY
         + """
-           MATCH (comm:Community)
-           """
+        UNWIND $search_vectors AS q
+        MATCH (n:Entity)
+        """
         + group_filter_query
+        + filter_query
         + """
-           WITH comm, """
-        + get_vector_cosine_func_query('comm.name_embedding', '$search_vector', driver.provider)
+        WITH q, n, """
+        + get_vector_cosine_func_query('n.name_embedding', 'q.vector', driver.provider)
         + """ AS score
-           WHERE score > $min_score
-           RETURN
-               comm.uuid As uuid,
-               comm.group_id AS group_id,
-               comm.name AS name, 
-               comm.created_at AS created_at, 
-               comm.summary AS summary,
-               comm.name_embedding AS name_embedding
-           ORDER BY score DESC
-           LIMIT $limit
+        WHERE score > $min_score
+        WITH q, n, score
+        ORDER BY score DESC
+        WITH q, collect("""
+        + ENTITY_NODE_MATCH
+        + """)[..$limit] AS matches
+        RETURN q.idx AS query_idx, matches
         """
     )
 
     records, _, _ = await driver.execute_query(
         query,
-        search_vector=search_vector,
+        params=query_params,
+        search_vectors=[{'idx': i, 'vector': vector} for i, vector in enumerate(search_vectors)],
         group_ids=group_ids,
         limit=limit,
         min_score=min_score,
         routing_='r',
     )
-    communities = [get_community_node_from_record(record) for record in records]
 
-    return communities
+    return _group_batch_records(
+        records,
+        len(search_vectors),
+        partial(get_entity_node_from_record, include_embedding=include_embedding),
+    )
+
+
+async def edge_fulltext_search_batch(
+    driver: GraphDriver,
+    queries: list[str],
+    search_filter: SearchFilters,
+    group_ids: list[str] | None = None,
+    limit=RELEVANT_SCHEMA_LIMIT,
+    include_embedding: bool = False,
+) -> list[list[EntityEdge]]:
+    # fulltext search over facts for many queries in a single round trip
+    fuzzy_queries = [
+        {'idx': i, 'query': fulltext_query(query, group_ids)} for i, query in enumerate(queries)
+    ]
+    fuzzy_queries = [q for q in fuzzy_queries if q['query'] != '']
+    if len(fuzzy_queries) == 0:
+        return [[] for _ in queries]
+
+    filter_query, filter_params = edge_search_filter_query_constructor(search_filter)
+
+    group_filter_query: LiteralString = 'WHERE r.group_id IS NOT NULL'
+    if group_ids is not None:
+        group_filter_query += ' AND r.group_id IN $group_ids'
+
+    query = (
+        """
+        UNWIND $queries AS q
+        """
+        + get_relationships_query('edge_name_and_fact', db_type=driver.provider, query='q.query')
+        + """
+        YIELD relationship AS rel, score
+        MATCH (n:Entity)-[r:RELATES_TO {uuid: rel.uuid}]->(m:Entity)
+        """
+        + group_filter_query
+        + filter_query
+        + """
+        WITH q, r, score
+        ORDER BY score DESC
+        WITH q, collect("""
+        + ENTITY_EDGE_MATCH
+        + """)[..$limit] AS matches
+        RETURN q.idx AS query_idx, matches
+        """
+    )
+
+    records, _, _ = await driver.execute_query(
+        query,
+        params=filter_params,
+        queries=fuzzy_queries,
+        group_ids=group_ids,
+        limit=limit,
+        routing_='r',
+    )
+
+    return _group_batch_records(
+        records,
+        len(queries),
+        partial(get_entity_edge_from_record, include_embedding=include_embedding),
+    )
+
+
+async def edge_similarity_search_batch(
+    driver: GraphDriver,
+    search_vectors: list[list[float]],
+    search_filter: SearchFilters,
+    group_ids: list[str] | None = None,
+    limit: int = RELEVANT_SCHEMA_LIMIT,
+    min_score: float = DEFAULT_MIN_SCORE,
+    include_embedding: bool = False,
+) -> list[list[EntityEdge]]:
+    # vector similarity search over embedded facts for many queries in a single round trip
+    if len(search_vectors) == 0:
+        return []
+
+    query_params: dict[str, Any] = {}
+
+    filter_query, filter_params = edge_search_filter_query_constructor(search_filter)
+    query_params.update(filter_params)
+
+    group_filter_query: LiteralString = 'WHERE r.group_id IS NOT NULL'
+    if group_ids is not None:
+        group_filter_query += '\nAND r.group_id IN $group_ids'
+        query_params['group_ids'] = group_ids
+
+    query = (
+        RUNTIME_QUERY
+        + """
+        UNWIND $search_vectors AS q
+        MATCH (n:Entity)-[r:RELATES_TO]->(m:Entity)
+        """
+        + group_filter_query
+        + filter_query
+        + """
+        WITH DISTINCT q, r, """
+        + get_vector_cosine_func_query('r.fact_embedding', 'q.vector', driver.provider)
+        + """ AS score
+        WHERE score > $min_score
+        WITH q, r, score
+        ORDER BY score DESC
+        WITH q, collect("""
+        + ENTITY_EDGE_MATCH
+        + """)[..$limit] AS matches
+        RETURN q.idx AS query_idx, matches
+        """
+    )
+
+    records, _, _ = await driver.execute_query(
+        query,
+        params=query_params,
+        search_vectors=[{'idx': i, 'vector': vector} for i, vector in enumerate(search_vectors)],
+        group_ids=group_ids,
+        limit=limit,
+        min_score=min_score,
+        routing_='r',
+    )
+
+    return _group_batch_records(
+        records,
+        len(search_vectors),
+        partial(get_entity_edge_from_record, include_embedding=include_embedding),
+    )
+
+
+def _group_batch_records(
+    records: list[Any], num_queries: int, parse_record: Callable[[Any], T]
+) -> list[list[T]]:
+    # Batched queries return one row per query that had matches, tagged with its index
+    grouped: list[list[T]] = [[] for _ in range(num_queries)]
+    for record in records:
+        grouped[record['query_idx']] = [parse_record(match) for match in record['matches']]
+
+    return grouped
+
+
+async def _ann_search(
+    driver: GraphDriver,
+    collection: AnnCollection,
+    search_vector: list[float],
+    group_ids: list[str] | None,
+    limit: int,
+    min_score: float,
+    hydrate_query: LiteralString,
+    get_from_record: Callable[[Any], T],
+) -> list[T]:
+    # Candidates come from the local index, then are loaded from the graph in score order
+    results = collection.search(search_vector, group_ids, limit, min_score)
+    if len(results) == 0:
+        return []
+
+    uuids = [uuid for uuid, _ in results]
+    records, _, _ = await driver.execute_query(hydrate_query, uuids=uuids, routing_='r')
+    items_by_uuid = {record['uuid']: get_from_record(record) for record in records}
+
+    # The index doesn't see deletes that cascade, like edges removed along with their nodes
+    collection.remove([uuid for uuid in uuids if uuid not in items_by_uuid])
+
+    return [items_by_uuid[uuid] for uuid in uuids if uuid in items_by_uuid]
 
 
 async def hybrid_node_search(
@@ -995,114 +1496,124 @@ async def episode_mentions_reranker(
 
 def maximal_marginal_relevance(
     query_vector: list[float],
-    candidates: dict[str, list[float]],
+    candidates: Mapping[str, list[float] | NDArray],
     mmr_lambda: float = DEFAULT_MMR_LAMBDA,
     min_score: float = -2.0,
+    max_results: int | None = None,
 ) -> list[str]:
-    start = time()
-    query_array = np.array(query_vector)
-    candidate_arrays: dict[str, NDArray] = {}
-    for uuid, embedding in candidates.items():
-        candidate_arrays[uuid] = normalize_l2(embedding)
-
-    uuids: list[str] = list(candidate_arrays.keys())
-
-    similarity_matrix = np.zeros((len(uuids), len(uuids)))
-
-    for i, uuid_1 in enumerate(uuids):
-        for j, uuid_2 in enumerate(uuids[:i]):
-            u = candidate_arrays[uuid_1]
-            v = candidate_arrays[uuid_2]
-            similarity = np.dot(u, v)
-
-            similarity_matrix[i, j] = similarity
-            similarity_matrix[j, i] = similarity
+    """
+    Rerank candidates with greedy maximal marginal relevance.
 
-    mmr_scores: dict[str, float] = {}
-    for i, uuid in enumerate(uuids):
-        max_sim = np.max(similarity_matrix[i, :])
-        mmr = mmr_lambda * np.dot(query_array, candidate_arrays[uuid]) + (mmr_lambda - 1) * max_sim
-        mmr_scores[uuid] = mmr
+    Candidates are selected one at a time by mmr_lambda * relevance - (1 - mmr_lambda) *
+    redundancy, where relevance is the dot product of the query with the normalized candidate
+    and redundancy is the highest cosine similarity to a candidate already selected. Scores only
+    drop as more candidates are selected, so selection stops at the first score below min_score,
+    or after max_results candidates.
+    """
+    start = time()
+    if len(candidates) == 0:
+        return []
 
-    uuids.sort(reverse=True, key=lambda c: mmr_scores[c])
+    uuids: list[str] = list(candidates.keys())
+    candidate_matrix = np.array(list(candidates.values()), dtype=np.float32)
+    norms = np.linalg.norm(candidate_matrix, axis=1, keepdims=True)
+    np.divide(candidate_matrix, norms, out=candidate_matrix, where=norms != 0)
+
+    relevance = candidate_matrix @ np.asarray(query_vector, dtype=np.float32)
+    similarity_matrix = candidate_matrix @ candidate_matrix.T
+
+    num_results = len(uuids) if max_results is None else min(max_results, len(uuids))
+    redundancy = np.zeros(len(uuids), dtype=np.float32)
+    selected = np.zeros(len(uuids), dtype=bool)
+    reranked_uuids: list[str] = []
+    for _ in range(num_results):
+        mmr_scores = mmr_lambda * relevance - (1 - mmr_lambda) * redundancy
+        mmr_scores[selected] = -np.inf
+        best = int(np.argmax(mmr_scores))
+        if mmr_scores[best] < min_score:
+            break
+
+        reranked_uuids.append(uuids[best])
+        selected[best] = True
+        redundancy = (
+            similarity_matrix[best]
+            if len(reranked_uuids) == 1
+            else np.maximum(redundancy, similarity_matrix[best])
+        )
 
     end = time()
     logger.debug(f'Completed MMR reranking in {(end - start) * 1000} ms')
 
-    return [uuid for uuid in uuids if mmr_scores[uuid] >= min_score]
+    return reranked_uuids
 
 
 async def get_embeddings_for_nodes(
     driver: GraphDriver, nodes: list[EntityNode]
-) -> dict[str, list[float]]:
+) -> dict[str, NDArray[np.float32]]:
     query: LiteralString = """MATCH (n:Entity)
-                              WHERE n.uuid IN $node_uuids
+                              WHERE n.uuid IN $uuids
                               RETURN DISTINCT
                                 n.uuid AS uuid,
-                                n.name_embedding AS name_embedding
+                                n.name_embedding AS embedding
                     """
 
-    results, _, _ = await driver.execute_query(
-        query, node_uuids=[node.uuid for node in nodes], routing_='r'
-    )
-
-    embeddings_dict: dict[str, list[float]] = {}
-    for result in results:
-        uuid: str = result.get('uuid')
-        embedding: list[float] = result.get('name_embedding')
-        if uuid is not None and embedding is not None:
-            embeddings_dict[uuid] = embedding
-
-    return embeddings_dict
+    return await _get_embeddings(driver, {node.uuid: node.name_embedding for node in nodes}, query)
 
 
 async def get_embeddings_for_communities(
     driver: GraphDriver, communities: list[CommunityNode]
-) -> dict[str, list[float]]:
+) -> dict[str, NDArray[np.float32]]:
     query: LiteralString = """MATCH (c:Community)
-                              WHERE c.uuid IN $community_uuids
+                              WHERE c.uuid IN $uuids
                               RETURN DISTINCT
                                 c.uuid AS uuid,
-                                c.name_embedding AS name_embedding
+                                c.name_embedding AS embedding
                     """
 
-    results, _, _ = await driver.execute_query(
-        query,
-        community_uuids=[community.uuid for community in communities],
-        routing_='r',
+    return await _get_embeddings(
+        driver, {community.uuid: community.name_embedding for community in communities}, query
     )
 
-    embeddings_dict: dict[str, list[float]] = {}
-    for result in results:
-        uuid: str = result.get('uuid')
-        embedding: list[float] = result.get('name_embedding')
-        if uuid is not None and embedding is not None:
-            embeddings_dict[uuid] = embedding
-
-    return embeddings_dict
-
 
 async def get_embeddings_for_edges(
     driver: GraphDriver, edges: list[EntityEdge]
-) -> dict[str, list[float]]:
+) -> dict[str, NDArray[np.float32]]:
     query: LiteralString = """MATCH (n:Entity)-[e:RELATES_TO]-(m:Entity)
-                              WHERE e.uuid IN $edge_uuids
+                              WHERE e.uuid IN $uuids
                               RETURN DISTINCT
                                 e.uuid AS uuid,
-                                e.fact_embedding AS fact_embedding
+                                e.fact_embedding AS embedding
                     """
 
-    results, _, _ = await driver.execute_query(
-        query,
-        edge_uuids=[edge.uuid for edge in edges],
-        routing_='r',
-    )
+    return await _get_embeddings(driver, {edge.uuid: edge.fact_embedding for edge in edges}, query)
 
-    embeddings_dict: dict[str, list[float]] = {}
-    for result in results:
-        uuid: str = result.get('uuid')
-        embedding: list[float] = result.get('fact_embedding')
-        if uuid is not None and embedding is not None:
-            embeddings_dict[uuid] = embedding
 
-    return embeddings_dict
+async def _get_embeddings(
+    driver: GraphDriver, carried: dict[str, list[float] | None], query: LiteralString
+) -> dict[str, NDArray[np.float32]]:
+    # Embeddings carried by the search results are used first, then the vector store, and only
+    # the rest are fetched from the database
+    embeddings: dict[str, NDArray[np.float32]] = {
+        uuid: np.asarray(embedding, dtype=np.float32)
+        for uuid, embedding in carried.items()
+        if embedding is not None
+    }
+    vector_store.set_many(embeddings)
+
+    embeddings.update(vector_store.get_many(uuid for uuid in carried if uuid not in embeddings))
+
+    missing = [uuid for uuid in carried if uuid not in embeddings]
+    if len(missing) > 0:
+        results, _, _ = await driver.execute_query(query, uuids=missing, routing_='r')
+
+        fetched: dict[str, NDArray[np.float32]] = {}
+        for result in results:
+            uuid: str = result.get('uuid')
+            embedding: list[float] = result.get('embedding')
+            if uuid is not None and embedding is not None:
+                fetched[uuid] = np.asarray(embedding, dtype=np.float32)
+
+        vector_store.set_many(fetched)
+        embeddings.update(fetched)
+
+    return {uuid: embeddings[uuid] for uuid in carried if uuid in embeddings}
@@ -0,0 +1,89 @@
+"""
+Copyright 2024, Zep Software, Inc.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+from collections import OrderedDict
+from collections.abc import Iterable, Mapping
+
+import numpy as np
+from numpy.typing import NDArray
+
+DEFAULT_VECTOR_STORE_MAX_BYTES = 256 * 2**20
+
+
+class VectorStore:
+    """
+    Process-local LRU of float32 embeddings keyed by node or edge uuid.
+
+    Rerankers look embeddings up here before going back to the database. The store is bounded by
+    the total size of the vectors it holds, evicting the least recently used first. Saving or
+    deleting a node or edge through graphiti_core invalidates its entry, and deleting whole groups
+    clears the store, so it never serves an embedding older than the last write made by this
+    process. Writes made by other processes are not seen.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_VECTOR_STORE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.vectors: OrderedDict[str, NDArray[np.float32]] = OrderedDict()
+        self.size_bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self.vectors)
+
+    def get_many(self, uuids: Iterable[str]) -> dict[str, NDArray[np.float32]]:
+        found: dict[str, NDArray[np.float32]] = {}
+        for uuid in uuids:
+            vector = self.vectors.get(uuid)
+            if vector is None:
+                self.misses += 1
+                continue
+
+            self.vectors.move_to_end(uuid)
+            found[uuid] = vector
+            self.hits += 1
+
+        return found
+
+    def set_many(self, embeddings: Mapping[str, list[float] | NDArray]):
+        for uuid, embedding in embeddings.items():
+            vector = np.asarray(embedding, dtype=np.float32)
+            if vector.nbytes > self.max_bytes:
+                continue
+
+            self._remove(uuid)
+            self.vectors[uuid] = vector
+            self.size_bytes += vector.nbytes
+
+        while self.size_bytes > self.max_bytes:
+            _, vector = self.vectors.popitem(last=False)
+            self.size_bytes -= vector.nbytes
+
+    def invalidate(self, uuids: Iterable[str]):
+        for uuid in uuids:
+            self._remove(uuid)
+
+    def clear(self):
+        self.vectors.clear()
+        self.size_bytes = 0
+
+    def _remove(self, uuid: str):
+        vector = self.vectors.pop(uuid, None)
+        if vector is not None:
+            self.size_bytes -= vector.nbytes
+
+
+vector_store = VectorStore()
@@ -14,11 +14,16 @@ See the License for the specific language governing permissions and
 limitations under the License.
 """
 
+import hashlib
+import json
 import logging
+import os
 import typing
 from datetime import datetime
+from typing import Literal
 
 import numpy as np
+from numpy.typing import NDArray
 from pydantic import BaseModel, Field
 from typing_extensions import Any
 
@@ -38,8 +43,15 @@ from graphiti_core.models.nodes.node_db_queries import (
     EPISODIC_NODE_SAVE_BULK,
 )
 from graphiti_core.nodes import EntityNode, EpisodeType, EpisodicNode, create_entity_node_embeddings
+from graphiti_core.search.search import node_search_batch
+from graphiti_core.search.search_config_recipes import NODE_HYBRID_SEARCH_RRF
+from graphiti_core.search.search_filters import SearchFilters
+from graphiti_core.search.search_utils import get_edge_invalidation_candidates, get_relevant_edges
+from graphiti_core.search.vector_store import vector_store
 from graphiti_core.utils.maintenance.edge_operations import (
+    build_duplicate_of_edges,
     extract_edges,
+    get_edge_types_for_edge,
     resolve_extracted_edge,
 )
 from graphiti_core.utils.maintenance.graph_data_operations import (
@@ -53,8 +65,21 @@ from graphiti_core.utils.maintenance.node_operations import (
 
 logger = logging.getLogger(__name__)
 
+T = typing.TypeVar('T')
+
 CHUNK_SIZE = 10
 
+# Number of rows compared per matrix multiply when blocking dedupe candidates
+DEDUPE_BLOCK_SIZE = 1024
+# Similarities this close to the threshold are recomputed pairwise so that blocking is exact
+SIMILARITY_TOLERANCE = 1e-9
+# Maximum number of extracted nodes resolved against the graph in one LLM call
+RESOLVE_BATCH_SIZE = 10
+# Rows sent per UNWIND statement when writing nodes and edges in bulk
+DEFAULT_WRITE_CHUNK_SIZE = 500
+# Number of episodes committed per transaction by a chunked add_episode_bulk
+DEFAULT_BULK_CHUNK_SIZE = 100
+
 
 class RawEpisode(BaseModel):
     name: str
@@ -65,6 +90,130 @@ class RawEpisode(BaseModel):
     reference_time: datetime
 
 
+class BulkChunkCheckpoint(BaseModel):
+    """
+    Progress of one chunk of a chunked add_episode_bulk, saved to disk so the load can resume.
+
+    status is 'created' once the chunk's episodes have been built, 'extracted' once its nodes and
+    edges have been extracted and deduplicated, and 'committed' once they have been written.
+    """
+
+    fingerprint: str
+    status: Literal['created', 'extracted', 'committed'] = 'created'
+    episodes: list[EpisodicNode]
+    episodic_edges: list[EpisodicEdge] = Field(default_factory=list)
+    entity_nodes: list[EntityNode] = Field(default_factory=list)
+    entity_edges: list[EntityEdge] = Field(default_factory=list)
+
+
+def get_bulk_chunk_fingerprint(bulk_episodes: list[RawEpisode], group_id: str) -> str:
+    payload = json.dumps(
+        [group_id] + [episode.model_dump(mode='json') for episode in bulk_episodes],
+        sort_keys=True,
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def load_bulk_chunk_checkpoint(path: str, fingerprint: str) -> BulkChunkCheckpoint | None:
+    if not os.path.exists(path):
+        return None
+
+    with open(path, encoding='utf-8') as f:
+        checkpoint = BulkChunkCheckpoint.model_validate_json(f.read())
+
+    if checkpoint.fingerprint != fingerprint:
+        raise ValueError(f'Checkpoint {path} was saved for different episodes')
+
+    return checkpoint
+
+
+def save_bulk_chunk_checkpoint(path: str, checkpoint: BulkChunkCheckpoint):
+    # Written to a temporary file and renamed, so a crash never leaves a partial checkpoint
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(checkpoint.model_dump_json())
+    os.replace(tmp_path, path)
+
+
+class CommittedNodeIndex:
+    """
+    Rolling index of the entity nodes committed by earlier chunks of a chunked bulk load.
+
+    Nodes extracted from a later chunk are deduplicated against it with the same rule as
+    find_dedupe_candidates: a committed node is a candidate if its name shares a lowercased word
+    with the extracted node's name, or if their name embeddings have a cosine similarity of at
+    least min_score. Only names, normalized embeddings and the nodes themselves are kept, not the
+    episodes, edges or LLM output of the chunks that produced them.
+    """
+
+    def __init__(self):
+        self.nodes: list[EntityNode] = []
+        self.positions: dict[str, int] = {}
+        self.embeddings: list[NDArray[np.float32]] = []
+        self.token_postings: dict[str, list[int]] = {}
+        self.matrix: NDArray[np.float32] | None = None
+
+    def __len__(self) -> int:
+        return len(self.nodes)
+
+    def __contains__(self, uuid: str) -> bool:
+        return uuid in self.positions
+
+    def get(self, uuid: str) -> EntityNode:
+        return self.nodes[self.positions[uuid]]
+
+    def add(self, nodes: list[EntityNode]):
+        for node in nodes:
+            embedding = (
+                np.asarray(normalize_l2(node.name_embedding), dtype=np.float32)
+                if node.name_embedding
+                else np.zeros(0, dtype=np.float32)
+            )
+            if node.uuid in self.positions:
+                # A later chunk merged into a committed node and wrote it again
+                position = self.positions[node.uuid]
+                self.nodes[position] = node
+                self.embeddings[position] = embedding
+                continue
+
+            position = len(self.nodes)
+            self.positions[node.uuid] = position
+            self.nodes.append(node)
+            self.embeddings.append(embedding)
+            for token in set(node.name.lower().split()):
+                self.token_postings.setdefault(token, []).append(position)
+
+        self.matrix = None
+
+    def find_candidates(self, nodes: list[EntityNode], min_score: float) -> list[list[EntityNode]]:
+        if not self.nodes or not nodes:
+            return [[] for _ in nodes]
+
+        dim = max(
+            max(len(embedding) for embedding in self.embeddings),
+            max(len(node.name_embedding or []) for node in nodes),
+        )
+        if self.matrix is None or self.matrix.shape[1] != dim:
+            self.matrix = np.zeros((len(self.nodes), dim), dtype=np.float32)
+            for position, embedding in enumerate(self.embeddings):
+                self.matrix[position, : len(embedding)] = embedding
+
+        queries = np.zeros((len(nodes), dim), dtype=np.float32)
+        for row, node in enumerate(nodes):
+            if node.name_embedding:
+                queries[row, : len(node.name_embedding)] = normalize_l2(node.name_embedding)
+
+        mask = (queries @ self.matrix.T) >= min_score
+        candidates: list[list[EntityNode]] = []
+        for row, node in enumerate(nodes):
+            for token in set(node.name.lower().split()):
+                mask[row, self.token_postings.get(token, [])] = True
+            candidates.append([self.nodes[position] for position in np.flatnonzero(mask[row])])
+
+        return candidates
+
+
 async def retrieve_previous_episodes_bulk(
     driver: GraphDriver, episodes: list[EpisodicNode]
 ) -> list[tuple[EpisodicNode, list[EpisodicNode]]]:
@@ -90,7 +239,11 @@ async def add_nodes_and_edges_bulk(
     entity_nodes: list[EntityNode],
     entity_edges: list[EntityEdge],
     embedder: EmbedderClient,
+    chunk_size: int = DEFAULT_WRITE_CHUNK_SIZE,
 ):
+    # Embed before the transaction opens, so it isn't held open across embedding API calls
+    await create_missing_embeddings(embedder, entity_nodes, entity_edges)
+
     session = driver.session()
     try:
         await session.execute_write(
@@ -101,10 +254,85 @@ async def add_nodes_and_edges_bulk(
             entity_edges,
             embedder,
             driver=driver,
+            chunk_size=chunk_size,
         )
     finally:
         await session.close()
 
+    # Updated once the transaction has committed, so a rolled back write never reaches the index
+    if driver.ann_index is not None:
+        driver.ann_index.entities.upsert(
+            (node.uuid, node.group_id, node.name_embedding) for node in entity_nodes
+        )
+        driver.ann_index.edges.upsert(
+            (edge.uuid, edge.group_id, edge.fact_embedding) for edge in entity_edges
+        )
+
+    # Bumped once the transaction has committed, so no search can cache the old graph after it
+    if driver.search_cache is not None:
+        driver.search_cache.bump(
+            {item.group_id for item in [*episodic_nodes, *entity_nodes, *entity_edges]}
+        )
+
+
+async def create_missing_embeddings(
+    embedder: EmbedderClient, entity_nodes: list[EntityNode], entity_edges: list[EntityEdge]
+):
+    await semaphore_gather(
+        create_entity_node_embeddings(
+            embedder, [node for node in entity_nodes if node.name_embedding is None]
+        ),
+        create_entity_edge_embeddings(
+            embedder, [edge for edge in entity_edges if edge.fact_embedding is None]
+        ),
+    )
+
+
+def _chunks(items: list[T], chunk_size: int) -> typing.Iterator[list[T]]:
+    for start in range(0, len(items), chunk_size):
+        yield items[start : start + chunk_size]
+
+
+def _episode_row(episode: EpisodicNode) -> dict[str, Any]:
+    row = dict(episode)
+    row['source'] = str(row['source'].value)
+    return row
+
+
+def _entity_node_row(node: EntityNode) -> dict[str, Any]:
+    row: dict[str, Any] = {
+        'uuid': node.uuid,
+        'name': node.name,
+        'name_embedding': node.name_embedding,
+        'group_id': node.group_id,
+        'summary': node.summary,
+        'created_at': node.created_at,
+    }
+
+    row.update(node.attributes or {})
+    row['labels'] = list(set(node.labels + ['Entity']))
+    return row
+
+
+def _entity_edge_row(edge: EntityEdge) -> dict[str, Any]:
+    row: dict[str, Any] = {
+        'uuid': edge.uuid,
+        'source_node_uuid': edge.source_node_uuid,
+        'target_node_uuid': edge.target_node_uuid,
+        'name': edge.name,
+        'fact': edge.fact,
+        'fact_embedding': edge.fact_embedding,
+        'group_id': edge.group_id,
+        'episodes': edge.episodes,
+        'created_at': edge.created_at,
+        'expired_at': edge.expired_at,
+        'valid_at': edge.valid_at,
+        'invalid_at': edge.invalid_at,
+    }
+
+    row.update(edge.attributes or {})
+    return row
+
 
 async def add_nodes_and_edges_bulk_tx(
     tx: GraphDriverSession,
@@ -114,57 +342,30 @@ async def add_nodes_and_edges_bulk_tx(
     entity_edges: list[EntityEdge],
     embedder: EmbedderClient,
     driver: GraphDriver,
+    chunk_size: int = DEFAULT_WRITE_CHUNK_SIZE,
 ):
-    episodes = [dict(episode) for episode in episodic_nodes]
-    for episode in episodes:
-        episode['source'] = str(episode['source'].value)
-    nodes: list[dict[str, Any]] = []
-    for node in entity_nodes:
-        if node.name_embedding is None:
-            await node.generate_name_embedding(embedder)
-        entity_data: dict[str, Any] = {
-            'uuid': node.uuid,
-            'name': node.name,
-            'name_embedding': node.name_embedding,
-            'group_id': node.group_id,
-            'summary': node.summary,
-            'created_at': node.created_at,
-        }
+    # A no-op when called through add_nodes_and_edges_bulk, which embeds before the transaction
+    await create_missing_embeddings(embedder, entity_nodes, entity_edges)
 
-        entity_data.update(node.attributes or {})
-        entity_data['labels'] = list(set(node.labels + ['Entity']))
-        nodes.append(entity_data)
-
-    edges: list[dict[str, Any]] = []
-    for edge in entity_edges:
-        if edge.fact_embedding is None:
-            await edge.generate_embedding(embedder)
-        edge_data: dict[str, Any] = {
-            'uuid': edge.uuid,
-            'source_node_uuid': edge.source_node_uuid,
-            'target_node_uuid': edge.target_node_uuid,
-            'name': edge.name,
-            'fact': edge.fact,
-            'fact_embedding': edge.fact_embedding,
-            'group_id': edge.group_id,
-            'episodes': edge.episodes,
-            'created_at': edge.created_at,
-            'expired_at': edge.expired_at,
-            'valid_at': edge.valid_at,
-            'invalid_at': edge.invalid_at,
-        }
+    # Rows are built and sent chunk_size at a time, so no statement carries the whole batch.
+    # Nodes are written before the edges that match them.
+    for chunk in _chunks(episodic_nodes, chunk_size):
+        await tx.run(EPISODIC_NODE_SAVE_BULK, episodes=[_episode_row(episode) for episode in chunk])
 
-        edge_data.update(edge.attributes or {})
-        edges.append(edge_data)
+    for chunk in _chunks(entity_nodes, chunk_size):
+        nodes = [_entity_node_row(node) for node in chunk]
+        entity_node_save_bulk = get_entity_node_save_bulk_query(nodes, driver.provider)
+        await tx.run(entity_node_save_bulk, nodes=nodes)
+
+    for chunk in _chunks(episodic_edges, chunk_size):
+        await tx.run(EPISODIC_EDGE_SAVE_BULK, episodic_edges=[edge.model_dump() for edge in chunk])
 
-    await tx.run(EPISODIC_NODE_SAVE_BULK, episodes=episodes)
-    entity_node_save_bulk = get_entity_node_save_bulk_query(nodes, driver.provider)
-    await tx.run(entity_node_save_bulk, nodes=nodes)
-    await tx.run(
-        EPISODIC_EDGE_SAVE_BULK, episodic_edges=[edge.model_dump() for edge in episodic_edges]
-    )
     entity_edge_save_bulk = get_entity_edge_save_bulk_query(driver.provider)
-    await tx.run(entity_edge_save_bulk, entity_edges=edges)
+    for chunk in _chunks(entity_edges, chunk_size):
+        await tx.run(entity_edge_save_bulk, entity_edges=[_entity_edge_row(edge) for edge in chunk])
+
+    vector_store.invalidate([node.uuid for node in entity_nodes])
+    vector_store.invalidate([edge.uuid for edge in entity_edges])
 
 
 async def extract_nodes_and_edges_bulk(
@@ -205,6 +406,7 @@ async def dedupe_nodes_bulk(
     extracted_nodes: list[list[EntityNode]],
     episode_tuples: list[tuple[EpisodicNode, list[EpisodicNode]]],
     entity_types: dict[str, BaseModel] | None = None,
+    committed_nodes: CommittedNodeIndex | None = None,
 ) -> tuple[dict[str, list[EntityNode]], dict[str, str]]:
     embedder = clients.embedder
     min_score = 0.8
@@ -215,33 +417,28 @@ async def dedupe_nodes_bulk(
     )
 
     # Find similar results
+    flat_nodes = [node for nodes in extracted_nodes for node in nodes]
+    node_by_uuid: dict[str, EntityNode] = {node.uuid: node for node in flat_nodes}
+    candidate_indices = find_dedupe_candidates(
+        [node.name for node in flat_nodes],
+        [node.name_embedding for node in flat_nodes],
+        [len(nodes) for nodes in extracted_nodes],
+        min_score,
+    )
+
     dedupe_tuples: list[tuple[list[EntityNode], list[EntityNode]]] = []
-    for i, nodes_i in enumerate(extracted_nodes):
-        existing_nodes: list[EntityNode] = []
-        for j, nodes_j in enumerate(extracted_nodes):
-            if i == j:
-                continue
-            existing_nodes += nodes_j
-
-        candidates_i: list[EntityNode] = []
-        for node in nodes_i:
-            for existing_node in existing_nodes:
-                # Approximate BM25 by checking for word overlaps (this is faster than creating many in-memory indices)
-                # This approach will cast a wider net than BM25, which is ideal for this use case
-                node_words = set(node.name.lower().split())
-                existing_node_words = set(existing_node.name.lower().split())
-                has_overlap = not node_words.isdisjoint(existing_node_words)
-                if has_overlap:
-                    candidates_i.append(existing_node)
-                    continue
-
-                # Check for semantic similarity even if there is no overlap
-                similarity = np.dot(
-                    normalize_l2(node.name_embedding or []),
-                    normalize_l2(existing_node.name_embedding or []),
-                )
-                if similarity >= min_score:
-                    candidates_i.append(existing_node)
+    offset = 0
+    for nodes_i in extracted_nodes:
+        candidates_i: list[EntityNode] = [
+            flat_nodes[j]
+            for k in range(offset, offset + len(nodes_i))
+            for j in candidate_indices[k]
+        ]
+        offset += len(nodes_i)
+
+        if committed_nodes is not None:
+            for committed_candidates in committed_nodes.find_candidates(nodes_i, min_score):
+                candidates_i.extend(committed_candidates)
 
         dedupe_tuples.append((nodes_i, candidates_i))
 
@@ -264,7 +461,16 @@ async def dedupe_nodes_bulk(
 
     # Collect all duplicate pairs sorted by uuid
     duplicate_pairs: list[tuple[EntityNode, EntityNode]] = []
-    for _, _, duplicates in bulk_node_resolutions:
+    for _, resolution_uuid_map, duplicates in bulk_node_resolutions:
+        if committed_nodes is not None:
+            # Nodes resolved to a committed node are merged into it
+            duplicates = duplicates + [
+                (committed_nodes.get(resolved_uuid), node_by_uuid[extracted_uuid])
+                for extracted_uuid, resolved_uuid in resolution_uuid_map.items()
+                if resolved_uuid != extracted_uuid
+                and resolved_uuid in committed_nodes
+                and extracted_uuid in node_by_uuid
+            ]
         for duplicate in duplicates:
             n, m = duplicate
             if n.uuid < m.uuid:
@@ -284,9 +490,22 @@ async def dedupe_nodes_bulk(
     # Now we compress the duplicate_map, so that 3 -> 2 and 2 -> becomes 3 -> 1 (sorted by uuid)
     compressed_map: dict[str, str] = compress_uuid_map(duplicate_map)
 
-    node_uuid_map: dict[str, EntityNode] = {
-        node.uuid: node for nodes in extracted_nodes for node in nodes
-    }
+    node_uuid_map: dict[str, EntityNode] = dict(node_by_uuid)
+
+    if committed_nodes is not None:
+        # A committed node is already in the graph, so it is kept over the nodes merged into it
+        committed_by_root: dict[str, str] = {}
+        for uuid, root in compressed_map.items():
+            if uuid in committed_nodes and (
+                root not in committed_by_root or uuid < committed_by_root[root]
+            ):
+                committed_by_root[root] = uuid
+        compressed_map = {
+            uuid: committed_by_root.get(root, root) for uuid, root in compressed_map.items()
+        }
+        node_uuid_map.update(
+            {uuid: committed_nodes.get(uuid) for uuid in committed_by_root.values()}
+        )
 
     nodes_by_episode: dict[str, list[EntityNode]] = {}
     for i, nodes in enumerate(extracted_nodes):
@@ -316,35 +535,21 @@ async def dedupe_edges_bulk(
     )
 
     # Find similar results
+    flat_edges = [edge for edges in extracted_edges for edge in edges]
+    candidate_indices = find_dedupe_candidates(
+        [edge.fact for edge in flat_edges],
+        [edge.fact_embedding for edge in flat_edges],
+        [len(edges) for edges in extracted_edges],
+        min_score,
+    )
+
     dedupe_tuples: list[tuple[EpisodicNode, EntityEdge, list[EntityEdge]]] = []
+    offset = 0
     for i, edges_i in enumerate(extracted_edges):
-        existing_edges: list[EntityEdge] = []
-        for j, edges_j in enumerate(extracted_edges):
-            if i == j:
-                continue
-            existing_edges += edges_j
-
-        for edge in edges_i:
-            candidates: list[EntityEdge] = []
-            for existing_edge in existing_edges:
-                # Approximate BM25 by checking for word overlaps (this is faster than creating many in-memory indices)
-                # This approach will cast a wider net than BM25, which is ideal for this use case
-                edge_words = set(edge.fact.lower().split())
-                existing_edge_words = set(existing_edge.fact.lower().split())
-                has_overlap = not edge_words.isdisjoint(existing_edge_words)
-                if has_overlap:
-                    candidates.append(existing_edge)
-                    continue
-
-                # Check for semantic similarity even if there is no overlap
-                similarity = np.dot(
-                    normalize_l2(edge.fact_embedding or []),
-                    normalize_l2(existing_edge.fact_embedding or []),
-                )
-                if similarity >= min_score:
-                    candidates.append(existing_edge)
-
+        for k, edge in enumerate(edges_i, start=offset):
+            candidates = [flat_edges[j] for j in candidate_indices[k]]
             dedupe_tuples.append((episode_tuples[i][0], edge, candidates))
+        offset += len(edges_i)
 
     bulk_edge_resolutions: list[
         tuple[EntityEdge, EntityEdge, list[EntityEdge]]
@@ -393,6 +598,275 @@ async def dedupe_edges_bulk(
     return edges_by_episode
 
 
+async def resolve_nodes_against_graph_bulk(
+    clients: GraphitiClients,
+    nodes_by_episode: dict[str, list[EntityNode]],
+    episode_tuples: list[tuple[EpisodicNode, list[EpisodicNode]]],
+    created_at: datetime,
+    entity_types: dict[str, BaseModel] | None = None,
+    batch_size: int = RESOLVE_BATCH_SIZE,
+) -> tuple[dict[str, list[EntityNode]], dict[str, str], list[EntityEdge]]:
+    """
+    Resolve the nodes of a bulk batch, already deduplicated within the batch, against the graph.
+
+    Candidates for every node are found with one batched fulltext and one batched similarity
+    query per group, using the embeddings the nodes already have. Nodes that share a candidate
+    are resolved together, up to batch_size nodes per LLM call, with the episodes that mention
+    them as context. Nodes without candidates are kept without calling the LLM.
+
+    Returns nodes_by_episode with duplicates replaced by the existing nodes, the uuid map from
+    the extracted to the existing nodes, and IS_DUPLICATE_OF edges for the duplicates found.
+    """
+    episodes_by_uuid = {episode.uuid: (episode, previous) for episode, previous in episode_tuples}
+
+    # Each unique node with the first episode that mentions it
+    node_episodes: dict[str, str] = {}
+    nodes: list[EntityNode] = []
+    for episode_uuid, episode_nodes in nodes_by_episode.items():
+        for node in episode_nodes:
+            if node.uuid not in node_episodes:
+                node_episodes[node.uuid] = episode_uuid
+                nodes.append(node)
+
+    await create_entity_node_embeddings(
+        clients.embedder, [node for node in nodes if node.name_embedding is None]
+    )
+
+    node_idxs_by_group: dict[str, list[int]] = {}
+    for i, node in enumerate(nodes):
+        node_idxs_by_group.setdefault(node.group_id, []).append(i)
+
+    config = NODE_HYBRID_SEARCH_RRF
+    results_by_group: list[list[list[EntityNode]]] = await semaphore_gather(
+        *[
+            node_search_batch(
+                clients.driver,
+                [nodes[i].name for i in node_idxs],
+                [nodes[i].name_embedding or [] for i in node_idxs],
+                [group_id],
+                config.node_config,
+                SearchFilters(),
+                config.limit,
+                config.reranker_min_score,
+            )
+            for group_id, node_idxs in node_idxs_by_group.items()
+        ]
+    )
+
+    candidates: list[list[EntityNode]] = [[] for _ in nodes]
+    for node_idxs, group_results in zip(node_idxs_by_group.values(), results_by_group, strict=True):
+        for i, result in zip(node_idxs, group_results, strict=True):
+            # A node committed by an earlier chunk finds itself
+            candidates[i] = [candidate for candidate in result if candidate.uuid != nodes[i].uuid]
+
+    # Group the nodes that share candidates, so related nodes are resolved in the same prompt
+    components: dict[str, list[int]] = {}
+    candidate_components: dict[str, str] = {}
+    for i in range(len(nodes)):
+        if not candidates[i]:
+            continue
+        roots = {
+            candidate_components[candidate.uuid]
+            for candidate in candidates[i]
+            if candidate.uuid in candidate_components
+        }
+        merged = [i] + [j for root in roots for j in components.pop(root)]
+        root = nodes[i].uuid
+        components[root] = merged
+        for j in merged:
+            for candidate in candidates[j]:
+                candidate_components[candidate.uuid] = root
+
+    batches: list[list[int]] = [
+        sorted(component)[start : start + batch_size]
+        for component in components.values()
+        for start in range(0, len(component), batch_size)
+    ]
+
+    batch_contexts: list[tuple[EpisodicNode, list[EpisodicNode]]] = []
+    for batch in batches:
+        episode_uuids = list(dict.fromkeys(node_episodes[nodes[i].uuid] for i in batch))
+        episode, previous_episodes = episodes_by_uuid[episode_uuids[0]]
+        other_episodes = [episodes_by_uuid[uuid][0] for uuid in episode_uuids[1:]]
+        batch_contexts.append((episode, previous_episodes + other_episodes))
+
+    resolutions: list[
+        tuple[list[EntityNode], dict[str, str], list[tuple[EntityNode, EntityNode]]]
+    ] = await semaphore_gather(
+        *[
+            resolve_extracted_nodes(
+                clients,
+                [nodes[i] for i in batch],
+                episode,
+                previous_episodes,
+                entity_types,
+                existing_nodes_override=[candidate for i in batch for candidate in candidates[i]],
+            )
+            for batch, (episode, previous_episodes) in zip(batches, batch_contexts, strict=True)
+        ]
+    )
+
+    uuid_map: dict[str, str] = {}
+    resolved_by_uuid: dict[str, EntityNode] = {}
+    duplicate_of_edges: list[EntityEdge] = []
+    for (resolved_nodes, resolution_uuid_map, duplicates), (episode, _) in zip(
+        resolutions, batch_contexts, strict=True
+    ):
+        for resolved_node in resolved_nodes:
+            resolved_by_uuid[resolved_node.uuid] = resolved_node
+        uuid_map.update(
+            {
+                extracted_uuid: resolved_uuid
+                for extracted_uuid, resolved_uuid in resolution_uuid_map.items()
+                if extracted_uuid != resolved_uuid
+            }
+        )
+        duplicate_of_edges.extend(build_duplicate_of_edges(episode, created_at, duplicates))
+
+    resolved_nodes_by_episode: dict[str, list[EntityNode]] = {}
+    for episode_uuid, episode_nodes in nodes_by_episode.items():
+        resolved: dict[str, EntityNode] = {}
+        for node in episode_nodes:
+            resolved_uuid = uuid_map.get(node.uuid, node.uuid)
+            resolved[resolved_uuid] = resolved_by_uuid.get(resolved_uuid, node)
+        resolved_nodes_by_episode[episode_uuid] = list(resolved.values())
+
+    return resolved_nodes_by_episode, uuid_map, duplicate_of_edges
+
+
+async def resolve_edges_against_graph_bulk(
+    clients: GraphitiClients,
+    edges: list[EntityEdge],
+    episodes_by_uuid: dict[str, EpisodicNode],
+    entities: list[EntityNode],
+    edge_types: dict[str, BaseModel],
+    edge_type_map: dict[tuple[str, str], list[str]],
+) -> tuple[list[EntityEdge], list[EntityEdge]]:
+    """
+    Resolve the edges of a bulk batch, already deduplicated within the batch, against the graph.
+
+    Duplicate and invalidation candidates for all edges are fetched with one UNWIND query each,
+    and only edges with candidates are sent to the LLM. Returns the resolved edges, with
+    duplicates replaced by the existing edges, and the existing edges they invalidate.
+    """
+    if len(edges) == 0:
+        return [], []
+
+    await create_entity_edge_embeddings(
+        clients.embedder, [edge for edge in edges if edge.fact_embedding is None]
+    )
+
+    related_edges_lists, invalidation_candidates_lists = await semaphore_gather(
+        get_relevant_edges(clients.driver, edges, SearchFilters()),
+        get_edge_invalidation_candidates(clients.driver, edges, SearchFilters(), 0.2),
+    )
+
+    uuid_entity_map: dict[str, EntityNode] = {entity.uuid: entity for entity in entities}
+
+    results: list[tuple[EntityEdge, list[EntityEdge], list[EntityEdge]]] = await semaphore_gather(
+        *[
+            resolve_extracted_edge(
+                clients.llm_client,
+                edge,
+                [candidate for candidate in related_edges if candidate.uuid != edge.uuid],
+                [candidate for candidate in invalidation_candidates if candidate.uuid != edge.uuid],
+                episodes_by_uuid[edge.episodes[0]],
+                get_edge_types_for_edge(edge, uuid_entity_map, edge_types, edge_type_map),
+            )
+            for edge, related_edges, invalidation_candidates in zip(
+                edges, related_edges_lists, invalidation_candidates_lists, strict=True
+            )
+        ]
+    )
+
+    # Several edges of the batch may resolve to the same existing edge
+    resolved_edges: dict[str, EntityEdge] = {}
+    invalidated_edges: dict[str, EntityEdge] = {}
+    for resolved_edge, invalidated, _ in results:
+        resolved_edges[resolved_edge.uuid] = resolved_edge
+        for edge in invalidated:
+            invalidated_edges[edge.uuid] = edge
+
+    for uuid in resolved_edges:
+        invalidated_edges.pop(uuid, None)
+
+    return list(resolved_edges.values()), list(invalidated_edges.values())
+
+
+def find_dedupe_candidates(
+    texts: list[str],
+    embeddings: list[list[float] | None],
+    group_sizes: list[int],
+    min_score: float,
+    block_size: int = DEDUPE_BLOCK_SIZE,
+) -> list[list[int]]:
+    """
+    Find dedupe candidates for every item across all other groups of a bulk batch.
+
+    Items are laid out flat, group after group, with group_sizes giving the number of items in
+    each group (one group per episode). An item is a candidate for another item from a different
+    group if their texts share a lowercased word, or if the cosine similarity of their embeddings
+    is at least min_score.
+
+    Word overlaps are found through an inverted token index and similarities through one
+    normalized embedding matrix multiplied block_size rows at a time, so the result is the same
+    as comparing every pair of items but without a Python loop over the pairs.
+
+    Returns, for every item, the flat indices of its candidates in ascending order.
+    """
+    n = len(texts)
+    if n == 0:
+        return []
+
+    group_bounds: list[tuple[int, int]] = []
+    start = 0
+    for size in group_sizes:
+        group_bounds += [(start, start + size)] * size
+        start += size
+
+    # Inverted index of lowercased words -> flat indices of the items containing them
+    item_tokens = [set(text.lower().split()) for text in texts]
+    token_postings: dict[str, list[int]] = {}
+    for k, tokens in enumerate(item_tokens):
+        for token in tokens:
+            token_postings.setdefault(token, []).append(k)
+    token_index: dict[str, NDArray[np.int64]] = {
+        token: np.array(postings, dtype=np.int64) for token, postings in token_postings.items()
+    }
+
+    # Missing embeddings are treated as zero vectors, the same as a pairwise dot product of
+    # an empty embedding, so they only match when min_score <= 0
+    dim = max((len(embedding or []) for embedding in embeddings), default=0)
+    matrix = np.zeros((n, dim), dtype=np.float64)
+    for k, embedding in enumerate(embeddings):
+        if embedding:
+            matrix[k, : len(embedding)] = normalize_l2(embedding)
+
+    candidates: list[list[int]] = []
+    for block_start in range(0, n, block_size):
+        block_end = min(block_start + block_size, n)
+        similarities = matrix[block_start:block_end] @ matrix.T
+        mask = similarities >= min_score
+
+        # Matrix multiplication may round differently than pairwise dot products, so settle
+        # borderline pairs the same way a pairwise comparison would
+        rows, cols = np.nonzero(np.abs(similarities - min_score) <= SIMILARITY_TOLERANCE)
+        for row, col in zip(rows, cols, strict=True):
+            similarity = np.dot(matrix[block_start + row], matrix[col])
+            mask[row, col] = similarity >= min_score
+
+        for row in range(block_end - block_start):
+            k = block_start + row
+            if item_tokens[k]:
+                mask[row, np.concatenate([token_index[token] for token in item_tokens[k]])] = True
+
+            group_start, group_end = group_bounds[k]
+            mask[row, group_start:group_end] = False
+            candidates.append(np.flatnonzero(mask[row]).tolist())
+
+    return candidates
+
+
 def compress_uuid_map(uuid_map: dict[str, str]) -> dict[str, str]:
     compressed_map = {}
 
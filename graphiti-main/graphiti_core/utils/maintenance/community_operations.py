@@ -1,28 +1,52 @@
 import asyncio
+import hashlib
+import json
 import logging
 from collections import defaultdict
+from collections.abc import MutableMapping
+from datetime import datetime
+from typing import Any
 
-from pydantic import BaseModel
+import numpy as np
+from numpy.typing import NDArray
+from pydantic import BaseModel, ConfigDict
 
 from graphiti_core.driver.driver import GraphDriver
 from graphiti_core.edges import CommunityEdge
 from graphiti_core.embedder import EmbedderClient
-from graphiti_core.helpers import semaphore_gather
+from graphiti_core.helpers import parse_db_date, semaphore_gather
 from graphiti_core.llm_client import LLMClient
 from graphiti_core.nodes import CommunityNode, EntityNode, get_community_node_from_record
 from graphiti_core.prompts import prompt_library
+from graphiti_core.prompts.models import Message
 from graphiti_core.prompts.summarize_nodes import Summary, SummaryDescription
+from graphiti_core.search.vector_store import vector_store
 from graphiti_core.utils.datetime_utils import utc_now
 from graphiti_core.utils.maintenance.edge_operations import build_community_edges
 
 MAX_COMMUNITY_BUILD_CONCURRENCY = 10
+DEFAULT_SUMMARY_FAN_IN = 2
+PROJECTION_PAGE_SIZE = 10000
+MAX_LABEL_PROPAGATION_ITERATIONS = 100
 
 logger = logging.getLogger(__name__)
 
 
-class Neighbor(BaseModel):
-    node_uuid: str
-    edge_count: int
+class CommunityProjection(BaseModel):
+    """
+    RELATES_TO adjacency of one group, stored in compressed sparse row form.
+
+    Nodes are identified by their position in uuids. The neighbors of node i are
+    indices[indptr[i]:indptr[i + 1]], with the number of edges to each neighbor in the same
+    slice of weights.
+    """
+
+    uuids: list[str]
+    indptr: NDArray[np.int64]
+    indices: NDArray[np.int64]
+    weights: NDArray[np.int64]
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
 
 
 async def get_community_clusters(
@@ -31,35 +55,10 @@ async def get_community_clusters(
     community_clusters: list[list[EntityNode]] = []
 
     if group_ids is None:
-        group_id_values, _, _ = await driver.execute_query(
-            """
-        MATCH (n:Entity WHERE n.group_id IS NOT NULL)
-        RETURN 
-            collect(DISTINCT n.group_id) AS group_ids
-        """,
-        )
-
-        group_ids = group_id_values[0]['group_ids'] if group_id_values else []
+        group_ids = await get_entity_group_ids(driver)
 
     for group_id in group_ids:
-        projection: dict[str, list[Neighbor]] = {}
-        nodes = await EntityNode.get_by_group_ids(driver, [group_id])
-        for node in nodes:
-            records, _, _ = await driver.execute_query(
-                """
-            MATCH (n:Entity {group_id: $group_id, uuid: $uuid})-[r:RELATES_TO]-(m: Entity {group_id: $group_id})
-            WITH count(r) AS count, m.uuid AS uuid
-            RETURN
-                uuid,
-                count
-            """,
-                uuid=node.uuid,
-                group_id=group_id,
-            )
-
-            projection[node.uuid] = [
-                Neighbor(node_uuid=record['uuid'], edge_count=record['count']) for record in records
-            ]
+        projection = await get_community_projection(driver, group_id)
 
         cluster_uuids = label_propagation(projection)
 
@@ -74,65 +73,330 @@ async def get_community_clusters(
     return community_clusters
 
 
-def label_propagation(projection: dict[str, list[Neighbor]]) -> list[list[str]]:
+async def get_entity_group_ids(driver: GraphDriver) -> list[str]:
+    group_id_values, _, _ = await driver.execute_query(
+        """
+    MATCH (n:Entity WHERE n.group_id IS NOT NULL)
+    RETURN 
+        collect(DISTINCT n.group_id) AS group_ids
+    """,
+    )
+
+    return group_id_values[0]['group_ids'] if group_id_values else []
+
+
+async def get_community_projection(
+    driver: GraphDriver, group_id: str, page_size: int = PROJECTION_PAGE_SIZE
+) -> CommunityProjection:
+    records, _, _ = await driver.execute_query(
+        """
+    MATCH (n:Entity {group_id: $group_id})
+    RETURN n.uuid AS uuid
+    ORDER BY n.uuid DESC
+    """,
+        group_id=group_id,
+        routing_='r',
+    )
+    uuids: list[str] = [record['uuid'] for record in records]
+
+    return _build_projection(
+        uuids, await _get_projection_records(driver, group_id, uuids, page_size)
+    )
+
+
+async def get_local_community_projection(
+    driver: GraphDriver,
+    group_id: str,
+    changed_uuids: list[str],
+    page_size: int = PROJECTION_PAGE_SIZE,
+) -> tuple[CommunityProjection, int]:
+    """
+    Project the neighbourhood of the changed entities.
+
+    The changed entities and their direct neighbours come first in the projection, with their
+    full adjacency. They are followed by the boundary: neighbours of those nodes that are
+    included so their communities are counted, but have no adjacency of their own.
+    Returns the projection and the number of nodes before the boundary.
+    """
+    changed_records = await _get_projection_records(driver, group_id, changed_uuids, page_size)
+
+    affected_uuids = list(changed_uuids)
+    seen = set(changed_uuids)
+    for record in changed_records:
+        if record['target_uuid'] not in seen:
+            seen.add(record['target_uuid'])
+            affected_uuids.append(record['target_uuid'])
+
+    records = changed_records + await _get_projection_records(
+        driver, group_id, affected_uuids[len(changed_uuids) :], page_size
+    )
+
+    uuids = list(affected_uuids)
+    for record in records:
+        if record['target_uuid'] not in seen:
+            seen.add(record['target_uuid'])
+            uuids.append(record['target_uuid'])
+
+    return _build_projection(uuids, records), len(affected_uuids)
+
+
+async def _get_projection_records(
+    driver: GraphDriver, group_id: str, uuids: list[str], page_size: int
+) -> list[Any]:
+    # Edge counts are aggregated in the database, one page of source nodes per query
+    pages: list[list[Any]] = await semaphore_gather(
+        *[
+            _get_projection_page(driver, group_id, uuids[i : i + page_size])
+            for i in range(0, len(uuids), page_size)
+        ]
+    )
+
+    return [record for page in pages for record in page]
+
+
+def _build_projection(uuids: list[str], records: list[Any]) -> CommunityProjection:
+    uuid_idx = {uuid: i for i, uuid in enumerate(uuids)}
+
+    sources: list[int] = []
+    targets: list[int] = []
+    counts: list[int] = []
+    for record in records:
+        source_idx = uuid_idx.get(record['source_uuid'])
+        target_idx = uuid_idx.get(record['target_uuid'])
+        if source_idx is None or target_idx is None:
+            continue
+        sources.append(source_idx)
+        targets.append(target_idx)
+        counts.append(record['count'])
+
+    source_array = np.array(sources, dtype=np.int64)
+    order = np.argsort(source_array, kind='stable')
+    indptr = np.zeros(len(uuids) + 1, dtype=np.int64)
+    np.cumsum(np.bincount(source_array, minlength=len(uuids)), out=indptr[1:])
+
+    return CommunityProjection(
+        uuids=uuids,
+        indptr=indptr,
+        indices=np.array(targets, dtype=np.int64)[order],
+        weights=np.array(counts, dtype=np.int64)[order],
+    )
+
+
+async def _get_projection_page(driver: GraphDriver, group_id: str, uuids: list[str]) -> list[Any]:
+    records, _, _ = await driver.execute_query(
+        """
+    UNWIND $uuids AS uuid
+    MATCH (n:Entity {group_id: $group_id, uuid: uuid})-[r:RELATES_TO]-(m:Entity {group_id: $group_id})
+    WITH n.uuid AS source_uuid, m.uuid AS target_uuid, count(r) AS count
+    RETURN
+        source_uuid,
+        target_uuid,
+        count
+    """,
+        uuids=uuids,
+        group_id=group_id,
+        routing_='r',
+    )
+
+    return records
+
+
+def label_propagation(
+    projection: CommunityProjection, max_iterations: int = MAX_LABEL_PROPAGATION_ITERATIONS
+) -> list[list[str]]:
     # Implement the label propagation community detection algorithm.
     # 1. Start with each node being assigned its own community
     # 2. Each node will take on the community of the plurality of its neighbors
     # 3. Ties are broken by going to the largest community
-    # 4. Continue until no communities change during propagation
+    # 4. Continue until no communities change during propagation, or max_iterations is reached
+    #    (all nodes update at once, so two strongly linked nodes can swap labels forever)
+    #
+    # A node can only change if its own community or a neighbor's community changed in the
+    # previous sweep, so each sweep only revisits that frontier.
+
+    community_map = propagate_labels(
+        projection, np.arange(len(projection.uuids), dtype=np.int64), max_iterations=max_iterations
+    )
+
+    # Clusters are returned in order of their first member, with members in projection order
+    member_order = np.argsort(community_map, kind='stable')
+    _, first_members, cluster_sizes = np.unique(
+        community_map[member_order], return_index=True, return_counts=True
+    )
+    cluster_order = np.argsort(member_order[first_members], kind='stable')
+    clusters = [
+        [projection.uuids[i] for i in member_order[start : start + size].tolist()]
+        for start, size in zip(
+            first_members[cluster_order].tolist(),
+            cluster_sizes[cluster_order].tolist(),
+            strict=True,
+        )
+    ]
 
-    community_map = {uuid: i for i, uuid in enumerate(projection.keys())}
+    return clusters
 
-    while True:
-        no_change = True
-        new_community_map: dict[str, int] = {}
 
-        for uuid, neighbors in projection.items():
-            curr_community = community_map[uuid]
+def propagate_labels(
+    projection: CommunityProjection,
+    community_map: NDArray[np.int64],
+    num_movable: int | None = None,
+    max_iterations: int = MAX_LABEL_PROPAGATION_ITERATIONS,
+) -> NDArray[np.int64]:
+    """
+    Run label propagation from the given communities and return the final communities.
+
+    Only the first num_movable nodes of the projection may change community, the rest keep the
+    community they start with. Communities must be non-negative integers.
+    """
+    num_nodes = len(projection.uuids)
+    num_movable = num_nodes if num_movable is None else num_movable
+    indptr = projection.indptr
+    indices = projection.indices
+    weights = projection.weights
+
+    # Reverse adjacency, used to find the nodes that list a changed node as their neighbor
+    sources = np.repeat(np.arange(num_nodes, dtype=np.int64), np.diff(indptr))
+    reverse_order = np.argsort(indices, kind='stable')
+    reverse_indptr = np.zeros(num_nodes + 1, dtype=np.int64)
+    np.cumsum(np.bincount(indices, minlength=num_nodes), out=reverse_indptr[1:])
+    reverse_indices = sources[reverse_order]
+
+    community_map = community_map.copy()
+    frontier = np.arange(num_movable, dtype=np.int64)
+
+    for _ in range(max_iterations):
+        new_communities = _propagate(indptr, indices, weights, community_map, frontier)
+
+        is_changed = new_communities != community_map[frontier]
+        changed = frontier[is_changed]
+        if len(changed) == 0:
+            break
 
-            community_candidates: dict[int, int] = defaultdict(int)
-            for neighbor in neighbors:
-                community_candidates[community_map[neighbor.node_uuid]] += neighbor.edge_count
-            community_lst = [
-                (count, community) for community, count in community_candidates.items()
-            ]
+        community_map[changed] = new_communities[is_changed]
 
-            community_lst.sort(reverse=True)
-            candidate_rank, community_candidate = community_lst[0] if community_lst else (0, -1)
-            if community_candidate != -1 and candidate_rank > 1:
-                new_community = community_candidate
-            else:
-                new_community = max(community_candidate, curr_community)
+        _, reverse_positions = _csr_gather(reverse_indptr, changed)
+        frontier = np.unique(np.concatenate([changed, reverse_indices[reverse_positions]]))
+        frontier = frontier[frontier < num_movable]
+    else:
+        logger.warning(f'Label propagation did not converge within {max_iterations} iterations')
 
-            new_community_map[uuid] = new_community
+    return community_map
 
-            if new_community != curr_community:
-                no_change = False
 
-        if no_change:
-            break
+def _csr_gather(
+    indptr: NDArray[np.int64], rows: NDArray[np.int64]
+) -> tuple[NDArray[np.int64], NDArray[np.int64]]:
+    # Returns the edge positions of rows, along with the index into rows each position belongs to
+    starts = indptr[rows]
+    degrees = indptr[rows + 1] - starts
+    owners = np.repeat(np.arange(len(rows), dtype=np.int64), degrees)
+    offsets = np.arange(len(owners), dtype=np.int64) - np.repeat(
+        np.cumsum(degrees) - degrees, degrees
+    )
 
-        community_map = new_community_map
+    return owners, starts[owners] + offsets
 
-    community_cluster_map = defaultdict(list)
-    for uuid, community in community_map.items():
-        community_cluster_map[community].append(uuid)
 
-    clusters = [cluster for cluster in community_cluster_map.values()]
-    return clusters
+def _propagate(
+    indptr: NDArray[np.int64],
+    indices: NDArray[np.int64],
+    weights: NDArray[np.int64],
+    community_map: NDArray[np.int64],
+    frontier: NDArray[np.int64],
+) -> NDArray[np.int64]:
+    num_communities = int(community_map.max()) + 1 if len(community_map) > 0 else 1
+    owners, positions = _csr_gather(indptr, frontier)
+
+    # Sum edge counts per (frontier node, neighbor community)
+    keys, inverse = np.unique(
+        owners * num_communities + community_map[indices[positions]], return_inverse=True
+    )
+    counts = np.bincount(inverse, weights=weights[positions]).astype(np.int64)
+    key_owners = keys // num_communities
+    key_communities = keys % num_communities
+
+    # Keys are sorted by (owner, community), so a stable sort on (owner, count) leaves the
+    # largest count with the largest community last for every owner
+    order = np.lexsort((counts, key_owners))
+    last = np.ones(len(order), dtype=bool)
+    last[:-1] = key_owners[order][1:] != key_owners[order][:-1]
+    best = order[last]
+
+    curr_communities = community_map[frontier]
+    new_communities = curr_communities.copy()
+    best_owners = key_owners[best]
+    best_counts = counts[best]
+    best_communities = key_communities[best]
+    new_communities[best_owners] = np.where(
+        best_counts > 1,
+        best_communities,
+        np.maximum(best_communities, curr_communities[best_owners]),
+    )
+
+    return new_communities
 
 
 async def summarize_pair(llm_client: LLMClient, summary_pair: tuple[str, str]) -> str:
+    return await summarize_summaries(llm_client, list(summary_pair))
+
+
+async def summarize_summaries(
+    llm_client: LLMClient,
+    summaries: list[str],
+    summary_cache: MutableMapping[str, str] | None = None,
+) -> str:
     # Prepare context for LLM
-    context = {'node_summaries': [{'summary': summary} for summary in summary_pair]}
+    context = {'node_summaries': [{'summary': summary} for summary in summaries]}
+    messages = prompt_library.summarize_nodes.summarize_pair(context)
 
-    llm_response = await llm_client.generate_response(
-        prompt_library.summarize_nodes.summarize_pair(context), response_model=Summary
-    )
+    cache_key = get_summary_cache_key(llm_client.model, messages)
+    if summary_cache is not None and cache_key in summary_cache:
+        return summary_cache[cache_key]
+
+    llm_response = await llm_client.generate_response(messages, response_model=Summary)
+
+    merged_summary = llm_response.get('summary', '')
+
+    if summary_cache is not None:
+        summary_cache[cache_key] = merged_summary
+
+    return merged_summary
+
+
+def get_summary_cache_key(model: str | None, messages: list[Message]) -> str:
+    # Keyed on the rendered prompt, so a change to the summaries, the prompt or the model is a miss
+    key = json.dumps({'model': model, 'messages': [m.model_dump() for m in messages]})
+
+    return hashlib.sha256(key.encode()).hexdigest()
+
+
+def _stable_hash(*parts: str) -> int:
+    return int.from_bytes(hashlib.sha256('\n'.join(parts).encode()).digest()[:8], 'big')
+
+
+def group_summaries(
+    items: list[tuple[str, str]], summary_fan_in: int, level: int
+) -> list[list[tuple[str, str]]]:
+    """
+    Split (key, summary) items into the groups merged at one level of the reduction tree.
 
-    pair_summary = llm_response.get('summary', '')
+    Items are ordered by a hash of their key, and a group ends after an item whose hash is a
+    multiple of summary_fan_in. Group boundaries therefore depend on the members themselves
+    rather than on their positions, so adding or removing a member only changes the group it
+    falls in and leaves the rest of the tree as it was. Every group but the last has at least
+    two items, and none has more than twice summary_fan_in.
+    """
+    ordered = sorted(items, key=lambda item: (_stable_hash(str(level), item[0]), item[0]))
 
-    return pair_summary
+    groups: list[list[tuple[str, str]]] = [[]]
+    for key, summary in ordered:
+        group = groups[-1]
+        group.append((key, summary))
+        is_boundary = _stable_hash(str(level), key) % summary_fan_in == 0
+        if len(group) >= 2 * summary_fan_in or (is_boundary and len(group) >= 2):
+            groups.append([])
+
+    return [group for group in groups if group]
 
 
 async def generate_summary_description(llm_client: LLMClient, summary: str) -> str:
@@ -149,31 +413,36 @@ async def generate_summary_description(llm_client: LLMClient, summary: str) -> s
 
 
 async def build_community(
-    llm_client: LLMClient, community_cluster: list[EntityNode]
+    llm_client: LLMClient,
+    community_cluster: list[EntityNode],
+    summary_cache: MutableMapping[str, str] | None = None,
+    summary_fan_in: int = DEFAULT_SUMMARY_FAN_IN,
 ) -> tuple[CommunityNode, list[CommunityEdge]]:
-    summaries = [entity.summary for entity in community_cluster]
-    length = len(summaries)
-    while length > 1:
-        odd_one_out: str | None = None
-        if length % 2 == 1:
-            odd_one_out = summaries.pop()
-            length -= 1
-        new_summaries: list[str] = list(
-            await semaphore_gather(
-                *[
-                    summarize_pair(llm_client, (str(left_summary), str(right_summary)))
-                    for left_summary, right_summary in zip(
-                        summaries[: int(length / 2)], summaries[int(length / 2) :], strict=False
-                    )
-                ]
-            )
+    if summary_fan_in < 2:
+        raise ValueError(f'summary_fan_in must be at least 2, got {summary_fan_in}')
+
+    # Each summary is keyed on the members below it in the reduction tree
+    items = [(entity.uuid, str(entity.summary)) for entity in community_cluster]
+    level = 0
+    while len(items) > 1:
+        groups = group_summaries(items, summary_fan_in, level)
+        # A trailing group of one summary is carried to the next level as is
+        odd_one_out = groups.pop()[0] if len(groups[-1]) == 1 else None
+        merged_summaries = await semaphore_gather(
+            *[
+                summarize_summaries(llm_client, [summary for _, summary in group], summary_cache)
+                for group in groups
+            ]
         )
+        items = [
+            (hashlib.sha256('\n'.join(key for key, _ in group).encode()).hexdigest(), summary)
+            for group, summary in zip(groups, merged_summaries, strict=True)
+        ]
         if odd_one_out is not None:
-            new_summaries.append(odd_one_out)
-        summaries = new_summaries
-        length = len(summaries)
+            items.append(odd_one_out)
+        level += 1
 
-    summary = summaries[0]
+    summary = items[0][1]
     name = await generate_summary_description(llm_client, summary)
     now = utc_now()
     community_node = CommunityNode(
@@ -191,15 +460,30 @@ async def build_community(
 
 
 async def build_communities(
-    driver: GraphDriver, llm_client: LLMClient, group_ids: list[str] | None
+    driver: GraphDriver,
+    llm_client: LLMClient,
+    group_ids: list[str] | None,
+    summary_cache: MutableMapping[str, str] | None = None,
+    summary_fan_in: int = DEFAULT_SUMMARY_FAN_IN,
 ) -> tuple[list[CommunityNode], list[CommunityEdge]]:
     community_clusters = await get_community_clusters(driver, group_ids)
 
+    return await _build_cluster_communities(
+        llm_client, community_clusters, summary_cache, summary_fan_in
+    )
+
+
+async def _build_cluster_communities(
+    llm_client: LLMClient,
+    community_clusters: list[list[EntityNode]],
+    summary_cache: MutableMapping[str, str] | None,
+    summary_fan_in: int,
+) -> tuple[list[CommunityNode], list[CommunityEdge]]:
     semaphore = asyncio.Semaphore(MAX_COMMUNITY_BUILD_CONCURRENCY)
 
     async def limited_build_community(cluster):
         async with semaphore:
-            return await build_community(llm_client, cluster)
+            return await build_community(llm_client, cluster, summary_cache, summary_fan_in)
 
     communities: list[tuple[CommunityNode, list[CommunityEdge]]] = list(
         await semaphore_gather(
@@ -223,6 +507,195 @@ async def remove_communities(driver: GraphDriver):
     DETACH DELETE c
     """,
     )
+    vector_store.clear()
+    if driver.ann_index is not None:
+        driver.ann_index.communities.clear()
+    if driver.search_cache is not None:
+        driver.search_cache.bump(None)
+
+
+async def build_communities_incremental(
+    driver: GraphDriver,
+    llm_client: LLMClient,
+    group_ids: list[str] | None,
+    summary_cache: MutableMapping[str, str] | None = None,
+    summary_fan_in: int = DEFAULT_SUMMARY_FAN_IN,
+) -> tuple[list[CommunityNode], list[CommunityEdge], list[str]]:
+    """
+    Update the communities of each group with the entities and edges created since its last build.
+
+    Label propagation is re-run only on the changed entities and their neighbours, starting from
+    their current communities, and only communities whose membership changed are summarized
+    again. Groups without communities are built from scratch.
+    Returns the new community nodes and edges, and the uuids of the communities they replace.
+    """
+    if group_ids is None:
+        group_ids = await get_entity_group_ids(driver)
+
+    community_clusters: list[list[EntityNode]] = []
+    stale_community_uuids: list[str] = []
+    for group_id in group_ids:
+        last_build = await get_last_community_build(driver, group_id)
+        if last_build is None:
+            community_clusters.extend(await get_community_clusters(driver, [group_id]))
+            continue
+
+        changed_uuids = await get_changed_entity_uuids(driver, group_id, last_build)
+        if len(changed_uuids) == 0:
+            continue
+
+        cluster_uuids, stale_uuids = await get_changed_community_clusters(
+            driver, group_id, changed_uuids
+        )
+        stale_community_uuids.extend(stale_uuids)
+        community_clusters.extend(
+            list(
+                await semaphore_gather(
+                    *[EntityNode.get_by_uuids(driver, cluster) for cluster in cluster_uuids]
+                )
+            )
+        )
+
+    community_nodes, community_edges = await _build_cluster_communities(
+        llm_client, community_clusters, summary_cache, summary_fan_in
+    )
+
+    return community_nodes, community_edges, stale_community_uuids
+
+
+async def get_changed_community_clusters(
+    driver: GraphDriver, group_id: str, changed_uuids: list[str]
+) -> tuple[list[list[str]], list[str]]:
+    """
+    Re-propagate communities around the changed entities.
+
+    Returns the member uuids of every community whose membership changed, and the uuids of the
+    existing communities they replace.
+    """
+    projection, num_movable = await get_local_community_projection(driver, group_id, changed_uuids)
+    entity_communities = await get_entity_communities(driver, projection.uuids)
+
+    # Existing communities keep one label each, entities without a community get their own
+    community_uuids = sorted(set(entity_communities.values()))
+    community_labels = {uuid: i for i, uuid in enumerate(community_uuids)}
+    initial_map = np.array(
+        [
+            community_labels[entity_communities[uuid]]
+            if uuid in entity_communities
+            else len(community_uuids) + i
+            for i, uuid in enumerate(projection.uuids)
+        ],
+        dtype=np.int64,
+    )
+
+    community_map = propagate_labels(projection, initial_map, num_movable)
+
+    moved = initial_map != community_map
+    is_new = initial_map >= len(community_uuids)
+    changed_labels = set(initial_map[moved].tolist()) | set(community_map[moved | is_new].tolist())
+
+    stale_uuids = [
+        community_uuids[label] for label in changed_labels if label < len(community_uuids)
+    ]
+    existing_members = await get_community_members(driver, stale_uuids)
+
+    clusters: dict[int, list[str]] = {label: [] for label in sorted(changed_labels)}
+    projected = set(projection.uuids)
+    for community_uuid in stale_uuids:
+        # Members outside the projected neighbourhood cannot have moved
+        clusters[community_labels[community_uuid]].extend(
+            uuid for uuid in existing_members.get(community_uuid, []) if uuid not in projected
+        )
+    for uuid, label in zip(projection.uuids, community_map.tolist(), strict=True):
+        if label in clusters:
+            clusters[label].append(uuid)
+
+    return [cluster for cluster in clusters.values() if len(cluster) > 0], stale_uuids
+
+
+async def get_last_community_build(driver: GraphDriver, group_id: str) -> datetime | None:
+    records, _, _ = await driver.execute_query(
+        """
+    MATCH (c:Community {group_id: $group_id})
+    RETURN max(c.created_at) AS last_build
+    """,
+        group_id=group_id,
+        routing_='r',
+    )
+
+    return parse_db_date(records[0]['last_build']) if records else None
+
+
+async def get_changed_entity_uuids(
+    driver: GraphDriver, group_id: str, since: datetime
+) -> list[str]:
+    # Entities created since the last build, and the endpoints of edges created since then
+    records, _, _ = await driver.execute_query(
+        """
+    MATCH (n:Entity {group_id: $group_id})
+    WHERE n.created_at > $since
+    RETURN n.uuid AS uuid
+    UNION
+    MATCH (n:Entity {group_id: $group_id})-[e:RELATES_TO]-(:Entity {group_id: $group_id})
+    WHERE e.created_at > $since
+    RETURN n.uuid AS uuid
+    """,
+        group_id=group_id,
+        since=since,
+        routing_='r',
+    )
+
+    return [record['uuid'] for record in records]
+
+
+async def get_entity_communities(driver: GraphDriver, entity_uuids: list[str]) -> dict[str, str]:
+    records, _, _ = await driver.execute_query(
+        """
+    UNWIND $entity_uuids AS entity_uuid
+    MATCH (c:Community)-[:HAS_MEMBER]->(n:Entity {uuid: entity_uuid})
+    RETURN
+        n.uuid AS entity_uuid,
+        c.uuid AS community_uuid
+    """,
+        entity_uuids=entity_uuids,
+        routing_='r',
+    )
+
+    return {record['entity_uuid']: record['community_uuid'] for record in records}
+
+
+async def get_community_members(
+    driver: GraphDriver, community_uuids: list[str]
+) -> dict[str, list[str]]:
+    records, _, _ = await driver.execute_query(
+        """
+    MATCH (c:Community)-[:HAS_MEMBER]->(n:Entity)
+    WHERE c.uuid IN $community_uuids
+    RETURN
+        c.uuid AS community_uuid,
+        collect(n.uuid) AS entity_uuids
+    """,
+        community_uuids=community_uuids,
+        routing_='r',
+    )
+
+    return {record['community_uuid']: record['entity_uuids'] for record in records}
+
+
+async def remove_communities_by_uuids(driver: GraphDriver, uuids: list[str]):
+    await driver.execute_query(
+        """
+    MATCH (c:Community)
+    WHERE c.uuid IN $uuids
+    DETACH DELETE c
+    """,
+        uuids=uuids,
+    )
+    vector_store.invalidate(uuids)
+    if driver.ann_index is not None:
+        driver.ann_index.communities.remove(uuids)
+    if driver.search_cache is not None:
+        driver.search_cache.bump(None)
 
 
 async def determine_entity_community(
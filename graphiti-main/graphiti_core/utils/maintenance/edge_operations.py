@@ -272,27 +272,10 @@ async def resolve_extracted_edges(
     uuid_entity_map: dict[str, EntityNode] = {entity.uuid: entity for entity in entities}
 
     # Determine which edge types are relevant for each edge
-    edge_types_lst: list[dict[str, BaseModel]] = []
-    for extracted_edge in extracted_edges:
-        source_node_labels = uuid_entity_map[extracted_edge.source_node_uuid].labels + ['Entity']
-        target_node_labels = uuid_entity_map[extracted_edge.target_node_uuid].labels + ['Entity']
-        label_tuples = [
-            (source_label, target_label)
-            for source_label in source_node_labels
-            for target_label in target_node_labels
-        ]
-
-        extracted_edge_types = {}
-        for label_tuple in label_tuples:
-            type_names = edge_type_map.get(label_tuple, [])
-            for type_name in type_names:
-                type_model = edge_types.get(type_name)
-                if type_model is None:
-                    continue
-
-                extracted_edge_types[type_name] = type_model
-
-        edge_types_lst.append(extracted_edge_types)
+    edge_types_lst: list[dict[str, BaseModel]] = [
+        get_edge_types_for_edge(extracted_edge, uuid_entity_map, edge_types, edge_type_map)
+        for extracted_edge in extracted_edges
+    ]
 
     # resolve edges with related edges in the graph and find invalidation candidates
     results: list[tuple[EntityEdge, list[EntityEdge], list[EntityEdge]]] = list(
@@ -336,6 +319,33 @@ async def resolve_extracted_edges(
     return resolved_edges, invalidated_edges
 
 
+def get_edge_types_for_edge(
+    edge: EntityEdge,
+    uuid_entity_map: dict[str, EntityNode],
+    edge_types: dict[str, BaseModel],
+    edge_type_map: dict[tuple[str, str], list[str]],
+) -> dict[str, BaseModel]:
+    source_node_labels = uuid_entity_map[edge.source_node_uuid].labels + ['Entity']
+    target_node_labels = uuid_entity_map[edge.target_node_uuid].labels + ['Entity']
+    label_tuples = [
+        (source_label, target_label)
+        for source_label in source_node_labels
+        for target_label in target_node_labels
+    ]
+
+    extracted_edge_types = {}
+    for label_tuple in label_tuples:
+        type_names = edge_type_map.get(label_tuple, [])
+        for type_name in type_names:
+            type_model = edge_types.get(type_name)
+            if type_model is None:
+                continue
+
+            extracted_edge_types[type_name] = type_model
+
+    return extracted_edge_types
+
+
 def resolve_edge_contradictions(
     resolved_edge: EntityEdge, invalidation_candidates: list[EntityEdge]
 ) -> list[EntityEdge]:
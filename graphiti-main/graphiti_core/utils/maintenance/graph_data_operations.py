@@ -20,16 +20,20 @@ from datetime import datetime, timezone
 from typing_extensions import LiteralString
 
 from graphiti_core.driver.driver import GraphDriver
-from graphiti_core.graph_queries import get_fulltext_indices, get_range_indices
+from graphiti_core.embedder.client import EMBEDDING_DIM
+from graphiti_core.graph_queries import get_fulltext_indices, get_range_indices, get_vector_indices
 from graphiti_core.helpers import parse_db_date, semaphore_gather
 from graphiti_core.nodes import EpisodeType, EpisodicNode
+from graphiti_core.search.vector_store import vector_store
 
 EPISODE_WINDOW_LEN = 3
 
 logger = logging.getLogger(__name__)
 
 
-async def build_indices_and_constraints(driver: GraphDriver, delete_existing: bool = False):
+async def build_indices_and_constraints(
+    driver: GraphDriver, delete_existing: bool = False, embedding_dim: int = EMBEDDING_DIM
+):
     if delete_existing:
         records, _, _ = await driver.execute_query(
             """
@@ -50,7 +54,9 @@ async def build_indices_and_constraints(driver: GraphDriver, delete_existing: bo
 
     fulltext_indices: list[LiteralString] = get_fulltext_indices(driver.provider)
 
-    index_queries: list[LiteralString] = range_indices + fulltext_indices
+    vector_indices: list[str] = get_vector_indices(embedding_dim, driver.provider)
+
+    index_queries: list[str] = range_indices + fulltext_indices + vector_indices
 
     await semaphore_gather(
         *[
@@ -60,6 +66,7 @@ async def build_indices_and_constraints(driver: GraphDriver, delete_existing: bo
             for query in index_queries
         ]
     )
+    driver.use_vector_indices = True
 
 
 async def clear_data(driver: GraphDriver, group_ids: list[str] | None = None):
@@ -78,6 +85,14 @@ async def clear_data(driver: GraphDriver, group_ids: list[str] | None = None):
             await session.execute_write(delete_all)
         else:
             await session.execute_write(delete_group_ids)
+    vector_store.clear()
+    if driver.ann_index is not None:
+        if group_ids is None:
+            driver.ann_index.clear()
+        else:
+            driver.ann_index.remove_groups(group_ids)
+    if driver.search_cache is not None:
+        driver.search_cache.bump(group_ids)
 
 
 async def retrieve_episodes(
@@ -35,7 +35,7 @@ from graphiti_core.prompts.extract_nodes import (
     ExtractedEntity,
     MissedEntities,
 )
-from graphiti_core.search.search import search
+from graphiti_core.search.search import search_batch
 from graphiti_core.search.search_config import SearchResults
 from graphiti_core.search.search_config_recipes import NODE_HYBRID_SEARCH_RRF
 from graphiti_core.search.search_filters import SearchFilters
@@ -176,6 +176,38 @@ async def extract_nodes(
     return extracted_nodes
 
 
+async def search_existing_nodes(
+    clients: GraphitiClients, extracted_nodes: list[EntityNode]
+) -> list[EntityNode]:
+    # Search for every extracted name at once, one batch per group
+    node_idxs_by_group: dict[str, list[int]] = {}
+    for i, node in enumerate(extracted_nodes):
+        node_idxs_by_group.setdefault(node.group_id, []).append(i)
+
+    search_results_by_group: list[list[SearchResults]] = await semaphore_gather(
+        *[
+            search_batch(
+                clients=clients,
+                queries=[extracted_nodes[i].name for i in node_idxs],
+                group_ids=[group_id],
+                search_filter=SearchFilters(),
+                config=NODE_HYBRID_SEARCH_RRF,
+            )
+            for group_id, node_idxs in node_idxs_by_group.items()
+        ]
+    )
+
+    # Merge the results back in the order of extracted_nodes
+    search_results: list[SearchResults | None] = [None] * len(extracted_nodes)
+    for node_idxs, group_results in zip(
+        node_idxs_by_group.values(), search_results_by_group, strict=True
+    ):
+        for i, result in zip(node_idxs, group_results, strict=True):
+            search_results[i] = result
+
+    return [node for result in search_results if result is not None for node in result.nodes]
+
+
 async def resolve_extracted_nodes(
     clients: GraphitiClients,
     extracted_nodes: list[EntityNode],
@@ -187,21 +219,8 @@ async def resolve_extracted_nodes(
     llm_client = clients.llm_client
     driver = clients.driver
 
-    search_results: list[SearchResults] = await semaphore_gather(
-        *[
-            search(
-                clients=clients,
-                query=node.name,
-                group_ids=[node.group_id],
-                search_filter=SearchFilters(),
-                config=NODE_HYBRID_SEARCH_RRF,
-            )
-            for node in extracted_nodes
-        ]
-    )
-
     candidate_nodes: list[EntityNode] = (
-        [node for result in search_results for node in result.nodes]
+        await search_existing_nodes(clients, extracted_nodes)
         if existing_nodes_override is None
         else existing_nodes_override
     )
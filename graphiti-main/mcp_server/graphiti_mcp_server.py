@@ -23,11 +23,13 @@ from graphiti_core.edges import EntityEdge
 from graphiti_core.embedder.azure_openai import AzureOpenAIEmbedderClient
 from graphiti_core.embedder.client import EmbedderClient
 from graphiti_core.embedder.openai import OpenAIEmbedder, OpenAIEmbedderConfig
+from graphiti_core.graphiti import ExtractedEpisode
 from graphiti_core.llm_client import LLMClient
 from graphiti_core.llm_client.azure_openai_client import AzureOpenAILLMClient
 from graphiti_core.llm_client.config import LLMConfig
 from graphiti_core.llm_client.openai_client import OpenAIClient
 from graphiti_core.nodes import EpisodeType, EpisodicNode
+from graphiti_core.search.search_cache import SearchCache
 from graphiti_core.search.search_config_recipes import (
     NODE_HYBRID_SEARCH_NODE_DISTANCE,
     NODE_HYBRID_SEARCH_RRF,
@@ -47,6 +49,16 @@ DEFAULT_EMBEDDER_MODEL = 'text-embedding-3-small'
 # Increase if you have high rate limits.
 SEMAPHORE_LIMIT = int(os.getenv('SEMAPHORE_LIMIT', 10))
 
+# Limits for the add_memory episode scheduler.
+# EPISODE_QUEUE_SIZE bounds the episodes waiting per group_id; add_memory fails once it is reached.
+# The other limits bound the episodes being extracted or resolved at once across all groups.
+EPISODE_QUEUE_SIZE = int(os.getenv('EPISODE_QUEUE_SIZE', 100))
+MAX_CONCURRENT_EXTRACTIONS = int(os.getenv('MAX_CONCURRENT_EXTRACTIONS', SEMAPHORE_LIMIT))
+MAX_CONCURRENT_RESOLUTIONS = int(os.getenv('MAX_CONCURRENT_RESOLUTIONS', SEMAPHORE_LIMIT))
+
+# Number of search results kept in memory for repeated searches; 0 disables the cache.
+SEARCH_CACHE_SIZE = int(os.getenv('SEARCH_CACHE_SIZE', 1024))
+
 
 class Requirement(BaseModel):
     """A Requirement represents a specific need, feature, or functionality that a product or service must fulfill.
@@ -165,6 +177,8 @@ class EpisodeSearchResponse(TypedDict):
 class StatusResponse(TypedDict):
     status: str
     message: str
+    episode_queues: dict[str, Any]
+    search_cache: dict[str, Any] | None
 
 
 def create_azure_credential_token_provider() -> Callable[[], str]:
@@ -574,7 +588,7 @@ graphiti_client: Graphiti | None = None
 
 async def initialize_graphiti():
     """Initialize the Graphiti client with the configured settings."""
-    global graphiti_client, config
+    global graphiti_client, episode_scheduler, config
 
     try:
         # Create LLM client if possible
@@ -597,6 +611,7 @@ async def initialize_graphiti():
             llm_client=llm_client,
             embedder=embedder_client,
             max_coroutines=SEMAPHORE_LIMIT,
+            search_cache=SearchCache(SEARCH_CACHE_SIZE) if SEARCH_CACHE_SIZE > 0 else None,
         )
 
         # Destroy graph if requested
@@ -606,6 +621,7 @@ async def initialize_graphiti():
 
         # Initialize the graph database with Graphiti's indices
         await graphiti_client.build_indices_and_constraints()
+        episode_scheduler = EpisodeScheduler(graphiti_client)
         logger.info('Graphiti client initialized successfully')
 
         # Log configuration details for transparency
@@ -647,45 +663,126 @@ def format_fact_result(edge: EntityEdge) -> dict[str, Any]:
     return result
 
 
-# Dictionary to store queues for each group_id
-# Each queue is a list of tasks to be processed sequentially
-episode_queues: dict[str, asyncio.Queue] = {}
-# Dictionary to track if a worker is running for each group_id
-queue_workers: dict[str, bool] = {}
-
-
-async def process_episode_queue(group_id: str):
-    """Process episodes for a specific group_id sequentially.
+class GroupEpisodePipeline:
+    """Ingests the episodes of one group_id in order, pipelining extraction and resolution.
 
-    This function runs as a long-lived task that processes episodes
-    from the queue one at a time.
+    One task extracts episodes from the queue while a second resolves and writes the episodes
+    already extracted, so extraction of episode N+1 overlaps with resolution of episode N.
+    Resolution runs one episode at a time, in queue order, so deduplication and edge invalidation
+    always see everything written for the earlier episodes of the group.
     """
-    global queue_workers
 
-    logger.info(f'Starting episode queue worker for group_id: {group_id}')
-    queue_workers[group_id] = True
+    def __init__(self, group_id: str, scheduler: 'EpisodeScheduler'):
+        self.group_id = group_id
+        self.scheduler = scheduler
+        self.queue: asyncio.Queue[tuple[str, dict[str, Any]]] = asyncio.Queue(
+            maxsize=EPISODE_QUEUE_SIZE
+        )
+        # Holds at most one extracted episode, so extraction runs one episode ahead
+        self.extracted: asyncio.Queue[tuple[str, ExtractedEpisode]] = asyncio.Queue(maxsize=1)
+        # Episodes extracted but not written yet, used as previous episodes for later extractions
+        self.unwritten: list[EpisodicNode] = []
+        self.extracting: str | None = None
+        self.resolving: str | None = None
+        self.processed = 0
+        self.failed = 0
+        self.tasks = [
+            asyncio.create_task(self.extract_episodes()),
+            asyncio.create_task(self.resolve_episodes()),
+        ]
 
-    try:
+    async def extract_episodes(self):
+        client = self.scheduler.client
         while True:
-            # Get the next episode processing function from the queue
-            # This will wait if the queue is empty
-            process_func = await episode_queues[group_id].get()
+            name, episode_kwargs = await self.queue.get()
+            self.extracting = name
+            try:
+                logger.info(f"Extracting queued episode '{name}' for group_id: {self.group_id}")
+                async with self.scheduler.extraction_semaphore:
+                    extracted = await client.extract_episode(
+                        **episode_kwargs, pending_episodes=list(self.unwritten)
+                    )
+            except Exception as e:
+                self.failed += 1
+                logger.error(
+                    f"Error extracting episode '{name}' for group_id {self.group_id}: {str(e)}"
+                )
+                continue
+            finally:
+                self.extracting = None
+                self.queue.task_done()
+
+            self.unwritten.append(extracted.episode)
+            # Waits while the resolver is still busy with the previous extracted episode
+            await self.extracted.put((name, extracted))
 
+    async def resolve_episodes(self):
+        client = self.scheduler.client
+        while True:
+            name, extracted = await self.extracted.get()
+            self.resolving = name
             try:
-                # Process the episode
-                await process_func()
+                async with self.scheduler.resolution_semaphore:
+                    await client.resolve_episode(extracted)
+                self.processed += 1
+                logger.info(f"Episode '{name}' processed successfully")
             except Exception as e:
-                logger.error(f'Error processing queued episode for group_id {group_id}: {str(e)}')
+                self.failed += 1
+                logger.error(
+                    f"Error processing episode '{name}' for group_id {self.group_id}: {str(e)}"
+                )
             finally:
-                # Mark the task as done regardless of success/failure
-                episode_queues[group_id].task_done()
-    except asyncio.CancelledError:
-        logger.info(f'Episode queue worker for group_id {group_id} was cancelled')
-    except Exception as e:
-        logger.error(f'Unexpected error in queue worker for group_id {group_id}: {str(e)}')
-    finally:
-        queue_workers[group_id] = False
-        logger.info(f'Stopped episode queue worker for group_id: {group_id}')
+                self.resolving = None
+                self.unwritten.remove(extracted.episode)
+
+    def get_status(self) -> dict[str, Any]:
+        return {
+            'queued': self.queue.qsize(),
+            'extracting': self.extracting,
+            'extracted': self.extracted.qsize(),
+            'resolving': self.resolving,
+            'processed': self.processed,
+            'failed': self.failed,
+        }
+
+
+class EpisodeScheduler:
+    """Runs one GroupEpisodePipeline per group_id under global concurrency limits."""
+
+    def __init__(self, client: Graphiti):
+        self.client = client
+        self.extraction_semaphore = asyncio.Semaphore(MAX_CONCURRENT_EXTRACTIONS)
+        self.resolution_semaphore = asyncio.Semaphore(MAX_CONCURRENT_RESOLUTIONS)
+        self.pipelines: dict[str, GroupEpisodePipeline] = {}
+
+    def submit(self, group_id: str, name: str, episode_kwargs: dict[str, Any]) -> int:
+        """Queue an episode and return its position in the group's queue.
+
+        Raises asyncio.QueueFull when the group already has EPISODE_QUEUE_SIZE episodes waiting.
+        """
+        pipeline = self.pipelines.get(group_id)
+        if pipeline is None:
+            logger.info(f'Starting episode pipeline for group_id: {group_id}')
+            pipeline = GroupEpisodePipeline(group_id, self)
+            self.pipelines[group_id] = pipeline
+
+        pipeline.queue.put_nowait((name, episode_kwargs))
+        return pipeline.queue.qsize()
+
+    def get_status(self) -> dict[str, Any]:
+        return {
+            'queue_limit': EPISODE_QUEUE_SIZE,
+            'max_concurrent_extractions': MAX_CONCURRENT_EXTRACTIONS,
+            'max_concurrent_resolutions': MAX_CONCURRENT_RESOLUTIONS,
+            'total_queued': sum(p.queue.qsize() for p in self.pipelines.values()),
+            'groups': {
+                group_id: pipeline.get_status() for group_id, pipeline in self.pipelines.items()
+            },
+        }
+
+
+# Scheduler for add_memory episodes, created with the Graphiti client
+episode_scheduler: EpisodeScheduler | None = None
 
 
 @mcp.tool()
@@ -700,7 +797,9 @@ async def add_memory(
     """Add an episode to memory. This is the primary way to add information to the graph.
 
     This function returns immediately and processes the episode addition in the background.
-    Episodes for the same group_id are processed sequentially to avoid race conditions.
+    Episodes for the same group_id are resolved and written sequentially to avoid race conditions,
+    while the next episode's extraction runs ahead. If too many episodes are already queued for the
+    group_id, an error is returned and the episode should be retried later.
 
     Args:
         name (str): Name of the episode
@@ -752,9 +851,9 @@ async def add_memory(
         - Entities will be created from appropriate JSON properties
         - Relationships between entities will be established based on the JSON structure
     """
-    global graphiti_client, episode_queues, queue_workers
+    global graphiti_client, episode_scheduler
 
-    if graphiti_client is None:
+    if graphiti_client is None or episode_scheduler is None:
         return ErrorResponse(error='Graphiti client not initialized')
 
     try:
@@ -772,53 +871,32 @@ async def add_memory(
         # The Graphiti client expects a str for group_id, not Optional[str]
         group_id_str = str(effective_group_id) if effective_group_id is not None else ''
 
-        # We've already checked that graphiti_client is not None above
-        # This assert statement helps type checkers understand that graphiti_client is defined
-        assert graphiti_client is not None, 'graphiti_client should not be None here'
-
-        # Use cast to help the type checker understand that graphiti_client is not None
-        client = cast(Graphiti, graphiti_client)
-
-        # Define the episode processing function
-        async def process_episode():
-            try:
-                logger.info(f"Processing queued episode '{name}' for group_id: {group_id_str}")
-                # Use all entity types if use_custom_entities is enabled, otherwise use empty dict
-                entity_types = ENTITY_TYPES if config.use_custom_entities else {}
-
-                await client.add_episode(
-                    name=name,
-                    episode_body=episode_body,
-                    source=source_type,
-                    source_description=source_description,
-                    group_id=group_id_str,  # Using the string version of group_id
-                    uuid=uuid,
-                    reference_time=datetime.now(timezone.utc),
-                    entity_types=entity_types,
-                )
-                logger.info(f"Episode '{name}' added successfully")
-
-                logger.info(f"Episode '{name}' processed successfully")
-            except Exception as e:
-                error_msg = str(e)
-                logger.error(
-                    f"Error processing episode '{name}' for group_id {group_id_str}: {error_msg}"
-                )
-
-        # Initialize queue for this group_id if it doesn't exist
-        if group_id_str not in episode_queues:
-            episode_queues[group_id_str] = asyncio.Queue()
-
-        # Add the episode processing function to the queue
-        await episode_queues[group_id_str].put(process_episode)
-
-        # Start a worker for this queue if one isn't already running
-        if not queue_workers.get(group_id_str, False):
-            asyncio.create_task(process_episode_queue(group_id_str))
+        # Use all entity types if use_custom_entities is enabled, otherwise use empty dict
+        entity_types = ENTITY_TYPES if config.use_custom_entities else {}
+
+        episode_kwargs = {
+            'name': name,
+            'episode_body': episode_body,
+            'source': source_type,
+            'source_description': source_description,
+            'group_id': group_id_str,  # Using the string version of group_id
+            'uuid': uuid,
+            'reference_time': datetime.now(timezone.utc),
+            'entity_types': entity_types,
+        }
+
+        try:
+            position = episode_scheduler.submit(group_id_str, name, episode_kwargs)
+        except asyncio.QueueFull:
+            logger.warning(f"Episode queue for group_id {group_id_str} is full, rejecting '{name}'")
+            return ErrorResponse(
+                error=f'Episode queue for group_id {group_id_str} is full '
+                f'({EPISODE_QUEUE_SIZE} episodes), retry later'
+            )
 
         # Return immediately with a success message
         return SuccessResponse(
-            message=f"Episode '{name}' queued for processing (position: {episode_queues[group_id_str].qsize()})"
+            message=f"Episode '{name}' queued for processing (position: {position})"
         )
     except Exception as e:
         error_msg = str(e)
@@ -1131,11 +1209,20 @@ async def clear_graph() -> SuccessResponse | ErrorResponse:
 
 @mcp.resource('http://graphiti/status')
 async def get_status() -> StatusResponse:
-    """Get the status of the Graphiti MCP server and Neo4j connection."""
-    global graphiti_client
+    """Get the status of the Graphiti MCP server, its episode queues and the Neo4j connection."""
+    global graphiti_client, episode_scheduler
+
+    episode_queues = episode_scheduler.get_status() if episode_scheduler is not None else {}
+    search_cache = graphiti_client.driver.search_cache if graphiti_client is not None else None
+    search_cache_stats = search_cache.get_stats().model_dump() if search_cache is not None else None
 
     if graphiti_client is None:
-        return StatusResponse(status='error', message='Graphiti client not initialized')
+        return StatusResponse(
+            status='error',
+            message='Graphiti client not initialized',
+            episode_queues=episode_queues,
+            search_cache=search_cache_stats,
+        )
 
     try:
         # We've already checked that graphiti_client is not None above
@@ -1148,7 +1235,10 @@ async def get_status() -> StatusResponse:
         await client.driver.client.verify_connectivity()  # type: ignore
 
         return StatusResponse(
-            status='ok', message='Graphiti MCP server is running and connected to Neo4j'
+            status='ok',
+            message='Graphiti MCP server is running and connected to Neo4j',
+            episode_queues=episode_queues,
+            search_cache=search_cache_stats,
         )
     except Exception as e:
         error_msg = str(e)
@@ -1156,6 +1246,8 @@ async def get_status() -> StatusResponse:
         return StatusResponse(
             status='error',
             message=f'Graphiti MCP server is running but Neo4j connection failed: {error_msg}',
+            episode_queues=episode_queues,
+            search_cache=search_cache_stats,
         )
 
 
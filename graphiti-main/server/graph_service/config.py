@@ -14,6 +14,10 @@ class Settings(BaseSettings):
     neo4j_uri: str
     neo4j_user: str
     neo4j_password: str
+    ingest_queue_path: str = Field('ingest_queue.db')
+    ingest_consumers: int = Field(4)
+    ingest_max_attempts: int = Field(3)
+    ingest_retry_delay: float = Field(5.0)
 
     model_config = SettingsConfigDict(env_file='.env', extra='ignore')
 
@@ -0,0 +1,278 @@
+import asyncio
+import contextlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from pydantic import BaseModel
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_RETRY_DELAY = 5.0
+MAX_RETRY_DELAY = 300.0
+
+
+class IngestJob(BaseModel):
+    id: int
+    group_id: str
+    payload: dict[str, Any]
+    enqueued_at: float
+    attempts: int
+
+
+class GroupQueueStats(BaseModel):
+    depth: int
+    in_flight: int
+    lag_seconds: float
+
+
+class IngestQueueStats(BaseModel):
+    depth: int
+    in_flight: int
+    failed: int
+    lag_seconds: float
+    groups: dict[str, GroupQueueStats]
+
+
+class IngestQueue:
+    """
+    Durable FIFO of ingest jobs, stored in a SQLite database in WAL mode.
+
+    Jobs stay in the database until they are acknowledged, so a job that was claimed but not
+    finished when the process stopped is claimed again after a restart (at-least-once delivery).
+    Only the oldest job of a group can be claimed, and only while no other job of that group is
+    claimed, so each group is processed in order while different groups run in parallel. A job
+    that fails is retried after retry_delay seconds, doubling with each attempt up to
+    MAX_RETRY_DELAY, and its group waits meanwhile. Jobs that fail max_attempts times are moved
+    to the failed_jobs table so they don't block their group.
+    """
+
+    def __init__(self, path: str, max_attempts: int = 3, retry_delay: float = DEFAULT_RETRY_DELAY):
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS jobs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                group_id TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                enqueued_at REAL NOT NULL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                claimed_at REAL,
+                next_attempt_at REAL NOT NULL DEFAULT 0
+            );
+            CREATE INDEX IF NOT EXISTS jobs_group_id ON jobs (group_id, id);
+            CREATE TABLE IF NOT EXISTS failed_jobs (
+                id INTEGER PRIMARY KEY,
+                group_id TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                enqueued_at REAL NOT NULL,
+                attempts INTEGER NOT NULL,
+                failed_at REAL NOT NULL,
+                error TEXT NOT NULL
+            );
+            """
+        )
+        columns = [row[1] for row in self.conn.execute('PRAGMA table_info(jobs)')]
+        if 'next_attempt_at' not in columns:
+            # Queues created before retries were delayed
+            self.conn.execute('ALTER TABLE jobs ADD COLUMN next_attempt_at REAL NOT NULL DEFAULT 0')
+        # Claims left over from a previous process will never be acknowledged
+        self.conn.execute('UPDATE jobs SET claimed_at = NULL WHERE claimed_at IS NOT NULL')
+        self.job_added = asyncio.Event()
+
+    async def put_many(self, group_id: str, payloads: list[dict[str, Any]]) -> list[int]:
+        ids = await asyncio.to_thread(self._put_many, group_id, payloads)
+        self.job_added.set()
+        return ids
+
+    async def claim(self) -> IngestJob | None:
+        return await asyncio.to_thread(self._claim)
+
+    async def ack(self, job: IngestJob):
+        await asyncio.to_thread(self._execute, 'DELETE FROM jobs WHERE id = ?', (job.id,))
+        # Finishing a job can make the next job of its group claimable
+        self.job_added.set()
+
+    async def fail(self, job: IngestJob, error: str):
+        await asyncio.to_thread(self._fail, job, error)
+        self.job_added.set()
+
+    async def get_stats(self) -> IngestQueueStats:
+        return await asyncio.to_thread(self._get_stats)
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+    def _execute(self, query: str, params: tuple = ()):
+        with self.lock:
+            self.conn.execute(query, params)
+
+    def _put_many(self, group_id: str, payloads: list[dict[str, Any]]) -> list[int]:
+        now = time.time()
+        with self.lock:
+            self.conn.execute('BEGIN IMMEDIATE')
+            try:
+                ids = [
+                    self.conn.execute(
+                        'INSERT INTO jobs (group_id, payload, enqueued_at) VALUES (?, ?, ?)',
+                        (group_id, json.dumps(payload), now),
+                    ).lastrowid
+                    for payload in payloads
+                ]
+                self.conn.execute('COMMIT')
+            except Exception:
+                self.conn.execute('ROLLBACK')
+                raise
+
+        return [job_id for job_id in ids if job_id is not None]
+
+    def _claim(self) -> IngestJob | None:
+        with self.lock:
+            self.conn.execute('BEGIN IMMEDIATE')
+            try:
+                # The head of each group, unless it is already claimed or waiting to be retried
+                row = self.conn.execute(
+                    """
+                    SELECT id, group_id, payload, enqueued_at, attempts FROM jobs AS j
+                    WHERE claimed_at IS NULL
+                      AND next_attempt_at <= ?
+                      AND id = (SELECT MIN(id) FROM jobs WHERE group_id = j.group_id)
+                    ORDER BY id
+                    LIMIT 1
+                    """,
+                    (time.time(),),
+                ).fetchone()
+                if row is not None:
+                    self.conn.execute(
+                        'UPDATE jobs SET claimed_at = ?, attempts = attempts + 1 WHERE id = ?',
+                        (time.time(), row[0]),
+                    )
+                self.conn.execute('COMMIT')
+            except Exception:
+                self.conn.execute('ROLLBACK')
+                raise
+
+        if row is None:
+            return None
+
+        return IngestJob(
+            id=row[0],
+            group_id=row[1],
+            payload=json.loads(row[2]),
+            enqueued_at=row[3],
+            attempts=row[4] + 1,
+        )
+
+    def _fail(self, job: IngestJob, error: str):
+        with self.lock:
+            if job.attempts < self.max_attempts:
+                delay = min(self.retry_delay * 2 ** (job.attempts - 1), MAX_RETRY_DELAY)
+                self.conn.execute(
+                    'UPDATE jobs SET claimed_at = NULL, next_attempt_at = ? WHERE id = ?',
+                    (time.time() + delay, job.id),
+                )
+                return
+
+            self.conn.execute('BEGIN IMMEDIATE')
+            try:
+                self.conn.execute(
+                    """
+                    INSERT OR REPLACE INTO failed_jobs
+                        (id, group_id, payload, enqueued_at, attempts, failed_at, error)
+                    SELECT id, group_id, payload, enqueued_at, attempts, ?, ? FROM jobs
+                    WHERE id = ?
+                    """,
+                    (time.time(), error, job.id),
+                )
+                self.conn.execute('DELETE FROM jobs WHERE id = ?', (job.id,))
+                self.conn.execute('COMMIT')
+            except Exception:
+                self.conn.execute('ROLLBACK')
+                raise
+
+    def _get_stats(self) -> IngestQueueStats:
+        now = time.time()
+        with self.lock:
+            rows = self.conn.execute(
+                """
+                SELECT group_id, COUNT(*), COUNT(claimed_at), MIN(enqueued_at) FROM jobs
+                GROUP BY group_id
+                """
+            ).fetchall()
+            (failed,) = self.conn.execute('SELECT COUNT(*) FROM failed_jobs').fetchone()
+
+        groups = {
+            group_id: GroupQueueStats(
+                depth=depth, in_flight=in_flight, lag_seconds=max(now - oldest, 0.0)
+            )
+            for group_id, depth, in_flight, oldest in rows
+        }
+        return IngestQueueStats(
+            depth=sum(group.depth for group in groups.values()),
+            in_flight=sum(group.in_flight for group in groups.values()),
+            failed=failed,
+            lag_seconds=max((group.lag_seconds for group in groups.values()), default=0.0),
+            groups=groups,
+        )
+
+
+class IngestWorker:
+    """Runs num_consumers tasks that claim jobs from an IngestQueue and pass them to handler."""
+
+    def __init__(
+        self,
+        queue: IngestQueue,
+        handler: Callable[[IngestJob], Awaitable[None]],
+        num_consumers: int = 4,
+        poll_interval: float = 1.0,
+    ):
+        self.queue = queue
+        self.handler = handler
+        self.num_consumers = num_consumers
+        self.poll_interval = poll_interval
+        self.tasks: list[asyncio.Task] = []
+        self.stopping = False
+
+    async def consumer(self):
+        # wait_for can swallow a cancel that lands as job_added is set, so stop() also sets a flag
+        while not self.stopping:
+            # Cleared before claiming, so a job added after the claim still wakes us up
+            self.queue.job_added.clear()
+            job = await self.queue.claim()
+            if job is None:
+                with contextlib.suppress(asyncio.TimeoutError):
+                    await asyncio.wait_for(self.queue.job_added.wait(), self.poll_interval)
+                continue
+
+            logger.info(f'Processing job {job.id} for group {job.group_id}')
+            try:
+                await self.handler(job)
+            except asyncio.CancelledError:
+                # Left claimed; it is claimed again after a restart
+                raise
+            except Exception as e:
+                logger.error(f'Job {job.id} failed (attempt {job.attempts}): {e}')
+                await self.queue.fail(job, str(e))
+            else:
+                await self.queue.ack(job)
+
+    async def start(self):
+        self.stopping = False
+        self.tasks = [asyncio.create_task(self.consumer()) for _ in range(self.num_consumers)]
+
+    async def stop(self):
+        self.stopping = True
+        for task in self.tasks:
+            task.cancel()
+        await asyncio.gather(*self.tasks, return_exceptions=True)
+        self.tasks = []
@@ -1,62 +1,37 @@
-import asyncio
 from contextlib import asynccontextmanager
-from functools import partial
 
-from fastapi import APIRouter, FastAPI, status
+from fastapi import APIRouter, FastAPI, Request, status
 from graphiti_core.nodes import EpisodeType  # type: ignore
 from graphiti_core.utils.maintenance.graph_data_operations import clear_data  # type: ignore
 
+from graph_service.config import get_settings
 from graph_service.dto import AddEntityNodeRequest, AddMessagesRequest, Message, Result
-from graph_service.zep_graphiti import ZepGraphitiDep
-
-
-class AsyncWorker:
-    def __init__(self):
-        self.queue = asyncio.Queue()
-        self.task = None
-
-    async def worker(self):
-        while True:
-            try:
-                print(f'Got a job: (size of remaining queue: {self.queue.qsize()})')
-                job = await self.queue.get()
-                await job()
-            except asyncio.CancelledError:
-                break
-
-    async def start(self):
-        self.task = asyncio.create_task(self.worker())
-
-    async def stop(self):
-        if self.task:
-            self.task.cancel()
-            await self.task
-        while not self.queue.empty():
-            self.queue.get_nowait()
-
-
-async_worker = AsyncWorker()
+from graph_service.ingest_queue import (
+    GroupQueueStats,
+    IngestJob,
+    IngestQueue,
+    IngestQueueStats,
+    IngestWorker,
+)
+from graph_service.zep_graphiti import ZepGraphitiDep, create_graphiti
 
 
 @asynccontextmanager
-async def lifespan(_: FastAPI):
-    await async_worker.start()
-    yield
-    await async_worker.stop()
-
-
-router = APIRouter(lifespan=lifespan)
-
+async def lifespan(app: FastAPI):
+    settings = get_settings()
+    queue = IngestQueue(
+        settings.ingest_queue_path,
+        max_attempts=settings.ingest_max_attempts,
+        retry_delay=settings.ingest_retry_delay,
+    )
+    # Jobs outlive the request that queued them, so consumers use their own client
+    graphiti = create_graphiti(settings)
 
-@router.post('/messages', status_code=status.HTTP_202_ACCEPTED)
-async def add_messages(
-    request: AddMessagesRequest,
-    graphiti: ZepGraphitiDep,
-):
-    async def add_messages_task(m: Message):
+    async def add_message(job: IngestJob):
+        m = Message.model_validate(job.payload)
         await graphiti.add_episode(
             uuid=m.uuid,
-            group_id=request.group_id,
+            group_id=job.group_id,
             name=m.name,
             episode_body=f'{m.role or ""}({m.role_type}): {m.content}',
             reference_time=m.timestamp,
@@ -64,12 +39,39 @@ async def add_messages(
             source_description=m.source_description,
         )
 
-    for m in request.messages:
-        await async_worker.queue.put(partial(add_messages_task, m))
+    worker = IngestWorker(queue, add_message, num_consumers=settings.ingest_consumers)
+    app.state.ingest_queue = queue
+    await worker.start()
+    yield
+    await worker.stop()
+    await graphiti.close()
+    queue.close()
+
+
+router = APIRouter(lifespan=lifespan)
+
+
+@router.post('/messages', status_code=status.HTTP_202_ACCEPTED)
+async def add_messages(request: AddMessagesRequest, http_request: Request):
+    queue: IngestQueue = http_request.app.state.ingest_queue
+    await queue.put_many(request.group_id, [m.model_dump(mode='json') for m in request.messages])
 
     return Result(message='Messages added to processing queue', success=True)
 
 
+@router.get('/queue', status_code=status.HTTP_200_OK)
+async def get_queue_stats(http_request: Request) -> IngestQueueStats:
+    queue: IngestQueue = http_request.app.state.ingest_queue
+    return await queue.get_stats()
+
+
+@router.get('/queue/{group_id}', status_code=status.HTTP_200_OK)
+async def get_group_queue_stats(group_id: str, http_request: Request) -> GroupQueueStats:
+    queue: IngestQueue = http_request.app.state.ingest_queue
+    stats = await queue.get_stats()
+    return stats.groups.get(group_id, GroupQueueStats(depth=0, in_flight=0, lag_seconds=0.0))
+
+
 @router.post('/entity-node', status_code=status.HTTP_201_CREATED)
 async def add_entity_node(
     request: AddEntityNodeRequest,
@@ -0,0 +1,112 @@
+import asyncio
+import sqlite3
+import time
+from unittest.mock import patch
+
+import pytest
+
+from graph_service.ingest_queue import IngestJob, IngestQueue, IngestWorker
+
+
+@pytest.fixture
+def queue_path(tmp_path):
+    return str(tmp_path / 'ingest_queue.db')
+
+
+@pytest.mark.asyncio
+async def test_groups_are_claimed_in_order_and_in_parallel(queue_path):
+    queue = IngestQueue(queue_path)
+    await queue.put_many('g1', [{'n': 1}, {'n': 2}])
+    await queue.put_many('g2', [{'n': 3}])
+
+    first = await queue.claim()
+    other_group = await queue.claim()
+    assert first is not None and first.payload == {'n': 1}
+    assert other_group is not None and other_group.payload == {'n': 3}
+    # The next job of g1 waits until the one in flight is acknowledged
+    assert await queue.claim() is None
+
+    await queue.ack(first)
+    second = await queue.claim()
+    assert second is not None and second.payload == {'n': 2}
+    queue.close()
+
+
+@pytest.mark.asyncio
+async def test_unacknowledged_jobs_are_redelivered_after_restart(queue_path):
+    queue = IngestQueue(queue_path)
+    await queue.put_many('g', [{'n': 1}])
+    claimed = await queue.claim()
+    assert claimed is not None
+    queue.close()
+
+    queue = IngestQueue(queue_path)
+    redelivered = await queue.claim()
+    assert redelivered is not None
+    assert (redelivered.id, redelivered.attempts) == (claimed.id, 2)
+    queue.close()
+
+
+@pytest.mark.asyncio
+async def test_failed_jobs_are_retried_after_a_delay(queue_path):
+    queue = IngestQueue(queue_path, retry_delay=10)
+    await queue.put_many('g', [{'n': 1}])
+
+    job = await queue.claim()
+    assert job is not None
+    await queue.fail(job, 'boom')
+    assert await queue.claim() is None
+
+    with patch('graph_service.ingest_queue.time.time', return_value=time.time() + 11):
+        retried = await queue.claim()
+    assert retried is not None and retried.attempts == 2
+    queue.close()
+
+
+@pytest.mark.asyncio
+async def test_jobs_move_to_failed_jobs_after_max_attempts(queue_path):
+    queue = IngestQueue(queue_path, max_attempts=2, retry_delay=0)
+    await queue.put_many('g', [{'n': 1}, {'n': 2}])
+
+    for _ in range(2):
+        job = await queue.claim()
+        assert job is not None and job.payload == {'n': 1}
+        await queue.fail(job, 'boom')
+
+    # The failed job no longer blocks its group
+    next_job = await queue.claim()
+    assert next_job is not None and next_job.payload == {'n': 2}
+    stats = await queue.get_stats()
+    assert (stats.depth, stats.in_flight, stats.failed) == (1, 1, 1)
+    queue.close()
+
+    conn = sqlite3.connect(queue_path)
+    assert conn.execute('SELECT attempts, error FROM failed_jobs').fetchall() == [(2, 'boom')]
+    conn.close()
+
+
+@pytest.mark.asyncio
+async def test_worker_processes_each_group_in_order(queue_path):
+    queue = IngestQueue(queue_path)
+    processed: list[tuple[str, int]] = []
+    done = asyncio.Event()
+
+    async def handler(job: IngestJob):
+        await asyncio.sleep(0.01)
+        processed.append((job.group_id, job.payload['n']))
+        if len(processed) == 6:
+            done.set()
+
+    worker = IngestWorker(queue, handler, num_consumers=3, poll_interval=0.05)
+    await worker.start()
+    await queue.put_many('g1', [{'n': n} for n in range(3)])
+    await queue.put_many('g2', [{'n': n} for n in range(3)])
+    await asyncio.wait_for(done.wait(), timeout=10)
+    # The last job is acknowledged after its handler returns
+    while (await queue.get_stats()).depth:
+        await asyncio.sleep(0.01)
+    await worker.stop()
+
+    for group_id in ['g1', 'g2']:
+        assert [n for g, n in processed if g == group_id] == [0, 1, 2]
+    queue.close()
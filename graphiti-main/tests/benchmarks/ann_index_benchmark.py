@@ -0,0 +1,74 @@
+"""
+Benchmark for the local ANN index.
+
+Compares search latency and recall@limit of a single group partition against an exhaustive
+cosine scan, which is what the graph similarity queries do, on clustered random embeddings.
+
+    python -m tests.benchmarks.ann_index_benchmark --sizes 10000 50000 200000 --dim 256
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from graphiti_core.search.ann_index import DEFAULT_N_PROBE, AnnCollection
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the local ANN index.')
+    parser.add_argument(
+        '--sizes',
+        type=int,
+        nargs='+',
+        default=[10000, 50000, 200000],
+        help='Number of vectors in the partition for each run',
+    )
+    parser.add_argument('--dim', type=int, default=256, help='Embedding dimension')
+    parser.add_argument('--limit', type=int, default=10)
+    parser.add_argument('--n-probe', type=int, default=DEFAULT_N_PROBE)
+    parser.add_argument('--queries', type=int, default=50)
+    parser.add_argument('--seed', type=int, default=0)
+
+    args = parser.parse_args()
+    rng = np.random.default_rng(args.seed)
+
+    print(f'{"vectors":>10} {"build s":>8} {"scan ms":>8} {"index ms":>9} {"recall":>7}')
+    for size in args.sizes:
+        centers = rng.normal(size=(max(size // 500, 1), args.dim))
+        vectors = (
+            centers[rng.integers(0, len(centers), size)] + 0.5 * rng.normal(size=(size, args.dim))
+        ).astype(np.float32)
+        vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+        queries = vectors[rng.integers(0, size, args.queries)] + 0.1 * rng.normal(
+            size=(args.queries, args.dim)
+        ).astype(np.float32)
+
+        start = time.perf_counter()
+        collection = AnnCollection('entity', n_probe=args.n_probe, min_train_size=1)
+        collection.upsert((str(i), 'g', vector) for i, vector in enumerate(vectors))
+        build_seconds = time.perf_counter() - start
+
+        scan_seconds = 0.0
+        index_seconds = 0.0
+        hits = 0
+        for query in queries:
+            start = time.perf_counter()
+            expected = np.argpartition(-(vectors @ query), args.limit)[: args.limit]
+            scan_seconds += time.perf_counter() - start
+
+            start = time.perf_counter()
+            results = collection.search(query.tolist(), ['g'], args.limit, 0.0)
+            index_seconds += time.perf_counter() - start
+
+            hits += len({str(i) for i in expected} & {uuid for uuid, _ in results})
+
+        print(
+            f'{size:>10} {build_seconds:>8.1f} {scan_seconds / args.queries * 1000:>8.2f} '
+            f'{index_seconds / args.queries * 1000:>9.2f} '
+            f'{hits / (args.queries * args.limit):>7.2f}'
+        )
+
+
+if __name__ == '__main__':
+    main()
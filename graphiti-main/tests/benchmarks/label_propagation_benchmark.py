@@ -0,0 +1,155 @@
+"""
+Benchmark for community label propagation.
+
+Compares label_propagation against a per-node Python sweep over the same CSR projection on
+synthetic graphs with planted communities, and checks that both produce the same clusters.
+
+    python -m tests.benchmarks.label_propagation_benchmark --edges 10000 100000 1000000
+"""
+
+import argparse
+import time
+from collections import defaultdict
+
+import numpy as np
+
+from graphiti_core.utils.maintenance.community_operations import (
+    MAX_LABEL_PROPAGATION_ITERATIONS,
+    CommunityProjection,
+    label_propagation,
+)
+
+
+def synthetic_projection(
+    num_edges: int, community_size: int, intra_fraction: float, seed: int
+) -> CommunityProjection:
+    rng = np.random.default_rng(seed)
+    num_nodes = max(num_edges // 5, 2)
+    num_communities = max(num_nodes // community_size, 1)
+
+    sources = rng.integers(0, num_nodes, size=num_edges)
+    targets = rng.integers(0, num_nodes, size=num_edges)
+    # Most edges stay inside the community of their source
+    intra = rng.random(num_edges) < intra_fraction
+    targets[intra] = (sources[intra] % num_communities) + num_communities * rng.integers(
+        0, max(num_nodes // num_communities, 1), size=int(intra.sum())
+    )
+    targets = np.minimum(targets, num_nodes - 1)
+    keep = sources != targets
+    sources, targets = sources[keep], targets[keep]
+
+    # Undirected multigraph, collapsed to one weighted entry per (source, target) pair
+    pairs = np.unique(
+        np.concatenate([sources * num_nodes + targets, targets * num_nodes + sources]),
+        return_counts=True,
+    )
+    keys, counts = pairs
+    row = keys // num_nodes
+    indptr = np.zeros(num_nodes + 1, dtype=np.int64)
+    np.cumsum(np.bincount(row, minlength=num_nodes), out=indptr[1:])
+
+    return CommunityProjection(
+        uuids=[f'{i:08d}' for i in range(num_nodes)],
+        indptr=indptr,
+        indices=(keys % num_nodes).astype(np.int64),
+        weights=counts.astype(np.int64),
+    )
+
+
+def python_label_propagation(
+    projection: CommunityProjection, max_iterations: int = MAX_LABEL_PROPAGATION_ITERATIONS
+) -> list[list[str]]:
+    # Full synchronous sweeps with a dict of candidate counts per node
+    indptr = projection.indptr.tolist()
+    indices = projection.indices.tolist()
+    weights = projection.weights.tolist()
+
+    community_map = list(range(len(projection.uuids)))
+
+    for _ in range(max_iterations):
+        no_change = True
+        new_community_map: list[int] = []
+
+        for i, curr_community in enumerate(community_map):
+            community_candidates: dict[int, int] = defaultdict(int)
+            for j in range(indptr[i], indptr[i + 1]):
+                community_candidates[community_map[indices[j]]] += weights[j]
+            community_lst = [
+                (count, community) for community, count in community_candidates.items()
+            ]
+
+            community_lst.sort(reverse=True)
+            candidate_rank, community_candidate = community_lst[0] if community_lst else (0, -1)
+            if community_candidate != -1 and candidate_rank > 1:
+                new_community = community_candidate
+            else:
+                new_community = max(community_candidate, curr_community)
+
+            new_community_map.append(new_community)
+
+            if new_community != curr_community:
+                no_change = False
+
+        if no_change:
+            break
+
+        community_map = new_community_map
+
+    community_cluster_map = defaultdict(list)
+    for uuid, community in zip(projection.uuids, community_map, strict=True):
+        community_cluster_map[community].append(uuid)
+
+    return list(community_cluster_map.values())
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark community label propagation.')
+    parser.add_argument(
+        '--edges',
+        type=int,
+        nargs='+',
+        default=[10_000, 100_000, 1_000_000],
+        help='Number of synthetic edges for each run',
+    )
+    parser.add_argument('--community-size', type=int, default=50, help='Planted community size')
+    parser.add_argument(
+        '--intra-fraction',
+        type=float,
+        default=0.9,
+        help='Fraction of edges inside a planted community',
+    )
+    parser.add_argument('--max-iterations', type=int, default=MAX_LABEL_PROPAGATION_ITERATIONS)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument(
+        '--skip-python', action='store_true', help='Only time the NumPy implementation'
+    )
+
+    args = parser.parse_args()
+
+    print(f'{"edges":>10} {"nodes":>10} {"clusters":>10} {"numpy s":>10} {"python s":>10} {"x":>8}')
+    for num_edges in args.edges:
+        projection = synthetic_projection(
+            num_edges, args.community_size, args.intra_fraction, args.seed
+        )
+
+        start = time.perf_counter()
+        clusters = label_propagation(projection, max_iterations=args.max_iterations)
+        numpy_seconds = time.perf_counter() - start
+
+        python_seconds = float('nan')
+        if not args.skip_python:
+            start = time.perf_counter()
+            expected = python_label_propagation(projection, max_iterations=args.max_iterations)
+            python_seconds = time.perf_counter() - start
+            if clusters != expected:
+                raise AssertionError(f'Clusters differ for {num_edges} edges')
+
+        print(
+            f'{num_edges:>10} {len(projection.uuids):>10} {len(clusters):>10} '
+            f'{numpy_seconds:>10.3f} {python_seconds:>10.3f} '
+            f'{python_seconds / numpy_seconds:>8.1f}'
+        )
+
+
+if __name__ == '__main__':
+    main()
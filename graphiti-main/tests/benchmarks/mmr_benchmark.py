@@ -0,0 +1,102 @@
+"""
+Benchmark for MMR reranking.
+
+Compares maximal_marginal_relevance against the previous one-shot implementation, which built
+the similarity matrix with a Python loop of dot products, on random candidate embeddings.
+
+    python -m tests.benchmarks.mmr_benchmark --candidates 50 200 500 1000 --limit 10
+"""
+
+import argparse
+import time
+
+import numpy as np
+from numpy.typing import NDArray
+
+from graphiti_core.helpers import normalize_l2
+from graphiti_core.search.search_config import DEFAULT_MMR_LAMBDA
+from graphiti_core.search.search_utils import maximal_marginal_relevance
+
+
+def loop_maximal_marginal_relevance(
+    query_vector: list[float],
+    candidates: dict[str, list[float]],
+    mmr_lambda: float = DEFAULT_MMR_LAMBDA,
+    min_score: float = -2.0,
+) -> list[str]:
+    # The previous implementation: pairwise similarities in Python, then one score per candidate
+    query_array = np.array(query_vector)
+    candidate_arrays: dict[str, NDArray] = {}
+    for uuid, embedding in candidates.items():
+        candidate_arrays[uuid] = normalize_l2(embedding)
+
+    uuids: list[str] = list(candidate_arrays.keys())
+
+    similarity_matrix = np.zeros((len(uuids), len(uuids)))
+
+    for i, uuid_1 in enumerate(uuids):
+        for j, uuid_2 in enumerate(uuids[:i]):
+            similarity = np.dot(candidate_arrays[uuid_1], candidate_arrays[uuid_2])
+            similarity_matrix[i, j] = similarity
+            similarity_matrix[j, i] = similarity
+
+    mmr_scores: dict[str, float] = {}
+    for i, uuid in enumerate(uuids):
+        max_sim = np.max(similarity_matrix[i, :])
+        mmr = mmr_lambda * np.dot(query_array, candidate_arrays[uuid]) + (mmr_lambda - 1) * max_sim
+        mmr_scores[uuid] = mmr
+
+    uuids.sort(reverse=True, key=lambda c: mmr_scores[c])
+
+    return [uuid for uuid in uuids if mmr_scores[uuid] >= min_score]
+
+
+def best_of(repeats: int, func, *args, **kwargs) -> float:
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func(*args, **kwargs)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark MMR reranking.')
+    parser.add_argument(
+        '--candidates',
+        type=int,
+        nargs='+',
+        default=[50, 200, 500, 1000],
+        help='Number of candidates for each run',
+    )
+    parser.add_argument('--dim', type=int, default=1024, help='Embedding dimension')
+    parser.add_argument('--limit', type=int, default=10, help='Results selected (max_results)')
+    parser.add_argument('--repeats', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=0)
+
+    args = parser.parse_args()
+    rng = np.random.default_rng(args.seed)
+
+    print(f'{"candidates":>10} {"greedy ms":>10} {"top-k ms":>10} {"loop ms":>10} {"x top-k":>8}')
+    for num_candidates in args.candidates:
+        query = normalize_l2(rng.normal(size=args.dim).tolist()).tolist()
+        candidates = {f'{i:08d}': rng.normal(size=args.dim).tolist() for i in range(num_candidates)}
+
+        greedy_seconds = best_of(args.repeats, maximal_marginal_relevance, query, candidates)
+        top_k_seconds = best_of(
+            args.repeats,
+            maximal_marginal_relevance,
+            query,
+            candidates,
+            max_results=args.limit,
+        )
+        loop_seconds = best_of(args.repeats, loop_maximal_marginal_relevance, query, candidates)
+
+        print(
+            f'{num_candidates:>10} {greedy_seconds * 1000:>10.2f} {top_k_seconds * 1000:>10.2f} '
+            f'{loop_seconds * 1000:>10.2f} {loop_seconds / top_k_seconds:>8.1f}'
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,98 @@
+"""
+Copyright 2024, Zep Software, Inc.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+
+from graphiti_core.embedder.batching import BatchingEmbedder
+
+
+def _mock_embedder() -> AsyncMock:
+    embedder = AsyncMock()
+
+    async def create_batch(texts):
+        await asyncio.sleep(0)
+        return [[float(len(text))] for text in texts]
+
+    embedder.create_batch.side_effect = create_batch
+    return embedder
+
+
+@pytest.mark.asyncio
+async def test_concurrent_creates_share_one_batch():
+    embedder = _mock_embedder()
+    batching_embedder = BatchingEmbedder(embedder, batch_window=0.01)
+
+    results = await asyncio.gather(
+        batching_embedder.create(input_data=['a']),
+        batching_embedder.create('bb'),
+        batching_embedder.create(input_data=['a']),
+        batching_embedder.create('ccc'),
+    )
+
+    assert results == [[1.0], [2.0], [1.0], [3.0]]
+    embedder.create_batch.assert_awaited_once_with(['a', 'bb', 'ccc'])
+    assert batching_embedder.futures == {}
+
+
+@pytest.mark.asyncio
+async def test_batches_are_split_at_max_batch_size():
+    embedder = _mock_embedder()
+    batching_embedder = BatchingEmbedder(embedder, batch_window=0.01, max_batch_size=2)
+
+    results = await asyncio.gather(*[batching_embedder.create(text) for text in ['a', 'b', 'c']])
+    assert results == [[1.0], [1.0], [1.0]]
+    assert [call.args[0] for call in embedder.create_batch.call_args_list] == [['a', 'b'], ['c']]
+
+
+@pytest.mark.asyncio
+async def test_create_batch_joins_in_flight_texts():
+    embedder = _mock_embedder()
+    batching_embedder = BatchingEmbedder(embedder, batch_window=0.01)
+
+    single, batch = await asyncio.gather(
+        batching_embedder.create('a'), batching_embedder.create_batch(['a', 'bb'])
+    )
+
+    assert single == [1.0]
+    assert batch == [[1.0], [2.0]]
+    embedder.create_batch.assert_awaited_once_with(['a', 'bb'])
+
+
+@pytest.mark.asyncio
+async def test_errors_reach_every_caller_in_the_batch():
+    embedder = AsyncMock()
+    embedder.create_batch.side_effect = RuntimeError('provider down')
+    batching_embedder = BatchingEmbedder(embedder, batch_window=0.01)
+
+    results = await asyncio.gather(
+        batching_embedder.create('a'), batching_embedder.create('b'), return_exceptions=True
+    )
+
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert batching_embedder.futures == {}
+
+
+@pytest.mark.asyncio
+async def test_token_inputs_pass_through():
+    embedder = AsyncMock()
+    embedder.create.return_value = [0.5]
+    batching_embedder = BatchingEmbedder(embedder)
+
+    assert await batching_embedder.create([1, 2, 3]) == [0.5]
+    embedder.create_batch.assert_not_called()
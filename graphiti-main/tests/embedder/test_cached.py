@@ -0,0 +1,105 @@
+"""
+Copyright 2024, Zep Software, Inc.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from graphiti_core.embedder.cached import CachedEmbedder
+from graphiti_core.embedder.openai import OpenAIEmbedder, OpenAIEmbedderConfig
+
+
+def _mock_embedder() -> AsyncMock:
+    embedder = AsyncMock()
+    embedder.config = OpenAIEmbedderConfig(embedding_model='model', embedding_dim=2)
+
+    async def create_batch(texts):
+        return [[float(len(text)), 1.0] for text in texts]
+
+    async def create(input_data):
+        text = input_data if isinstance(input_data, str) else input_data[0]
+        return [float(len(text)), 0.0]
+
+    embedder.create_batch.side_effect = create_batch
+    embedder.create.side_effect = create
+    return embedder
+
+
+@pytest.mark.asyncio
+async def test_create_batch_only_embeds_misses():
+    embedder = _mock_embedder()
+    cached_embedder = CachedEmbedder(embedder, cache_dir=None)
+
+    assert await cached_embedder.create_batch(['Imam Ali', 'Kufa']) == [[8.0, 1.0], [4.0, 1.0]]
+    assert await cached_embedder.create_batch(['Kufa', ' Imam  Ali ', 'Basra', 'Basra']) == [
+        [4.0, 1.0],
+        [8.0, 1.0],
+        [5.0, 1.0],
+        [5.0, 1.0],
+    ]
+
+    assert [call.args[0] for call in embedder.create_batch.call_args_list] == [
+        ['Imam Ali', 'Kufa'],
+        ['Basra'],
+    ]
+    assert cached_embedder.hits == 2
+    assert cached_embedder.misses == 4
+
+
+@pytest.mark.asyncio
+async def test_create_shares_cache_with_create_batch():
+    embedder = _mock_embedder()
+    cached_embedder = CachedEmbedder(embedder, cache_dir=None)
+
+    await cached_embedder.create_batch(['Imam Ali'])
+
+    assert await cached_embedder.create(input_data=['Imam Ali']) == [8.0, 1.0]
+    assert await cached_embedder.create('Imam Ali') == [8.0, 1.0]
+    embedder.create.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_memory_tier_is_bounded_and_backed_by_disk(tmp_path):
+    embedder = _mock_embedder()
+    cached_embedder = CachedEmbedder(embedder, cache_dir=str(tmp_path), max_memory_entries=1)
+
+    await cached_embedder.create_batch(['a', 'bb'])
+    assert len(cached_embedder.memory_cache) == 1
+    cached_embedder.close()
+
+    reopened = CachedEmbedder(_mock_embedder(), cache_dir=str(tmp_path))
+    assert await reopened.create_batch(['a', 'bb']) == [[1.0, 1.0], [2.0, 1.0]]
+    reopened.embedder.create_batch.assert_not_called()  # type: ignore[attr-defined]
+    reopened.close()
+
+
+def test_key_depends_on_model_and_dimension():
+    small = OpenAIEmbedder(OpenAIEmbedderConfig(embedding_dim=256), client=MagicMock())
+    large = OpenAIEmbedder(OpenAIEmbedderConfig(embedding_dim=1024), client=MagicMock())
+    other_model = OpenAIEmbedder(
+        OpenAIEmbedderConfig(embedding_model='text-embedding-3-large', embedding_dim=256),
+        client=MagicMock(),
+    )
+
+    keys = {
+        CachedEmbedder(embedder, cache_dir=None).get_key('Imam Ali')
+        for embedder in (small, large, other_model)
+    }
+
+    assert len(keys) == 3
+    assert CachedEmbedder(small, cache_dir=None).get_key(' Imam\nAli') == CachedEmbedder(
+        small, cache_dir=None
+    ).get_key('Imam Ali')
@@ -0,0 +1,140 @@
+"""
+Copyright 2024, Zep Software, Inc.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+from unittest.mock import patch
+
+import pytest
+from pydantic import BaseModel
+
+from graphiti_core.llm_client.cache import DiskLLMCache, InMemoryLLMCache
+from graphiti_core.llm_client.client import LLMClient
+from graphiti_core.llm_client.config import LLMConfig, ModelSize
+from graphiti_core.prompts.models import Message
+
+
+class Answer(BaseModel):
+    answer: str
+
+
+class OtherAnswer(BaseModel):
+    other: str
+
+
+class CountingLLMClient(LLMClient):
+    """LLMClient that counts the requests that reach the provider"""
+
+    calls = 0
+
+    async def _generate_response(
+        self, messages, response_model=None, max_tokens=None, model_size=ModelSize.medium
+    ):
+        self.calls += 1
+        return {'answer': f'response {self.calls}'}
+
+
+def _messages() -> list[Message]:
+    return [Message(role='system', content='system'), Message(role='user', content='question')]
+
+
+@pytest.mark.asyncio
+async def test_generate_response_uses_cache_keyed_before_prompt_is_extended():
+    llm_cache = InMemoryLLMCache()
+    client = CountingLLMClient(LLMConfig(), llm_cache=llm_cache)
+
+    first = await client.generate_response(_messages(), response_model=Answer)
+    second = await client.generate_response(_messages(), response_model=Answer)
+
+    assert first == second == {'answer': 'response 1'}
+    assert client.calls == 1
+    assert llm_cache.stats.hits == 1
+    assert llm_cache.stats.misses == 1
+    assert llm_cache.stats.hit_rate == 0.5
+
+
+@pytest.mark.asyncio
+async def test_generate_response_cache_key_includes_response_model():
+    client = CountingLLMClient(LLMConfig(), llm_cache=InMemoryLLMCache())
+
+    await client.generate_response(_messages(), response_model=Answer)
+    await client.generate_response(_messages(), response_model=OtherAnswer)
+    await client.generate_response(_messages(), response_model=Answer, model_size=ModelSize.small)
+
+    assert client.calls == 3
+
+
+def test_cache_key_includes_namespace():
+    args = ('model', _messages(), Answer, 100, ModelSize.medium)
+
+    assert InMemoryLLMCache(namespace='v1').get_key(*args) == InMemoryLLMCache(
+        namespace='v1'
+    ).get_key(*args)
+    assert InMemoryLLMCache(namespace='v1').get_key(*args) != InMemoryLLMCache(
+        namespace='v2'
+    ).get_key(*args)
+
+
+@pytest.mark.asyncio
+async def test_in_memory_cache_evicts_least_recently_used():
+    llm_cache = InMemoryLLMCache(max_entries=2)
+
+    await llm_cache.set('a', {'value': 'a'})
+    await llm_cache.set('b', {'value': 'b'})
+    assert await llm_cache.get('a') == {'value': 'a'}
+    await llm_cache.set('c', {'value': 'c'})
+
+    assert await llm_cache.get('b') is None
+    assert await llm_cache.get('a') == {'value': 'a'}
+    assert await llm_cache.get('c') == {'value': 'c'}
+
+
+@pytest.mark.asyncio
+async def test_in_memory_cache_stores_and_returns_copies():
+    llm_cache = InMemoryLLMCache()
+    response = {'items': ['a']}
+
+    await llm_cache.set('a', response)
+    response['items'].append('b')
+    cached_response = await llm_cache.get('a')
+    assert cached_response == {'items': ['a']}
+
+    cached_response['items'].append('c')  # type: ignore[index]
+    assert await llm_cache.get('a') == {'items': ['a']}
+
+
+@pytest.mark.asyncio
+async def test_in_memory_cache_expires_entries():
+    llm_cache = InMemoryLLMCache(ttl=10)
+
+    with patch('graphiti_core.llm_client.cache.monotonic', return_value=100.0):
+        await llm_cache.set('a', {'value': 'a'})
+    with patch('graphiti_core.llm_client.cache.monotonic', return_value=109.0):
+        assert await llm_cache.get('a') == {'value': 'a'}
+    with patch('graphiti_core.llm_client.cache.monotonic', return_value=110.0):
+        assert await llm_cache.get('a') is None
+
+
+@pytest.mark.asyncio
+async def test_disk_cache_persists_between_instances(tmp_path):
+    llm_cache = DiskLLMCache(str(tmp_path))
+    await llm_cache.set('a', {'value': 'a'})
+    llm_cache.close()
+
+    reopened = DiskLLMCache(str(tmp_path))
+    assert await reopened.get('a') == {'value': 'a'}
+    assert await reopened.get('b') is None
+    assert reopened.stats.hits == 1
+    assert reopened.stats.misses == 1
+    reopened.close()
@@ -0,0 +1,100 @@
+"""
+Copyright 2024, Zep Software, Inc.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import asyncio
+import sys
+from unittest.mock import MagicMock, patch
+
+import pytest
+from pydantic import BaseModel
+
+from graphiti_core.llm_client.claude_cli_client import ClaudeCLIClient, ClaudeCLIPool
+from graphiti_core.llm_client.config import LLMConfig
+
+# Answers each stream-json user message with a result event, like `claude --input-format
+# stream-json --output-format stream-json`. Like a real session it remembers earlier messages,
+# and reports how many it has seen. The prompt 'exit' makes the process exit.
+FAKE_CLI = """
+import json, sys, time
+seen = 0
+for line in sys.stdin:
+    text = json.loads(line)['message']['content'][0]['text']
+    seen += 1
+    if text == 'exit':
+        sys.exit(1)
+    if text.startswith('slow'):
+        time.sleep(0.2)
+    print(json.dumps({'type': 'assistant', 'message': {}}), flush=True)
+    print(json.dumps({'type': 'result', 'is_error': False, 'result': f'{text.upper()} {seen}'}), flush=True)
+"""
+FAKE_CLI_COMMAND = [sys.executable, '-c', FAKE_CLI]
+
+
+class Answer(BaseModel):
+    answer: str
+
+
+@pytest.mark.asyncio
+async def test_pool_answers_each_request_in_a_fresh_session():
+    pool = ClaudeCLIPool(FAKE_CLI_COMMAND, pool_size=2, health_check_interval=None)
+    await pool.start()
+    try:
+        results = await asyncio.gather(*[pool.submit(f'slow {i}') for i in range(3)])
+        assert results == ['SLOW 0 1', 'SLOW 1 1', 'SLOW 2 1']
+        assert await pool.submit('a') == 'A 1'
+        # Each request took a process and started its replacement
+        await asyncio.gather(*pool.tasks)
+        assert pool.spawned == 6
+        assert pool.in_use == 0
+    finally:
+        await pool.close()
+
+
+@pytest.mark.asyncio
+async def test_pool_refills_after_workers_exit():
+    pool = ClaudeCLIPool(FAKE_CLI_COMMAND, pool_size=1, health_check_interval=None)
+    await pool.start()
+    try:
+        with pytest.raises(RuntimeError):
+            await pool.submit('exit')
+        assert await pool.submit('hello') == 'HELLO 1'
+
+        # An idle process that exits is dropped and replaced by the health check
+        await asyncio.gather(*pool.tasks)
+        pool.idle[0].process.kill()  # type: ignore[union-attr]
+        await pool.idle[0].process.wait()  # type: ignore[union-attr]
+        await pool.health_check()
+
+        assert await pool.submit('again') == 'AGAIN 1'
+        assert pool.spawned == 5
+    finally:
+        await pool.close()
+
+
+@pytest.mark.asyncio
+async def test_client_uses_pool_when_pool_size_is_set():
+    version = MagicMock(returncode=0, stdout='1.0.0')
+    with patch('graphiti_core.llm_client.claude_cli_client.subprocess.run', return_value=version):
+        client = ClaudeCLIClient(LLMConfig(), claude_command='claude', pool_size=2)
+
+    with patch.object(ClaudeCLIPool, 'start'), patch.object(ClaudeCLIPool, 'submit') as submit:
+        submit.return_value = '{"answer": "yes"}'
+        response = await client._generate_response([], response_model=Answer)
+
+    assert response == {'answer': 'yes'}
+    pool = next(iter(client.pools.values()))
+    assert pool.pool_size == 2
+    assert '--input-format' in pool.command and 'stream-json' in pool.command
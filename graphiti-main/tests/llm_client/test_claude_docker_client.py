@@ -0,0 +1,129 @@
+"""
+Copyright 2024, Zep Software, Inc.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import asyncio
+import sys
+
+import pytest
+
+from graphiti_core.llm_client.claude_docker_client import ClaudeDockerContainerPool
+
+# Stands in for the docker CLI: `run -d` prints a new container id, `exec` upper-cases stdin
+# (or fails for the input 'fail'), and every call is appended to a log file. Once the file
+# max_runs exists, `run` fails after that many containers were started.
+FAKE_DOCKER = """#!{python}
+import os, sys, uuid
+max_runs = os.path.join(os.path.dirname({log!r}), 'max_runs')
+runs = open({log!r}).read().count('run ') if os.path.exists({log!r}) else 0
+with open({log!r}, 'a') as log:
+    log.write(' '.join(sys.argv[1:3]) + '\\n')
+command = sys.argv[1]
+if command == 'run':
+    if os.path.exists(max_runs) and runs >= int(open(max_runs).read()):
+        sys.exit(1)
+    print(uuid.uuid4().hex)
+elif command == 'exec':
+    text = sys.stdin.read()
+    if text == 'fail':
+        sys.exit(1)
+    sys.stdout.write(text.upper())
+"""
+
+
+@pytest.fixture
+def fake_docker(tmp_path):
+    log = tmp_path / 'docker.log'
+    script = tmp_path / 'docker'
+    script.write_text(FAKE_DOCKER.format(python=sys.executable, log=str(log)))
+    script.chmod(0o755)
+    return str(script), log
+
+
+def _calls(log) -> list[str]:
+    return log.read_text().splitlines() if log.exists() else []
+
+
+@pytest.mark.asyncio
+async def test_pool_reuses_warm_containers(fake_docker):
+    docker_command, log = fake_docker
+    pool = ClaudeDockerContainerPool([], pool_size=2, docker_command=docker_command)
+    await pool.start()
+    try:
+        results = await asyncio.gather(
+            *[pool.execute(['claude', '--print'], f'prompt {i}'.encode()) for i in range(6)]
+        )
+
+        assert [stdout for _, stdout, _ in results] == [f'PROMPT {i}'.encode() for i in range(6)]
+        assert sum(call.startswith('run') for call in _calls(log)) == 2
+        stats = pool.get_stats()
+        assert sum(container['requests'] for container in stats['containers']) == 6
+        assert all(container['mean_latency'] is not None for container in stats['containers'])
+    finally:
+        await pool.close()
+
+
+@pytest.mark.asyncio
+async def test_pool_recycles_after_max_requests_and_on_failure(fake_docker):
+    docker_command, log = fake_docker
+    pool = ClaudeDockerContainerPool(
+        [], pool_size=1, max_requests_per_container=2, docker_command=docker_command
+    )
+    await pool.start()
+    try:
+        await pool.execute(['claude'], b'a')
+        await pool.execute(['claude'], b'b')
+        returncode, _, _ = await pool.execute(['claude'], b'fail')
+        assert returncode == 1
+        assert (await pool.execute(['claude'], b'c'))[1] == b'C'
+
+        assert pool.recycled == 2
+        assert sum(call.startswith('run') for call in _calls(log)) == 3
+        assert sum(call.startswith('rm') for call in _calls(log)) == 2
+    finally:
+        await pool.close()
+
+    assert sum(call.startswith('rm') for call in _calls(log)) == 3
+
+
+@pytest.mark.asyncio
+async def test_pool_start_failure_removes_started_containers(fake_docker, tmp_path):
+    docker_command, log = fake_docker
+    (tmp_path / 'max_runs').write_text('1')
+    pool = ClaudeDockerContainerPool([], pool_size=3, docker_command=docker_command)
+
+    with pytest.raises(RuntimeError):
+        await pool.start()
+
+    assert sum(call.startswith('rm') for call in _calls(log)) == 1
+    assert pool.containers == {}
+
+
+@pytest.mark.asyncio
+async def test_pool_times_out_while_replacements_fail(fake_docker, tmp_path):
+    docker_command, _ = fake_docker
+    (tmp_path / 'max_runs').write_text('1')
+    pool = ClaudeDockerContainerPool(
+        [], pool_size=1, docker_command=docker_command, wait_timeout=0.5
+    )
+    await pool.start()
+    try:
+        returncode, _, _ = await pool.execute(['claude'], b'fail')
+        assert returncode == 1
+
+        with pytest.raises(TimeoutError):
+            await pool.execute(['claude'], b'a')
+    finally:
+        await pool.close()
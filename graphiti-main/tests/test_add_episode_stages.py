@@ -0,0 +1,135 @@
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from graphiti_core.cross_encoder.client import CrossEncoderClient
+from graphiti_core.driver.driver import GraphDriver
+from graphiti_core.embedder import EmbedderClient
+from graphiti_core.graphiti import Graphiti
+from graphiti_core.llm_client import LLMClient
+from graphiti_core.nodes import EntityNode, EpisodeType, EpisodicNode
+from graphiti_core.utils.bulk_utils import RawEpisode
+
+NOW = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def _episode(name: str, minutes: int, group_id: str = 'g', source=EpisodeType.text):
+    return EpisodicNode(
+        name=name,
+        group_id=group_id,
+        labels=[],
+        source=source,
+        content=name,
+        source_description='test',
+        created_at=NOW,
+        valid_at=NOW + timedelta(minutes=minutes),
+    )
+
+
+def _graphiti() -> Graphiti:
+    return Graphiti(
+        graph_driver=MagicMock(spec=GraphDriver),
+        llm_client=MagicMock(spec=LLMClient),
+        embedder=MagicMock(spec=EmbedderClient),
+        cross_encoder=MagicMock(spec=CrossEncoderClient),
+    )
+
+
+@pytest.mark.asyncio
+async def test_extract_episode_uses_pending_episodes_as_previous_episodes():
+    graphiti = _graphiti()
+    stored = _episode('stored', 0)
+    pending = [
+        _episode('pending', 1),
+        _episode('other group', 2, group_id='other'),
+        _episode('other source', 3, source=EpisodeType.message),
+        _episode('later', 30),
+    ]
+
+    with (
+        patch.object(graphiti, 'retrieve_episodes', AsyncMock(return_value=[stored])),
+        patch('graphiti_core.graphiti.extract_nodes', AsyncMock(return_value=[])) as mock_extract,
+    ):
+        extracted = await graphiti.extract_episode(
+            'new',
+            'body',
+            'test',
+            NOW + timedelta(minutes=10),
+            source=EpisodeType.text,
+            group_id='g',
+            pending_episodes=pending + [stored],
+        )
+
+    assert [e.name for e in extracted.previous_episodes] == ['stored', 'pending']
+    assert mock_extract.call_args.args[2] == extracted.previous_episodes
+    assert extracted.episode.name == 'new'
+    assert extracted.edge_type_map == {('Entity', 'Entity'): []}
+
+
+@pytest.mark.asyncio
+async def test_add_episode_runs_extraction_then_resolution():
+    graphiti = _graphiti()
+    with (
+        patch.object(graphiti, 'extract_episode', AsyncMock()) as mock_extract,
+        patch.object(graphiti, 'resolve_episode', AsyncMock()) as mock_resolve,
+    ):
+        results = await graphiti.add_episode('new', 'body', 'test', NOW, update_communities=True)
+
+    mock_resolve.assert_awaited_once_with(mock_extract.return_value, update_communities=True)
+    assert results is mock_resolve.return_value
+
+
+@pytest.mark.asyncio
+async def test_chunked_add_episode_bulk_resumes_from_checkpoints(tmp_path):
+    graphiti = _graphiti()
+    bulk_episodes = [
+        RawEpisode(
+            name=f'e{i}',
+            content='body',
+            source_description='test',
+            source=EpisodeType.text,
+            reference_time=NOW + timedelta(minutes=i),
+        )
+        for i in range(5)
+    ]
+    committed_sizes: list[int] = []
+
+    async def extract(episodes, committed_nodes, *args):
+        committed_sizes.append(len(committed_nodes))
+        node = EntityNode(name=episodes[0].name, group_id='g', labels=[], name_embedding=[1.0])
+        return [], [node], []
+
+    writes = AsyncMock(side_effect=[None, None, None, RuntimeError('lost connection')])
+    with (
+        patch.object(graphiti, '_extract_episode_bulk', side_effect=extract) as mock_extract,
+        patch('graphiti_core.graphiti.add_nodes_and_edges_bulk', writes),
+        pytest.raises(RuntimeError),
+    ):
+        await graphiti.add_episode_bulk(
+            bulk_episodes, group_id='g', chunk_size=2, checkpoint_dir=str(tmp_path)
+        )
+
+    assert mock_extract.await_count == 2 and committed_sizes == [0, 1]
+
+    writes = AsyncMock()
+    with (
+        patch.object(graphiti, '_extract_episode_bulk', side_effect=extract) as mock_extract,
+        patch('graphiti_core.graphiti.add_nodes_and_edges_bulk', writes),
+    ):
+        await graphiti.add_episode_bulk(
+            bulk_episodes, group_id='g', chunk_size=2, checkpoint_dir=str(tmp_path)
+        )
+
+    # The first chunk is skipped, the second is written from its checkpoint
+    assert mock_extract.await_count == 1 and committed_sizes == [0, 1, 2]
+    written_episodes = [call.args[1] for call in writes.await_args_list if call.args]
+    assert [[e.name for e in episodes] for episodes in written_episodes] == [
+        ['e2', 'e3'],
+        ['e4'],
+    ]
+    assert sorted(p.name for p in tmp_path.iterdir()) == [
+        'chunk-000000.json',
+        'chunk-000001.json',
+        'chunk-000002.json',
+    ]
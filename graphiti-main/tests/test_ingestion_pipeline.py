@@ -0,0 +1,102 @@
+import asyncio
+from datetime import datetime, timezone
+from unittest.mock import MagicMock
+
+import pytest
+
+from graphiti_core.ingestion_pipeline import EpisodeIngestionPipeline
+from graphiti_core.nodes import EpisodeType
+from graphiti_core.utils.bulk_utils import RawEpisode
+
+NOW = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def _raw_episode(name: str) -> RawEpisode:
+    return RawEpisode(
+        name=name,
+        content=name,
+        source_description='test',
+        source=EpisodeType.text,
+        reference_time=NOW,
+    )
+
+
+class FakeGraphiti:
+    """Stands in for the Graphiti stage methods and records the order stages run in."""
+
+    def __init__(self, delay: float = 0.05, fail_on: str | None = None):
+        self.delay = delay
+        self.fail_on = fail_on
+        self.events: list[tuple[str, str]] = []
+        self.written: list[str] = []
+        self.pending: dict[str, list[str]] = {}
+
+    async def extract_episode(self, name, *args, group_id='', pending_episodes=None, **kwargs):
+        self.events.append(('extract', name))
+        self.pending[name] = [episode.name for episode in pending_episodes or []]
+        await asyncio.sleep(self.delay)
+        if name == self.fail_on:
+            raise ValueError(name)
+        episode = MagicMock()
+        episode.name = name
+        extracted = MagicMock()
+        extracted.episode = episode
+        extracted.group_id = group_id
+        return extracted
+
+    async def resolve_episode_entities(self, extracted):
+        name = extracted.episode.name
+        self.events.append(('resolve', name))
+        # Resolution must see every earlier episode of the group written
+        group_written = [n for n in self.written if n.split('-')[0] == extracted.group_id]
+        resolved = MagicMock()
+        resolved.name = name
+        resolved.seen = group_written
+        await asyncio.sleep(self.delay)
+        return resolved
+
+    async def save_episode(self, resolved, update_communities=False):
+        self.events.append(('write', resolved.name))
+        await asyncio.sleep(self.delay)
+        self.written.append(resolved.name)
+        return resolved
+
+
+@pytest.mark.asyncio
+async def test_pipeline_keeps_group_order_and_overlaps_stages():
+    graphiti = FakeGraphiti()
+    names = [f'{group}-{i}' for i in range(3) for group in ('a', 'b')]
+
+    async with EpisodeIngestionPipeline(graphiti, queue_size=2) as pipeline:  # type: ignore
+        futures = [
+            await pipeline.submit(_raw_episode(name), group_id=name.split('-')[0]) for name in names
+        ]
+    results = await asyncio.gather(*futures)
+
+    for name, result in zip(names, results, strict=True):
+        group, index = name.split('-')
+        assert result.name == name
+        assert result.seen == [f'{group}-{i}' for i in range(int(index))]
+
+    assert [n for n in graphiti.written if n.startswith('a')] == ['a-0', 'a-1', 'a-2']
+    # Later episodes get the earlier unwritten episodes of their group only
+    assert all(n.startswith('a') for n in graphiti.pending['a-2'])
+    # Extraction of a later episode runs before an earlier one is written
+    assert graphiti.events.index(('extract', 'a-1')) < graphiti.events.index(('write', 'a-0'))
+    assert pipeline.get_stats().completed == len(names)
+
+
+@pytest.mark.asyncio
+async def test_pipeline_failure_does_not_block_group():
+    graphiti = FakeGraphiti(delay=0, fail_on='a-0')
+
+    async with EpisodeIngestionPipeline(graphiti) as pipeline:  # type: ignore
+        failed = await pipeline.submit(_raw_episode('a-0'), group_id='a')
+        succeeded = await pipeline.submit(_raw_episode('a-1'), group_id='a')
+
+    with pytest.raises(ValueError):
+        await failed
+    assert (await succeeded).name == 'a-1'
+    stats = pipeline.get_stats()
+    assert stats.failed == 1 and stats.completed == 1
+    assert pipeline.unwritten == {'a': []}
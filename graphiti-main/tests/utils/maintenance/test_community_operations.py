@@ -0,0 +1,314 @@
+from collections import defaultdict
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, patch
+
+import numpy as np
+import pytest
+
+from graphiti_core.nodes import EntityNode
+from graphiti_core.utils.maintenance.community_operations import (
+    CommunityProjection,
+    build_communities_incremental,
+    build_community,
+    get_changed_community_clusters,
+    get_community_projection,
+    group_summaries,
+    label_propagation,
+    propagate_labels,
+)
+
+
+def _reference_label_propagation(
+    projection: dict[str, list[tuple[str, int]]], max_iterations: int
+) -> list[list[str]]:
+    # The original dict based implementation, kept as the reference for the clusters produced.
+    # It is capped at max_iterations like label_propagation, since it may not converge.
+    community_map = {uuid: i for i, uuid in enumerate(projection.keys())}
+
+    for _ in range(max_iterations):
+        no_change = True
+        new_community_map: dict[str, int] = {}
+
+        for uuid, neighbors in projection.items():
+            curr_community = community_map[uuid]
+
+            community_candidates: dict[int, int] = defaultdict(int)
+            for neighbor_uuid, edge_count in neighbors:
+                community_candidates[community_map[neighbor_uuid]] += edge_count
+            community_lst = [
+                (count, community) for community, count in community_candidates.items()
+            ]
+
+            community_lst.sort(reverse=True)
+            candidate_rank, community_candidate = community_lst[0] if community_lst else (0, -1)
+            if community_candidate != -1 and candidate_rank > 1:
+                new_community = community_candidate
+            else:
+                new_community = max(community_candidate, curr_community)
+
+            new_community_map[uuid] = new_community
+
+            if new_community != curr_community:
+                no_change = False
+
+        if no_change:
+            break
+
+        community_map = new_community_map
+
+    community_cluster_map = defaultdict(list)
+    for uuid, community in community_map.items():
+        community_cluster_map[community].append(uuid)
+
+    return list(community_cluster_map.values())
+
+
+def _to_projection(adjacency: dict[str, list[tuple[str, int]]]) -> CommunityProjection:
+    uuids = list(adjacency.keys())
+    uuid_idx = {uuid: i for i, uuid in enumerate(uuids)}
+    indptr = [0]
+    indices: list[int] = []
+    weights: list[int] = []
+    for uuid in uuids:
+        for neighbor_uuid, count in adjacency[uuid]:
+            indices.append(uuid_idx[neighbor_uuid])
+            weights.append(count)
+        indptr.append(len(indices))
+
+    return CommunityProjection(
+        uuids=uuids,
+        indptr=np.array(indptr, dtype=np.int64),
+        indices=np.array(indices, dtype=np.int64),
+        weights=np.array(weights, dtype=np.int64),
+    )
+
+
+def _random_adjacency(seed: int, num_nodes: int, num_edges: int):
+    rng = np.random.default_rng(seed)
+    counts: dict[tuple[int, int], int] = defaultdict(int)
+    for _ in range(num_edges):
+        a, b = (int(x) for x in rng.integers(0, num_nodes, size=2))
+        if a != b:
+            counts[(a, b)] += 1
+            counts[(b, a)] += 1
+
+    adjacency: dict[str, list[tuple[str, int]]] = {f'n{i:04d}': [] for i in range(num_nodes)}
+    for (a, b), count in counts.items():
+        adjacency[f'n{a:04d}'].append((f'n{b:04d}', count))
+    return adjacency
+
+
+def test_label_propagation_two_cliques():
+    adjacency = {
+        'a': [('b', 2), ('c', 2)],
+        'b': [('a', 2), ('c', 2)],
+        'c': [('a', 2), ('b', 2)],
+        'd': [('e', 1)],
+        'e': [('d', 1)],
+        'f': [],
+    }
+
+    clusters = label_propagation(_to_projection(adjacency))
+
+    assert sorted(sorted(cluster) for cluster in clusters) == [['a', 'b', 'c'], ['d', 'e'], ['f']]
+
+
+def test_label_propagation_stops_at_max_iterations():
+    # Two nodes joined by several edges swap labels on every sweep and never converge
+    adjacency = {'a': [('b', 3)], 'b': [('a', 3)]}
+
+    assert label_propagation(_to_projection(adjacency), max_iterations=4) == [['a'], ['b']]
+    assert label_propagation(_to_projection(adjacency), max_iterations=5) == [['a'], ['b']]
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_label_propagation_matches_reference(seed):
+    adjacency = _random_adjacency(seed, num_nodes=60, num_edges=150)
+
+    assert label_propagation(
+        _to_projection(adjacency), max_iterations=20
+    ) == _reference_label_propagation(adjacency, max_iterations=20)
+
+
+@pytest.mark.parametrize('max_iterations', [1, 2, 3, 7, 50])
+@pytest.mark.parametrize('seed', range(5, 10))
+def test_label_propagation_matches_reference_at_every_cap(seed, max_iterations):
+    adjacency = _random_adjacency(seed, num_nodes=400, num_edges=900)
+
+    assert label_propagation(
+        _to_projection(adjacency), max_iterations=max_iterations
+    ) == _reference_label_propagation(adjacency, max_iterations=max_iterations)
+
+
+def test_label_propagation_empty_projection():
+    assert label_propagation(_to_projection({})) == []
+
+
+@pytest.mark.asyncio
+async def test_get_community_projection_builds_csr():
+    driver = AsyncMock()
+    driver.execute_query.side_effect = [
+        ([{'uuid': 'c'}, {'uuid': 'b'}, {'uuid': 'a'}], None, None),
+        (
+            [
+                {'source_uuid': 'a', 'target_uuid': 'b', 'count': 2},
+                {'source_uuid': 'c', 'target_uuid': 'b', 'count': 1},
+                {'source_uuid': 'b', 'target_uuid': 'a', 'count': 2},
+                {'source_uuid': 'b', 'target_uuid': 'c', 'count': 1},
+            ],
+            None,
+            None,
+        ),
+    ]
+
+    projection = await get_community_projection(driver, 'group')
+
+    assert driver.execute_query.call_count == 2
+    assert projection.uuids == ['c', 'b', 'a']
+    assert projection.indptr.tolist() == [0, 1, 3, 4]
+    assert projection.indices.tolist() == [1, 2, 0, 1]
+    assert projection.weights.tolist() == [1, 2, 1, 2]
+
+
+def test_propagate_labels_keeps_boundary_fixed():
+    adjacency = {
+        'a': [('b', 2), ('c', 2)],
+        'b': [('a', 2), ('c', 2)],
+        'c': [('a', 2), ('b', 2)],
+    }
+    initial = np.array([0, 1, 5], dtype=np.int64)
+
+    assert propagate_labels(_to_projection(adjacency), initial, num_movable=2).tolist() == [5, 5, 5]
+    assert propagate_labels(_to_projection(adjacency), initial, num_movable=0).tolist() == [0, 1, 5]
+
+
+@pytest.mark.asyncio
+async def test_get_changed_community_clusters_only_returns_changed_communities():
+    # 'n' is a new entity attached to community c1; 'c' and 'd' are the unchanged boundary
+    adjacency = {
+        'n': [('a', 1), ('b', 1)],
+        'a': [('n', 1), ('b', 2), ('c', 2)],
+        'b': [('n', 1), ('a', 2), ('c', 2)],
+        'c': [],
+        'd': [],
+    }
+    module = 'graphiti_core.utils.maintenance.community_operations'
+    with (
+        patch(f'{module}.get_local_community_projection') as mock_projection,
+        patch(f'{module}.get_entity_communities') as mock_communities,
+        patch(f'{module}.get_community_members') as mock_members,
+    ):
+        mock_projection.return_value = (_to_projection(adjacency), 3)
+        mock_communities.return_value = {'a': 'c1', 'b': 'c1', 'c': 'c1', 'd': 'c2'}
+        mock_members.return_value = {'c1': ['a', 'b', 'c', 'z']}
+
+        clusters, stale_uuids = await get_changed_community_clusters(AsyncMock(), 'g', ['n'])
+
+    mock_members.assert_awaited_once_with(mock_members.call_args.args[0], ['c1'])
+    assert stale_uuids == ['c1']
+    assert clusters == [['z', 'n', 'a', 'b', 'c']]
+
+
+@pytest.mark.asyncio
+async def test_build_communities_incremental_skips_unchanged_groups():
+    module = 'graphiti_core.utils.maintenance.community_operations'
+    llm_client = AsyncMock()
+    with (
+        patch(f'{module}.get_last_community_build') as mock_last_build,
+        patch(f'{module}.get_changed_entity_uuids') as mock_changed,
+        patch(f'{module}.get_changed_community_clusters') as mock_clusters,
+        patch(f'{module}.get_community_clusters') as mock_full_clusters,
+    ):
+        mock_last_build.side_effect = [datetime(2024, 1, 1, tzinfo=timezone.utc), None]
+        mock_changed.return_value = []
+        mock_full_clusters.return_value = []
+
+        nodes, edges, stale_uuids = await build_communities_incremental(
+            AsyncMock(), llm_client, ['unchanged', 'new']
+        )
+
+    mock_clusters.assert_not_called()
+    mock_full_clusters.assert_awaited_once_with(mock_full_clusters.call_args.args[0], ['new'])
+    llm_client.generate_response.assert_not_called()
+    assert (nodes, edges, stale_uuids) == ([], [], [])
+
+
+def _summary_llm_client():
+    llm_client = AsyncMock()
+    llm_client.model = 'test-model'
+    llm_client.merged = []
+
+    async def generate_response(messages, response_model=None):
+        if response_model is not None and response_model.__name__ == 'SummaryDescription':
+            return {'description': 'description'}
+        llm_client.merged.append(messages[-1].content)
+        return {'summary': f'merged {hash(messages[-1].content)}'}
+
+    llm_client.generate_response.side_effect = generate_response
+    return llm_client
+
+
+def _members(count: int) -> list[EntityNode]:
+    return [
+        EntityNode(uuid=f'{i:02d}', name=f'n{i}', labels=['Entity'], group_id='g', summary=f's{i}')
+        for i in range(count)
+    ]
+
+
+@pytest.mark.asyncio
+async def test_build_community_merges_summary_fan_in_at_a_time():
+    llm_client = _summary_llm_client()
+
+    community_node, community_edges = await build_community(
+        llm_client, _members(40), summary_fan_in=4
+    )
+
+    merge_sizes = [
+        int(prompt.split('following ')[1].split(' summaries')[0]) for prompt in llm_client.merged
+    ]
+    assert all(2 <= size <= 8 for size in merge_sizes)
+    # Every merge removes size - 1 summaries until one is left
+    assert sum(size - 1 for size in merge_sizes) == 39
+    assert community_node.summary == f'merged {hash(llm_client.merged[-1])}'
+    assert len(community_edges) == 40
+
+
+def test_group_summaries_is_stable_under_insertion():
+    items = [(f'{i:03d}', f's{i}') for i in range(200)]
+    groups = group_summaries(items, 4, 0)
+    grown_groups = group_summaries([*items, ('new', 'new')], 4, 0)
+
+    assert all(len(group) >= 2 for group in groups[:-1])
+    assert all(len(group) <= 8 for group in groups)
+    # Only the groups around the new member change
+    assert len({tuple(group) for group in groups} - {tuple(group) for group in grown_groups}) <= 2
+
+
+@pytest.mark.asyncio
+async def test_build_community_reuses_cached_summaries():
+    summary_cache: dict[str, str] = {}
+    members = _members(64)
+
+    await build_community(_summary_llm_client(), members, summary_cache)
+    merge_count = len(summary_cache)
+
+    llm_client = _summary_llm_client()
+    await build_community(llm_client, list(reversed(members)), summary_cache)
+    assert llm_client.merged == []
+
+    # A new member only repeats the merges on its path to the root
+    llm_client = _summary_llm_client()
+    await build_community(llm_client, [*members, *_members(65)[64:]], summary_cache)
+    assert 0 < len(llm_client.merged) < merge_count / 3
+
+    # A different model doesn't reuse the summaries of another
+    llm_client = _summary_llm_client()
+    llm_client.model = 'other-model'
+    await build_community(llm_client, members, summary_cache)
+    assert len(llm_client.merged) == merge_count
+
+
+@pytest.mark.asyncio
+async def test_build_community_rejects_fan_in_below_two():
+    with pytest.raises(ValueError):
+        await build_community(_summary_llm_client(), _members(2), summary_fan_in=1)
@@ -0,0 +1,22 @@
+from unittest.mock import AsyncMock
+
+import pytest
+
+from graphiti_core.utils.maintenance.graph_data_operations import build_indices_and_constraints
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('provider', ['neo4j', 'falkordb'])
+async def test_build_indices_creates_vector_indices(provider):
+    driver = AsyncMock()
+    driver.provider = provider
+    driver.use_vector_indices = False
+
+    await build_indices_and_constraints(driver, embedding_dim=256)
+
+    queries = [call.args[0] for call in driver.execute_query.await_args_list]
+    vector_queries = [query for query in queries if 'VECTOR INDEX' in query]
+    assert len(vector_queries) == 3
+    assert all('256' in query for query in vector_queries)
+    assert any('fact_embedding' in query for query in vector_queries)
+    assert driver.use_vector_indices
@@ -0,0 +1,147 @@
+from unittest.mock import AsyncMock, MagicMock
+
+import numpy as np
+import pytest
+
+from graphiti_core.nodes import EntityNode
+from graphiti_core.search.ann_index import AnnCollection, LocalAnnIndex
+from graphiti_core.search.search_filters import SearchFilters
+from graphiti_core.search.search_utils import node_similarity_search
+from graphiti_core.utils.bulk_utils import add_nodes_and_edges_bulk
+
+
+def _brute_force(vectors: np.ndarray, query: np.ndarray, limit: int) -> list[int]:
+    normalized = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+    return list(np.argsort(-(normalized @ (query / np.linalg.norm(query))))[:limit])
+
+
+def test_search_is_exact_below_train_size_and_partitioned_by_group():
+    collection = AnnCollection('entity')
+    collection.upsert(
+        [
+            ('a', 'g1', [1.0, 0.0]),
+            ('b', 'g1', [1.0, 1.0]),
+            ('c', 'g2', [1.0, 0.1]),
+            ('d', 'g1', [-1.0, 0.0]),
+        ]
+    )
+
+    results = collection.search([1.0, 0.0], ['g1'], limit=5, min_score=0.6)
+    assert [uuid for uuid, _ in results] == ['a', 'b']
+    assert results[0][1] == pytest.approx(1.0)
+    assert results[1][1] == pytest.approx((1 + np.sqrt(0.5)) / 2)
+
+    assert [uuid for uuid, _ in collection.search([1.0, 0.0], None, 2, 0.0)] == ['a', 'c']
+
+
+def test_upsert_remove_and_remove_groups():
+    collection = AnnCollection('entity')
+    collection.upsert([('a', 'g1', [1.0, 0.0]), ('b', 'g2', [1.0, 0.0])])
+
+    # Re-saving a uuid replaces its vector and can move it to another group
+    collection.upsert([('a', 'g2', [0.0, 1.0])])
+    assert collection.search([0.0, 1.0], ['g1'], 5, 0.6) == []
+    assert [uuid for uuid, _ in collection.search([0.0, 1.0], ['g2'], 5, 0.6)] == ['a']
+
+    collection.upsert([('a', 'g2', None)])
+    collection.remove_groups(['g2'])
+    assert len(collection) == 0
+    assert collection.search([1.0, 0.0], None, 5, 0.0) == []
+
+
+def test_trained_partition_recall():
+    rng = np.random.default_rng(1)
+    centers = rng.normal(size=(16, 32))
+    vectors = centers[rng.integers(0, 16, 3000)] + 0.3 * rng.normal(size=(3000, 32))
+    collection = AnnCollection('entity', n_probe=8, min_train_size=1000)
+    collection.upsert((str(i), 'g', vector.tolist()) for i, vector in enumerate(vectors))
+
+    partition = collection.partitions['g']
+    assert partition.centroids is not None and len(partition.centroids) == 54
+
+    hits = 0
+    for query in rng.normal(size=(20, 32)):
+        expected = {str(i) for i in _brute_force(vectors, query, 10)}
+        found = {uuid for uuid, _ in collection.search(query.tolist(), ['g'], 10, 0.0)}
+        hits += len(expected & found)
+    assert hits / 200 >= 0.9
+
+
+def test_save_and_load(tmp_path):
+    index = LocalAnnIndex(str(tmp_path))
+    index.entities.upsert([('a', 'g1', [1.0, 0.0]), ('b', 'g2', [0.0, 1.0])])
+    index.edges.upsert([('e', 'g1', [0.5, 0.5])])
+    index.save()
+
+    index.remove_groups(['g2'])
+    index.save()
+
+    loaded = LocalAnnIndex(str(tmp_path))
+    assert set(loaded.entities.group_ids) == {'a'}
+    assert [uuid for uuid, _ in loaded.edges.search([1.0, 1.0], ['g1'], 5, 0.6)] == ['e']
+    assert len(list(tmp_path.iterdir())) == 2
+
+
+@pytest.mark.asyncio
+async def test_node_similarity_search_hydrates_index_results():
+    driver = AsyncMock()
+    driver.ann_index = LocalAnnIndex()
+    driver.search_cache = None
+    driver.ann_index.entities.upsert(
+        [('a', 'g', [1.0, 0.0]), ('b', 'g', [0.9, 0.1]), ('deleted', 'g', [1.0, 0.05])]
+    )
+    driver.execute_query.return_value = (
+        [
+            {
+                'uuid': uuid,
+                'name': uuid,
+                'group_id': 'g',
+                'labels': ['Entity'],
+                'created_at': '2024-01-01T00:00:00+00:00',
+                'summary': '',
+                'attributes': {},
+            }
+            for uuid in ['b', 'a']
+        ],
+        None,
+        None,
+    )
+
+    nodes = await node_similarity_search(driver, [1.0, 0.0], SearchFilters(), ['g'], limit=5)
+
+    assert driver.execute_query.await_args.kwargs['uuids'] == ['a', 'deleted', 'b']
+    assert [node.uuid for node in nodes] == ['a', 'b']
+    # Uuids the graph no longer has are dropped from the index
+    assert 'deleted' not in driver.ann_index.entities.group_ids
+
+
+@pytest.mark.asyncio
+async def test_entity_node_save_updates_index():
+    driver = AsyncMock()
+    driver.ann_index = LocalAnnIndex()
+    driver.search_cache = None
+    node = EntityNode(uuid='a', name='a', labels=[], group_id='g', name_embedding=[1.0, 0.0])
+
+    await node.save(driver)
+    assert driver.ann_index.entities.group_ids == {'a': 'g'}
+
+    await node.delete(driver)
+    assert len(driver.ann_index.entities) == 0
+
+
+@pytest.mark.asyncio
+async def test_bulk_write_updates_index_after_commit():
+    driver = MagicMock()
+    driver.ann_index = LocalAnnIndex()
+    driver.search_cache = None
+    session = driver.session.return_value = AsyncMock()
+    node = EntityNode(uuid='a', name='a', labels=[], group_id='g', name_embedding=[1.0, 0.0])
+
+    session.execute_write.side_effect = RuntimeError('rolled back')
+    with pytest.raises(RuntimeError):
+        await add_nodes_and_edges_bulk(driver, [], [], [node], [], AsyncMock())
+    assert len(driver.ann_index.entities) == 0
+
+    session.execute_write.side_effect = None
+    await add_nodes_and_edges_bulk(driver, [], [], [node], [], AsyncMock())
+    assert driver.ann_index.entities.group_ids == {'a': 'g'}
@@ -0,0 +1,262 @@
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from graphiti_core.edges import get_entity_edge_from_record
+from graphiti_core.nodes import EntityNode
+from graphiti_core.search.search import edge_search_batch, search_batch
+from graphiti_core.search.search_config import (
+    EdgeReranker,
+    EdgeSearchConfig,
+    EdgeSearchMethod,
+    SearchResults,
+)
+from graphiti_core.search.search_config_recipes import (
+    NODE_HYBRID_SEARCH_NODE_DISTANCE,
+    NODE_HYBRID_SEARCH_RRF,
+)
+from graphiti_core.search.search_filters import SearchFilters
+from graphiti_core.search.search_utils import (
+    edge_fulltext_search_batch,
+    fulltext_query,
+    node_fulltext_search_batch,
+    node_similarity_search_batch,
+)
+from graphiti_core.utils.maintenance.node_operations import search_existing_nodes
+
+
+def _mock_clients(vectors):
+    clients = MagicMock()
+    clients.driver = AsyncMock()
+    clients.embedder = AsyncMock()
+    clients.embedder.create_batch.return_value = vectors
+    return clients
+
+
+@pytest.mark.asyncio
+async def test_search_batch_embeds_once_and_ranks_per_query():
+    clients = _mock_clients([[0.1, 0.2], [0.3, 0.4]])
+    alice = EntityNode(uuid='1', name='Alice', labels=['Entity'], group_id='g')
+    bob = EntityNode(uuid='2', name='Bob', labels=['Entity'], group_id='g')
+    carol = EntityNode(uuid='3', name='Carol', labels=['Entity'], group_id='g')
+
+    with (
+        patch('graphiti_core.search.search.node_fulltext_search_batch') as mock_fulltext,
+        patch('graphiti_core.search.search.node_similarity_search_batch') as mock_similarity,
+    ):
+        mock_fulltext.return_value = [[alice], [bob]]
+        mock_similarity.return_value = [[carol, alice], []]
+
+        results = await search_batch(
+            clients, ['Alice', '', 'Bob'], ['g'], NODE_HYBRID_SEARCH_RRF, SearchFilters()
+        )
+
+    clients.embedder.create_batch.assert_awaited_once_with(['Alice', 'Bob'])
+    clients.embedder.create.assert_not_called()
+    assert mock_fulltext.call_count == 1
+    assert mock_similarity.call_count == 1
+    assert len(results) == 3
+    assert [node.uuid for node in results[0].nodes] == ['1', '3']
+    assert results[1].nodes == []
+    assert [node.uuid for node in results[2].nodes] == ['2']
+
+
+@pytest.mark.asyncio
+async def test_search_batch_falls_back_to_search_with_batched_vectors():
+    clients = _mock_clients([[0.1, 0.2], [0.3, 0.4]])
+
+    with patch('graphiti_core.search.search.search') as mock_search:
+        mock_search.return_value = MagicMock()
+        await search_batch(
+            clients, ['Alice', 'Bob'], ['g'], NODE_HYBRID_SEARCH_NODE_DISTANCE, SearchFilters()
+        )
+
+    clients.embedder.create_batch.assert_awaited_once()
+    assert [call.kwargs['query_vector'] for call in mock_search.call_args_list] == [
+        [0.1, 0.2],
+        [0.3, 0.4],
+    ]
+
+
+@pytest.mark.asyncio
+async def test_node_similarity_search_batch_groups_rows_by_query():
+    driver = AsyncMock()
+    driver.provider = 'neo4j'
+    match = {
+        'uuid': '1',
+        'name': 'Alice',
+        'group_id': 'g',
+        'created_at': '2024-01-01T00:00:00+00:00',
+        'summary': '',
+        'labels': ['Entity'],
+        'attributes': {},
+    }
+    driver.execute_query.return_value = ([{'query_idx': 1, 'matches': [match]}], None, None)
+
+    results = await node_similarity_search_batch(
+        driver, [[0.1], [0.2], [0.3]], SearchFilters(), ['g']
+    )
+
+    assert driver.execute_query.call_count == 1
+    assert [[node.uuid for node in result] for result in results] == [[], ['1'], []]
+
+
+def _edge_match(uuid: str, episodes: list[str]) -> dict:
+    return {
+        'uuid': uuid,
+        'group_id': 'g',
+        'source_node_uuid': 's',
+        'target_node_uuid': 't',
+        'created_at': '2024-01-01T00:00:00+00:00',
+        'name': 'RELATES_TO',
+        'fact': f'fact {uuid}',
+        'episodes': episodes,
+        'expired_at': None,
+        'valid_at': None,
+        'invalid_at': None,
+        'attributes': {},
+    }
+
+
+@pytest.mark.asyncio
+async def test_node_fulltext_search_batch_skips_empty_queries():
+    driver = AsyncMock()
+    driver.provider = 'neo4j'
+    match = {
+        'uuid': '2',
+        'name': 'Bob',
+        'group_id': 'g',
+        'created_at': '2024-01-01T00:00:00+00:00',
+        'summary': '',
+        'labels': ['Entity'],
+        'attributes': {},
+    }
+    driver.execute_query.return_value = ([{'query_idx': 2, 'matches': [match]}], None, None)
+    long_query = ' '.join(['word'] * 40)
+
+    results = await node_fulltext_search_batch(
+        driver, ['Alice', long_query, 'Bob'], SearchFilters(), ['g'], limit=5
+    )
+
+    query = driver.execute_query.call_args.args[0]
+    kwargs = driver.execute_query.call_args.kwargs
+    assert 'UNWIND $queries AS q' in query
+    assert 'collect(' in query and '[..$limit]' in query
+    assert [q['idx'] for q in kwargs['queries']] == [0, 2]
+    assert kwargs['queries'][0]['query'] == fulltext_query('Alice', ['g'])
+    assert kwargs['limit'] == 5
+    assert [[node.uuid for node in result] for result in results] == [[], [], ['2']]
+
+
+@pytest.mark.asyncio
+async def test_edge_fulltext_search_batch_without_valid_queries_skips_database():
+    driver = AsyncMock()
+    driver.provider = 'neo4j'
+
+    results = await edge_fulltext_search_batch(driver, [' '.join(['w'] * 40)], SearchFilters())
+
+    driver.execute_query.assert_not_called()
+    assert results == [[]]
+
+
+@pytest.mark.asyncio
+async def test_edge_fulltext_search_batch_maps_rows_to_queries():
+    driver = AsyncMock()
+    driver.provider = 'neo4j'
+    driver.execute_query.return_value = (
+        [
+            {'query_idx': 1, 'matches': [_edge_match('e2', ['ep'])]},
+            {'query_idx': 0, 'matches': [_edge_match('e1', ['ep'])]},
+        ],
+        None,
+        None,
+    )
+
+    results = await edge_fulltext_search_batch(driver, ['first', 'second'], SearchFilters(), ['g'])
+
+    query = driver.execute_query.call_args.args[0]
+    assert 'queryRelationships("edge_name_and_fact", q.query' in query
+    assert '[r:RELATES_TO {uuid: rel.uuid}]' in query
+    assert [q['idx'] for q in driver.execute_query.call_args.kwargs['queries']] == [0, 1]
+    assert [[edge.uuid for edge in result] for result in results] == [['e1'], ['e2']]
+
+
+@pytest.mark.asyncio
+async def test_edge_search_batch_episode_mentions_reranks_per_query():
+    driver = AsyncMock()
+    config = EdgeSearchConfig(
+        search_methods=[EdgeSearchMethod.bm25, EdgeSearchMethod.cosine_similarity],
+        reranker=EdgeReranker.episode_mentions,
+    )
+    few = get_entity_edge_from_record(_edge_match('few', ['a']))
+    many = get_entity_edge_from_record(_edge_match('many', ['a', 'b', 'c']))
+
+    with (
+        patch('graphiti_core.search.search.edge_fulltext_search_batch') as mock_fulltext,
+        patch('graphiti_core.search.search.edge_similarity_search_batch') as mock_similarity,
+    ):
+        mock_fulltext.return_value = [[few, many], []]
+        mock_similarity.return_value = [[few], []]
+
+        results = await edge_search_batch(
+            driver, ['q1', 'q2'], [[0.1], [0.2]], ['g'], config, SearchFilters()
+        )
+
+    assert [[edge.uuid for edge in result] for result in results] == [['many', 'few'], []]
+
+
+@pytest.mark.asyncio
+async def test_edge_search_batch_mmr_fetches_embeddings_once():
+    driver = AsyncMock()
+    config = EdgeSearchConfig(
+        search_methods=[EdgeSearchMethod.cosine_similarity], reranker=EdgeReranker.mmr
+    )
+    e1 = get_entity_edge_from_record(_edge_match('e1', ['a']))
+    e2 = get_entity_edge_from_record(_edge_match('e2', ['a']))
+
+    with (
+        patch('graphiti_core.search.search.edge_similarity_search_batch') as mock_similarity,
+        patch('graphiti_core.search.search.get_embeddings_for_edges') as mock_embeddings,
+    ):
+        mock_similarity.return_value = [[e1, e2], [e2]]
+        mock_embeddings.return_value = {'e1': [1.0, 0.0], 'e2': [0.0, 1.0]}
+
+        results = await edge_search_batch(
+            driver, ['q1', 'q2'], [[1.0, 0.0], [0.0, 1.0]], ['g'], config, SearchFilters()
+        )
+
+    assert mock_embeddings.call_count == 1
+    assert {edge.uuid for edge in mock_embeddings.call_args.args[1]} == {'e1', 'e2'}
+    assert [[edge.uuid for edge in result] for result in results] == [['e1', 'e2'], ['e2']]
+
+
+@pytest.mark.asyncio
+async def test_search_existing_nodes_keeps_extracted_order():
+    clients = MagicMock()
+    extracted = [
+        EntityNode(uuid='x1', name='Alice', labels=['Entity'], group_id='g1'),
+        EntityNode(uuid='x2', name='Bob', labels=['Entity'], group_id='g2'),
+        EntityNode(uuid='x3', name='Carol', labels=['Entity'], group_id='g1'),
+    ]
+
+    def results_for(names):
+        return [
+            SearchResults(
+                edges=[],
+                nodes=[EntityNode(uuid=f'found-{name}', name=name, labels=['Entity'], group_id='')],
+                episodes=[],
+                communities=[],
+            )
+            for name in names
+        ]
+
+    async def fake_search_batch(clients, queries, group_ids, search_filter, config):
+        return results_for(queries)
+
+    with patch(
+        'graphiti_core.utils.maintenance.node_operations.search_batch',
+        side_effect=fake_search_batch,
+    ):
+        nodes = await search_existing_nodes(clients, extracted)
+
+    assert [node.uuid for node in nodes] == ['found-Alice', 'found-Bob', 'found-Carol']
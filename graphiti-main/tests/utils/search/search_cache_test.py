@@ -0,0 +1,129 @@
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from graphiti_core.nodes import EntityNode, EpisodeType, EpisodicNode
+from graphiti_core.search.search import search
+from graphiti_core.search.search_cache import SearchCache
+from graphiti_core.search.search_config import SearchResults
+from graphiti_core.search.search_config_recipes import NODE_HYBRID_SEARCH_RRF
+from graphiti_core.search.search_filters import SearchFilters
+from graphiti_core.utils.bulk_utils import add_nodes_and_edges_bulk
+from graphiti_core.utils.datetime_utils import utc_now
+
+
+def _results(name: str) -> SearchResults:
+    node = EntityNode(uuid=name, name=name, labels=['Entity'], group_id='g')
+    return SearchResults(edges=[], nodes=[node], episodes=[], communities=[])
+
+
+def _key(query: str) -> str:
+    return SearchCache.get_key(query, None, NODE_HYBRID_SEARCH_RRF, SearchFilters())
+
+
+def test_lru_bound():
+    cache = SearchCache(max_entries=2)
+    for query in ['a', 'b']:
+        cache.set(_key(query), cache.get_generations(None), _results(query))
+
+    # Reading 'a' makes 'b' the least recently used entry
+    assert cache.get(_key('a'), None) is not None
+    cache.set(_key('c'), cache.get_generations(None), _results('c'))
+
+    assert len(cache) == 2
+    assert cache.get(_key('b'), None) is None
+    assert cache.get(_key('c'), None) is not None
+    assert cache.get_stats().model_dump() == {'hits': 2, 'misses': 1, 'size': 2}
+
+
+def test_bump_invalidates_only_touched_groups():
+    cache = SearchCache()
+    cache.set('g1', cache.get_generations(['g1']), _results('g1'))
+    cache.set('g2', cache.get_generations(['g2']), _results('g2'))
+    cache.set('all', cache.get_generations(None), _results('all'))
+
+    cache.bump(['g1'])
+
+    assert cache.get('g1', ['g1']) is None
+    assert cache.get('g2', ['g2']) is not None
+    # Searches across all groups depend on every write
+    assert cache.get('all', None) is None
+
+    cache.bump(None)
+    assert cache.get('g2', ['g2']) is None
+
+
+def test_results_started_before_a_write_are_not_served():
+    cache = SearchCache()
+    generations = cache.get_generations(['g'])
+    cache.bump(['g'])
+    cache.set('key', generations, _results('stale'))
+
+    assert cache.get('key', ['g']) is None
+
+
+def test_cached_results_are_copies():
+    cache = SearchCache()
+    cache.set('key', cache.get_generations(['g']), _results('a'))
+    cache.get('key', ['g']).nodes.clear()  # type: ignore[union-attr]
+
+    assert len(cache.get('key', ['g']).nodes) == 1  # type: ignore[union-attr]
+
+
+def test_cached_results_drop_embeddings():
+    node = EntityNode(uuid='a', name='a', labels=['Entity'], group_id='g', name_embedding=[1.0])
+    results = SearchResults(edges=[], nodes=[node], episodes=[], communities=[])
+    cache = SearchCache()
+    cache.set('key', cache.get_generations(['g']), results)
+
+    assert cache.get('key', ['g']).nodes[0].name_embedding is None  # type: ignore[union-attr]
+    # The caller's results keep theirs
+    assert node.name_embedding == [1.0]
+
+
+@pytest.mark.asyncio
+async def test_search_is_served_from_cache_until_a_write():
+    clients = MagicMock()
+    clients.driver = AsyncMock()
+    clients.driver.search_cache = SearchCache()
+    clients.embedder = AsyncMock()
+    clients.embedder.create.return_value = [0.1, 0.2]
+    alice = EntityNode(uuid='1', name='Alice', labels=['Entity'], group_id='g')
+
+    with patch('graphiti_core.search.search.node_search', return_value=[alice]) as mock_search:
+        for _ in range(2):
+            results = await search(clients, 'alice', ['g'], NODE_HYBRID_SEARCH_RRF, SearchFilters())
+            assert [node.uuid for node in results.nodes] == ['1']
+        assert mock_search.await_count == 1
+        assert clients.embedder.create.await_count == 1
+
+        await search(
+            clients, 'alice', ['g'], NODE_HYBRID_SEARCH_RRF, SearchFilters(), None, None, [0.1, 0.2]
+        )
+        assert mock_search.await_count == 2
+
+        clients.driver.search_cache.bump(['g'])
+        await search(clients, 'alice', ['g'], NODE_HYBRID_SEARCH_RRF, SearchFilters())
+        assert mock_search.await_count == 3
+
+
+@pytest.mark.asyncio
+async def test_bulk_write_bumps_written_groups():
+    driver = MagicMock()
+    driver.search_cache = SearchCache()
+    driver.session.return_value = AsyncMock()
+    episode = EpisodicNode(
+        name='episode',
+        group_id='g1',
+        source=EpisodeType.text,
+        source_description='',
+        content='',
+        valid_at=utc_now(),
+    )
+    driver.search_cache.set('g1', driver.search_cache.get_generations(['g1']), _results('g1'))
+    driver.search_cache.set('g2', driver.search_cache.get_generations(['g2']), _results('g2'))
+
+    await add_nodes_and_edges_bulk(driver, [episode], [], [], [], AsyncMock())
+
+    assert driver.search_cache.get('g1', ['g1']) is None
+    assert driver.search_cache.get('g2', ['g2']) is not None
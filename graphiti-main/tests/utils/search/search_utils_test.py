@@ -1,10 +1,18 @@
 from unittest.mock import AsyncMock, patch
 
+import numpy as np
 import pytest
 
+from graphiti_core.helpers import normalize_l2
 from graphiti_core.nodes import EntityNode
 from graphiti_core.search.search_filters import SearchFilters
-from graphiti_core.search.search_utils import hybrid_node_search
+from graphiti_core.search.search_utils import (
+    MAX_VECTOR_INDEX_K,
+    VECTOR_INDEX_OVERSAMPLING,
+    hybrid_node_search,
+    maximal_marginal_relevance,
+    node_similarity_search,
+)
 
 
 @pytest.mark.asyncio
@@ -161,3 +169,177 @@ async def test_hybrid_node_search_with_limit_and_duplicates():
         mock_similarity_search.assert_called_with(
             mock_driver, [0.1, 0.2, 0.3], SearchFilters(), ['1'], 4
         )
+
+
+def _greedy_mmr(query_vector, candidates, mmr_lambda, min_score=-2.0):
+    # Textbook greedy MMR, one candidate and one pair at a time
+    normalized = {uuid: normalize_l2(embedding) for uuid, embedding in candidates.items()}
+    remaining = list(normalized)
+    selected: list[str] = []
+    while remaining:
+        scores = {
+            uuid: mmr_lambda * np.dot(query_vector, normalized[uuid])
+            - (1 - mmr_lambda)
+            * max((np.dot(normalized[uuid], normalized[s]) for s in selected), default=0.0)
+            for uuid in remaining
+        }
+        best = max(remaining, key=lambda uuid: scores[uuid])
+        if scores[best] < min_score:
+            break
+        selected.append(best)
+        remaining.remove(best)
+    return selected
+
+
+def test_maximal_marginal_relevance_matches_greedy_selection():
+    rng = np.random.default_rng(7)
+    query = normalize_l2(rng.normal(size=32).tolist()).tolist()
+    candidates = {f'c{i}': rng.normal(size=32).tolist() for i in range(60)}
+
+    for mmr_lambda in (0.3, 0.5, 0.9):
+        expected = _greedy_mmr(query, candidates, mmr_lambda)
+        assert maximal_marginal_relevance(query, candidates, mmr_lambda) == expected
+        assert (
+            maximal_marginal_relevance(query, candidates, mmr_lambda, max_results=5)
+            == (expected[:5])
+        )
+
+
+def test_maximal_marginal_relevance_prefers_diverse_candidates():
+    query = [1.0, 0.0]
+    candidates = {'a': [1.0, 0.1], 'a_copy': [1.0, 0.1], 'b': [0.7, -0.7]}
+
+    assert maximal_marginal_relevance(query, candidates, 0.5) == ['a', 'b', 'a_copy']
+    assert maximal_marginal_relevance(query, candidates, 0.5, min_score=0.0) == ['a', 'b']
+    assert maximal_marginal_relevance(query, {}, 0.5) == []
+
+
+def _vector_index_driver(provider: str = 'neo4j') -> AsyncMock:
+    driver = AsyncMock()
+    driver.provider = provider
+    driver.ann_index = None
+    driver.use_vector_indices = True
+    return driver
+
+
+def _node_record(uuid: str) -> dict:
+    return {
+        'uuid': uuid,
+        'name': uuid,
+        'group_id': 'g',
+        'labels': ['Entity'],
+        'created_at': '2024-01-01T00:00:00+00:00',
+        'summary': '',
+        'attributes': {},
+    }
+
+
+@pytest.mark.asyncio
+async def test_node_similarity_search_queries_vector_index():
+    driver = _vector_index_driver()
+    driver.execute_query.return_value = ([_node_record('a'), _node_record('b')], None, None)
+
+    nodes = await node_similarity_search(driver, [1.0], SearchFilters(), ['g'], limit=2)
+
+    assert [node.uuid for node in nodes] == ['a', 'b']
+    driver.execute_query.assert_awaited_once()
+    call = driver.execute_query.await_args
+    assert "db.index.vector.queryNodes('entity_name_embedding'" in call.args[0]
+    assert call.kwargs['k'] == 2 * VECTOR_INDEX_OVERSAMPLING
+
+
+@pytest.mark.asyncio
+async def test_node_similarity_search_keeps_short_results_when_index_ran_out():
+    driver = _vector_index_driver()
+    driver.execute_query.side_effect = [
+        ([_node_record('a')], None, None),
+        ([{'neighbours': 5, 'lowest_score': 0.9}], None, None),
+    ]
+
+    nodes = await node_similarity_search(driver, [1.0], SearchFilters(), ['g'], limit=2)
+
+    assert [node.uuid for node in nodes] == ['a']
+    assert driver.execute_query.await_count == 2
+    assert 'count(*) AS neighbours' in driver.execute_query.await_args.args[0]
+
+
+@pytest.mark.asyncio
+async def test_node_similarity_search_keeps_short_results_below_min_score():
+    driver = _vector_index_driver()
+    k = 2 * VECTOR_INDEX_OVERSAMPLING
+    driver.execute_query.side_effect = [
+        ([_node_record('a')], None, None),
+        ([{'neighbours': k, 'lowest_score': 0.4}], None, None),
+    ]
+
+    nodes = await node_similarity_search(
+        driver, [1.0], SearchFilters(), ['g'], limit=2, min_score=0.5
+    )
+
+    assert [node.uuid for node in nodes] == ['a']
+    assert driver.execute_query.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_node_similarity_search_retries_short_results_with_larger_k():
+    driver = _vector_index_driver()
+    k = 2 * VECTOR_INDEX_OVERSAMPLING
+    driver.execute_query.side_effect = [
+        ([_node_record('a')], None, None),
+        ([{'neighbours': k, 'lowest_score': 0.9}], None, None),
+        ([_node_record('a'), _node_record('b')], None, None),
+    ]
+
+    nodes = await node_similarity_search(driver, [1.0], SearchFilters(), ['g'], limit=2)
+
+    assert [node.uuid for node in nodes] == ['a', 'b']
+    assert driver.execute_query.await_args.kwargs['k'] == k * VECTOR_INDEX_OVERSAMPLING
+    assert 'db.index.vector.queryNodes' in driver.execute_query.await_args.args[0]
+
+
+@pytest.mark.asyncio
+async def test_node_similarity_search_falls_back_past_max_k():
+    driver = _vector_index_driver()
+    limit = MAX_VECTOR_INDEX_K // VECTOR_INDEX_OVERSAMPLING
+    driver.execute_query.side_effect = [
+        ([_node_record('a')], None, None),
+        ([{'neighbours': MAX_VECTOR_INDEX_K, 'lowest_score': 0.9}], None, None),
+        ([_node_record('a'), _node_record('b')], None, None),
+    ]
+
+    nodes = await node_similarity_search(driver, [1.0], SearchFilters(), ['g'], limit=limit)
+
+    assert [node.uuid for node in nodes] == ['a', 'b']
+    assert 'vector.similarity.cosine' in driver.execute_query.await_args.args[0]
+    assert driver.use_vector_indices
+
+
+@pytest.mark.asyncio
+async def test_node_similarity_search_falls_back_once_on_transient_error():
+    driver = _vector_index_driver()
+    driver.execute_query.side_effect = [
+        ConnectionError('connection reset'),
+        ([_node_record('a')], None, None),
+    ]
+
+    await node_similarity_search(driver, [1.0], SearchFilters(), ['g'], limit=2)
+
+    assert 'vector.similarity.cosine' in driver.execute_query.await_args.args[0]
+    assert driver.use_vector_indices
+
+
+@pytest.mark.asyncio
+async def test_node_similarity_search_stops_using_missing_vector_index():
+    driver = _vector_index_driver()
+    driver.execute_query.side_effect = [
+        RuntimeError('There is no such vector schema index'),
+        ([_node_record('a')], None, None),
+        ([_node_record('a')], None, None),
+    ]
+
+    await node_similarity_search(driver, [1.0], SearchFilters(), ['g'], limit=2)
+    assert not driver.use_vector_indices
+
+    await node_similarity_search(driver, [1.0], SearchFilters(), ['g'], limit=2)
+    assert driver.execute_query.await_count == 3
+    assert 'vector.similarity.cosine' in driver.execute_query.await_args.args[0]
@@ -0,0 +1,98 @@
+import copy
+from unittest.mock import AsyncMock, patch
+
+import numpy as np
+import pytest
+
+from graphiti_core.edges import get_entity_edge_from_record
+from graphiti_core.nodes import EntityNode, get_entity_node_from_record
+from graphiti_core.search.search_utils import get_embeddings_for_nodes
+from graphiti_core.search.vector_store import VectorStore
+
+
+def test_vector_store_evicts_least_recently_used_by_size():
+    # Each vector is 4 float32s, 16 bytes
+    store = VectorStore(max_bytes=32)
+    store.set_many({'a': [1.0] * 4, 'b': [2.0] * 4})
+    store.get_many(['a'])
+    store.set_many({'c': [3.0] * 4})
+
+    assert set(store.get_many(['a', 'b', 'c'])) == {'a', 'c'}
+    assert store.size_bytes == 32
+    assert store.get_many(['a'])['a'].dtype == np.float32
+
+
+def test_vector_store_invalidate_and_clear():
+    store = VectorStore()
+    store.set_many({'a': [1.0], 'b': [2.0]})
+    store.invalidate(['a', 'missing'])
+
+    assert list(store.get_many(['a', 'b'])) == ['b']
+    assert (store.hits, store.misses) == (1, 1)
+
+    store.clear()
+    assert len(store) == 0 and store.size_bytes == 0
+
+
+@pytest.mark.asyncio
+async def test_get_embeddings_for_nodes_only_queries_missing_uuids():
+    store = VectorStore()
+    store.set_many({'stored': [2.0, 2.0]})
+    driver = AsyncMock()
+    driver.execute_query.return_value = ([{'uuid': 'missing', 'embedding': [3.0, 3.0]}], None, None)
+    nodes = [
+        EntityNode(uuid=uuid, name=uuid, labels=[], group_id='g', name_embedding=embedding)
+        for uuid, embedding in [('carried', [1.0, 1.0]), ('stored', None), ('missing', None)]
+    ]
+
+    with patch('graphiti_core.search.search_utils.vector_store', store):
+        embeddings = await get_embeddings_for_nodes(driver, nodes)
+        assert driver.execute_query.await_args.kwargs['uuids'] == ['missing']
+        assert {uuid: e.tolist() for uuid, e in embeddings.items()} == {
+            'carried': [1.0, 1.0],
+            'stored': [2.0, 2.0],
+            'missing': [3.0, 3.0],
+        }
+
+        # Everything is in the store now
+        driver.execute_query.reset_mock()
+        for node in nodes:
+            node.name_embedding = None
+        await get_embeddings_for_nodes(driver, nodes)
+        driver.execute_query.assert_not_awaited()
+
+
+def test_record_parsers_keep_embeddings_only_when_asked():
+    node_record = {
+        'uuid': 'n',
+        'name': 'n',
+        'group_id': 'g',
+        'labels': ['Entity'],
+        'created_at': '2024-01-01T00:00:00+00:00',
+        'summary': '',
+        'attributes': {'name_embedding': [1.0], 'age': 3},
+    }
+    edge_record = {
+        'uuid': 'e',
+        'source_node_uuid': 'a',
+        'target_node_uuid': 'b',
+        'fact': 'f',
+        'name': 'R',
+        'group_id': 'g',
+        'episodes': [],
+        'created_at': '2024-01-01T00:00:00+00:00',
+        'expired_at': None,
+        'valid_at': None,
+        'invalid_at': None,
+        'attributes': {'fact_embedding': [2.0]},
+    }
+
+    node = get_entity_node_from_record(copy.deepcopy(node_record))
+    edge = get_entity_edge_from_record(copy.deepcopy(edge_record))
+    assert node.name_embedding is None and node.attributes == {'age': 3}
+    assert edge.fact_embedding is None and edge.attributes == {}
+
+    node = get_entity_node_from_record(node_record, include_embedding=True)
+    edge = get_entity_edge_from_record(edge_record, include_embedding=True)
+    assert node.name_embedding == [1.0] and node.attributes == {'age': 3}
+    assert edge.fact_embedding == [2.0] and edge.attributes == {}
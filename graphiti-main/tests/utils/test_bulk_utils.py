@@ -0,0 +1,265 @@
+from datetime import datetime, timezone
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pytest
+
+from graphiti_core.edges import EntityEdge
+from graphiti_core.helpers import normalize_l2
+from graphiti_core.nodes import EntityNode, EpisodeType, EpisodicNode
+from graphiti_core.utils.bulk_utils import (
+    BulkChunkCheckpoint,
+    CommittedNodeIndex,
+    RawEpisode,
+    add_nodes_and_edges_bulk,
+    find_dedupe_candidates,
+    get_bulk_chunk_fingerprint,
+    load_bulk_chunk_checkpoint,
+    resolve_nodes_against_graph_bulk,
+    save_bulk_chunk_checkpoint,
+)
+
+NOW = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def _pairwise_candidates(texts, embeddings, group_sizes, min_score):
+    group_of = [g for g, size in enumerate(group_sizes) for _ in range(size)]
+    candidates = []
+    for k, text in enumerate(texts):
+        row = []
+        for j, other in enumerate(texts):
+            if group_of[j] == group_of[k]:
+                continue
+            if not set(text.lower().split()).isdisjoint(set(other.lower().split())):
+                row.append(j)
+                continue
+            similarity = np.dot(normalize_l2(embeddings[k]), normalize_l2(embeddings[j]))
+            if similarity >= min_score:
+                row.append(j)
+        candidates.append(row)
+    return candidates
+
+
+def test_find_dedupe_candidates_matches_pairwise():
+    rng = np.random.default_rng(42)
+    words = ['imam', 'ali', 'hadith', 'kufa', 'scholar', 'book', 'fiqh', 'usul', 'tafsir']
+    group_sizes = [5, 0, 7, 3, 9]
+    n = sum(group_sizes)
+    texts = [' '.join(rng.choice(words, size=2)).title() for _ in range(n)]
+    base = rng.normal(size=(3, 16))
+    embeddings = [(base[k % 3] + rng.normal(scale=0.5, size=16)).tolist() for k in range(n)]
+
+    for min_score in (0.6, 0.8):
+        expected = _pairwise_candidates(texts, embeddings, group_sizes, min_score)
+        assert find_dedupe_candidates(texts, embeddings, group_sizes, min_score) == expected
+        assert (
+            find_dedupe_candidates(texts, embeddings, group_sizes, min_score, block_size=4)
+            == expected
+        )
+
+
+def test_find_dedupe_candidates_threshold_is_inclusive():
+    texts = ['alpha', 'beta', 'gamma']
+    embeddings = [[1.0, 0.0], [1.0, 0.0], [0.0, 1.0]]
+
+    assert find_dedupe_candidates(texts, embeddings, [1, 1, 1], 1.0) == [[1], [0], []]
+    assert find_dedupe_candidates(texts, embeddings, [2, 1], 1.0) == [[], [], []]
+
+
+def test_find_dedupe_candidates_empty():
+    assert find_dedupe_candidates([], [], [], 0.8) == []
+
+
+def test_find_dedupe_candidates_missing_embeddings():
+    texts = ['alpha', 'beta', 'gamma']
+    embeddings = [[1.0, 0.0], None, []]
+
+    assert find_dedupe_candidates(texts, embeddings, [1, 1, 1], 0.8) == [[], [], []]
+    assert find_dedupe_candidates(texts, embeddings, [1, 1, 1], 0.0) == [[1, 2], [0, 2], [0, 1]]
+
+
+def _entity(name: str, embedding: list[float] | None) -> EntityNode:
+    return EntityNode(name=name, group_id='g', labels=[], name_embedding=embedding)
+
+
+def test_committed_node_index_finds_token_and_embedding_matches():
+    index = CommittedNodeIndex()
+    assert index.find_candidates([_entity('Ali', [1.0, 0.0])], 0.8) == [[]]
+
+    ali = _entity('Imam Ali', [1.0, 0.0])
+    kufa = _entity('Kufa', [0.0, 1.0])
+    index.add([ali, kufa])
+
+    queries = [_entity('Ali ibn Abi Talib', None), _entity('Al-Kufa', [0.1, 1.0, 0.0])]
+    candidates = index.find_candidates(queries, 0.8)
+
+    assert [[node.uuid for node in nodes] for nodes in candidates] == [[ali.uuid], [kufa.uuid]]
+
+
+def test_committed_node_index_replaces_rewritten_nodes():
+    index = CommittedNodeIndex()
+    ali = _entity('Imam Ali', [1.0, 0.0])
+    index.add([ali])
+    updated = ali.model_copy(update={'summary': 'updated'})
+    index.add([updated])
+
+    assert len(index) == 1 and ali.uuid in index
+    assert index.get(ali.uuid).summary == 'updated'
+
+
+def test_bulk_chunk_checkpoint_round_trip(tmp_path):
+    raw = [
+        RawEpisode(
+            name='e1',
+            content='body',
+            source_description='test',
+            source=EpisodeType.text,
+            reference_time=NOW,
+        )
+    ]
+    fingerprint = get_bulk_chunk_fingerprint(raw, 'g')
+    episode = EpisodicNode(
+        name='e1',
+        group_id='g',
+        labels=[],
+        source=EpisodeType.text,
+        content='body',
+        source_description='test',
+        created_at=NOW,
+        valid_at=NOW,
+    )
+    path = str(tmp_path / 'chunks' / 'chunk-000000.json')
+
+    assert load_bulk_chunk_checkpoint(path, fingerprint) is None
+
+    checkpoint = BulkChunkCheckpoint(
+        fingerprint=fingerprint,
+        status='extracted',
+        episodes=[episode],
+        entity_nodes=[_entity('Imam Ali', [1.0, 0.0])],
+    )
+    save_bulk_chunk_checkpoint(path, checkpoint)
+
+    assert load_bulk_chunk_checkpoint(path, fingerprint) == checkpoint
+    with pytest.raises(ValueError):
+        load_bulk_chunk_checkpoint(path, get_bulk_chunk_fingerprint(raw, 'other'))
+
+
+@pytest.mark.asyncio
+async def test_resolve_nodes_against_graph_bulk_batches_related_nodes():
+    episode = EpisodicNode(
+        name='e1',
+        group_id='g',
+        labels=[],
+        source=EpisodeType.text,
+        content='body',
+        source_description='test',
+        created_at=NOW,
+        valid_at=NOW,
+    )
+    ali, imam_ali, kufa, basra = (
+        _entity(name, [1.0, float(i)])
+        for i, name in enumerate(['Ali', 'Imam Ali', 'Kufa', 'Basra'])
+    )
+    existing_ali = _entity('Ali ibn Abi Talib', [1.0, 0.0])
+    existing_kufa = _entity('Kufa', [0.0, 1.0])
+    search_results = {
+        'Ali': [existing_ali],
+        'Imam Ali': [existing_ali, imam_ali],
+        'Kufa': [existing_kufa],
+        'Basra': [],
+    }
+
+    async def search(driver, queries, *args):
+        return [search_results[query] for query in queries]
+
+    async def resolve(clients, nodes, episode, previous_episodes, entity_types, **kwargs):
+        existing = kwargs['existing_nodes_override']
+        uuid_map = {node.uuid: existing[0].uuid for node in nodes}
+        return existing[:1] * len(nodes), uuid_map, []
+
+    clients = MagicMock()
+    with (
+        patch('graphiti_core.utils.bulk_utils.node_search_batch', side_effect=search),
+        patch(
+            'graphiti_core.utils.bulk_utils.resolve_extracted_nodes', side_effect=resolve
+        ) as mock_resolve,
+    ):
+        nodes_by_episode, uuid_map, duplicate_of_edges = await resolve_nodes_against_graph_bulk(
+            clients,
+            {episode.uuid: [ali, imam_ali, kufa, basra]},
+            [(episode, [])],
+            NOW,
+        )
+
+    # Ali and Imam Ali share a candidate and are resolved in one call, Basra has none
+    batches = sorted([n.name for n in call.args[1]] for call in mock_resolve.call_args_list)
+    assert batches == [['Ali', 'Imam Ali'], ['Kufa']]
+    assert uuid_map == {
+        ali.uuid: existing_ali.uuid,
+        imam_ali.uuid: existing_ali.uuid,
+        kufa.uuid: existing_kufa.uuid,
+    }
+    assert [n.name for n in nodes_by_episode[episode.uuid]] == [
+        'Ali ibn Abi Talib',
+        'Kufa',
+        'Basra',
+    ]
+    assert duplicate_of_edges == []
+
+
+@pytest.mark.asyncio
+async def test_add_nodes_and_edges_bulk_embeds_before_writing_in_chunks():
+    events: list[str] = []
+    statements: list[tuple[str, int]] = []
+
+    embedder = MagicMock()
+
+    async def create_batch(texts):
+        events.append(f'embed {len(texts)}')
+        return [[1.0, 0.0] for _ in texts]
+
+    embedder.create_batch.side_effect = create_batch
+
+    class FakeTx:
+        async def run(self, query, **params):
+            ((name, rows),) = params.items()
+            statements.append((name, len(rows)))
+
+    class FakeSession:
+        async def execute_write(self, func, *args, **kwargs):
+            events.append('transaction')
+            await func(FakeTx(), *args, **kwargs)
+
+        async def close(self):
+            pass
+
+    driver = MagicMock()
+    driver.provider = 'neo4j'
+    driver.session.return_value = FakeSession()
+
+    nodes = [_entity(f'node {i}', None) for i in range(5)] + [_entity('embedded', [0.0, 1.0])]
+    edges = [
+        EntityEdge(
+            source_node_uuid=nodes[0].uuid,
+            target_node_uuid=nodes[1].uuid,
+            name='RELATES_TO',
+            fact=f'fact {i}',
+            group_id='g',
+            episodes=[],
+            created_at=NOW,
+        )
+        for i in range(3)
+    ]
+
+    await add_nodes_and_edges_bulk(driver, [], [], nodes, edges, embedder, chunk_size=2)
+
+    assert events == ['embed 5', 'embed 3', 'transaction']
+    assert all(node.name_embedding is not None for node in nodes)
+    assert statements == [
+        ('nodes', 2),
+        ('nodes', 2),
+        ('nodes', 2),
+        ('entity_edges', 2),
+        ('entity_edges', 1),
+    ]